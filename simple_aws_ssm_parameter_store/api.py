@@ -1,16 +1,294 @@
 # -*- coding: utf-8 -*-
 
-from .constants import ParameterType
-from .constants import ParameterTier
-from .constants import ResourceType
-from .constants import DEFAULT_KMS_KEY
-from .utils import encode_tags
-from .utils import decode_tags
-from .model import Parameter
-from .client import get_parameter
-from .client import put_parameter_if_changed
-from .client import delete_parameter
-from .client import get_parameter_tags
-from .client import remove_parameter_tags
-from .client import update_parameter_tags
-from .client import put_parameter_tags
\ No newline at end of file
+"""
+Public API of this library.
+
+Members are resolved lazily, on first attribute access, with a module level
+``__getattr__`` (:pep:`562`). ``import simple_aws_ssm_parameter_store.api``
+is therefore cheap, and heavy dependencies such as boto3 and botocore are only
+loaded by the modules that need them.
+
+Example::
+
+    import simple_aws_ssm_parameter_store.api as ssm
+
+    ssm.get_parameter(ssm_client, "/app/db/host")
+"""
+
+import typing as T
+import importlib
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .constants import ParameterType
+    from .constants import ParameterTier
+    from .constants import ResourceType
+    from .constants import DEFAULT_KMS_KEY
+    from .constants import STANDARD_TIER_MAX_VALUE_SIZE
+    from .constants import ADVANCED_TIER_MAX_VALUE_SIZE
+    from .exc import ChunkIntegrityError
+    from .codec import Codec
+    from .codec import JSON_CODEC
+    from .codec import STRING_LIST_CODEC
+    from .codec import INT_CODEC
+    from .codec import BOOL_CODEC
+    from .codec import register_codec
+    from .codec import get_codec
+    from .compression import CompressionAlgorithm
+    from .compression import compress_value
+    from .compression import decompress_value
+    from .compression import is_compressed_value
+    from .utils import encode_tags
+    from .utils import decode_tags
+    from .model import Parameter
+    from .client import get_parameter
+    from .client import get_parameters
+    from .client import put_parameter_if_changed
+    from .client import delete_parameter
+    from .client import delete_parameters
+    from .client import get_parameter_tags
+    from .client import remove_parameter_tags
+    from .client import update_parameter_tags
+    from .client import put_parameter_tags
+    from .chunk import put_chunked_parameter
+    from .chunk import get_chunked_parameter
+    from .chunk import delete_chunked_parameter
+    from .tier import StandardTierCandidate
+    from .tier import find_standard_tier_candidates
+    from .tier import select_tier
+    from .tier import TierPricing
+    from .tier import TierRecommendation
+    from .tier import TierStats
+    from .tier import TierReport
+    from .inventory import iter_parameter_metadata_pages
+    from .inventory import iter_parameter_metadata
+    from .inventory import iter_parameter_inventory
+    from .inventory import scan_tier_report
+    from .instrument import OperationRecord
+    from .instrument import OperationStats
+    from .instrument import UsageStats
+    from .instrument import MetricsExporter
+    from .instrument import StatsdExporter
+    from .instrument import PrometheusExporter
+    from .instrument import add_exporter
+    from .instrument import remove_exporter
+    from .instrument import track_usage
+    from .instrument import record_cache_access
+    from .instrument import instrument_client
+    from .instrument import uninstrument_client
+    from .emulator import LocalSSMClient
+    from .fault import constant_latency
+    from .fault import uniform_latency
+    from .fault import lognormal_latency
+    from .fault import FaultSpec
+    from .fault import FaultStats
+    from .fault import FaultInjectingClient
+    from .batch import get_max_pool_connections
+    from .factory import build_config
+    from .factory import get_ssm_client
+    from .factory import clear_client_cache
+    from .factory import prewarm_client
+    from .inventory import iter_parameters_by_path
+    from .env import make_env_key
+    from .env import load_env
+    from .env import apply_env
+    from .env import format_dotenv
+    from .env import write_dotenv
+    from .env import format_exports
+    from .env import write_snapshot
+    from .env import read_snapshot
+    from .client import put_parameters_if_changed
+    from .cache import ParameterCache
+    from .settings import SettingSpec
+    from .settings import setting
+    from .settings import coerce_value
+    from .settings import load_settings
+    from .exc import SettingsError
+    from .watcher import Subscription
+    from .watcher import ParameterWatcher
+    from .watcher import get_shared_watcher
+    from .shared_cache import SharedParameterCache
+    from .sidecar import SidecarServer
+    from .sidecar import SidecarClient
+    from .exc import SidecarError
+    from .subtree import SubtreeReport
+    from .subtree import copy_subtree
+    from .subtree import move_subtree
+    from .exc import SubtreeVerificationError
+    from .sync import parse_desired_state
+    from .sync import load_desired_state
+    from .sync import hash_desired_state
+    from .sync import SyncResult
+    from .sync import sync_file
+    from .incremental import ChangeAction
+    from .incremental import ParameterChange
+    from .incremental import PrefixState
+    from .incremental import read_state
+    from .incremental import write_state
+    from .incremental import iter_changes
+    from .exc import ParameterVersionConflictError
+    from .lease import Lease
+    from .lease import acquire_lease
+    from .lease import renew_lease
+    from .lease import renew_leases
+    from .lease import release_lease
+    from .writer import BufferedWriter
+    from .history import BudgetAction
+    from .history import VersionBudgetGuard
+    from .history import VersionChurn
+    from .history import VersionChurnReport
+    from .history import scan_version_churn
+    from .exc import VersionBudgetExceededError
+    from .constants import MAX_PARAMETER_VERSIONS
+    from .policy import PathPolicy
+    from .policy import PolicyRegistry
+    from .policy import get_parameters_by_policy
+    from .kms import get_parameters_by_key
+    from .kms import group_by_key
+
+
+# member name -> module that defines it
+_LAZY_MEMBERS: dict[str, str] = {
+    "ParameterType": "constants",
+    "ParameterTier": "constants",
+    "ResourceType": "constants",
+    "DEFAULT_KMS_KEY": "constants",
+    "STANDARD_TIER_MAX_VALUE_SIZE": "constants",
+    "ADVANCED_TIER_MAX_VALUE_SIZE": "constants",
+    "ChunkIntegrityError": "exc",
+    "Codec": "codec",
+    "JSON_CODEC": "codec",
+    "STRING_LIST_CODEC": "codec",
+    "INT_CODEC": "codec",
+    "BOOL_CODEC": "codec",
+    "register_codec": "codec",
+    "get_codec": "codec",
+    "CompressionAlgorithm": "compression",
+    "compress_value": "compression",
+    "decompress_value": "compression",
+    "is_compressed_value": "compression",
+    "encode_tags": "utils",
+    "decode_tags": "utils",
+    "Parameter": "model",
+    "get_parameter": "client",
+    "get_parameters": "client",
+    "put_parameter_if_changed": "client",
+    "delete_parameter": "client",
+    "delete_parameters": "client",
+    "get_parameter_tags": "client",
+    "remove_parameter_tags": "client",
+    "update_parameter_tags": "client",
+    "put_parameter_tags": "client",
+    "put_chunked_parameter": "chunk",
+    "get_chunked_parameter": "chunk",
+    "delete_chunked_parameter": "chunk",
+    "StandardTierCandidate": "tier",
+    "find_standard_tier_candidates": "tier",
+    "select_tier": "tier",
+    "TierPricing": "tier",
+    "TierRecommendation": "tier",
+    "TierStats": "tier",
+    "TierReport": "tier",
+    "iter_parameter_metadata_pages": "inventory",
+    "iter_parameter_metadata": "inventory",
+    "iter_parameter_inventory": "inventory",
+    "scan_tier_report": "inventory",
+    "OperationRecord": "instrument",
+    "OperationStats": "instrument",
+    "UsageStats": "instrument",
+    "MetricsExporter": "instrument",
+    "StatsdExporter": "instrument",
+    "PrometheusExporter": "instrument",
+    "add_exporter": "instrument",
+    "remove_exporter": "instrument",
+    "track_usage": "instrument",
+    "record_cache_access": "instrument",
+    "instrument_client": "instrument",
+    "uninstrument_client": "instrument",
+    "LocalSSMClient": "emulator",
+    "constant_latency": "fault",
+    "uniform_latency": "fault",
+    "lognormal_latency": "fault",
+    "FaultSpec": "fault",
+    "FaultStats": "fault",
+    "FaultInjectingClient": "fault",
+    "get_max_pool_connections": "batch",
+    "build_config": "factory",
+    "get_ssm_client": "factory",
+    "clear_client_cache": "factory",
+    "prewarm_client": "factory",
+    "iter_parameters_by_path": "inventory",
+    "make_env_key": "env",
+    "load_env": "env",
+    "apply_env": "env",
+    "format_dotenv": "env",
+    "write_dotenv": "env",
+    "format_exports": "env",
+    "write_snapshot": "env",
+    "read_snapshot": "env",
+    "put_parameters_if_changed": "client",
+    "ParameterCache": "cache",
+    "SettingSpec": "settings",
+    "setting": "settings",
+    "coerce_value": "settings",
+    "load_settings": "settings",
+    "SettingsError": "exc",
+    "Subscription": "watcher",
+    "ParameterWatcher": "watcher",
+    "get_shared_watcher": "watcher",
+    "SharedParameterCache": "shared_cache",
+    "SidecarServer": "sidecar",
+    "SidecarClient": "sidecar",
+    "SidecarError": "exc",
+    "SubtreeReport": "subtree",
+    "copy_subtree": "subtree",
+    "move_subtree": "subtree",
+    "SubtreeVerificationError": "exc",
+    "parse_desired_state": "sync",
+    "load_desired_state": "sync",
+    "hash_desired_state": "sync",
+    "SyncResult": "sync",
+    "sync_file": "sync",
+    "ChangeAction": "incremental",
+    "ParameterChange": "incremental",
+    "PrefixState": "incremental",
+    "read_state": "incremental",
+    "write_state": "incremental",
+    "iter_changes": "incremental",
+    "ParameterVersionConflictError": "exc",
+    "Lease": "lease",
+    "acquire_lease": "lease",
+    "renew_lease": "lease",
+    "renew_leases": "lease",
+    "release_lease": "lease",
+    "BufferedWriter": "writer",
+    "BudgetAction": "history",
+    "VersionBudgetGuard": "history",
+    "VersionChurn": "history",
+    "VersionChurnReport": "history",
+    "scan_version_churn": "history",
+    "VersionBudgetExceededError": "exc",
+    "MAX_PARAMETER_VERSIONS": "constants",
+    "PathPolicy": "policy",
+    "PolicyRegistry": "policy",
+    "get_parameters_by_policy": "policy",
+    "get_parameters_by_key": "kms",
+    "group_by_key": "kms",
+}
+
+__all__ = list(_LAZY_MEMBERS)
+
+
+def __getattr__(name: str) -> T.Any:
+    try:
+        module_name = _LAZY_MEMBERS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __package__)
+    value = getattr(module, name)
+    # cache it, so that __getattr__ is only called once per member
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_MEMBERS))
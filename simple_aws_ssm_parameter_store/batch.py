@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batching and concurrency helpers of the bulk functions, e.g.
+:func:`~simple_aws_ssm_parameter_store.client.get_parameters`.
+
+SSM bulk APIs take at most 10 names per call. The bulk functions split their
+input with :func:`make_batches` and run the batches with :func:`map_batches`,
+never with more threads than :func:`get_max_workers` allows.
+"""
+
+import typing as T
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def make_batches(items: list[T.Any], size: int) -> list[list[T.Any]]:
+    """
+    Example:
+        >>> make_batches([1, 2, 3, 4, 5], 2)
+        [[1, 2], [3, 4], [5]]
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def get_max_pool_connections(ssm_client: "SSMClient") -> int | None:
+    """
+    Get the connection pool size of a boto3 client, None if the client has
+    no connection pool, e.g. an emulator.
+    """
+    try:
+        return ssm_client.meta.config.max_pool_connections
+    except AttributeError:
+        return None
+
+
+def get_max_workers(
+    ssm_client: "SSMClient",
+    max_workers: int | None,
+) -> int:
+    """
+    Resolve the concurrency of a bulk operation. It never exceeds the
+    connection pool of the client, extra threads would only wait for a
+    connection, or open throwaway connections.
+    """
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    pool_size = get_max_pool_connections(ssm_client)
+    if pool_size:
+        max_workers = min(max_workers, pool_size)
+    return max_workers
+
+
+def map_batches(
+    func: T.Callable[[T.Any], T.Any],
+    batches: list[T.Any],
+    max_workers: int,
+) -> list[T.Any]:
+    """
+    Apply ``func`` to every batch, concurrently when there is more than one batch.
+    """
+    if len(batches) <= 1 or max_workers <= 1:
+        return [func(batch) for batch in batches]
+    # run each batch in a copy of the caller's context, so context variables
+    # such as the usage tracking scope follow the work into the worker threads
+    contexts = [contextvars.copy_context() for _ in batches]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+        return list(
+            executor.map(lambda ctx, batch: ctx.run(func, batch), contexts, batches)
+        )
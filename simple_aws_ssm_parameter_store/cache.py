@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-process TTL cache in front of ``GetParameter`` / ``GetParameters``.
+
+:class:`ParameterCache` keeps the :class:`~simple_aws_ssm_parameter_store.model.Parameter`
+objects returned by SSM for ``ttl`` seconds. Because a ``Parameter`` memoizes
+its decompressed and decoded values, a cache hit also skips the decoding.
+Names that don't exist are cached too (negative caching), so probing an
+optional parameter doesn't cost an API call every time.
+
+With ``stale_while_revalidate``, an expired entry is still served for that
+many more seconds, while a background thread re-fetches all the stale names
+together. Readers then never wait for SSM once a name is cached, unless it
+was not read for a long time.
+
+With a :class:`~simple_aws_ssm_parameter_store.policy.PolicyRegistry`, the
+TTL, stale-while-revalidate and decryption of every name are resolved from
+its path, the cache settings are the defaults.
+
+Every lookup is reported with
+:func:`~simple_aws_ssm_parameter_store.instrument.record_cache_access`, so hit
+rates show up in :func:`~simple_aws_ssm_parameter_store.instrument.track_usage`
+scopes and in the registered exporters.
+
+Example::
+
+    cache = ParameterCache(ssm_client, ttl=300)
+    param = cache.get("/app/db/host")
+    params = cache.get_many(["/app/db/host", "/app/db/port"])
+"""
+
+import typing as T
+import time
+import logging
+import threading
+import dataclasses
+
+from .client import get_parameter
+from .model import Parameter
+from .policy import PolicyRegistry, get_with_decryption, get_parameters_by_policy
+from .instrument import record_cache_access
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class _CacheEntry:
+    param: Parameter | None = dataclasses.field()
+    expires_at: float = dataclasses.field()
+    stale_until: float = dataclasses.field()
+
+
+class ParameterCache:
+    """
+    Thread safe TTL cache of parameters, bound to one SSM client.
+
+    :param ssm_client: SSM client
+    :param ttl: seconds an entry stays fresh
+    :param stale_while_revalidate: seconds an expired entry is still served
+        while it is refreshed in the background
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param max_workers: max number of concurrent ``GetParameters`` calls
+        of :meth:`get_many`
+    :param clock: monotonic clock, for testing
+    :param policies: per path TTL, stale-while-revalidate and decryption
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        ttl: float = 60.0,
+        with_decryption: bool = True,
+        max_workers: int | None = None,
+        clock: T.Callable[[], float] = time.monotonic,
+        stale_while_revalidate: float = 0.0,
+        policies: PolicyRegistry | None = None,
+    ):
+        self.ssm_client = ssm_client
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.with_decryption = with_decryption
+        self.max_workers = max_workers
+        self.clock = clock
+        self.policies = policies
+        self._entries: dict[str, _CacheEntry] = dict()
+        self._lock = threading.Lock()
+        # stale names waiting for the background refresh
+        self._stale: set[str] = set()
+        self._refresh_thread: threading.Thread | None = None
+
+    def _lookup(self, name: str, now: float) -> _CacheEntry | None:
+        """
+        Get the entry if it can be served, must be called with the lock held.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        if entry.expires_at > now:
+            return entry
+        if entry.stale_until > now:
+            self._schedule_revalidate(name)
+            return entry
+        return None
+
+    def _schedule_revalidate(self, name: str):
+        """
+        Queue a stale name for the background refresh, must be called with
+        the lock held.
+        """
+        self._stale.add(name)
+        if self._refresh_thread is None:
+            self._refresh_thread = threading.Thread(
+                target=self._revalidate,
+                name="ssm-parameter-cache-revalidate",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+
+    def _revalidate(self):
+        """
+        Re-fetch the stale names in batches, until there are no more.
+        """
+        while True:
+            with self._lock:
+                names = list(self._stale)
+                self._stale.clear()
+                if not names:
+                    self._refresh_thread = None
+                    return
+            try:
+                self._refetch(names)
+            except Exception:
+                # keep serving the stale entries, until they are too old
+                logger.exception("Failed to revalidate %d parameters", len(names))
+
+    def _refetch(self, names: list[str]):
+        """
+        Fetch ``names`` and replace their entries.
+        """
+        fetched = self._fetch(names)
+        with self._lock:
+            for name in names:
+                self._store(name, fetched.get(name))
+
+    def _fetch(self, names: list[str]) -> dict[str, Parameter]:
+        return get_parameters_by_policy(
+            self.ssm_client,
+            names,
+            self.policies,
+            with_decryption=self.with_decryption,
+            max_workers=self.max_workers,
+        )
+
+    def _resolve_ttl(self, name: str) -> tuple[float, float]:
+        """
+        :return: the TTL and the stale-while-revalidate window of ``name``,
+            the policy values take precedence over the cache defaults
+        """
+        ttl = self.ttl
+        stale_while_revalidate = self.stale_while_revalidate
+        if self.policies is not None:
+            policy = self.policies.resolve(name)
+            if policy.ttl is not None:
+                ttl = policy.ttl
+            if policy.stale_while_revalidate is not None:
+                stale_while_revalidate = policy.stale_while_revalidate
+        return ttl, stale_while_revalidate
+
+    def _store(self, name: str, param: Parameter | None):
+        ttl, stale_while_revalidate = self._resolve_ttl(name)
+        expires_at = self.clock() + ttl
+        self._entries[name] = _CacheEntry(
+            param=param,
+            expires_at=expires_at,
+            stale_until=expires_at + stale_while_revalidate,
+        )
+
+    def get(self, name: str) -> Parameter | None:
+        """
+        Get one parameter, None if it doesn't exist.
+
+        :param name: parameter name, may include a version or label selector
+        """
+        with self._lock:
+            entry = self._lookup(name, self.clock())
+        record_cache_access("GetParameter", entry is not None)
+        if entry is not None:
+            return entry.param
+        param = get_parameter(
+            self.ssm_client,
+            name,
+            with_decryption=get_with_decryption(
+                self.policies, name, self.with_decryption
+            ),
+        )
+        with self._lock:
+            self._store(name, param)
+        return param
+
+    def get_many(self, names: T.Iterable[str]) -> dict[str, Parameter]:
+        """
+        Get many parameters. All the names that are missing or expired in the
+        cache are fetched together with
+        :func:`~simple_aws_ssm_parameter_store.client.get_parameters`, i.e.
+        one ``GetParameters`` call per 10 names.
+
+        :param names: parameter names, may include version or label selectors
+
+        :return: dictionary mapping the requested name to the ``Parameter``
+            object, in the requested order, non-existent parameters are omitted
+        """
+        names = list(dict.fromkeys(names))
+        cached: dict[str, Parameter | None] = dict()
+        with self._lock:
+            now = self.clock()
+            for name in names:
+                entry = self._lookup(name, now)
+                if entry is not None:
+                    cached[name] = entry.param
+        missing = [name for name in names if name not in cached]
+        for _ in range(len(cached)):
+            record_cache_access("GetParameters", True)
+        for _ in range(len(missing)):
+            record_cache_access("GetParameters", False)
+
+        if missing:
+            fetched = self._fetch(missing)
+            with self._lock:
+                for name in missing:
+                    param = fetched.get(name)
+                    self._store(name, param)
+                    cached[name] = param
+
+        return {name: cached[name] for name in names if cached.get(name) is not None}
+
+    def set(self, name: str, param: Parameter | None):
+        """
+        Put a parameter fetched by other means, e.g. a path listing, into
+        the cache. None caches that the parameter doesn't exist.
+        """
+        with self._lock:
+            self._store(name, param)
+
+    def invalidate(self, name: str | None = None):
+        """
+        Drop one cached entry, or all of them if ``name`` is None.
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
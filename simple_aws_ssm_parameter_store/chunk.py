@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+"""
+Store values larger than the tier limit across multiple parameters.
+
+A chunked value named ``/app/cert`` is stored as:
+
+- ``/app/cert``: the manifest, a small JSON document that records the number
+  of chunks, the payload size, the compression and the SHA256 of the payload.
+  It has the type of the chunks, a SecureString payload gets a SecureString
+  manifest, so that its hash isn't readable by whoever can read plain values.
+- ``/app/cert/__chunk__/0``, ``/app/cert/__chunk__/1``, ...: the chunks.
+
+Chunks are written with :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`,
+so re-writing the same payload does not consume version history, and read back
+with batched ``GetParameters`` calls.
+
+.. note::
+
+    The manifest is written after the chunks. A reader that runs concurrently
+    with a writer may see new chunks with an old manifest, in which case the
+    hash check raises :class:`~simple_aws_ssm_parameter_store.exc.ChunkIntegrityError`
+    and the read can be retried.
+
+.. note::
+
+    The chunks live under the value's own path, so path readers see them.
+    :func:`~simple_aws_ssm_parameter_store.env.load_env` and the sidecar
+    path listing skip them (see :func:`is_chunk_name`), but still return the
+    manifest JSON under the value's name, read the value with
+    :func:`get_chunked_parameter`. ``ssm-param export`` keeps both the chunks
+    and the manifest, so that ``ssm-param import`` restores a working value.
+"""
+
+import typing as T
+import json
+import zlib
+import base64
+import hashlib
+
+from func_args.api import OPT
+
+from .constants import (
+    ParameterType,
+    ParameterTier,
+    STANDARD_TIER_MAX_VALUE_SIZE,
+)
+from .exc import ChunkIntegrityError
+from .model import Parameter
+from .client import (
+    get_parameter,
+    get_parameters,
+    put_parameter_if_changed,
+    delete_parameters,
+)
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+CHUNK_MARKER = "__chunk__"
+MANIFEST_KIND = "simple_aws_ssm_parameter_store.chunked"
+
+
+def get_chunk_name(name: str, index: int) -> str:
+    """
+    Example:
+        >>> get_chunk_name("/app/cert", 0)
+        '/app/cert/__chunk__/0'
+    """
+    return f"{name}/{CHUNK_MARKER}/{index}"
+
+
+def is_chunk_name(name: str) -> bool:
+    """
+    Whether ``name`` is a chunk of a chunked value, not a regular parameter.
+
+    Example:
+        >>> is_chunk_name("/app/cert/__chunk__/0")
+        True
+        >>> is_chunk_name("/app/cert")
+        False
+    """
+    return f"/{CHUNK_MARKER}/" in name
+
+
+def split_text(text: str, max_size: int) -> list[str]:
+    """
+    Split text into pieces whose UTF-8 encoded size is at most ``max_size`` bytes,
+    never cutting a multi-byte character in half.
+
+    :param max_size: at least 4, the size of the longest UTF-8 character
+    """
+    if max_size < 4:
+        raise ValueError(f"max_size must be at least 4 bytes, got {max_size}")
+    data = text.encode("utf-8")
+    pieces = list()
+    start = 0
+    while start < len(data):
+        end = min(start + max_size, len(data))
+        # back off while ``end`` points to a UTF-8 continuation byte
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode("utf-8"))
+        start = end
+    return pieces
+
+
+def _encode_payload(
+    value: str | bytes,
+    compress: bool,
+) -> tuple[str, dict[str, T.Any]]:
+    """
+    Convert the payload to the text that is split into chunks,
+    and build the manifest for it.
+    """
+    is_binary = isinstance(value, bytes)
+    data = value if is_binary else value.encode("utf-8")
+    if compress:
+        text = base64.b64encode(zlib.compress(data)).decode("ascii")
+        encoding = "zlib+base64"
+    elif is_binary:
+        text = base64.b64encode(data).decode("ascii")
+        encoding = "base64"
+    else:
+        text = value
+        encoding = "text"
+    manifest = {
+        "kind": MANIFEST_KIND,
+        "binary": is_binary,
+        "encoding": encoding,
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    return text, manifest
+
+
+def _decode_payload(
+    text: str,
+    manifest: dict[str, T.Any],
+) -> str | bytes:
+    encoding = manifest["encoding"]
+    if encoding == "zlib+base64":
+        data = zlib.decompress(base64.b64decode(text))
+    elif encoding == "base64":
+        data = base64.b64decode(text)
+    else:
+        data = text.encode("utf-8")
+    if hashlib.sha256(data).hexdigest() != manifest["sha256"]:
+        raise ChunkIntegrityError("Chunked value hash does not match the manifest")
+    if manifest["binary"]:
+        return data
+    return data.decode("utf-8")
+
+
+def _parse_manifest(param: Parameter) -> dict[str, T.Any]:
+    try:
+        manifest = json.loads(param.value)
+    except ValueError:
+        manifest = None
+    if not (isinstance(manifest, dict) and manifest.get("kind") == MANIFEST_KIND):
+        raise ValueError(f"Parameter {param.name!r} is not a chunked value manifest")
+    return manifest
+
+
+def put_chunked_parameter(
+    ssm_client: "SSMClient",
+    name: str,
+    value: str | bytes,
+    compress: bool = False,
+    chunk_size: int = STANDARD_TIER_MAX_VALUE_SIZE,
+    description: str | None = OPT,
+    type: ParameterType | None = ParameterType.STRING,
+    tier: ParameterTier | None = OPT,
+    key_id: str | None = OPT,
+    tags: dict[str, str] | None = OPT,
+) -> tuple[Parameter | None, Parameter | None]:
+    """
+    Store a value of any size across multiple parameters.
+
+    Only chunks whose content changed are written. Chunks left over from a
+    previous, larger value are deleted with batched ``DeleteParameters`` calls.
+
+    Example::
+
+        before, after = put_chunked_parameter(
+            ssm_client=client,
+            name="/app/tls/cert-chain",
+            value=pem_text,
+            compress=True,
+        )
+
+    :param ssm_client: SSM client
+    :param name: manifest parameter name, must be a hierarchy name starting with "/"
+    :param value: text or binary payload
+    :param compress: whether to zlib compress the payload before splitting it
+    :param chunk_size: max size in bytes of each chunk, use
+        :data:`~simple_aws_ssm_parameter_store.constants.ADVANCED_TIER_MAX_VALUE_SIZE`
+        together with ``tier=ParameterTier.ADVANCED`` for fewer, larger chunks
+    :param description: description of the manifest parameter
+    :param type: parameter type of the chunks, String or SecureString
+    :param tier: parameter tier of the chunks and the manifest
+    :param key_id: KMS key ID for SecureString encryption
+    :param tags: tags for newly created chunk and manifest parameters
+
+    :returns: Tuple of (before_manifest, after_manifest) with the same semantic
+        as :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`.
+    """
+    if not name.startswith("/"):
+        raise ValueError(f"Chunked parameter name must start with '/', got {name!r}")
+    text, manifest = _encode_payload(value, compress)
+    chunks = split_text(text, chunk_size)
+    manifest["chunks"] = len(chunks)
+
+    kwargs = dict(
+        type=type,
+        tier=tier,
+        key_id=key_id,
+        tags=tags,
+    )
+    # chunks are written sequentially, PutParameter has a low default TPS quota
+    for index, chunk in enumerate(chunks):
+        put_parameter_if_changed(
+            ssm_client=ssm_client,
+            name=get_chunk_name(name, index),
+            value=chunk,
+            **kwargs,
+        )
+    # the hash of a secret payload is as sensitive as the payload
+    if type is ParameterType.SECURE_STRING:
+        manifest_kwargs = dict(type=ParameterType.SECURE_STRING, key_id=key_id)
+    else:
+        manifest_kwargs = dict(type=ParameterType.STRING)
+    before_param, after_param = put_parameter_if_changed(
+        ssm_client=ssm_client,
+        name=name,
+        value=manifest,
+        codec="json",
+        description=description,
+        tier=tier,
+        tags=tags,
+        **manifest_kwargs,
+    )
+
+    # remove chunks of the previous value that are no longer needed
+    if before_param is not None:
+        try:
+            before_n_chunk = _parse_manifest(before_param)["chunks"]
+        except ValueError:
+            before_n_chunk = 0
+        stale_names = [
+            get_chunk_name(name, index) for index in range(len(chunks), before_n_chunk)
+        ]
+        if stale_names:
+            delete_parameters(ssm_client, stale_names)
+
+    return before_param, after_param
+
+
+def get_chunked_parameter(
+    ssm_client: "SSMClient",
+    name: str,
+    with_decryption: bool = False,
+    max_workers: int | None = None,
+) -> str | bytes | None:
+    """
+    Read back a value written by :func:`put_chunked_parameter`.
+
+    All chunks are fetched with batched ``GetParameters`` calls that run
+    concurrently, then reassembled and verified against the manifest hash.
+
+    :param ssm_client: SSM client
+    :param name: manifest parameter name
+    :param with_decryption: whether to decrypt the SecureString manifest
+        and chunks
+    :param max_workers: max number of concurrent ``GetParameters`` calls
+
+    :return: the original text or binary payload, None if the manifest does not exist.
+    """
+    manifest_param = get_parameter(ssm_client, name, with_decryption=with_decryption)
+    if manifest_param is None:
+        return None
+    if manifest_param.is_secure_string_type and not with_decryption:
+        raise ValueError(
+            f"Chunked value {name!r} is a SecureString, read it with with_decryption=True"
+        )
+    manifest = _parse_manifest(manifest_param)
+    chunk_names = [get_chunk_name(name, index) for index in range(manifest["chunks"])]
+    params = get_parameters(
+        ssm_client,
+        chunk_names,
+        with_decryption=with_decryption,
+        max_workers=max_workers,
+    )
+    pieces = list()
+    for chunk_name in chunk_names:
+        try:
+            pieces.append(params[chunk_name].value)
+        except KeyError:
+            raise ChunkIntegrityError(f"Chunk {chunk_name!r} is missing")
+    return _decode_payload("".join(pieces), manifest)
+
+
+def delete_chunked_parameter(
+    ssm_client: "SSMClient",
+    name: str,
+) -> bool:
+    """
+    Delete the manifest and all chunks of a chunked value, idempotently.
+
+    :return: True if the manifest was deleted, False if it did not exist.
+    """
+    manifest_param = get_parameter(ssm_client, name, with_decryption=True)
+    if manifest_param is None:
+        return False
+    manifest = _parse_manifest(manifest_param)
+    chunk_names = [get_chunk_name(name, index) for index in range(manifest["chunks"])]
+    delete_parameters(ssm_client, chunk_names + [name])
+    return True
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+
+"""
+Command line interface, installed as ``ssm-param``.
+
+Usage::
+
+    ssm-param get /app/db/host
+    ssm-param put-if-changed /app/db/host db.example.com --type String
+    ssm-param delete /app/tmp/a /app/tmp/b
+    ssm-param tags get /app/db/host
+    ssm-param tags update /app/db/host env=prod team=data
+    ssm-param export /app/ --decrypt > app.jsonl
+    ssm-param import < app.jsonl
+    ssm-param env /app/prod/ --format export
+    ssm-param sidecar --socket /run/ssm-param.sock
+    ssm-param sidecar --port 8741 --token-file /run/ssm-param.token
+    ssm-param sync parameters/prod.yml --marker /sync-state/app/prod
+    ssm-param changes /app/ --state changes-state.json --decrypt
+
+``export`` writes one JSON document per line, the
+:attr:`~simple_aws_ssm_parameter_store.model.Parameter.core_data` plus the
+value and the attributes needed to re-create the parameter. Without
+``--decrypt``, SecureString records hold the encrypted value and are marked
+``"encrypted": true``, ``import`` refuses them. ``import`` reads
+that format and writes the parameters with
+:func:`~simple_aws_ssm_parameter_store.client.put_parameters_if_changed`,
+chunk by chunk, so only changed parameters are written. Both stream, memory
+usage doesn't depend on the number of parameters, and report progress on
+stderr.
+"""
+
+import typing as T
+import os
+import sys
+import json
+import time
+import secrets
+import argparse
+import itertools
+
+from .constants import ParameterType, ParameterTier
+from .client import (
+    get_parameter,
+    put_parameter_if_changed,
+    put_parameters_if_changed,
+    delete_parameters,
+    get_parameter_tags,
+    put_parameter_tags,
+    update_parameter_tags,
+    remove_parameter_tags,
+)
+from .inventory import iter_parameter_inventory
+from .env import load_env, format_exports, format_dotenv
+from .record import parameter_to_record, record_to_kwargs
+from .utils import write_private_file
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+DEFAULT_IMPORT_CHUNK_SIZE = 500
+
+
+class Progress:
+    """
+    Report the number of processed items on stderr, at most once per
+    ``interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        action: str,
+        enabled: bool = True,
+        interval: float = 1.0,
+        file: T.TextIO | None = None,
+    ):
+        self.action = action
+        self.enabled = enabled
+        self.interval = interval
+        self.file = file or sys.stderr
+        self.count = 0
+        self.start = time.perf_counter()
+        self.reported_at = self.start
+
+    def add(self, n: int = 1):
+        self.count += n
+        now = time.perf_counter()
+        if now - self.reported_at >= self.interval:
+            self.reported_at = now
+            self.report()
+
+    def report(self, extra: str = ""):
+        if not self.enabled:
+            return
+        elapsed = time.perf_counter() - self.start
+        rate = self.count / elapsed if elapsed else 0.0
+        print(
+            f"{self.action} {self.count} parameters in {elapsed:.1f}s "
+            f"({rate:.0f}/s){extra}",
+            file=self.file,
+        )
+
+
+def _parse_tags(items: list[str]) -> dict[str, str]:
+    tags = dict()
+    for item in items:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"tag must be KEY=VALUE, got {item!r}")
+        tags[key] = value
+    return tags
+
+
+def cmd_get(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    param = get_parameter(ssm_client, args.name, with_decryption=args.decrypt)
+    if param is None:
+        print(f"parameter {args.name} not found", file=sys.stderr)
+        return 1
+    if args.json:
+        record = parameter_to_record(param, decrypted=args.decrypt)
+        print(json.dumps(record, ensure_ascii=False))
+    else:
+        print(param.value)
+    return 0
+
+
+def cmd_put_if_changed(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    value = sys.stdin.read() if args.value == "-" else args.value
+    kwargs = dict()
+    for key in ["description", "key_id", "codec", "compression"]:
+        if getattr(args, key) is not None:
+            kwargs[key] = getattr(args, key)
+    if args.tier is not None:
+        kwargs["tier"] = ParameterTier(args.tier)
+    if args.tag:
+        kwargs["tags"] = _parse_tags(args.tag)
+    if args.codec is not None:
+        value = json.loads(value)
+    before, after = put_parameter_if_changed(
+        ssm_client,
+        args.name,
+        value,
+        type=ParameterType(args.type),
+        auto_tier=args.auto_tier,
+        **kwargs,
+    )
+    if after is None:
+        print(f"unchanged {args.name} (version {before.version})")
+    elif before is None:
+        print(f"created {args.name} (version {after.version})")
+    else:
+        print(f"updated {args.name} (version {after.version})")
+    return 0
+
+
+def cmd_delete(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    deleted = set(
+        delete_parameters(ssm_client, args.names, max_workers=args.max_workers)
+    )
+    for name in args.names:
+        print(f"{'deleted' if name in deleted else 'not found'} {name}")
+    return 0
+
+
+def cmd_tags(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    if args.tags_command == "set":
+        put_parameter_tags(ssm_client, args.name, _parse_tags(args.tags))
+    elif args.tags_command == "update":
+        update_parameter_tags(ssm_client, args.name, _parse_tags(args.tags))
+    elif args.tags_command == "remove":
+        remove_parameter_tags(ssm_client, args.name, args.keys)
+    tags = get_parameter_tags(ssm_client, args.name)
+    print(json.dumps(tags, indent=2, sort_keys=True, ensure_ascii=False))
+    return 0
+
+
+def cmd_export(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    progress = Progress("exported", enabled=not args.quiet)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for param in iter_parameter_inventory(
+            ssm_client,
+            path_prefix=args.path,
+            with_decryption=args.decrypt,
+            max_workers=args.max_workers,
+        ):
+            tags = get_parameter_tags(ssm_client, param.name) if args.tags else None
+            record = parameter_to_record(param, tags=tags, decrypted=args.decrypt)
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            progress.add()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    progress.report()
+    return 0
+
+
+def cmd_import(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    progress = Progress("imported", enabled=not args.quiet)
+    file = sys.stdin if args.input == "-" else open(args.input)
+    n_written = 0
+    try:
+        records = (json.loads(line) for line in file if line.strip())
+        while True:
+            chunk = list(itertools.islice(records, args.chunk_size))
+            if not chunk:
+                break
+            try:
+                kwargs_list = [record_to_kwargs(record) for record in chunk]
+            except ValueError as e:
+                progress.report(extra=f", {n_written} written")
+                print(f"error: {e}", file=sys.stderr)
+                return 1
+            results = put_parameters_if_changed(
+                ssm_client,
+                kwargs_list,
+                max_workers=args.max_workers,
+            )
+            n_written += sum(1 for _, after in results if after is not None)
+            progress.add(len(chunk))
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    progress.report(extra=f", {n_written} written")
+    return 0
+
+
+def cmd_env(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    env = load_env(
+        ssm_client,
+        args.paths,
+        env_prefix=args.env_prefix,
+        snapshot_path=args.snapshot,
+    )
+    if args.format == "export":
+        sys.stdout.write(format_exports(env))
+    elif args.format == "dotenv":
+        sys.stdout.write(format_dotenv(env))
+    else:
+        print(json.dumps(env, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_sidecar(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    from .sidecar import SidecarServer
+
+    token = None
+    if args.token_file is not None:
+        if os.path.exists(args.token_file):
+            with open(args.token_file) as f:
+                token = f.read().strip()
+        if not token:
+            token = secrets.token_urlsafe(32)
+            write_private_file(args.token_file, token + "\n")
+    elif args.socket is None:
+        print("error: --token-file is required to serve HTTP", file=sys.stderr)
+        return 2
+    server = SidecarServer(
+        ssm_client,
+        socket_path=args.socket,
+        host=args.host,
+        port=args.port,
+        ttl=args.ttl,
+        stale_while_revalidate=args.stale,
+        token=token,
+    )
+    print(f"serving on {args.socket or server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+def cmd_sync(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    from .sync import sync_file
+
+    result = sync_file(
+        ssm_client,
+        args.file,
+        marker_name=args.marker,
+        state_path=args.state,
+        prune=not args.no_prune,
+        force=args.force,
+    )
+    if result.skipped:
+        print(f"unchanged {result.hash}")
+        return 0
+    for action in ["created", "updated", "deleted"]:
+        for name in getattr(result, action):
+            print(f"{action} {name}")
+    print(f"applied {result.hash}")
+    return 0
+
+
+def cmd_changes(ssm_client: "SSMClient", args: argparse.Namespace) -> int:
+    from .incremental import iter_changes
+
+    for change in iter_changes(
+        ssm_client,
+        args.path,
+        args.state,
+        with_decryption=args.decrypt,
+        with_tags=args.tags,
+        max_workers=args.max_workers,
+    ):
+        if change.is_deleted:
+            record = {"name": change.name}
+        else:
+            record = parameter_to_record(
+                change.parameter, tags=change.tags, decrypted=args.decrypt
+            )
+        record = {"action": change.action.value, **record}
+        print(json.dumps(record, ensure_ascii=False))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ssm-param",
+        description="AWS SSM Parameter Store command line interface.",
+    )
+    parser.add_argument("--profile", help="AWS profile name")
+    parser.add_argument("--region", help="AWS region name")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="max number of concurrent API calls of bulk commands",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("get", help="print a parameter value")
+    p.add_argument("name", help="parameter name, optionally with :version or :label")
+    p.add_argument("--decrypt", action="store_true", help="decrypt SecureString")
+    p.add_argument("--json", action="store_true", help="print metadata as JSON")
+    p.set_defaults(func=cmd_get)
+
+    p = sub.add_parser("put-if-changed", help="write a parameter if its value changed")
+    p.add_argument("name")
+    p.add_argument("value", help="the value, '-' to read it from stdin")
+    p.add_argument(
+        "--type",
+        default=ParameterType.STRING.value,
+        choices=[t.value for t in ParameterType],
+    )
+    p.add_argument("--tier", choices=[t.value for t in ParameterTier])
+    p.add_argument("--auto-tier", action="store_true", help="pick the cheapest tier")
+    p.add_argument("--description")
+    p.add_argument("--key-id", dest="key_id", help="KMS key of SecureString")
+    p.add_argument("--codec", help="codec of a structured value given as JSON")
+    p.add_argument("--compression", help="compression algorithm, zlib or zstd")
+    p.add_argument(
+        "--tag", action="append", default=[], help="KEY=VALUE, on create only"
+    )
+    p.set_defaults(func=cmd_put_if_changed)
+
+    p = sub.add_parser("delete", help="delete parameters, missing ones are ignored")
+    p.add_argument("names", nargs="+")
+    p.set_defaults(func=cmd_delete)
+
+    p = sub.add_parser("tags", help="manage parameter tags")
+    tags_sub = p.add_subparsers(dest="tags_command", required=True)
+    tp = tags_sub.add_parser("get", help="print the tags")
+    tp.add_argument("name")
+    tp = tags_sub.add_parser("set", help="replace all tags")
+    tp.add_argument("name")
+    tp.add_argument("tags", nargs="*", help="KEY=VALUE")
+    tp = tags_sub.add_parser("update", help="add or overwrite tags")
+    tp.add_argument("name")
+    tp.add_argument("tags", nargs="+", help="KEY=VALUE")
+    tp = tags_sub.add_parser("remove", help="remove tags by key")
+    tp.add_argument("name")
+    tp.add_argument("keys", nargs="+")
+    p.set_defaults(func=cmd_tags)
+
+    p = sub.add_parser("export", help="export parameters as JSON lines")
+    p.add_argument("path", nargs="?", default=None, help="parameter name prefix")
+    p.add_argument("-o", "--output", default="-", help="output file, default stdout")
+    p.add_argument("--decrypt", action="store_true", help="decrypt SecureString")
+    p.add_argument(
+        "--tags",
+        action="store_true",
+        help="include tags, costs one extra API call per parameter",
+    )
+    p.add_argument("-q", "--quiet", action="store_true", help="no progress report")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="import parameters from JSON lines")
+    p.add_argument("-i", "--input", default="-", help="input file, default stdin")
+    p.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_IMPORT_CHUNK_SIZE,
+        help="number of records held in memory and written at a time",
+    )
+    p.add_argument("-q", "--quiet", action="store_true", help="no progress report")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("env", help="print parameter paths as environment variables")
+    p.add_argument("paths", nargs="+", help="parameter paths, later paths win")
+    p.add_argument("--format", default="export", choices=["export", "dotenv", "json"])
+    p.add_argument("--env-prefix", default="", help="prefix of the variable names")
+    p.add_argument("--snapshot", help="snapshot file used when SSM is unreachable")
+    p.set_defaults(func=cmd_env)
+
+    p = sub.add_parser("sidecar", help="serve a node level parameter cache")
+    p.add_argument("--socket", help="Unix domain socket path, otherwise serve HTTP")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8741)
+    p.add_argument("--ttl", type=float, default=60.0, help="seconds fresh")
+    p.add_argument(
+        "--stale",
+        type=float,
+        default=300.0,
+        help="seconds an expired value is served while it is refreshed",
+    )
+    p.add_argument(
+        "--token-file",
+        help="bearer token file, required for HTTP, generated if it doesn't exist",
+    )
+    p.set_defaults(func=cmd_sidecar)
+
+    p = sub.add_parser("sync", help="apply a YAML / JSON desired state file")
+    p.add_argument("file", help="desired state file")
+    p.add_argument("--marker", help="parameter that stores the last applied state")
+    p.add_argument("--state", help="local file that stores the last applied state")
+    p.add_argument("--no-prune", action="store_true", help="keep removed entries")
+    p.add_argument("--force", action="store_true", help="check every entry")
+    p.set_defaults(func=cmd_sync)
+
+    p = sub.add_parser("changes", help="print changes since the last run as JSON lines")
+    p.add_argument("path", help="parameter name prefix")
+    p.add_argument("--state", required=True, help="file that stores the last run")
+    p.add_argument("--decrypt", action="store_true", help="decrypt SecureString")
+    p.add_argument("--tags", action="store_true", help="include tags")
+    p.set_defaults(func=cmd_changes)
+
+    return parser
+
+
+def run(args: argparse.Namespace, ssm_client: "SSMClient") -> int:
+    return args.func(ssm_client, args)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .batch import DEFAULT_MAX_WORKERS
+    from .factory import get_ssm_client
+
+    args = build_parser().parse_args(argv)
+    ssm_client = get_ssm_client(
+        profile_name=args.profile,
+        region_name=args.region,
+        max_workers=args.max_workers or DEFAULT_MAX_WORKERS,
+    )
+    return run(args, ssm_client)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -11,7 +11,6 @@ and idempotent operations.
 
 import typing as T
 
-import botocore.exceptions
 from func_args.api import OPT, remove_optional
 
 from .constants import (
@@ -23,14 +22,30 @@ from .utils import (
     encode_tags,
     decode_tags,
 )
+from .codec import (
+    Codec,
+    get_codec,
+)
+from .compression import (
+    CompressionAlgorithm,
+    compress_value_if_smaller,
+    get_compression_algorithm,
+)
 from .model import (
     Parameter,
 )
+from .tier import select_tier
+from .batch import get_max_workers, make_batches, map_batches
+from .exc import ParameterVersionConflictError
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from mypy_boto3_ssm.client import SSMClient
 
 
+GET_PARAMETERS_BATCH_SIZE = 10
+DELETE_PARAMETERS_BATCH_SIZE = 10
+
+
 def get_parameter(
     ssm_client: "SSMClient",
     name: str,
@@ -62,6 +77,10 @@ def get_parameter(
 
     :return: ``Parameter`` object if the parameter exists, None if it does not exist.
     """
+    # botocore is imported on first call, to keep the import of this
+    # library cheap for short-lived processes
+    import botocore.exceptions
+
     try:
         response = ssm_client.get_parameter(
             Name=name,
@@ -79,10 +98,91 @@ def get_parameter(
         raise  # pragma: no cover
 
 
+def get_parameters(
+    ssm_client: "SSMClient",
+    names: T.Iterable[str],
+    with_decryption: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, Parameter]:
+    """
+    Get many parameters by name with as few API calls as possible.
+
+    Names are de-duplicated and sent in batches of 10 (the ``GetParameters``
+    limit). When more than one batch is needed, the batches are fetched
+    concurrently. Non-existent parameters are silently omitted from the result,
+    which makes this function also usable for bulk existence testing.
+
+    Example::
+
+        params = get_parameters(ssm_client, ["/app/db/host", "/app/db/port"])
+        if "/app/db/host" in params:
+            print(params["/app/db/host"].value)
+
+    Ref:
+
+    - `get_parameters <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ssm.html#SSM.Client.get_parameters>`_
+
+    :param ssm_client: SSM client
+    :param names: parameter names, may include version or label selectors
+        (e.g., "/app/database/host:3")
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param max_workers: max number of concurrent ``GetParameters`` calls
+
+    :return: dictionary mapping the requested name to the ``Parameter`` object,
+        in the requested order
+    """
+    names = list(dict.fromkeys(names))
+
+    def get_batch(batch: list[str]) -> list[dict[str, T.Any]]:
+        response = ssm_client.get_parameters(
+            Names=batch,
+            WithDecryption=with_decryption,
+        )
+        return response.get("Parameters", [])
+
+    found = dict()
+    for param_data_list in map_batches(
+        get_batch,
+        make_batches(names, GET_PARAMETERS_BATCH_SIZE),
+        get_max_workers(ssm_client, max_workers),
+    ):
+        for param_data in param_data_list:
+            param = Parameter(_data=param_data)
+            if param.selector:
+                found[param.name + param.selector] = param
+            else:
+                found[param.name] = param
+                # not every implementation echoes the version selector back
+                found.setdefault(f"{param.name}:{param.version}", param)
+    # keep the requested order
+    return {name: found[name] for name in names if name in found}
+
+
+def _is_value_changed(
+    before_param: Parameter,
+    value: str,
+    codec: Codec | None,
+) -> bool:
+    """
+    Compare the existing parameter value with the desired (encoded) value.
+
+    With a codec, values are compared in decoded form. If the existing value
+    cannot be decoded, it is considered changed.
+    """
+    if value == before_param.value:
+        return False
+    if codec is None:
+        return True
+    try:
+        return before_param.decode(codec) != codec.decode(value)
+    except Exception:
+        return True
+
+
 def put_parameter_if_changed(
     ssm_client: "SSMClient",
     name: str,
-    value: str,
+    value: str | T.Any,
     description: str | None = OPT,
     type: ParameterType | None = OPT,
     tier: ParameterTier | None = OPT,
@@ -91,6 +191,10 @@ def put_parameter_if_changed(
     tags: dict[str, str] | None = OPT,
     policies: str | None = OPT,
     data_type: str | None = OPT,
+    codec: Codec | str | None = None,
+    compression: CompressionAlgorithm | str | None = None,
+    auto_tier: bool = False,
+    expected_version: int | None = None,
 ) -> tuple[Parameter | None, Parameter | None]:
     """
     Put a parameter only if its value has changed (conditional write).
@@ -123,6 +227,67 @@ def put_parameter_if_changed(
     decryption when comparing values, ensuring accurate change detection even for
     encrypted parameters.
 
+    **Structured Values:**
+
+    When ``codec`` is given, ``value`` is a Python object (e.g. a ``dict`` for
+    the ``"json"`` codec) that is serialized with the codec's canonical encoding.
+    The existing value is compared in decoded form, so semantically equal
+    values such as JSON documents with different key order or whitespace
+    do not cause a write::
+
+        put_parameter_if_changed(
+            ssm_client=client,
+            name="/app/config",
+            value={"host": "db.example.com", "port": 5432},
+            codec="json",
+        )
+
+    **Compression:**
+
+    When ``compression`` is given (``"zlib"`` or ``"zstd"``), the value is
+    stored compressed and base64 encoded with a marker prefix, if that makes
+    it smaller. This keeps large JSON documents under the Standard tier size
+    limit. :attr:`Parameter.value <simple_aws_ssm_parameter_store.model.Parameter.value>`
+    decompresses it transparently. The change detection compares the
+    uncompressed values, a write also happens when the stored compression
+    algorithm differs from the requested one.
+
+    **Optimistic Concurrency:**
+
+    Two writers that get then put the same parameter can overwrite each other.
+    With ``expected_version``, the write is based on the version the caller
+    read (0 for "must not exist"), so concurrent deploys don't need a global
+    lock:
+
+    - the version is checked before the write, a different version raises
+      :class:`~simple_aws_ssm_parameter_store.exc.ParameterVersionConflictError`
+    - a create is sent without ``Overwrite``, so a concurrent create fails
+      with ``ParameterAlreadyExists`` instead of being overwritten
+    - ``PutParameter`` doesn't support a condition, so an update is verified
+      afterwards: the new version must directly follow the expected one.
+      Otherwise the versions written in between are read back, and unless
+      they hold the same value (e.g. two deploys of the same config) the
+      other writer's value is put back, if ours is still the latest version,
+      and the conflict is raised with ``written=True``
+
+    This is not an atomic compare-and-set. An update that lands between the
+    check and the write is overwritten until the value is put back, readers
+    may see our value in the meantime, and it stays overwritten if the
+    process dies before putting it back. The put back itself is a check then
+    write, a third writer in that window is overwritten by it.
+
+    A parameter that already has the desired value is never a conflict, no
+    write is needed. On conflict, read the parameter again and retry with
+    its current version::
+
+        before = get_parameter(client, "/app/config")
+        put_parameter_if_changed(
+            ssm_client=client,
+            name="/app/config",
+            value=new_value,
+            expected_version=0 if before is None else before.version,
+        )
+
     Example usage::
 
         # Create or update parameter only if value changed
@@ -160,6 +325,16 @@ def put_parameter_if_changed(
     :param tags: dictionary of tag key-value pairs
     :param policies: parameter policies (JSON string)
     :param data_type: parameter data type (e.g., "text", "aws:ec2:image")
+    :param codec: optional :class:`~simple_aws_ssm_parameter_store.codec.Codec`
+        or registered codec name, used to encode a structured ``value`` and
+        to compare it with the existing value in decoded form
+    :param compression: optional compression algorithm, see
+        :mod:`~simple_aws_ssm_parameter_store.compression`
+    :param auto_tier: when True and ``tier`` is not given, pick the cheapest
+        tier that fits the stored value size and policies, see
+        :func:`~simple_aws_ssm_parameter_store.tier.select_tier`
+    :param expected_version: optional version the write is based on, 0 if the
+        parameter must not exist, see "Optimistic Concurrency" above
 
     :returns: Tuple of (before_parameter, after_parameter) where:
         - before_parameter: Parameter object before operation (None if didn't exist)
@@ -173,20 +348,99 @@ def put_parameter_if_changed(
 
     # Get current parameter value to compare against desired value
     before_param = get_parameter(ssm_client, name, with_decryption=with_decryption)
+    return _put_parameter_if_changed(
+        ssm_client=ssm_client,
+        before_param=before_param,
+        name=name,
+        value=value,
+        description=description,
+        type=type,
+        tier=tier,
+        key_id=key_id,
+        allowed_pattern=allowed_pattern,
+        tags=tags,
+        policies=policies,
+        data_type=data_type,
+        codec=codec,
+        compression=compression,
+        auto_tier=auto_tier,
+        expected_version=expected_version,
+    )
+
+
+def _put_parameter_if_changed(
+    ssm_client: "SSMClient",
+    before_param: Parameter | None,
+    name: str,
+    value: str | T.Any,
+    description: str | None = OPT,
+    type: ParameterType | None = OPT,
+    tier: ParameterTier | None = OPT,
+    key_id: str | None = OPT,
+    allowed_pattern: str | None = OPT,
+    tags: dict[str, str] | None = OPT,
+    policies: str | None = OPT,
+    data_type: str | None = OPT,
+    codec: Codec | str | None = None,
+    compression: CompressionAlgorithm | str | None = None,
+    auto_tier: bool = False,
+    expected_version: int | None = None,
+    before_write: T.Callable[[Parameter | None], None] | None = None,
+) -> tuple[Parameter | None, Parameter | None]:
+    """
+    The write half of :func:`put_parameter_if_changed`, ``before_param`` is
+    the current parameter, already fetched by the caller. ``before_write`` is
+    called with it when a write is needed, right before it, and may raise to
+    prevent it.
+    """
+    # Serialize structured value with the canonical codec encoding
+    if codec is not None:
+        codec = get_codec(codec)
+        value = codec.encode(value)
+
+    # The value that is actually sent to Parameter Store
+    if compression is not None:
+        stored_value = compress_value_if_smaller(value, compression)
+    else:
+        stored_value = value
+
     is_param_exists = before_param is not None
     # Determine if write operation is needed
     if is_param_exists:
         # Parameter exists - only write if value has changed
-        should_write = not (value == before_param.value)
+        should_write = _is_value_changed(before_param, value, codec) or (
+            get_compression_algorithm(before_param.raw_value)
+            != get_compression_algorithm(stored_value)
+        )
     else:
         # Parameter doesn't exist - always write
         should_write = True
 
+    if should_write and expected_version is not None:
+        actual_version = before_param.version if is_param_exists else 0
+        if actual_version != expected_version:
+            raise ParameterVersionConflictError(name, expected_version, actual_version)
+
+    if should_write and before_write is not None:
+        before_write(before_param)
+
     if should_write:
+        # Pick the tier from the value size and policies
+        if auto_tier and (tier is OPT or tier is None):
+            selected_tier = select_tier(
+                stored_value,
+                policies=None if policies is OPT else policies,
+                before_tier=before_param.tier if is_param_exists else None,
+            )
+            # get_parameter doesn't return the tier, an existing parameter may
+            # be Advanced and can't be downgraded, so only request upgrades
+            if not (is_param_exists and selected_tier is ParameterTier.STANDARD):
+                tier = selected_tier
+
         # Prepare parameters for put_parameter API call
         kwargs = dict(
             Name=name,
-            Value=value,
+            Value=stored_value,
             Description=description,
             Type=type.value if isinstance(type, ParameterType) else type,
             Tier=tier.value if isinstance(tier, ParameterTier) else tier,
@@ -201,13 +455,26 @@ def put_parameter_if_changed(
             kwargs.pop("Tags")
 
         # Execute the parameter write operation
-        response = ssm_client.put_parameter(**remove_optional(**kwargs))
+        if expected_version is None:
+            response = ssm_client.put_parameter(**remove_optional(**kwargs))
+        else:
+            response = _put_parameter_expected_version(
+                ssm_client=ssm_client,
+                before_param=before_param,
+                kwargs=kwargs,
+                value=value,
+                codec=codec,
+                expected_version=expected_version,
+            )
+            if isinstance(response, Parameter):
+                # created concurrently with the same value
+                return response, None
 
         # Construct Parameter object from put_parameter response and input data
         # Note: put_parameter response only contains Version and Tier, not full parameter data
         param_data = dict(
             Name=name,
-            Value=value,
+            Value=stored_value,
             Description=description,
             Type=type.value if isinstance(type, ParameterType) else type,
             Tier=tier.value if isinstance(tier, ParameterTier) else tier,
@@ -222,6 +489,182 @@ def put_parameter_if_changed(
     return before_param, after_param
 
 
+def _put_parameter_expected_version(
+    ssm_client: "SSMClient",
+    before_param: Parameter | None,
+    kwargs: dict[str, T.Any],
+    value: str,
+    codec: Codec | None,
+    expected_version: int,
+) -> dict[str, T.Any] | Parameter:
+    """
+    Send the ``put_parameter`` call of an ``expected_version`` write, and
+    detect the writes of others, see :func:`put_parameter_if_changed`.
+
+    :return: the ``put_parameter`` response, or the parameter another writer
+        created with the same value
+    """
+    import botocore.exceptions
+
+    name = kwargs["Name"]
+    with_decryption = kwargs["Type"] == ParameterType.SECURE_STRING.value
+    try:
+        response = ssm_client.put_parameter(**remove_optional(**kwargs))
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] != "ParameterAlreadyExists":
+            raise
+        current = get_parameter(ssm_client, name, with_decryption=with_decryption)
+        if current is not None and not _is_value_changed(current, value, codec):
+            return current
+        raise ParameterVersionConflictError(
+            name,
+            expected_version,
+            0 if current is None else current.version,
+        ) from e
+
+    new_version = response["Version"]
+    if new_version == expected_version + 1:
+        return response
+    # other versions were written between the check and the write
+    selectors = [f"{name}:{v}" for v in range(expected_version + 1, new_version)]
+    others = get_parameters(ssm_client, selectors, with_decryption=with_decryption)
+    if len(others) != len(selectors) or any(
+        _is_value_changed(other, value, codec) for other in others.values()
+    ):
+        restored = _restore_version(ssm_client, kwargs, new_version)
+        raise ParameterVersionConflictError(
+            name,
+            expected_version,
+            new_version - 1,
+            written=True,
+            restored=restored,
+        )
+    return response
+
+
+def _restore_version(
+    ssm_client: "SSMClient",
+    kwargs: dict[str, T.Any],
+    our_version: int,
+) -> bool:
+    """
+    Put back the value of the version our ``expected_version`` write
+    overwrote, unless a newer write already replaced ours.
+
+    :return: whether the value was put back
+    """
+    name = kwargs["Name"]
+    other = get_parameter(ssm_client, f"{name}:{our_version - 1}", True)
+    current = get_parameter(ssm_client, name)
+    if other is None or current is None or current.version != our_version:
+        return False
+    restore_kwargs = dict(
+        Name=name,
+        Value=other.raw_value,
+        Type=other.type,
+        Overwrite=True,
+    )
+    # GetParameters doesn't return the KMS key, the writers share ours
+    if other.is_secure_string_type and kwargs.get("KeyId") not in (None, OPT):
+        restore_kwargs["KeyId"] = kwargs["KeyId"]
+    if other.data_type:
+        restore_kwargs["DataType"] = other.data_type
+    ssm_client.put_parameter(**restore_kwargs)
+    return True
+
+
+def put_parameters_if_changed(
+    ssm_client: "SSMClient",
+    parameters: T.Iterable[dict[str, T.Any]],
+    max_workers: int | None = None,
+) -> list[tuple[Parameter | None, Parameter | None]]:
+    """
+    Conditional write of many parameters, see :func:`put_parameter_if_changed`.
+
+    The current parameters are fetched with batched, concurrent
+    ``GetParameters`` calls (SecureString parameters with decryption, the
+    others without), instead of one ``GetParameter`` call per parameter.
+    Then only the changed parameters are written, concurrently.
+
+    Parameters with an ``expected_version`` are optimistic writes, each
+    one is checked on its own, without any lock. All the writes are
+    attempted, then the first conflict is raised, with every conflict in its
+    ``conflicts`` attribute.
+
+    Example::
+
+        results = put_parameters_if_changed(
+            ssm_client,
+            [
+                dict(name="/app/db/host", value="db.example.com", type=ParameterType.STRING),
+                dict(name="/app/db/password", value="...", type=ParameterType.SECURE_STRING),
+            ],
+        )
+        n_written = sum(1 for before, after in results if after is not None)
+
+    :param ssm_client: SSM client
+    :param parameters: keyword arguments of :func:`put_parameter_if_changed`
+        (without ``ssm_client``), one dict per parameter, names must be unique
+    :param max_workers: max number of concurrent API calls
+
+    :return: ``(before_parameter, after_parameter)`` tuples, in the input order
+    """
+    parameters = list(parameters)
+    names = [kwargs["name"] for kwargs in parameters]
+    if len(set(names)) != len(names):
+        raise ValueError("parameter names must be unique")
+    secure_names = {
+        kwargs["name"]
+        for kwargs in parameters
+        if kwargs.get("type") is ParameterType.SECURE_STRING
+    }
+    other_names = [name for name in names if name not in secure_names]
+    secure_names = [name for name in names if name in secure_names]
+
+    before_params = dict()
+    if other_names:
+        before_params.update(
+            get_parameters(ssm_client, other_names, max_workers=max_workers)
+        )
+    if secure_names:
+        before_params.update(
+            get_parameters(
+                ssm_client,
+                secure_names,
+                with_decryption=True,
+                max_workers=max_workers,
+            )
+        )
+
+    def put(
+        batch: list[dict[str, T.Any]],
+    ) -> tuple[Parameter | None, Parameter | None]:
+        kwargs = batch[0]
+        try:
+            return _put_parameter_if_changed(
+                ssm_client=ssm_client,
+                before_param=before_params.get(kwargs["name"]),
+                **kwargs,
+            )
+        except ParameterVersionConflictError as e:
+            return e
+
+    results = map_batches(
+        put,
+        [[kwargs] for kwargs in parameters],
+        get_max_workers(ssm_client, max_workers),
+    )
+    conflicts = [
+        result
+        for result in results
+        if isinstance(result, ParameterVersionConflictError)
+    ]
+    if conflicts:
+        conflicts[0].conflicts = conflicts
+        raise conflicts[0]
+    return results
+
+
 def delete_parameter(
     ssm_client: "SSMClient",
     name: str,
@@ -258,6 +701,8 @@ def delete_parameter(
 
     :return: True if the parameter was deleted, False if it did not exist.
     """
+    import botocore.exceptions
+
     try:
         ssm_client.delete_parameter(Name=name)
         return True
@@ -267,6 +712,43 @@ def delete_parameter(
         raise  # pragma: no cover
 
 
+def delete_parameters(
+    ssm_client: "SSMClient",
+    names: T.Iterable[str],
+    max_workers: int | None = None,
+) -> list[str]:
+    """
+    Delete many parameters by name with idempotent behavior.
+
+    Names are sent in batches of 10 (the ``DeleteParameters`` limit), and
+    batches are deleted concurrently. Non-existent parameters are ignored.
+
+    Ref:
+
+    - `delete_parameters <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ssm.html#SSM.Client.delete_parameters>`_
+
+    :param ssm_client: SSM client
+    :param names: parameter names
+    :param max_workers: max number of concurrent ``DeleteParameters`` calls
+
+    :return: list of parameter names that were actually deleted
+    """
+    names = list(dict.fromkeys(names))
+
+    def delete_batch(batch: list[str]) -> list[str]:
+        response = ssm_client.delete_parameters(Names=batch)
+        return response.get("DeletedParameters", [])
+
+    deleted = list()
+    for deleted_names in map_batches(
+        delete_batch,
+        make_batches(names, DELETE_PARAMETERS_BATCH_SIZE),
+        get_max_workers(ssm_client, max_workers),
+    ):
+        deleted.extend(deleted_names)
+    return deleted
+
+
 def get_parameter_tags(
     ssm_client: "SSMClient",
     name: str,
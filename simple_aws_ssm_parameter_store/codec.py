@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Value codecs for structured parameter values.
+
+SSM Parameter Store only stores strings. A codec describes how to turn a
+Python object into the parameter value string and back. The built-in codecs
+cover the common cases (JSON documents, ``StringList`` values, integers and
+booleans), and custom codecs can be registered with :func:`register_codec`.
+
+Encoding is canonical, for example the JSON codec sorts keys and removes
+insignificant whitespace, so semantically equal values always encode to the
+same string.
+"""
+
+import typing as T
+import json
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class Codec:
+    """
+    A named pair of encode / decode functions.
+
+    :param name: unique codec name, used to look up the codec in the registry
+    :param encode: function that converts a Python object to the parameter value string
+    :param decode: function that converts the parameter value string to a Python object
+    """
+
+    name: str = dataclasses.field()
+    encode: T.Callable[[T.Any], str] = dataclasses.field()
+    decode: T.Callable[[str], T.Any] = dataclasses.field()
+
+
+def _json_encode(obj: T.Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _string_list_encode(obj: T.Iterable[str]) -> str:
+    items = list(obj)
+    for item in items:
+        if "," in item:
+            raise ValueError(f"StringList item cannot contain comma: {item!r}")
+    return ",".join(items)
+
+
+def _string_list_decode(value: str) -> list[str]:
+    if value == "":
+        return []
+    return value.split(",")
+
+
+def _int_encode(obj: int) -> str:
+    return str(int(obj))
+
+
+_TRUE_VALUES = {"true", "1", "yes", "y", "on"}
+_FALSE_VALUES = {"false", "0", "no", "n", "off"}
+
+
+def _bool_encode(obj: bool) -> str:
+    return "true" if obj else "false"
+
+
+def _bool_decode(value: str) -> bool:
+    lower_value = value.strip().lower()
+    if lower_value in _TRUE_VALUES:
+        return True
+    if lower_value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Cannot decode {value!r} as boolean")
+
+
+JSON_CODEC = Codec(name="json", encode=_json_encode, decode=json.loads)
+STRING_LIST_CODEC = Codec(
+    name="string_list",
+    encode=_string_list_encode,
+    decode=_string_list_decode,
+)
+INT_CODEC = Codec(name="int", encode=_int_encode, decode=int)
+BOOL_CODEC = Codec(name="bool", encode=_bool_encode, decode=_bool_decode)
+
+_codec_registry: dict[str, Codec] = {
+    codec.name: codec
+    for codec in [
+        JSON_CODEC,
+        STRING_LIST_CODEC,
+        INT_CODEC,
+        BOOL_CODEC,
+    ]
+}
+
+
+def register_codec(codec: Codec, overwrite: bool = False) -> Codec:
+    """
+    Register a custom codec so it can be referenced by name.
+
+    Example::
+
+        import yaml
+
+        register_codec(
+            Codec(name="yaml", encode=yaml.safe_dump, decode=yaml.safe_load)
+        )
+        config = param.decode("yaml")
+
+    :param codec: the codec to register
+    :param overwrite: whether to replace an existing codec with the same name
+
+    :return: the registered codec
+    """
+    if (codec.name in _codec_registry) and (overwrite is False):
+        raise ValueError(f"Codec {codec.name!r} is already registered")
+    _codec_registry[codec.name] = codec
+    return codec
+
+
+def get_codec(codec: Codec | str) -> Codec:
+    """
+    Resolve a codec object or a registered codec name to a :class:`Codec`.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    try:
+        return _codec_registry[codec]
+    except KeyError:
+        raise ValueError(f"Unknown codec {codec!r}")
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Transparent parameter value compression.
+
+A compressed value is stored as ``<marker><algorithm>:<base64 payload>``,
+for example ``ssmz:zlib:eJzLSM3JyQcABiwCFQ==``. The marker lets the read path
+(:attr:`~simple_aws_ssm_parameter_store.model.Parameter.value`) recognize and
+decompress values automatically, while plain values pass through unchanged.
+A value is only taken as compressed when the whole of it has this format,
+with a known algorithm and a base64 payload, and the payload passes the
+checksum of the algorithm. Anything else, e.g. a plain value that happens
+to begin with ``ssmz:``, is read as is.
+
+``zlib`` is always available. ``zstd`` requires the optional
+`zstandard <https://pypi.org/project/zstandard/>`_ package, install it with
+``pip install simple_aws_ssm_parameter_store[zstd]``.
+"""
+
+import re
+import enum
+import zlib
+import base64
+import binascii
+
+
+class CompressionAlgorithm(str, enum.Enum):
+    ZLIB = "zlib"
+    ZSTD = "zstd"
+
+
+COMPRESSION_MARKER = "ssmz:"
+
+_COMPRESSED_VALUE_PATTERN = re.compile(
+    re.escape(COMPRESSION_MARKER)
+    + "(?P<algorithm>"
+    + "|".join(algorithm.value for algorithm in CompressionAlgorithm)
+    + r"):(?P<payload>(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?)"
+)
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package, "
+            "install it with 'pip install simple_aws_ssm_parameter_store[zstd]'"
+        ) from e
+    return zstandard
+
+
+def _compress(data: bytes, algorithm: CompressionAlgorithm) -> bytes:
+    if algorithm is CompressionAlgorithm.ZLIB:
+        return zlib.compress(data, 9)
+    return _import_zstandard().ZstdCompressor(level=19).compress(data)
+
+
+def _decompress(data: bytes, algorithm: CompressionAlgorithm) -> bytes:
+    if algorithm is CompressionAlgorithm.ZLIB:
+        try:
+            return zlib.decompress(data)
+        except zlib.error as e:
+            raise ValueError(f"Invalid zlib payload: {e}") from e
+    zstandard = _import_zstandard()
+    try:
+        return zstandard.ZstdDecompressor().decompress(data)
+    except zstandard.ZstdError as e:
+        raise ValueError(f"Invalid zstd payload: {e}") from e
+
+
+def _match(value: str | None) -> re.Match | None:
+    if not isinstance(value, str):
+        return None
+    return _COMPRESSED_VALUE_PATTERN.fullmatch(value)
+
+
+def is_compressed_value(value: str | None) -> bool:
+    """
+    Test whether a raw parameter value has the format of :func:`compress_value`.
+    """
+    return _match(value) is not None
+
+
+def get_compression_algorithm(value: str | None) -> CompressionAlgorithm | None:
+    """
+    Return the compression algorithm of a raw parameter value,
+    None if the value is not compressed.
+    """
+    match = _match(value)
+    if match is None:
+        return None
+    return CompressionAlgorithm(match.group("algorithm"))
+
+
+def compress_value(
+    value: str,
+    algorithm: CompressionAlgorithm | str = CompressionAlgorithm.ZLIB,
+) -> str:
+    """
+    Example:
+        >>> compress_value("hello")
+        'ssmz:zlib:eNrLSM3JyQcABiwCFQ=='
+    """
+    algorithm = CompressionAlgorithm(algorithm)
+    payload = base64.b64encode(_compress(value.encode("utf-8"), algorithm))
+    return f"{COMPRESSION_MARKER}{algorithm.value}:{payload.decode('ascii')}"
+
+
+def decompress_value(value: str) -> str:
+    """
+    Reverse :func:`compress_value`. Values without the format are returned
+    as is.
+
+    :raises ValueError: the value has the format, but the payload doesn't
+        decompress to UTF-8 text
+    """
+    match = _match(value)
+    if match is None:
+        return value
+    try:
+        payload = base64.b64decode(match.group("payload"), validate=True)
+    except binascii.Error as e:  # pragma: no cover, the pattern is stricter
+        raise ValueError(f"Invalid base64 payload: {e}") from e
+    algorithm = CompressionAlgorithm(match.group("algorithm"))
+    return _decompress(payload, algorithm).decode("utf-8")
+
+
+def compress_value_if_smaller(
+    value: str,
+    algorithm: CompressionAlgorithm | str = CompressionAlgorithm.ZLIB,
+) -> str:
+    """
+    Compress the value only if the compressed form (including the marker and
+    base64 overhead) is smaller than the original, short values usually aren't.
+    """
+    compressed = compress_value(value, algorithm)
+    if len(compressed) < len(value.encode("utf-8")):
+        return compressed
+    return value
+
+
+def get_value_size(value: str | None) -> int:
+    """
+    Size in bytes of a raw parameter value, as counted against the tier limit.
+    """
+    if value is None:
+        return 0
+    return len(value.encode("utf-8"))
@@ -42,3 +42,12 @@ class ResourceType(str, enum.Enum):
 
 
 DEFAULT_KMS_KEY = "alias/aws/ssm"
+
+# Max parameter value size in bytes per tier, see
+# `Parameter tiers <https://docs.aws.amazon.com/systems-manager/latest/userguide/parameter-store-advanced-parameters.html>`_
+STANDARD_TIER_MAX_VALUE_SIZE = 4096
+ADVANCED_TIER_MAX_VALUE_SIZE = 8192
+
+# Parameter Store keeps the last 100 versions of a parameter, see
+# `Parameter versions <https://docs.aws.amazon.com/systems-manager/latest/userguide/sysman-paramstore-versions.html>`_
+MAX_PARAMETER_VERSIONS = 100
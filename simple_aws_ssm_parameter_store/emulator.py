@@ -0,0 +1,936 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lightweight in-process SSM Parameter Store emulator.
+
+:class:`LocalSSMClient` implements the subset of the boto3 SSM client API that
+this library uses, on top of SQLite, so it can be passed as ``ssm_client``
+to every function of this library. Compared to moto it:
+
+- stores data in an indexed SQLite database, in memory or in a file, so
+  path queries and pagination stay fast with hundreds of thousands of
+  parameters, and the data can outlive the process
+- can inject latency and throttling, to load test caching and bulk
+  layers realistically without any network access
+
+Supported features: versions (with the 100 versions history limit), labels,
+tags, ``String`` / ``StringList`` / ``SecureString`` types, tiers and their
+value size limits, ``AllowedPattern``, path queries and the
+``describe_parameters`` filters ``Name``, ``Path``, ``Type``, ``KeyId``,
+``Tier``, ``DataType`` and ``tag:<key>``, and the ``describe_parameters``,
+``get_parameters_by_path`` and ``get_parameter_history`` paginators.
+
+Errors are raised as ``botocore.exceptions.ClientError`` with the same error
+codes as the real service, and are also available as
+``LocalSSMClient.exceptions.<ErrorCode>``.
+
+Example::
+
+    ssm_client = LocalSSMClient("/tmp/ssm.sqlite", latency=0.005, max_tps=40)
+    put_parameter_if_changed(ssm_client, "/app/db/host", "db.example.com")
+"""
+
+import typing as T
+import re
+import json
+import time
+import base64
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import botocore.exceptions
+
+from .constants import (
+    ParameterType,
+    ParameterTier,
+    DEFAULT_KMS_KEY,
+    STANDARD_TIER_MAX_VALUE_SIZE,
+    ADVANCED_TIER_MAX_VALUE_SIZE,
+)
+from .utils import encode_tags, decode_tags
+
+MAX_VERSIONS = 100
+MAX_LABELS_PER_VERSION = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parameter (
+    name TEXT PRIMARY KEY,
+    parent_path TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_parameter_parent_path ON parameter (parent_path);
+CREATE TABLE IF NOT EXISTS parameter_version (
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    type TEXT NOT NULL,
+    tier TEXT NOT NULL,
+    key_id TEXT,
+    description TEXT,
+    allowed_pattern TEXT,
+    policies TEXT,
+    data_type TEXT NOT NULL,
+    last_modified_date REAL NOT NULL,
+    last_modified_user TEXT NOT NULL,
+    PRIMARY KEY (name, version)
+);
+CREATE TABLE IF NOT EXISTS parameter_label (
+    name TEXT NOT NULL,
+    label TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (name, label)
+);
+CREATE TABLE IF NOT EXISTS parameter_tag (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (name, key)
+);
+"""
+
+_VERSION_COLUMNS = (
+    "name, version, value, type, tier, key_id, description, allowed_pattern, "
+    "policies, data_type, last_modified_date, last_modified_user"
+)
+
+
+def _get_parent_path(name: str) -> str:
+    """
+    Example:
+        >>> _get_parent_path("/app/db/host")
+        '/app/db'
+        >>> _get_parent_path("/host")
+        '/'
+        >>> _get_parent_path("host")
+        ''
+    """
+    if not name.startswith("/"):
+        return ""
+    parent = name.rsplit("/", 1)[0]
+    return parent or "/"
+
+
+def _split_selector(name: str) -> tuple[str, str | None]:
+    """
+    Split ``name:selector`` into name and selector.
+    """
+    if ":" in name:
+        name, selector = name.split(":", 1)
+        return name, selector
+    return name, None
+
+
+def _prefix_range(prefix: str) -> tuple[str, str]:
+    """
+    ``name LIKE 'prefix%'`` as a range scan that can use the primary key index.
+    """
+    return prefix, prefix + "\U0010ffff"
+
+
+def _fake_encrypt(value: str, key_id: str) -> str:
+    data = f"{key_id}:{value}".encode("utf-8")
+    return base64.b64encode(data).decode("ascii")
+
+
+class _Exceptions:
+    """
+    ``LocalSSMClient.exceptions.ParameterNotFound`` style access to error
+    classes, like the boto3 client. All of them are ``ClientError`` subclasses.
+    """
+
+    def __init__(self):
+        self._classes: dict[str, type] = dict()
+
+    def __getattr__(self, code: str) -> type:
+        if code.startswith("_"):
+            raise AttributeError(code)
+        try:
+            return self._classes[code]
+        except KeyError:
+            cls = type(code, (botocore.exceptions.ClientError,), {})
+            self._classes[code] = cls
+            return cls
+
+
+class _Paginator:
+    def __init__(self, method: T.Callable, max_page_size: int):
+        self.method = method
+        self.max_page_size = max_page_size
+
+    def paginate(self, **kwargs) -> T.Iterator[dict[str, T.Any]]:
+        config = kwargs.pop("PaginationConfig", {}) or {}
+        page_size = config.get("PageSize") or kwargs.pop("MaxResults", None)
+        kwargs["MaxResults"] = min(page_size or self.max_page_size, self.max_page_size)
+        next_token = config.get("StartingToken")
+        while True:
+            if next_token:
+                kwargs["NextToken"] = next_token
+            response = self.method(**kwargs)
+            yield response
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class LocalSSMClient:
+    """
+    SQLite backed stand-in for the boto3 SSM client.
+
+    :param database: SQLite database path, ``":memory:"`` for a private
+        in-memory database
+    :param latency: seconds of injected latency per call, or a callable that
+        receives the operation name and returns the seconds
+    :param max_tps: if given, calls beyond this rate (token bucket, shared by
+        all operations) raise ``ThrottlingException``
+    :param region_name: region used in ARNs
+    :param account_id: account id used in ARNs
+    :param user: ``LastModifiedUser`` of writes
+    """
+
+    def __init__(
+        self,
+        database: str = ":memory:",
+        latency: float | T.Callable[[str], float] | None = None,
+        max_tps: float | None = None,
+        region_name: str = "us-east-1",
+        account_id: str = "123456789012",
+        user: str = "arn:aws:iam::123456789012:user/local",
+    ):
+        self.database = database
+        self.latency = latency
+        self.region_name = region_name
+        self.account_id = account_id
+        self.user = user
+        self.exceptions = _Exceptions()
+        self._bucket = None if max_tps is None else _TokenBucket(max_tps)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            database,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # --------------------------------------------------------------------------
+    # Helpers
+    # --------------------------------------------------------------------------
+    def _before_call(self, operation: str):
+        if self.latency is not None:
+            latency = (
+                self.latency(operation) if callable(self.latency) else self.latency
+            )
+            if latency:
+                time.sleep(latency)
+        if self._bucket is not None and not self._bucket.acquire():
+            self._error(operation, "ThrottlingException", "Rate exceeded")
+
+    def _error(self, operation: str, code: str, message: str):
+        raise getattr(self.exceptions, code)(
+            {
+                "Error": {"Code": code, "Message": message},
+                "ResponseMetadata": {"HTTPStatusCode": 400},
+            },
+            operation,
+        )
+
+    def _arn(self, name: str) -> str:
+        path = name if name.startswith("/") else f"/{name}"
+        return f"arn:aws:ssm:{self.region_name}:{self.account_id}:parameter{path}"
+
+    def _query(self, sql: str, args: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def _get_version_row(
+        self,
+        operation: str,
+        name: str,
+        selector: str | None,
+    ) -> dict[str, T.Any]:
+        rows = self._query("SELECT version FROM parameter WHERE name = ?", (name,))
+        if not rows:
+            self._error(operation, "ParameterNotFound", f"Parameter {name} not found.")
+        version = rows[0][0]
+        if selector is not None:
+            if selector.isdigit():
+                version = int(selector)
+            else:
+                rows = self._query(
+                    "SELECT version FROM parameter_label WHERE name = ? AND label = ?",
+                    (name, selector),
+                )
+                if not rows:
+                    self._error(
+                        operation,
+                        "ParameterVersionNotFound",
+                        f"Label {selector} not found for parameter {name}.",
+                    )
+                version = rows[0][0]
+        rows = self._query(
+            f"SELECT {_VERSION_COLUMNS} FROM parameter_version "
+            "WHERE name = ? AND version = ?",
+            (name, version),
+        )
+        if not rows:
+            self._error(
+                operation,
+                "ParameterVersionNotFound",
+                f"Version {version} of parameter {name} not found.",
+            )
+        return self._row_to_dict(rows[0])
+
+    @staticmethod
+    def _row_to_dict(row: tuple) -> dict[str, T.Any]:
+        keys = [key.strip() for key in _VERSION_COLUMNS.split(",")]
+        return dict(zip(keys, row))
+
+    def _to_parameter(
+        self,
+        row: dict[str, T.Any],
+        with_decryption: bool,
+        selector: str | None = None,
+    ) -> dict[str, T.Any]:
+        value = row["value"]
+        if row["type"] == ParameterType.SECURE_STRING.value and not with_decryption:
+            value = _fake_encrypt(value, row["key_id"])
+        param = {
+            "Name": row["name"],
+            "Type": row["type"],
+            "Value": value,
+            "Version": row["version"],
+            "LastModifiedDate": datetime.fromtimestamp(
+                row["last_modified_date"], tz=timezone.utc
+            ),
+            "ARN": self._arn(row["name"]),
+            "DataType": row["data_type"],
+        }
+        if selector is not None:
+            param["Selector"] = f":{selector}"
+        return param
+
+    def _to_metadata(self, row: dict[str, T.Any]) -> dict[str, T.Any]:
+        metadata = {
+            "Name": row["name"],
+            "ARN": self._arn(row["name"]),
+            "Type": row["type"],
+            "LastModifiedDate": datetime.fromtimestamp(
+                row["last_modified_date"], tz=timezone.utc
+            ),
+            "LastModifiedUser": row["last_modified_user"],
+            "Version": row["version"],
+            "Tier": row["tier"],
+            "Policies": self._decode_policies(row["policies"]),
+            "DataType": row["data_type"],
+        }
+        for key, column in [
+            ("KeyId", "key_id"),
+            ("Description", "description"),
+            ("AllowedPattern", "allowed_pattern"),
+        ]:
+            if row[column] is not None:
+                metadata[key] = row[column]
+        return metadata
+
+    @staticmethod
+    def _decode_policies(policies: str | None) -> list[dict[str, str]]:
+        if not policies:
+            return []
+        return [
+            {
+                "PolicyText": json.dumps(policy),
+                "PolicyType": policy.get("Type", ""),
+                "PolicyStatus": "Pending",
+            }
+            for policy in json.loads(policies)
+        ]
+
+    def _assert_exists(self, operation: str, name: str, code: str):
+        rows = self._query("SELECT 1 FROM parameter WHERE name = ?", (name,))
+        if not rows:
+            self._error(operation, code, f"Parameter {name} not found.")
+
+    # --------------------------------------------------------------------------
+    # Read
+    # --------------------------------------------------------------------------
+    def get_parameter(
+        self,
+        Name: str,
+        WithDecryption: bool = False,
+    ) -> dict[str, T.Any]:
+        self._before_call("GetParameter")
+        name, selector = _split_selector(Name)
+        row = self._get_version_row("GetParameter", name, selector)
+        return {"Parameter": self._to_parameter(row, WithDecryption, selector)}
+
+    def get_parameters(
+        self,
+        Names: list[str],
+        WithDecryption: bool = False,
+    ) -> dict[str, T.Any]:
+        self._before_call("GetParameters")
+        if len(Names) > 10:
+            self._error(
+                "GetParameters",
+                "ValidationException",
+                "Member must have length less than or equal to 10",
+            )
+        params, invalid = list(), list()
+        for full_name in Names:
+            name, selector = _split_selector(full_name)
+            try:
+                row = self._get_version_row("GetParameters", name, selector)
+            except botocore.exceptions.ClientError:
+                invalid.append(full_name)
+            else:
+                params.append(self._to_parameter(row, WithDecryption, selector))
+        return {"Parameters": params, "InvalidParameters": invalid}
+
+    def get_parameters_by_path(
+        self,
+        Path: str,
+        Recursive: bool = False,
+        WithDecryption: bool = False,
+        ParameterFilters: list[dict[str, T.Any]] | None = None,
+        MaxResults: int = 10,
+        NextToken: str | None = None,
+    ) -> dict[str, T.Any]:
+        self._before_call("GetParametersByPath")
+        path = Path.rstrip("/") or "/"
+        if Recursive:
+            low, high = _prefix_range(path if path == "/" else f"{path}/")
+            where, args = "p.name >= ? AND p.name < ?", [low, high]
+        else:
+            where, args = "p.parent_path = ?", [path]
+        filter_sql, filter_args = self._build_filters(ParameterFilters or [])
+        rows, next_token = self._page(
+            where + filter_sql, args + filter_args, MaxResults, NextToken
+        )
+        response = {
+            "Parameters": [self._to_parameter(row, WithDecryption) for row in rows]
+        }
+        if next_token:
+            response["NextToken"] = next_token
+        return response
+
+    def describe_parameters(
+        self,
+        ParameterFilters: list[dict[str, T.Any]] | None = None,
+        MaxResults: int = 50,
+        NextToken: str | None = None,
+    ) -> dict[str, T.Any]:
+        self._before_call("DescribeParameters")
+        filter_sql, filter_args = self._build_filters(ParameterFilters or [])
+        rows, next_token = self._page(
+            "1 = 1" + filter_sql, filter_args, MaxResults, NextToken
+        )
+        response = {"Parameters": [self._to_metadata(row) for row in rows]}
+        if next_token:
+            response["NextToken"] = next_token
+        return response
+
+    def get_parameter_history(
+        self,
+        Name: str,
+        WithDecryption: bool = False,
+        MaxResults: int = 50,
+        NextToken: str | None = None,
+    ) -> dict[str, T.Any]:
+        self._before_call("GetParameterHistory")
+        self._assert_exists("GetParameterHistory", Name, "ParameterNotFound")
+        start = int(NextToken) if NextToken else 0
+        rows = self._query(
+            f"SELECT {_VERSION_COLUMNS} FROM parameter_version WHERE name = ? "
+            "AND version > ? ORDER BY version LIMIT ?",
+            (Name, start, MaxResults + 1),
+        )
+        labels = dict()
+        for version, label in self._query(
+            "SELECT version, label FROM parameter_label WHERE name = ?", (Name,)
+        ):
+            labels.setdefault(version, []).append(label)
+        history = list()
+        for row in rows[:MaxResults]:
+            row = self._row_to_dict(row)
+            item = self._to_metadata(row)
+            item["Value"] = self._to_parameter(row, WithDecryption)["Value"]
+            item["Labels"] = sorted(labels.get(row["version"], []))
+            history.append(item)
+        response = {"Parameters": history}
+        if len(rows) > MaxResults:
+            response["NextToken"] = str(history[-1]["Version"])
+        return response
+
+    def _page(
+        self,
+        where: str,
+        args: list[T.Any],
+        max_results: int,
+        next_token: str | None,
+    ) -> tuple[list[dict[str, T.Any]], str | None]:
+        """
+        Keyset pagination over parameters ordered by name, the next token is
+        the last returned name.
+        """
+        if next_token:
+            where += " AND p.name > ?"
+            args = args + [base64.urlsafe_b64decode(next_token).decode("utf-8")]
+        sql = (
+            f"SELECT {', '.join('v.' + c.strip() for c in _VERSION_COLUMNS.split(','))} "
+            "FROM parameter p JOIN parameter_version v "
+            "ON p.name = v.name AND p.version = v.version "
+            f"WHERE {where} ORDER BY p.name LIMIT ?"
+        )
+        rows = [
+            self._row_to_dict(row)
+            for row in self._query(sql, tuple(args + [max_results + 1]))
+        ]
+        if len(rows) > max_results:
+            rows = rows[:max_results]
+            token = base64.urlsafe_b64encode(rows[-1]["name"].encode("utf-8"))
+            return rows, token.decode("ascii")
+        return rows, None
+
+    def _build_filters(
+        self,
+        filters: list[dict[str, T.Any]],
+    ) -> tuple[str, list[T.Any]]:
+        sql, args = "", []
+        for dct in filters:
+            key = dct["Key"]
+            option = dct.get("Option", "Equals")
+            values = dct.get("Values", [])
+            if key == "Name":
+                if option == "BeginsWith":
+                    clauses = []
+                    for value in values:
+                        clauses.append("(p.name >= ? AND p.name < ?)")
+                        args.extend(_prefix_range(value))
+                    sql += f" AND ({' OR '.join(clauses)})"
+                elif option == "Contains":
+                    sql += (
+                        " AND ("
+                        + " OR ".join("instr(p.name, ?) > 0" for _ in values)
+                        + ")"
+                    )
+                    args.extend(values)
+                else:
+                    sql += f" AND p.name IN ({', '.join('?' for _ in values)})"
+                    args.extend(values)
+            elif key == "Path":
+                path = values[0].rstrip("/") or "/"
+                if option == "Recursive":
+                    low, high = _prefix_range(path if path == "/" else f"{path}/")
+                    sql += " AND p.name >= ? AND p.name < ?"
+                    args.extend([low, high])
+                else:
+                    sql += " AND p.parent_path = ?"
+                    args.append(path)
+            elif key in ("Type", "KeyId", "Tier", "DataType"):
+                column = {
+                    "Type": "type",
+                    "KeyId": "key_id",
+                    "Tier": "tier",
+                    "DataType": "data_type",
+                }[key]
+                sql += f" AND v.{column} IN ({', '.join('?' for _ in values)})"
+                args.extend(values)
+            elif key.startswith("tag:"):
+                tag_key = key[4:]
+                sql += " AND EXISTS (SELECT 1 FROM parameter_tag t WHERE t.name = p.name AND t.key = ?"
+                args.append(tag_key)
+                if values:
+                    sql += f" AND t.value IN ({', '.join('?' for _ in values)})"
+                    args.extend(values)
+                sql += ")"
+            else:
+                self._error(
+                    "DescribeParameters",
+                    "InvalidFilterKey",
+                    f"Filter key {key} is not supported.",
+                )
+        return sql, args
+
+    # --------------------------------------------------------------------------
+    # Write
+    # --------------------------------------------------------------------------
+    def put_parameter(
+        self,
+        Name: str,
+        Value: str,
+        Description: str | None = None,
+        Type: str | None = None,
+        KeyId: str | None = None,
+        Overwrite: bool = False,
+        AllowedPattern: str | None = None,
+        Tags: list[dict[str, str]] | None = None,
+        Tier: str | None = None,
+        Policies: str | None = None,
+        DataType: str | None = None,
+    ) -> dict[str, T.Any]:
+        operation = "PutParameter"
+        self._before_call(operation)
+        if "/" in Name and not Name.startswith("/"):
+            self._error(
+                operation,
+                "ValidationException",
+                "Parameter name must be a fully qualified name.",
+            )
+        if Overwrite and Tags:
+            self._error(
+                operation,
+                "ValidationException",
+                "Invalid request: tags and overwrite can't be used together.",
+            )
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                response = self._put_parameter(
+                    operation=operation,
+                    name=Name,
+                    value=Value,
+                    description=Description,
+                    type=Type,
+                    key_id=KeyId,
+                    overwrite=Overwrite,
+                    allowed_pattern=AllowedPattern,
+                    tags=Tags,
+                    tier=Tier,
+                    policies=Policies,
+                    data_type=DataType,
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return response
+
+    def _put_parameter(
+        self,
+        operation: str,
+        name: str,
+        value: str,
+        description: str | None,
+        type: str | None,
+        key_id: str | None,
+        overwrite: bool,
+        allowed_pattern: str | None,
+        tags: list[dict[str, str]] | None,
+        tier: str | None,
+        policies: str | None,
+        data_type: str | None,
+    ) -> dict[str, T.Any]:
+        conn = self._conn
+        rows = conn.execute(
+            "SELECT version FROM parameter WHERE name = ?", (name,)
+        ).fetchall()
+        before = None
+        if rows:
+            if not overwrite:
+                self._error(
+                    operation,
+                    "ParameterAlreadyExists",
+                    f"The parameter {name} already exists.",
+                )
+            before = self._row_to_dict(
+                conn.execute(
+                    f"SELECT {_VERSION_COLUMNS} FROM parameter_version "
+                    "WHERE name = ? AND version = ?",
+                    (name, rows[0][0]),
+                ).fetchone()
+            )
+
+        # inherit attributes from the current version
+        if before is not None:
+            type = type or before["type"]
+            description = (
+                description if description is not None else before["description"]
+            )
+            allowed_pattern = (
+                allowed_pattern
+                if allowed_pattern is not None
+                else before["allowed_pattern"]
+            )
+            data_type = data_type or before["data_type"]
+            if type == ParameterType.SECURE_STRING.value:
+                key_id = key_id or before["key_id"]
+        if type is None:
+            self._error(
+                operation,
+                "ValidationException",
+                "A parameter type is required when you create a parameter.",
+            )
+        data_type = data_type or "text"
+        if type == ParameterType.SECURE_STRING.value:
+            key_id = key_id or DEFAULT_KMS_KEY
+        else:
+            key_id = None
+
+        size = len(value.encode("utf-8"))
+        if tier == ParameterTier.INTELLIGENT_TIERING.value or tier is None:
+            if before is not None and before["tier"] == ParameterTier.ADVANCED.value:
+                tier = ParameterTier.ADVANCED.value
+            elif tier is None:
+                tier = ParameterTier.STANDARD.value
+            elif policies or size > STANDARD_TIER_MAX_VALUE_SIZE:
+                tier = ParameterTier.ADVANCED.value
+            else:
+                tier = ParameterTier.STANDARD.value
+        if (
+            before is not None
+            and before["tier"] == ParameterTier.ADVANCED.value
+            and tier == ParameterTier.STANDARD.value
+        ):
+            self._error(
+                operation,
+                "ValidationException",
+                "This parameter uses the advanced-parameter tier. "
+                "You can't downgrade a parameter from the advanced-parameter tier "
+                "to the standard-parameter tier.",
+            )
+        max_size = (
+            ADVANCED_TIER_MAX_VALUE_SIZE
+            if tier == ParameterTier.ADVANCED.value
+            else STANDARD_TIER_MAX_VALUE_SIZE
+        )
+        if size > max_size:
+            self._error(
+                operation,
+                "ValidationException",
+                f"Parameter value size {size} exceeds the {tier} tier limit {max_size}.",
+            )
+        if policies and tier != ParameterTier.ADVANCED.value:
+            self._error(
+                operation,
+                "ValidationException",
+                "Parameter policies are only supported in the advanced tier.",
+            )
+        if allowed_pattern and not re.fullmatch(allowed_pattern, value):
+            self._error(
+                operation,
+                "ParameterPatternMismatchException",
+                f"Parameter value, cannot be validated against allowedPattern: {allowed_pattern}",
+            )
+
+        version = 1 if before is None else before["version"] + 1
+        if version > MAX_VERSIONS:
+            oldest = version - MAX_VERSIONS
+            labeled = conn.execute(
+                "SELECT 1 FROM parameter_label WHERE name = ? AND version <= ?",
+                (name, oldest),
+            ).fetchall()
+            if labeled:
+                self._error(
+                    operation,
+                    "ParameterMaxVersionLimitExceeded",
+                    f"You attempted to create a new version of {name} by calling "
+                    "the PutParameter API with the overwrite flag. Version "
+                    f"{oldest}, the oldest version, can't be deleted because it "
+                    "has a label associated with it.",
+                )
+            conn.execute(
+                "DELETE FROM parameter_version WHERE name = ? AND version <= ?",
+                (name, oldest),
+            )
+
+        conn.execute(
+            f"INSERT INTO parameter_version ({_VERSION_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                version,
+                value,
+                type,
+                tier,
+                key_id,
+                description,
+                allowed_pattern,
+                policies,
+                data_type,
+                time.time(),
+                self.user,
+            ),
+        )
+        conn.execute(
+            "INSERT INTO parameter (name, parent_path, version) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET version = excluded.version",
+            (name, _get_parent_path(name), version),
+        )
+        if tags:
+            conn.executemany(
+                "INSERT OR REPLACE INTO parameter_tag (name, key, value) VALUES (?, ?, ?)",
+                [(name, k, v) for k, v in decode_tags(tags).items()],
+            )
+        return {"Version": version, "Tier": tier}
+
+    def _delete(self, name: str) -> bool:
+        cursor = self._conn.execute("DELETE FROM parameter WHERE name = ?", (name,))
+        if cursor.rowcount == 0:
+            return False
+        for table in ["parameter_version", "parameter_label", "parameter_tag"]:
+            self._conn.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+        return True
+
+    def delete_parameter(self, Name: str) -> dict[str, T.Any]:
+        self._before_call("DeleteParameter")
+        with self._lock:
+            deleted = self._delete(Name)
+        if not deleted:
+            self._error(
+                "DeleteParameter", "ParameterNotFound", f"Parameter {Name} not found."
+            )
+        return {}
+
+    def delete_parameters(self, Names: list[str]) -> dict[str, T.Any]:
+        self._before_call("DeleteParameters")
+        if len(Names) > 10:
+            self._error(
+                "DeleteParameters",
+                "ValidationException",
+                "Member must have length less than or equal to 10",
+            )
+        deleted, invalid = list(), list()
+        with self._lock:
+            for name in Names:
+                (deleted if self._delete(name) else invalid).append(name)
+        return {"DeletedParameters": deleted, "InvalidParameters": invalid}
+
+    def label_parameter_version(
+        self,
+        Name: str,
+        Labels: list[str],
+        ParameterVersion: int | None = None,
+    ) -> dict[str, T.Any]:
+        operation = "LabelParameterVersion"
+        self._before_call(operation)
+        row = self._get_version_row(
+            operation,
+            Name,
+            None if ParameterVersion is None else str(ParameterVersion),
+        )
+        invalid = [
+            label
+            for label in Labels
+            if label.startswith(("aws", "ssm")) or label[:1].isdigit()
+        ]
+        valid = [label for label in Labels if label not in invalid]
+        with self._lock:
+            # a label can only be attached to one version, moving it is allowed
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parameter_label (name, label, version) VALUES (?, ?, ?)",
+                [(Name, label, row["version"]) for label in valid],
+            )
+        return {"InvalidLabels": invalid, "ParameterVersion": row["version"]}
+
+    def unlabel_parameter_version(
+        self,
+        Name: str,
+        ParameterVersion: int,
+        Labels: list[str],
+    ) -> dict[str, T.Any]:
+        self._before_call("UnlabelParameterVersion")
+        removed, invalid = list(), list()
+        with self._lock:
+            for label in Labels:
+                cursor = self._conn.execute(
+                    "DELETE FROM parameter_label WHERE name = ? AND label = ? AND version = ?",
+                    (Name, label, ParameterVersion),
+                )
+                (removed if cursor.rowcount else invalid).append(label)
+        return {"RemovedLabels": removed, "InvalidLabels": invalid}
+
+    # --------------------------------------------------------------------------
+    # Tags
+    # --------------------------------------------------------------------------
+    def list_tags_for_resource(
+        self,
+        ResourceType: str,
+        ResourceId: str,
+    ) -> dict[str, T.Any]:
+        self._before_call("ListTagsForResource")
+        self._assert_exists("ListTagsForResource", ResourceId, "InvalidResourceId")
+        rows = self._query(
+            "SELECT key, value FROM parameter_tag WHERE name = ? ORDER BY key",
+            (ResourceId,),
+        )
+        return {"TagList": encode_tags(dict(rows))}
+
+    def add_tags_to_resource(
+        self,
+        ResourceType: str,
+        ResourceId: str,
+        Tags: list[dict[str, str]],
+    ) -> dict[str, T.Any]:
+        self._before_call("AddTagsToResource")
+        self._assert_exists("AddTagsToResource", ResourceId, "InvalidResourceId")
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parameter_tag (name, key, value) VALUES (?, ?, ?)",
+                [(ResourceId, k, v) for k, v in decode_tags(Tags).items()],
+            )
+        return {}
+
+    def remove_tags_from_resource(
+        self,
+        ResourceType: str,
+        ResourceId: str,
+        TagKeys: list[str],
+    ) -> dict[str, T.Any]:
+        self._before_call("RemoveTagsFromResource")
+        self._assert_exists("RemoveTagsFromResource", ResourceId, "InvalidResourceId")
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM parameter_tag WHERE name = ? AND key = ?",
+                [(ResourceId, key) for key in TagKeys],
+            )
+        return {}
+
+    # --------------------------------------------------------------------------
+    # Pagination
+    # --------------------------------------------------------------------------
+    def get_paginator(self, operation_name: str) -> _Paginator:
+        paginators = {
+            "describe_parameters": (self.describe_parameters, 50),
+            "get_parameters_by_path": (self.get_parameters_by_path, 10),
+            "get_parameter_history": (self.get_parameter_history, 50),
+        }
+        try:
+            method, max_page_size = paginators[operation_name]
+        except KeyError:
+            raise botocore.exceptions.OperationNotPageableError(
+                operation_name=operation_name
+            )
+        return _Paginator(method, max_page_size)
+
+    def can_paginate(self, operation_name: str) -> bool:
+        return operation_name in (
+            "describe_parameters",
+            "get_parameters_by_path",
+            "get_parameter_history",
+        )
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""
+Materialize parameter subtrees as environment variables, in one shot.
+
+Container entrypoints often build their environment with one ``get_parameter``
+call per variable. :func:`load_env` reads whole paths instead, with
+``get_parameters_by_path`` (10 parameters per call, SecureString values
+decrypted in the same call), all paths concurrently, and maps parameter
+names to environment variable names with configurable rules.
+
+The result can be written to ``os.environ`` (:func:`apply_env`), to a dotenv
+file (:func:`write_dotenv`) or printed as ``export`` lines to ``eval`` in a
+shell script before ``exec`` (:func:`format_exports`).
+
+Example::
+
+    env = load_env(
+        ssm_client,
+        ["/app/prod/", "/shared/prod/"],
+        snapshot_path="/var/cache/app/env.json",
+    )
+    apply_env(env)
+
+.. note::
+
+    The snapshot file contains the decrypted values, it is written with
+    ``0600`` permissions.
+"""
+
+import typing as T
+import os
+import re
+import json
+import shlex
+import logging
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from .inventory import iter_parameters_by_path
+from .chunk import is_chunk_name
+from .policy import PolicyRegistry, get_with_decryption
+from .instrument import THROTTLE_ERROR_CODES
+from .utils import write_private_file
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[^0-9A-Za-z]+")
+
+
+def make_env_key(
+    name: str,
+    path: str,
+    env_prefix: str = "",
+    upper: bool = True,
+) -> str:
+    """
+    Default name mapping rule: strip the path, join the remaining name
+    segments with ``_`` and upper case it.
+
+    Example:
+
+        >>> make_env_key("/app/prod/db/host", "/app/prod")
+        'DB_HOST'
+        >>> make_env_key("/app/prod/db-pool.size", "/app/prod/", env_prefix="APP_")
+        'APP_DB_POOL_SIZE'
+
+    :param name: parameter name
+    :param path: the path the parameter was loaded from
+    :param env_prefix: prefix prepended to every key
+    :param upper: whether to upper case the key
+    """
+    path = path.rstrip("/")
+    if path and name.startswith(path + "/"):
+        name = name[len(path) + 1 :]
+    key = _NON_ALNUM.sub("_", name).strip("_")
+    if upper:
+        key = key.upper()
+    return env_prefix + key
+
+
+def _is_unreachable(e: Exception) -> bool:
+    """
+    Whether ``e`` means SSM can't be reached or can't serve the request
+    right now, as opposed to an error of the request itself.
+    """
+    import botocore.exceptions
+
+    if isinstance(e, botocore.exceptions.BotoCoreError):
+        return True
+    if isinstance(e, botocore.exceptions.ClientError):
+        error = e.response.get("Error", {})
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return error.get("Code") in THROTTLE_ERROR_CODES or status >= 500
+    return False
+
+
+def write_snapshot(env: dict[str, str], path: Path | str) -> Path:
+    """
+    Atomically write ``env`` as JSON, readable by the owner only.
+    """
+    return write_private_file(path, json.dumps(env, indent=2, sort_keys=True))
+
+
+def read_snapshot(path: Path | str) -> dict[str, str]:
+    return json.loads(Path(path).read_text())
+
+
+def load_env(
+    ssm_client: "SSMClient",
+    paths: str | list[str],
+    recursive: bool = True,
+    with_decryption: bool = True,
+    rename: T.Callable[[str, str], str | None] | None = None,
+    mapping: dict[str, str] | None = None,
+    env_prefix: str = "",
+    snapshot_path: Path | str | None = None,
+    max_workers: int | None = None,
+    policies: PolicyRegistry | None = None,
+) -> dict[str, str]:
+    """
+    Load all parameters under ``paths`` as ``{env_key: value}``.
+
+    When several parameters map to the same key, the one from the later path
+    wins, so list the most specific path last.
+
+    :param ssm_client: SSM client
+    :param paths: one or more parameter paths
+    :param recursive: whether to include parameters in sub paths
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param rename: custom name mapping rule, receives the parameter name and
+        the path and returns the key, or None to skip the parameter.
+        Defaults to :func:`make_env_key`
+    :param mapping: explicit ``{parameter_name: env_key}`` overrides, checked
+        before ``rename``
+    :param env_prefix: prefix of the keys of the default rule
+    :param snapshot_path: if given, the result is saved to this file, and
+        loaded from it when SSM is unreachable (connection errors,
+        throttling, 5xx)
+    :param max_workers: max number of paths read concurrently
+    :param policies: per path decryption, resolved for every path of
+        ``paths``, overrides ``with_decryption``
+
+    :return: ``{env_key: value}``, in the path then name order
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    mapping = mapping or {}
+
+    def get_key(name: str, path: str) -> str | None:
+        if name in mapping:
+            return mapping[name]
+        if rename is not None:
+            return rename(name, path)
+        return make_env_key(name, path, env_prefix=env_prefix)
+
+    def load_path(path: str) -> list[tuple[str, str]]:
+        items = list()
+        for param in iter_parameters_by_path(
+            ssm_client,
+            path,
+            recursive=recursive,
+            with_decryption=get_with_decryption(policies, path, with_decryption),
+        ):
+            if is_chunk_name(param.name):
+                continue
+            key = get_key(param.name, path)
+            if key is not None:
+                items.append((key, param.value))
+        return items
+
+    try:
+        if len(paths) <= 1:
+            results = [load_path(path) for path in paths]
+        else:
+            contexts = [contextvars.copy_context() for _ in paths]
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers or len(paths), len(paths))
+            ) as executor:
+                results = list(
+                    executor.map(
+                        lambda ctx, path: ctx.run(load_path, path), contexts, paths
+                    )
+                )
+    except Exception as e:
+        if snapshot_path is None or not _is_unreachable(e):
+            raise
+        if not Path(snapshot_path).exists():
+            raise
+        logger.warning(
+            "SSM is unreachable (%s), load environment from snapshot %s",
+            e,
+            snapshot_path,
+        )
+        return read_snapshot(snapshot_path)
+
+    env = dict()
+    for items in results:
+        env.update(items)
+    if snapshot_path is not None:
+        write_snapshot(env, snapshot_path)
+    return env
+
+
+def apply_env(
+    env: dict[str, str],
+    environ: T.MutableMapping[str, str] | None = None,
+    overwrite: bool = True,
+) -> dict[str, str]:
+    """
+    Write ``env`` into ``os.environ`` (or ``environ``).
+
+    :param overwrite: whether to overwrite variables that are already set
+
+    :return: the variables that were set
+    """
+    if environ is None:
+        environ = os.environ
+    applied = dict()
+    for key, value in env.items():
+        if overwrite or key not in environ:
+            environ[key] = value
+            applied[key] = value
+    return applied
+
+
+def _quote_dotenv(value: str) -> str:
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("$", "\\$")
+    )
+    return f'"{escaped}"'
+
+
+def format_dotenv(env: dict[str, str]) -> str:
+    """
+    Render ``env`` in the dotenv format, values double quoted and escaped.
+    """
+    return "".join(f"{key}={_quote_dotenv(value)}\n" for key, value in env.items())
+
+
+def write_dotenv(env: dict[str, str], path: Path | str) -> Path:
+    """
+    Atomically write ``env`` to a dotenv file, readable by the owner only.
+    """
+    return write_private_file(path, format_dotenv(env))
+
+
+def format_exports(env: dict[str, str]) -> str:
+    """
+    Render ``env`` as shell ``export`` lines, e.g. for
+    ``eval "$(...)" && exec app`` in an entrypoint script.
+    """
+    return "".join(f"export {key}={shlex.quote(value)}\n" for key, value in env.items())
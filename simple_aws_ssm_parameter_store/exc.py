@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exceptions raised by this library.
+"""
+
+
+class ChunkIntegrityError(ValueError):
+    """
+    Raised when a chunked parameter value cannot be reassembled, for example
+    because a chunk is missing or the content hash does not match the manifest.
+    """
+
+
+class SettingsError(ValueError):
+    """
+    Raised when a settings class cannot be bound to parameters, for example
+    because a required parameter doesn't exist or its value cannot be coerced
+    to the field type.
+    """
+
+
+class SidecarError(Exception):
+    """
+    Raised by :class:`~simple_aws_ssm_parameter_store.sidecar.SidecarClient`
+    when the sidecar returns an error, e.g. an SSM error it got upstream.
+    """
+
+    def __init__(self, status: int, code: str | None, message: str | None):
+        super().__init__(f"{status} {code}: {message}")
+        self.status = status
+        self.code = code
+
+
+class SubtreeVerificationError(ValueError):
+    """
+    Raised when a copied parameter doesn't match its source, see
+    :mod:`~simple_aws_ssm_parameter_store.subtree`.
+    """
+
+
+class ParameterVersionConflictError(ValueError):
+    """
+    Raised by an ``expected_version`` write of
+    :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`
+    when another writer changed the parameter.
+
+    :param name: parameter name
+    :param expected_version: the version the caller based its write on,
+        0 for a parameter that must not exist
+    :param actual_version: the version the other writer left, 0 if it
+        doesn't exist
+    :param written: whether our value was written anyway, i.e. the other
+        write landed between the version check and the write
+    :param restored: whether the other writer's value was put back on top
+        of ours after such a write
+    """
+
+    def __init__(
+        self,
+        name: str,
+        expected_version: int,
+        actual_version: int,
+        written: bool = False,
+        restored: bool = False,
+    ):
+        if restored:
+            note = ", our value was written on top of it, then reverted"
+        elif written:
+            note = ", our value was written on top of it"
+        else:
+            note = ""
+        super().__init__(
+            f"Parameter {name!r} is at version {actual_version}, "
+            f"expected {expected_version}" + note
+        )
+        self.name = name
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        self.written = written
+        self.restored = restored
+        # all the conflicts of a put_parameters_if_changed call
+        self.conflicts: list["ParameterVersionConflictError"] = [self]
+
+
+class VersionBudgetExceededError(ValueError):
+    """
+    Raised by :class:`~simple_aws_ssm_parameter_store.history.VersionBudgetGuard`
+    when a write would exceed the write rate budget of a parameter, or rotate
+    out one of its labeled versions.
+    """
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cached, pre-warmed SSM client factory.
+
+Creating a boto3 session and client costs tens of milliseconds, and every new
+client opens new connections (and TLS handshakes). :func:`get_ssm_client`
+returns one client per ``(profile, region, config)``, whose connection pool
+is sized for the concurrency of the bulk functions of this library, with TCP
+keep-alive enabled.
+
+The bulk functions of :mod:`~simple_aws_ssm_parameter_store.client` never run
+more concurrent calls than the connection pool of the given client can hold,
+so that connections are reused instead of being discarded with a
+"Connection pool is full" warning.
+
+Example::
+
+    ssm_client = get_ssm_client(region_name="us-east-1", prewarm=4)
+    params = get_parameters(ssm_client, names)
+"""
+
+import typing as T
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .batch import DEFAULT_MAX_WORKERS, get_max_pool_connections
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    import boto3
+    from botocore.config import Config
+    from mypy_boto3_ssm.client import SSMClient
+
+
+_clients: dict[tuple, "SSMClient"] = dict()
+# clients of explicit sessions, by session then config key. Weak keys, so a
+# garbage collected session (whose id may be reused) drops its clients.
+_session_clients: "weakref.WeakKeyDictionary[boto3.Session, dict[tuple, SSMClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def build_config(
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    config: T.Optional["Config"] = None,
+    tcp_keepalive: bool = True,
+) -> "Config":
+    """
+    Build the botocore client config used by :func:`get_ssm_client`.
+
+    :param max_workers: number of concurrent calls the client must serve,
+        ``max_pool_connections`` is set to at least this value
+    :param config: user config, its options take precedence except
+        ``max_pool_connections`` which is only ever increased
+    :param tcp_keepalive: enable TCP keep-alive on pooled connections
+    """
+    from botocore.config import Config
+
+    base = Config(
+        max_pool_connections=max_workers,
+        tcp_keepalive=tcp_keepalive,
+    )
+    if config is None:
+        return base
+    merged = base.merge(config)
+    if (merged.max_pool_connections or 0) < max_workers:
+        merged = merged.merge(Config(max_pool_connections=max_workers))
+    return merged
+
+
+def _get_config_key(config: "Config") -> tuple:
+    return tuple(sorted((k, repr(v)) for k, v in vars(config).items()))
+
+
+def get_ssm_client(
+    profile_name: str | None = None,
+    region_name: str | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    config: T.Optional["Config"] = None,
+    tcp_keepalive: bool = True,
+    prewarm: int = 0,
+    boto_ses: T.Optional["boto3.Session"] = None,
+) -> "SSMClient":
+    """
+    Get a cached SSM client, see module docstring.
+
+    Clients are thread safe, the same client is returned for the same
+    profile, region and config. Clients created from an explicit
+    ``boto_ses`` are cached per session object.
+
+    :param profile_name: AWS profile name
+    :param region_name: AWS region name
+    :param max_workers: number of concurrent calls the client must serve
+    :param config: additional botocore client config, see :func:`build_config`
+    :param tcp_keepalive: enable TCP keep-alive on pooled connections
+    :param prewarm: number of connections to open when the client is
+        created, see :func:`prewarm_client`
+    :param boto_ses: use this session instead of creating one from
+        ``profile_name`` and ``region_name``
+    """
+    config = build_config(
+        max_workers=max_workers,
+        config=config,
+        tcp_keepalive=tcp_keepalive,
+    )
+    if boto_ses is None:
+        key = (profile_name, region_name, _get_config_key(config))
+        clients = _clients
+    else:
+        key = _get_config_key(config)
+        with _lock:
+            clients = _session_clients.setdefault(boto_ses, dict())
+    try:
+        return clients[key]
+    except KeyError:
+        pass
+    # boto3 sessions are not thread safe, create clients one at a time
+    with _lock:
+        if key not in clients:
+            if boto_ses is None:
+                import boto3
+
+                boto_ses = boto3.Session(
+                    profile_name=profile_name,
+                    region_name=region_name,
+                )
+            ssm_client = boto_ses.client("ssm", config=config)
+            if prewarm:
+                prewarm_client(ssm_client, n_connection=prewarm)
+            clients[key] = ssm_client
+        return clients[key]
+
+
+def clear_client_cache():
+    """
+    Drop all cached clients, e.g. after the credentials changed.
+    """
+    with _lock:
+        _clients.clear()
+        _session_clients.clear()
+
+
+def prewarm_client(
+    ssm_client: "SSMClient",
+    n_connection: int = 1,
+) -> int:
+    """
+    Open ``n_connection`` pooled connections, so that the DNS lookup and the
+    TLS handshakes happen at startup rather than on the first real calls.
+
+    Each connection is opened by one concurrent ``DescribeParameters`` call
+    with ``MaxResults=1``. Errors, e.g. missing permissions, are ignored,
+    the connection is established anyway.
+
+    :return: number of calls that succeeded
+    """
+    import botocore.exceptions
+
+    def call(_) -> bool:
+        try:
+            ssm_client.describe_parameters(MaxResults=1)
+            return True
+        except botocore.exceptions.ClientError:
+            return False
+
+    n_connection = min(
+        n_connection, get_max_pool_connections(ssm_client) or n_connection
+    )
+    if n_connection <= 1:
+        return int(call(0))
+    with ThreadPoolExecutor(max_workers=n_connection) as executor:
+        return sum(executor.map(call, range(n_connection)))
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fault injection for resilience tests and benchmarks.
+
+:class:`FaultInjectingClient` wraps an SSM client and, per operation, injects
+latency, ``ThrottlingException``, intermittent 5xx errors and read timeouts.
+
+For a boto3 client the faults are injected in the botocore ``before-send``
+event, i.e. in place of the HTTP request. The faults therefore go through
+the client's real retry logic, and the wrapper measures how many HTTP attempts
+one logical call costs (error amplification). The event system is shared by
+every user of the wrapped client, so the hook only injects faults into calls
+made through the wrapper, other users of the client are not affected.
+For other clients, e.g.
+:class:`~simple_aws_ssm_parameter_store.emulator.LocalSSMClient`, the faults
+are raised directly from the method call as ``ClientError``.
+
+Example::
+
+    client = FaultInjectingClient(
+        ssm_client,
+        faults={
+            "GetParameter": FaultSpec(throttle_rate=0.2, latency=lognormal_latency(0.02)),
+        },
+        default=FaultSpec(error_rate=0.01),
+        seed=1,
+    )
+    get_parameter(client, "/app/db/host")
+    print(client.stats.n_attempt, client.stats.n_throttle)
+"""
+
+import typing as T
+import json
+import math
+import time
+import random
+import threading
+import dataclasses
+
+import botocore.exceptions
+from botocore.awsrequest import AWSResponse
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+def constant_latency(seconds: float) -> T.Callable[[random.Random], float]:
+    """
+    Latency distribution that always returns ``seconds``.
+    """
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> T.Callable[[random.Random], float]:
+    """
+    Latency distribution uniform between ``low`` and ``high`` seconds.
+    """
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(
+    median: float,
+    sigma: float = 0.5,
+) -> T.Callable[[random.Random], float]:
+    """
+    Long tailed latency distribution, the typical shape of network latency.
+
+    :param median: median latency in seconds
+    :param sigma: standard deviation of the underlying normal distribution,
+        larger values make a longer tail
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclasses.dataclass(frozen=True)
+class FaultSpec:
+    """
+    Faults injected into one operation. The rates are probabilities per
+    attempt, at most one fault is injected per attempt.
+
+    :param throttle_rate: probability of a ``ThrottlingException``
+    :param error_rate: probability of a 5xx error
+        (``InternalServerError`` or ``ServiceUnavailable``)
+    :param timeout_rate: probability of a read timeout
+    :param latency: latency distribution, a callable that receives a
+        ``random.Random`` and returns seconds, see :func:`constant_latency`,
+        :func:`uniform_latency`, :func:`lognormal_latency`
+    """
+
+    throttle_rate: float = dataclasses.field(default=0.0)
+    error_rate: float = dataclasses.field(default=0.0)
+    timeout_rate: float = dataclasses.field(default=0.0)
+    latency: T.Callable[[random.Random], float] | None = dataclasses.field(default=None)
+
+
+NO_FAULT = FaultSpec()
+
+FAULT_THROTTLE = "throttle"
+FAULT_ERROR = "error"
+FAULT_TIMEOUT = "timeout"
+
+_ERRORS = {
+    FAULT_THROTTLE: [(400, "ThrottlingException", "Rate exceeded")],
+    FAULT_ERROR: [
+        (500, "InternalServerError", "An internal error occurred"),
+        (503, "ServiceUnavailable", "Service is unavailable"),
+    ],
+}
+
+
+@dataclasses.dataclass
+class FaultStats:
+    """
+    Thread safe counters of a :class:`FaultInjectingClient`.
+
+    :param n_attempt: number of attempts by operation, retries included
+    :param n_throttle: number of injected throttling errors by operation
+    :param n_error: number of injected 5xx errors by operation
+    :param n_timeout: number of injected timeouts by operation
+    """
+
+    n_attempt: dict[str, int] = dataclasses.field(default_factory=dict)
+    n_throttle: dict[str, int] = dataclasses.field(default_factory=dict)
+    n_error: dict[str, int] = dataclasses.field(default_factory=dict)
+    n_timeout: dict[str, int] = dataclasses.field(default_factory=dict)
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(self, operation: str, fault: str | None):
+        with self._lock:
+            self.n_attempt[operation] = self.n_attempt.get(operation, 0) + 1
+            if fault is not None:
+                counter = {
+                    FAULT_THROTTLE: self.n_throttle,
+                    FAULT_ERROR: self.n_error,
+                    FAULT_TIMEOUT: self.n_timeout,
+                }[fault]
+                counter[operation] = counter.get(operation, 0) + 1
+
+    @property
+    def total_attempt(self) -> int:
+        return sum(self.n_attempt.values())
+
+    @property
+    def total_fault(self) -> int:
+        return (
+            sum(self.n_throttle.values())
+            + sum(self.n_error.values())
+            + sum(self.n_timeout.values())
+        )
+
+    def reset(self):
+        with self._lock:
+            self.n_attempt.clear()
+            self.n_throttle.clear()
+            self.n_error.clear()
+            self.n_timeout.clear()
+
+
+class _RawBody:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, **kwargs) -> T.Iterator[bytes]:
+        yield self.body
+
+
+def _to_operation_name(method_name: str) -> str:
+    """
+    Example:
+        >>> _to_operation_name("get_parameters_by_path")
+        'GetParametersByPath'
+    """
+    return "".join(word.capitalize() for word in method_name.split("_"))
+
+
+class FaultInjectingClient:
+    """
+    SSM client wrapper that injects faults, see module docstring.
+
+    All attributes of the wrapped client are available on the wrapper, so it
+    can be used as ``ssm_client`` for every function of this library.
+
+    :param ssm_client: the wrapped client
+    :param faults: fault spec by operation name, e.g. ``"GetParameter"``
+    :param default: fault spec of operations not in ``faults``
+    :param seed: random seed, for reproducible fault sequences
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        faults: dict[str, FaultSpec] | None = None,
+        default: FaultSpec = NO_FAULT,
+        seed: int | None = None,
+    ):
+        self._ssm_client = ssm_client
+        self.faults = dict(faults or {})
+        self.default = default
+        self.stats = FaultStats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        # marks the threads that are inside a call made through the wrapper
+        self._local = threading.local()
+        self._events = getattr(getattr(ssm_client, "meta", None), "events", None)
+        self._is_botocore = self._events is not None
+        if self._is_botocore:
+            # registered first, so the fault wins over the moto mock_aws stubber
+            self._events.register_first("before-send.ssm", self._on_before_send)
+
+    def detach(self):
+        """
+        Stop injecting faults into a boto3 client.
+        """
+        if self._events is not None:
+            self._events.unregister("before-send.ssm", self._on_before_send)
+            self._events = None
+
+    def __enter__(self) -> "FaultInjectingClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.detach()
+
+    def _pick_fault(self, operation: str) -> tuple[str | None, float, int]:
+        """
+        :return: the fault to inject (or None), the latency in seconds and
+            the index of the error in :data:`_ERRORS`
+        """
+        spec = self.faults.get(operation, self.default)
+        with self._rng_lock:
+            latency = spec.latency(self._rng) if spec.latency else 0.0
+            x = self._rng.random()
+            index = self._rng.randrange(2)
+        fault = None
+        if x < spec.throttle_rate:
+            fault = FAULT_THROTTLE
+        elif x < spec.throttle_rate + spec.error_rate:
+            fault = FAULT_ERROR
+        elif x < spec.throttle_rate + spec.error_rate + spec.timeout_rate:
+            fault = FAULT_TIMEOUT
+        return fault, latency, index
+
+    def _inject(self, operation: str) -> tuple[str | None, int]:
+        fault, latency, index = self._pick_fault(operation)
+        self.stats.add(operation, fault)
+        if latency > 0:
+            time.sleep(latency)
+        return fault, index
+
+    def _scope(self, method: T.Callable) -> T.Callable:
+        """
+        Mark the calls of a boto3 client method as made through the wrapper,
+        only those get faults injected by the ``before-send`` hook.
+        """
+
+        def wrapper(*args, **kwargs):
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._local.depth = depth
+
+        return wrapper
+
+    def _on_before_send(self, request, **kwargs) -> AWSResponse | None:
+        if not getattr(self._local, "depth", 0):
+            return None
+        target = request.headers.get("X-Amz-Target", b"")
+        if isinstance(target, bytes):
+            target = target.decode("utf-8")
+        operation = target.rsplit(".", 1)[-1]
+        fault, index = self._inject(operation)
+        if fault is None:
+            return None
+        if fault == FAULT_TIMEOUT:
+            raise botocore.exceptions.ReadTimeoutError(endpoint_url=request.url)
+        errors = _ERRORS[fault]
+        status, code, message = errors[index % len(errors)]
+        body = json.dumps({"__type": code, "message": message}).encode("utf-8")
+        return AWSResponse(
+            url=request.url,
+            status_code=status,
+            headers={
+                "Content-Type": "application/x-amz-json-1.1",
+                "x-amzn-RequestId": "00000000-0000-0000-0000-000000000000",
+            },
+            raw=_RawBody(body),
+        )
+
+    def _wrap_method(self, method: T.Callable, operation: str) -> T.Callable:
+        def wrapper(*args, **kwargs):
+            fault, index = self._inject(operation)
+            if fault == FAULT_TIMEOUT:
+                raise botocore.exceptions.ReadTimeoutError(endpoint_url="local")
+            if fault is not None:
+                errors = _ERRORS[fault]
+                status, code, message = errors[index % len(errors)]
+                raise botocore.exceptions.ClientError(
+                    {
+                        "Error": {"Code": code, "Message": message},
+                        "ResponseMetadata": {"HTTPStatusCode": status},
+                    },
+                    operation,
+                )
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    def __getattr__(self, name: str) -> T.Any:
+        attr = getattr(self._ssm_client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if name in ("can_paginate", "close"):
+            return attr
+        # boto3 clients are handled by the before-send hook
+        if self._is_botocore:
+            if name == "get_paginator":
+
+                def get_paginator(operation_name: str):
+                    paginator = attr(operation_name)
+                    paginator._method = self._scope(paginator._method)
+                    return paginator
+
+                return get_paginator
+            return self._scope(attr)
+        if name == "get_paginator":
+
+            def get_paginator(operation_name: str):
+                paginator = attr(operation_name)
+                paginator.method = self._wrap_method(
+                    paginator.method, _to_operation_name(operation_name)
+                )
+                return paginator
+
+            return get_paginator
+        return self._wrap_method(attr, _to_operation_name(name))
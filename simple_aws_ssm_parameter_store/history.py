@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+"""
+Version history budget.
+
+Parameter Store keeps the last 100 versions of a parameter. Every write
+past that rotates out the oldest version, and fails with
+``ParameterMaxVersionLimitExceeded`` if that version has a label, e.g. the
+``stable`` label a rollback relies on.
+
+:class:`VersionBudgetGuard` sits in the write path. It tracks, per
+parameter, the writes of the last ``window`` seconds and the version count
+(from the current parameter and the ``PutParameter`` responses), and reads
+the labeled versions with ``GetParameterHistory`` only for the parameters
+close to the cap. A write that exceeds the rate budget, or would rotate out
+a labeled version within ``labeled_margin`` writes, is handled by the
+:class:`BudgetAction`:
+
+- ``warn``: log a warning and write
+- ``coalesce``: hand the write over to a
+  :class:`~simple_aws_ssm_parameter_store.writer.BufferedWriter`, which only
+  writes the last value of each flush window. A write that would rotate out
+  a labeled version is rejected, deferring it doesn't help
+- ``reject``: raise
+  :class:`~simple_aws_ssm_parameter_store.exc.VersionBudgetExceededError`
+
+:func:`scan_version_churn` reports the parameters that churn the most, with
+one streamed ``DescribeParameters`` pass, which returns the current version
+of every parameter, instead of one ``GetParameterHistory`` call per
+parameter.
+
+Example::
+
+    guard = VersionBudgetGuard(ssm_client, max_writes=10, window=60, action="coalesce")
+    guard.put_parameter_if_changed("/app/cursor", str(offset))
+
+    report = scan_version_churn(ssm_client, path_prefix="/app/")
+    for churn in report.top:
+        print(churn.name, churn.version)
+"""
+
+import typing as T
+import enum
+import time
+import heapq
+import logging
+import threading
+import collections
+import dataclasses
+from datetime import datetime
+
+from .constants import ParameterType, MAX_PARAMETER_VERSIONS
+from .client import get_parameter, _put_parameter_if_changed
+from .inventory import iter_parameter_metadata
+from .writer import BufferedWriter
+from .exc import VersionBudgetExceededError
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+    from mypy_boto3_ssm.type_defs import ParameterStringFilterTypeDef
+    from .model import Parameter
+
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetAction(str, enum.Enum):
+    WARN = "warn"
+    COALESCE = "coalesce"
+    REJECT = "reject"
+
+
+class _Deferred(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class _NameState:
+    write_times: collections.deque = dataclasses.field(
+        default_factory=collections.deque
+    )
+    version: int = dataclasses.field(default=0)
+    labeled_versions: list[int] | None = dataclasses.field(default=None)
+    labels_read_at: float = dataclasses.field(default=0.0)
+
+
+class VersionBudgetGuard:
+    """
+    See module docstring.
+
+    :param ssm_client: SSM client
+    :param max_writes: max number of writes of a parameter per ``window``
+    :param window: seconds of the write rate window
+    :param labeled_margin: act when a labeled version would rotate out within
+        this many writes
+    :param action: what to do with a write over budget, see :class:`BudgetAction`
+    :param writer: buffered writer of the ``coalesce`` action, by default one
+        that flushes every ``window / max_writes`` seconds
+    :param history_ttl: seconds the labeled versions read from the history
+        of a parameter are cached
+    :param clock: monotonic clock
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        max_writes: int = 10,
+        window: float = 60.0,
+        labeled_margin: int = 5,
+        action: BudgetAction | str = BudgetAction.WARN,
+        writer: BufferedWriter | None = None,
+        history_ttl: float = 300.0,
+        clock: T.Callable[[], float] = time.monotonic,
+    ):
+        self.ssm_client = ssm_client
+        self.max_writes = max_writes
+        self.window = window
+        self.labeled_margin = labeled_margin
+        self.action = BudgetAction(action)
+        if writer is None and self.action is BudgetAction.COALESCE:
+            writer = BufferedWriter(ssm_client, flush_interval=window / max_writes)
+        self.writer = writer
+        self.history_ttl = history_ttl
+        self.clock = clock
+        self._states: dict[str, _NameState] = dict()
+        self._lock = threading.Lock()
+
+    def _get_state(self, name: str) -> _NameState:
+        with self._lock:
+            return self._states.setdefault(name, _NameState())
+
+    def get_version(self, name: str) -> int:
+        """
+        The last known version of ``name``, 0 if unknown.
+        """
+        return self._get_state(name).version
+
+    def labeled_versions(self, name: str) -> list[int]:
+        """
+        The labeled versions of ``name``, from its history, cached for
+        ``history_ttl`` seconds.
+        """
+        state = self._get_state(name)
+        now = self.clock()
+        if (
+            state.labeled_versions is not None
+            and state.labels_read_at + self.history_ttl > now
+        ):
+            return state.labeled_versions
+        labeled = list()
+        paginator = self.ssm_client.get_paginator("get_parameter_history")
+        for page in paginator.paginate(Name=name):
+            for dct in page.get("Parameters", []):
+                state.version = max(state.version, dct["Version"])
+                if dct.get("Labels"):
+                    labeled.append(dct["Version"])
+        state.labeled_versions = labeled
+        state.labels_read_at = now
+        return labeled
+
+    def _check_rate(self, name: str) -> str | None:
+        state = self._get_state(name)
+        now = self.clock()
+        with self._lock:
+            while state.write_times and state.write_times[0] <= now - self.window:
+                state.write_times.popleft()
+            n_write = len(state.write_times)
+        if n_write >= self.max_writes:
+            return f"{n_write} writes in the last {self.window}s"
+        return None
+
+    def _check_labels(self, name: str, version: int) -> str | None:
+        # writing version v + 1 rotates out version v + 1 - 100, so a labeled
+        # version L goes away with the (L + 100 - v)th write from now
+        if version + self.labeled_margin <= MAX_PARAMETER_VERSIONS:
+            return None
+        for labeled in self.labeled_versions(name):
+            n_write_left = labeled + MAX_PARAMETER_VERSIONS - version
+            if n_write_left <= self.labeled_margin:
+                return (
+                    f"labeled version {labeled} rotates out in {n_write_left} write(s)"
+                )
+        return None
+
+    def check(self, name: str, version: int) -> str | None:
+        """
+        Check a write of ``name``, currently at ``version`` (0 if it doesn't
+        exist).
+
+        :return: why the write is over budget, None if it is within
+        """
+        self._get_state(name).version = version
+        return self._check_rate(name) or self._check_labels(name, version)
+
+    def record_write(self, name: str, version: int):
+        """
+        Account a write of ``name`` that created ``version``.
+        """
+        state = self._get_state(name)
+        with self._lock:
+            state.write_times.append(self.clock())
+        state.version = version
+
+    def put_parameter_if_changed(
+        self,
+        name: str,
+        value: str | T.Any,
+        **kwargs,
+    ) -> tuple["Parameter | None", "Parameter | None"]:
+        """
+        :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`
+        within the budget, see module docstring. A write handed over to the
+        buffered writer returns ``(before, None)``.
+        """
+        with_decryption = kwargs.get("type") is ParameterType.SECURE_STRING
+        before_param = get_parameter(
+            self.ssm_client, name, with_decryption=with_decryption
+        )
+
+        def before_write(before: "Parameter | None"):
+            if self.writer is not None and name in self.writer:
+                # keep the order of the deferred writes
+                raise _Deferred()
+            version = 0 if before is None else before.version
+            self._get_state(name).version = version
+            reason = self._check_rate(name)
+            if reason is not None and self.action is BudgetAction.COALESCE:
+                raise _Deferred()
+            reason = reason or self._check_labels(name, version)
+            if reason is None:
+                return
+            if self.action is BudgetAction.WARN:
+                logger.warning("Version budget of %s exceeded: %s", name, reason)
+            else:
+                raise VersionBudgetExceededError(f"{name}: {reason}")
+
+        try:
+            before, after = _put_parameter_if_changed(
+                ssm_client=self.ssm_client,
+                before_param=before_param,
+                name=name,
+                value=value,
+                before_write=before_write,
+                **kwargs,
+            )
+        except _Deferred:
+            self.writer.put(name, value, **kwargs)
+            return before_param, None
+        if after is not None:
+            self.record_write(name, after.version)
+        return before, after
+
+
+@dataclasses.dataclass(frozen=True)
+class VersionChurn:
+    """
+    Version count of one parameter.
+
+    :param name: parameter name
+    :param version: current version, i.e. the number of writes ever
+    :param last_modified_date: time of the last write
+    :param n_new_version: versions written since ``previous_versions``, None
+        without it
+    """
+
+    name: str = dataclasses.field()
+    version: int = dataclasses.field()
+    last_modified_date: datetime | None = dataclasses.field()
+    n_new_version: int | None = dataclasses.field(default=None)
+
+    @property
+    def is_history_full(self) -> bool:
+        """
+        Whether every new version rotates out the oldest one.
+        """
+        return self.version >= MAX_PARAMETER_VERSIONS
+
+
+@dataclasses.dataclass
+class VersionChurnReport:
+    """
+    Result of :func:`scan_version_churn`.
+
+    :param n_parameter: number of parameters scanned
+    :param n_history_full: number of parameters with 100 versions or more
+    :param top: the parameters that churn the most, most first
+    """
+
+    n_parameter: int = dataclasses.field(default=0)
+    n_history_full: int = dataclasses.field(default=0)
+    top: list[VersionChurn] = dataclasses.field(default_factory=list)
+
+
+def scan_version_churn(
+    ssm_client: "SSMClient",
+    path_prefix: str | None = None,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None = None,
+    previous_versions: dict[str, int] | None = None,
+    top: int = 20,
+) -> VersionChurnReport:
+    """
+    Find the parameters that churn the most with one streamed
+    ``DescribeParameters`` pass, see module docstring. Only the ``top``
+    entries are held in memory.
+
+    Without ``previous_versions``, parameters are ranked by version, the
+    number of writes over their lifetime. With the versions of a previous
+    scan, e.g. the ``versions`` of an
+    :class:`~simple_aws_ssm_parameter_store.incremental.PrefixState`, they
+    are ranked by the number of versions written since.
+
+    :param ssm_client: SSM client
+    :param path_prefix: only include parameters whose name begins with this prefix
+    :param parameter_filters: additional ``ParameterFilters``
+    :param previous_versions: ``{name: version}`` of a previous scan
+    :param top: number of parameters to report
+    """
+    report = VersionChurnReport()
+    heap: list[tuple[int, str, VersionChurn]] = list()
+    for param in iter_parameter_metadata(
+        ssm_client,
+        path_prefix=path_prefix,
+        parameter_filters=parameter_filters,
+    ):
+        if previous_versions is None:
+            n_new_version = None
+            key = param.version
+        else:
+            n_new_version = param.version - previous_versions.get(param.name, 0)
+            key = n_new_version
+        churn = VersionChurn(
+            name=param.name,
+            version=param.version,
+            last_modified_date=param.last_modified_date,
+            n_new_version=n_new_version,
+        )
+        report.n_parameter += 1
+        if churn.is_history_full:
+            report.n_history_full += 1
+        entry = (key, param.name, churn)
+        if len(heap) < top:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    report.top = [churn for _, _, churn in sorted(heap, reverse=True)]
+    return report
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""
+Incremental change detection with ``LastModifiedDate`` high-water marks.
+
+:func:`iter_changes` lists a prefix with ``DescribeParameters`` (metadata
+only, 50 parameters per call) and compares it with the state of the last
+run, kept per prefix in a JSON state file:
+
+- the high-water mark, the latest ``LastModifiedDate`` seen
+- the prefix index, ``{name: version}`` of every parameter seen
+
+Values (batched ``GetParameters``) and tags are only fetched for the
+parameters modified after the high-water mark, or whose version differs
+from the index. Deletions are the names of the index that are no longer
+listed, no value is re-read to find them.
+
+The changes are yielded as a stream of :class:`ParameterChange`, and the
+state is saved once the stream is fully consumed, so an interrupted run
+reports the same changes again next time.
+
+Example::
+
+    for change in iter_changes(ssm_client, "/app/", "changes-state.json"):
+        if change.is_deleted:
+            print("deleted", change.name)
+        else:
+            print(change.action, change.name, change.parameter.value)
+"""
+
+import typing as T
+import json
+import enum
+import dataclasses
+from pathlib import Path
+from datetime import datetime
+
+from .client import get_parameter_tags
+from .batch import map_batches, get_max_workers
+from .inventory import iter_parameter_inventory
+from .model import Parameter
+from .utils import write_private_file
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+class ChangeAction(str, enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclasses.dataclass(frozen=True)
+class ParameterChange:
+    """
+    A parameter created, updated or deleted since the last run.
+
+    :param action: created, updated or deleted
+    :param name: parameter name
+    :param parameter: metadata and value, None for a deleted parameter
+    :param tags: parameter tags, None if not requested or deleted
+    """
+
+    action: ChangeAction = dataclasses.field()
+    name: str = dataclasses.field()
+    parameter: Parameter | None = dataclasses.field(default=None)
+    tags: dict[str, str] | None = dataclasses.field(default=None)
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.action is ChangeAction.DELETED
+
+
+@dataclasses.dataclass
+class PrefixState:
+    """
+    State of one prefix, see module docstring.
+
+    :param high_water_mark: latest ``LastModifiedDate`` seen
+    :param versions: ``{name: version}`` of every parameter seen
+    """
+
+    high_water_mark: datetime | None = dataclasses.field(default=None)
+    versions: dict[str, int] = dataclasses.field(default_factory=dict)
+
+    def is_changed(self, meta: Parameter) -> bool:
+        if self.versions.get(meta.name) != meta.version:
+            return True
+        return (
+            self.high_water_mark is not None
+            and meta.last_modified_date is not None
+            and meta.last_modified_date > self.high_water_mark
+        )
+
+
+def read_state(path: Path | str) -> dict[str, PrefixState]:
+    """
+    Read the ``{prefix: PrefixState}`` of a state file, empty if it doesn't
+    exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text())
+    states = dict()
+    for prefix, dct in data["prefixes"].items():
+        mark = dct["high_water_mark"]
+        states[prefix] = PrefixState(
+            high_water_mark=None if mark is None else datetime.fromisoformat(mark),
+            versions=dct["versions"],
+        )
+    return states
+
+
+def write_state(path: Path | str, states: dict[str, PrefixState]):
+    """
+    Atomically write the ``{prefix: PrefixState}`` to a state file.
+    """
+    data = {
+        "prefixes": {
+            prefix: {
+                "high_water_mark": (
+                    None
+                    if state.high_water_mark is None
+                    else state.high_water_mark.isoformat()
+                ),
+                "versions": state.versions,
+            }
+            for prefix, state in states.items()
+        }
+    }
+    write_private_file(path, json.dumps(data, indent=2, sort_keys=True))
+
+
+def iter_changes(
+    ssm_client: "SSMClient",
+    prefix: str,
+    state_path: Path | str,
+    with_decryption: bool = False,
+    with_tags: bool = False,
+    max_workers: int | None = None,
+) -> T.Iterator[ParameterChange]:
+    """
+    Iterate the parameters under ``prefix`` that changed since the last run,
+    see module docstring. The first run reports every parameter as created.
+
+    :param ssm_client: SSM client
+    :param prefix: only include parameters whose name begins with this prefix
+    :param state_path: JSON file that keeps the state of every prefix
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param with_tags: whether to fetch the tags of the changed parameters
+    :param max_workers: max number of concurrent API calls
+    """
+    states = read_state(state_path)
+    old_state = states.get(prefix, PrefixState())
+    new_state = PrefixState(high_water_mark=old_state.high_water_mark)
+    n_worker = get_max_workers(ssm_client, max_workers)
+
+    def get_tags(batch: list[str]) -> dict[str, str]:
+        return get_parameter_tags(ssm_client, batch[0])
+
+    def flush(changed: list[Parameter]) -> T.Iterator[ParameterChange]:
+        if with_tags:
+            tags_list = map_batches(
+                get_tags, [[param.name] for param in changed], n_worker
+            )
+        else:
+            tags_list = [None] * len(changed)
+        for param, tags in zip(changed, tags_list):
+            yield ParameterChange(
+                action=(
+                    ChangeAction.UPDATED
+                    if param.name in old_state.versions
+                    else ChangeAction.CREATED
+                ),
+                name=param.name,
+                parameter=param,
+                tags=tags,
+            )
+
+    changed = list()
+    for param in iter_parameter_inventory(
+        ssm_client,
+        path_prefix=prefix,
+        with_value=old_state.is_changed,
+        with_decryption=with_decryption,
+        max_workers=max_workers,
+    ):
+        new_state.versions[param.name] = param.version
+        mark = param.last_modified_date
+        if mark is not None and (
+            new_state.high_water_mark is None or mark > new_state.high_water_mark
+        ):
+            new_state.high_water_mark = mark
+        if old_state.is_changed(param):
+            changed.append(param)
+            # one DescribeParameters page
+            if len(changed) >= 50:
+                yield from flush(changed)
+                changed = list()
+    yield from flush(changed)
+
+    for name in old_state.versions:
+        if name not in new_state.versions:
+            yield ParameterChange(action=ChangeAction.DELETED, name=name)
+
+    states[prefix] = new_state
+    write_state(state_path, states)
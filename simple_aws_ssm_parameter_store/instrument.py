@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+
+"""
+API call accounting and latency instrumentation.
+
+The hooks sit on the botocore event system of an SSM client, so every SSM
+operation is covered, including the bulk and concurrent paths, and calls
+made directly on the boto3 client. For each operation the following is
+recorded as an :class:`OperationRecord`:
+
+- operation name and latency
+- number of retries and throttled attempts
+- request and response payload bytes
+- number of SecureString values decrypted (one KMS decrypt each)
+- the final error code, if any
+
+Cache hits and misses are reported by the caching layer through
+:func:`record_cache_access`.
+
+Records are dispatched to:
+
+- every :func:`track_usage` scope that is active in the calling context,
+  for example to answer "how many SSM calls did this request cost"
+- every exporter registered with :func:`add_exporter`, see
+  :class:`StatsdExporter` and :class:`PrometheusExporter`
+
+A client that was never passed to :func:`instrument_client` pays nothing.
+An instrumented client with no active scope and no exporter only pays for
+a few dictionary operations per call.
+
+Example::
+
+    ssm_client = instrument_client(boto3.client("ssm"))
+    with track_usage() as usage:
+        get_parameter(ssm_client, "/app/db/host")
+        get_parameters(ssm_client, names)
+    print(usage.n_call, usage.n_decrypt, usage.operations["GetParameters"].avg_latency)
+"""
+
+import typing as T
+import time
+import threading
+import contextlib
+import contextvars
+import dataclasses
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+THROTTLE_ERROR_CODES = {
+    "ThrottlingException",
+    "Throttling",
+    "TooManyUpdates",
+    "RequestLimitExceeded",
+}
+
+_CONTEXT_KEY = "simple_aws_ssm_parameter_store.instrument"
+_INSTRUMENTED_FLAG = "_simple_aws_ssm_parameter_store_instrumented"
+
+
+@dataclasses.dataclass(frozen=True)
+class OperationRecord:
+    """
+    The accounting data of one SSM API call.
+
+    :param operation: operation name, e.g. ``GetParameter``
+    :param latency: wall clock seconds, including retries
+    :param retries: number of retry attempts
+    :param throttles: number of throttled attempts
+    :param request_bytes: size of the serialized request body
+    :param response_bytes: size of the response body
+    :param n_decrypt: number of SecureString values returned decrypted
+    :param error_code: error code of the final attempt, None on success
+    """
+
+    operation: str = dataclasses.field()
+    latency: float = dataclasses.field()
+    retries: int = dataclasses.field(default=0)
+    throttles: int = dataclasses.field(default=0)
+    request_bytes: int = dataclasses.field(default=0)
+    response_bytes: int = dataclasses.field(default=0)
+    n_decrypt: int = dataclasses.field(default=0)
+    error_code: str | None = dataclasses.field(default=None)
+
+
+@dataclasses.dataclass
+class OperationStats:
+    """
+    Aggregated statistics of one operation.
+    """
+
+    n_call: int = dataclasses.field(default=0)
+    n_error: int = dataclasses.field(default=0)
+    n_retry: int = dataclasses.field(default=0)
+    n_throttle: int = dataclasses.field(default=0)
+    n_decrypt: int = dataclasses.field(default=0)
+    n_cache_hit: int = dataclasses.field(default=0)
+    n_cache_miss: int = dataclasses.field(default=0)
+    request_bytes: int = dataclasses.field(default=0)
+    response_bytes: int = dataclasses.field(default=0)
+    total_latency: float = dataclasses.field(default=0.0)
+    max_latency: float = dataclasses.field(default=0.0)
+
+    def add(self, record: OperationRecord):
+        self.n_call += 1
+        self.n_error += 0 if record.error_code is None else 1
+        self.n_retry += record.retries
+        self.n_throttle += record.throttles
+        self.n_decrypt += record.n_decrypt
+        self.request_bytes += record.request_bytes
+        self.response_bytes += record.response_bytes
+        self.total_latency += record.latency
+        self.max_latency = max(self.max_latency, record.latency)
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.n_call if self.n_call else 0.0
+
+
+@dataclasses.dataclass
+class UsageStats:
+    """
+    Thread safe, per-operation accounting of SSM usage.
+    """
+
+    operations: dict[str, OperationStats] = dataclasses.field(default_factory=dict)
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+        compare=False,
+    )
+
+    def _get(self, operation: str) -> OperationStats:
+        try:
+            return self.operations[operation]
+        except KeyError:
+            stats = OperationStats()
+            self.operations[operation] = stats
+            return stats
+
+    def add(self, record: OperationRecord):
+        with self._lock:
+            self._get(record.operation).add(record)
+
+    def add_cache_access(self, operation: str, hit: bool):
+        with self._lock:
+            stats = self._get(operation)
+            if hit:
+                stats.n_cache_hit += 1
+            else:
+                stats.n_cache_miss += 1
+
+    def _sum(self, attr: str) -> int | float:
+        return sum(getattr(stats, attr) for stats in self.operations.values())
+
+    @property
+    def n_call(self) -> int:
+        return self._sum("n_call")
+
+    @property
+    def n_error(self) -> int:
+        return self._sum("n_error")
+
+    @property
+    def n_retry(self) -> int:
+        return self._sum("n_retry")
+
+    @property
+    def n_throttle(self) -> int:
+        return self._sum("n_throttle")
+
+    @property
+    def n_decrypt(self) -> int:
+        return self._sum("n_decrypt")
+
+    @property
+    def n_cache_hit(self) -> int:
+        return self._sum("n_cache_hit")
+
+    @property
+    def n_cache_miss(self) -> int:
+        return self._sum("n_cache_miss")
+
+    @property
+    def total_latency(self) -> float:
+        return self._sum("total_latency")
+
+
+class MetricsExporter:
+    """
+    Base class of metrics exporters. Subclasses override the methods they
+    care about, both are no-op by default.
+    """
+
+    def export_call(self, record: OperationRecord):  # pragma: no cover
+        pass
+
+    def export_cache_access(self, operation: str, hit: bool):  # pragma: no cover
+        pass
+
+
+class StatsdExporter(MetricsExporter):
+    """
+    Emit StatsD lines such as ``ssm.GetParameter.calls:1|c`` and
+    ``ssm.GetParameter.latency:12.345|ms``.
+
+    :param send: callable that ships one line, e.g. a UDP socket ``sendto`` wrapper
+    :param prefix: metric name prefix
+    """
+
+    def __init__(
+        self,
+        send: T.Callable[[str], T.Any],
+        prefix: str = "ssm",
+    ):
+        self.send = send
+        self.prefix = prefix
+
+    def export_call(self, record: OperationRecord):
+        name = f"{self.prefix}.{record.operation}"
+        self.send(f"{name}.calls:1|c")
+        self.send(f"{name}.latency:{record.latency * 1000:.3f}|ms")
+        if record.retries:
+            self.send(f"{name}.retries:{record.retries}|c")
+        if record.throttles:
+            self.send(f"{name}.throttles:{record.throttles}|c")
+        if record.n_decrypt:
+            self.send(f"{name}.decrypts:{record.n_decrypt}|c")
+        if record.error_code is not None:
+            self.send(f"{name}.errors:1|c")
+        self.send(f"{name}.request_bytes:{record.request_bytes}|c")
+        self.send(f"{name}.response_bytes:{record.response_bytes}|c")
+
+    def export_cache_access(self, operation: str, hit: bool):
+        outcome = "hit" if hit else "miss"
+        self.send(f"{self.prefix}.{operation}.cache_{outcome}:1|c")
+
+
+class PrometheusExporter(MetricsExporter):
+    """
+    Keep Prometheus style counters in memory and render them in the text
+    exposition format, e.g. to serve from a ``/metrics`` endpoint.
+
+    :param namespace: metric name prefix
+    """
+
+    def __init__(self, namespace: str = "ssm"):
+        self.namespace = namespace
+        self.usage = UsageStats()
+
+    def export_call(self, record: OperationRecord):
+        self.usage.add(record)
+
+    def export_cache_access(self, operation: str, hit: bool):
+        self.usage.add_cache_access(operation, hit)
+
+    def render(self) -> str:
+        metrics = [
+            ("calls_total", "n_call"),
+            ("errors_total", "n_error"),
+            ("retries_total", "n_retry"),
+            ("throttles_total", "n_throttle"),
+            ("decrypts_total", "n_decrypt"),
+            ("cache_hits_total", "n_cache_hit"),
+            ("cache_misses_total", "n_cache_miss"),
+            ("request_bytes_total", "request_bytes"),
+            ("response_bytes_total", "response_bytes"),
+            ("latency_seconds_sum", "total_latency"),
+        ]
+        with self.usage._lock:
+            items = sorted(self.usage.operations.items())
+            lines = list()
+            for metric, attr in metrics:
+                name = f"{self.namespace}_{metric}"
+                lines.append(f"# TYPE {name} counter")
+                for operation, stats in items:
+                    value = getattr(stats, attr)
+                    lines.append(f'{name}{{operation="{operation}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+_active_scopes: contextvars.ContextVar[tuple[UsageStats, ...]] = contextvars.ContextVar(
+    "simple_aws_ssm_parameter_store_usage_scopes", default=()
+)
+_exporters: list[MetricsExporter] = list()
+
+
+def add_exporter(exporter: MetricsExporter) -> MetricsExporter:
+    """
+    Send the records of all instrumented clients to the exporter.
+    """
+    _exporters.append(exporter)
+    return exporter
+
+
+def remove_exporter(exporter: MetricsExporter):
+    """
+    Stop sending records to the exporter.
+    """
+    _exporters.remove(exporter)
+
+
+@contextlib.contextmanager
+def track_usage() -> T.Iterator[UsageStats]:
+    """
+    Account all SSM calls made by instrumented clients within the block.
+
+    Scopes follow :mod:`contextvars`, so they nest, are isolated between
+    threads and asyncio tasks, and follow the work that the bulk functions
+    of this library fan out to their worker threads.
+    """
+    usage = UsageStats()
+    token = _active_scopes.set(_active_scopes.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _active_scopes.reset(token)
+
+
+def _dispatch(record: OperationRecord):
+    for usage in _active_scopes.get():
+        usage.add(record)
+    for exporter in _exporters:
+        exporter.export_call(record)
+
+
+def record_cache_access(operation: str, hit: bool):
+    """
+    Record a cache hit or miss, called by the caching layer.
+
+    :param operation: the SSM operation that a miss falls back to,
+        e.g. ``GetParameter``
+    :param hit: whether the value was served from the cache
+    """
+    for usage in _active_scopes.get():
+        usage.add_cache_access(operation, hit)
+    for exporter in _exporters:
+        exporter.export_cache_access(operation, hit)
+
+
+def _on_before_parameter_build(params, context, **kwargs):
+    context[_CONTEXT_KEY] = {
+        "with_decryption": bool(params.get("WithDecryption")),
+        "throttles": 0,
+    }
+
+
+def _on_before_call(model, params, context, **kwargs):
+    state = context.setdefault(
+        _CONTEXT_KEY,
+        {"with_decryption": False, "throttles": 0},
+    )
+    state["operation"] = model.name
+    state["request_bytes"] = len(params.get("body") or b"")
+    state["start"] = time.perf_counter()
+
+
+def _on_needs_retry(response, request_dict, **kwargs):
+    if response is None:
+        return None
+    _, parsed = response
+    error_code = parsed.get("Error", {}).get("Code")
+    if error_code in THROTTLE_ERROR_CODES:
+        state = request_dict["context"].get(_CONTEXT_KEY)
+        if state is not None:
+            state["throttles"] += 1
+    return None
+
+
+def _count_decrypted(parsed: dict[str, T.Any]) -> int:
+    params = parsed.get("Parameters", [])
+    if "Parameter" in parsed:
+        params = [parsed["Parameter"]]
+    return sum(1 for param in params if param.get("Type") == "SecureString")
+
+
+def _on_after_call(http_response, parsed, model, context, **kwargs):
+    state = context.get(_CONTEXT_KEY)
+    if state is None or "start" not in state:  # pragma: no cover
+        return
+    error_code = parsed.get("Error", {}).get("Code")
+    _dispatch(
+        OperationRecord(
+            operation=model.name,
+            latency=time.perf_counter() - state["start"],
+            retries=parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0),
+            throttles=state["throttles"],
+            request_bytes=state["request_bytes"],
+            response_bytes=len(http_response.content or b""),
+            n_decrypt=_count_decrypted(parsed) if state["with_decryption"] else 0,
+            error_code=error_code,
+        )
+    )
+
+
+def _on_after_call_error(exception, context, **kwargs):
+    state = context.get(_CONTEXT_KEY)
+    if state is None or "start" not in state:  # pragma: no cover
+        return
+    _dispatch(
+        OperationRecord(
+            operation=state["operation"],
+            latency=time.perf_counter() - state["start"],
+            throttles=state["throttles"],
+            request_bytes=state["request_bytes"],
+            error_code=type(exception).__name__,
+        )
+    )
+
+
+_HANDLERS = [
+    ("before-parameter-build.ssm", _on_before_parameter_build),
+    ("before-call.ssm", _on_before_call),
+    ("needs-retry.ssm", _on_needs_retry),
+    ("after-call.ssm", _on_after_call),
+    ("after-call-error.ssm", _on_after_call_error),
+]
+
+
+def instrument_client(ssm_client: "SSMClient") -> "SSMClient":
+    """
+    Register the instrumentation hooks on the client's event system.
+    Calling it more than once is a no-op.
+
+    :return: the same client, for chaining
+    """
+    if getattr(ssm_client, _INSTRUMENTED_FLAG, False):
+        return ssm_client
+    for event_name, handler in _HANDLERS:
+        ssm_client.meta.events.register(event_name, handler)
+    setattr(ssm_client, _INSTRUMENTED_FLAG, True)
+    return ssm_client
+
+
+def uninstrument_client(ssm_client: "SSMClient") -> "SSMClient":
+    """
+    Remove the instrumentation hooks from the client.
+    """
+    if not getattr(ssm_client, _INSTRUMENTED_FLAG, False):
+        return ssm_client
+    for event_name, handler in _HANDLERS:
+        ssm_client.meta.events.unregister(event_name, handler)
+    setattr(ssm_client, _INSTRUMENTED_FLAG, False)
+    return ssm_client
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streamed scan over the parameter inventory of an account and region.
+
+``describe_parameters`` returns metadata only (type, tier, key id, policies,
+version, last modified date, ...), at most 50 parameters per page. When
+values are also needed, they are fetched page by page with batched
+``GetParameters`` calls, batched by KMS key with
+:func:`~simple_aws_ssm_parameter_store.kms.get_parameters_by_key`. Only one page is held in memory at a time, so
+scanning tens of thousands of parameters uses constant memory.
+"""
+
+import typing as T
+
+from .model import Parameter
+from .kms import DEFAULT_MAX_WORKERS_PER_KEY, get_parameters_by_key
+from .tier import TierPricing, TierReport
+from .compression import CompressionAlgorithm
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+    from mypy_boto3_ssm.type_defs import ParameterStringFilterTypeDef
+
+
+DESCRIBE_PARAMETERS_PAGE_SIZE = 50
+GET_PARAMETERS_BY_PATH_PAGE_SIZE = 10
+
+
+def _build_parameter_filters(
+    path_prefix: str | None,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None,
+) -> list["ParameterStringFilterTypeDef"] | None:
+    filters = list(parameter_filters or [])
+    if path_prefix is not None:
+        filters.append({"Key": "Name", "Option": "BeginsWith", "Values": [path_prefix]})
+    return filters or None
+
+
+def iter_parameter_metadata_pages(
+    ssm_client: "SSMClient",
+    path_prefix: str | None = None,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None = None,
+    page_size: int = DESCRIBE_PARAMETERS_PAGE_SIZE,
+) -> T.Iterator[list[Parameter]]:
+    """
+    Iterate ``describe_parameters`` result pages.
+
+    Ref:
+
+    - `describe_parameters <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ssm.html#SSM.Client.describe_parameters>`_
+
+    :param ssm_client: SSM client
+    :param path_prefix: only include parameters whose name begins with this prefix
+    :param parameter_filters: additional ``ParameterFilters``
+    :param page_size: number of parameters per page, max 50
+    """
+    paginator = ssm_client.get_paginator("describe_parameters")
+    kwargs = dict(PaginationConfig={"PageSize": page_size})
+    filters = _build_parameter_filters(path_prefix, parameter_filters)
+    if filters:
+        kwargs["ParameterFilters"] = filters
+    for response in paginator.paginate(**kwargs):
+        yield [Parameter(_data=dct) for dct in response.get("Parameters", [])]
+
+
+def iter_parameter_metadata(
+    ssm_client: "SSMClient",
+    path_prefix: str | None = None,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None = None,
+    page_size: int = DESCRIBE_PARAMETERS_PAGE_SIZE,
+) -> T.Iterator[Parameter]:
+    """
+    Iterate the metadata of all parameters, see :func:`iter_parameter_metadata_pages`.
+    """
+    for page in iter_parameter_metadata_pages(
+        ssm_client,
+        path_prefix=path_prefix,
+        parameter_filters=parameter_filters,
+        page_size=page_size,
+    ):
+        yield from page
+
+
+def iter_parameters_by_path(
+    ssm_client: "SSMClient",
+    path: str,
+    recursive: bool = True,
+    with_decryption: bool = False,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None = None,
+    page_size: int = GET_PARAMETERS_BY_PATH_PAGE_SIZE,
+) -> T.Iterator[Parameter]:
+    """
+    Iterate all parameters under a path, with values, using
+    ``get_parameters_by_path``. Unlike :func:`iter_parameter_inventory` it
+    needs one API call per 10 parameters, SecureString values are decrypted
+    in the same call, but the metadata is limited to the ``GetParameters``
+    fields.
+
+    Ref:
+
+    - `get_parameters_by_path <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ssm.html#SSM.Client.get_parameters_by_path>`_
+
+    :param ssm_client: SSM client
+    :param path: parameter path, e.g. ``/app/prod``
+    :param recursive: whether to include parameters in sub paths
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param parameter_filters: additional ``ParameterFilters``
+    :param page_size: number of parameters per page, max 10
+    """
+    paginator = ssm_client.get_paginator("get_parameters_by_path")
+    kwargs = dict(
+        Path=path,
+        Recursive=recursive,
+        WithDecryption=with_decryption,
+        PaginationConfig={"PageSize": page_size},
+    )
+    if parameter_filters:
+        kwargs["ParameterFilters"] = parameter_filters
+    for response in paginator.paginate(**kwargs):
+        for dct in response.get("Parameters", []):
+            yield Parameter(_data=dct)
+
+
+def iter_parameter_inventory(
+    ssm_client: "SSMClient",
+    path_prefix: str | None = None,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None = None,
+    with_value: bool | T.Callable[[Parameter], bool] = True,
+    with_decryption: bool = False,
+    page_size: int = DESCRIBE_PARAMETERS_PAGE_SIZE,
+    max_workers: int | None = None,
+    max_workers_per_key: int | dict[str, int] = DEFAULT_MAX_WORKERS_PER_KEY,
+) -> T.Iterator[Parameter]:
+    """
+    Iterate all parameters with metadata and, optionally, values.
+
+    The yielded ``Parameter`` objects combine the ``describe_parameters``
+    metadata (e.g. ``policies``, ``key_id``) with the ``GetParameters`` data
+    (e.g. ``value``, ``arn``).
+
+    :param ssm_client: SSM client
+    :param path_prefix: only include parameters whose name begins with this prefix
+    :param parameter_filters: additional ``ParameterFilters``
+    :param with_value: whether to fetch values, either a bool or a predicate
+        that receives the metadata-only ``Parameter``, so that values are only
+        fetched for the parameters that need them
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param page_size: number of parameters per ``describe_parameters`` page
+    :param max_workers: max number of concurrent ``GetParameters`` calls per page
+    :param max_workers_per_key: max number of concurrent ``GetParameters``
+        calls that decrypt under the same KMS key, or ``{key_id: n}``
+    """
+    for page in iter_parameter_metadata_pages(
+        ssm_client,
+        path_prefix=path_prefix,
+        parameter_filters=parameter_filters,
+        page_size=page_size,
+    ):
+        if with_value is True:
+            metas = page
+        elif with_value is False:
+            metas = []
+        else:
+            metas = [param for param in page if with_value(param)]
+        if metas:
+            values = get_parameters_by_key(
+                ssm_client,
+                metas,
+                with_decryption=with_decryption,
+                max_workers=max_workers,
+                max_workers_per_key=max_workers_per_key,
+            )
+        else:
+            values = {}
+        for param in page:
+            try:
+                value_param = values[param.name]
+            except KeyError:
+                yield param
+            else:
+                yield Parameter(_data={**param._data, **value_param._data})
+
+
+def _is_advanced_tier(param: Parameter) -> bool:
+    return param.is_advanced_tier
+
+
+def scan_tier_report(
+    ssm_client: "SSMClient",
+    path_prefix: str | None = None,
+    parameter_filters: list["ParameterStringFilterTypeDef"] | None = None,
+    with_decryption: bool = False,
+    compression: CompressionAlgorithm | str | None = None,
+    pricing: TierPricing | None = None,
+    max_workers: int | None = None,
+) -> TierReport:
+    """
+    Build a :class:`~simple_aws_ssm_parameter_store.tier.TierReport` with one
+    streamed pass over the inventory.
+
+    Values are only fetched for Advanced parameters, because a Standard
+    parameter can never be moved to a cheaper tier. This keeps the number of
+    ``GetParameters`` calls proportional to the number of Advanced parameters.
+
+    Example::
+
+        report = scan_tier_report(ssm_client, path_prefix="/app/", compression="zlib")
+        print(report.monthly_storage_cost, report.recommended_monthly_storage_cost)
+        for rec in report.recommendations:
+            print(rec.name, rec.reason)
+
+    :param ssm_client: SSM client
+    :param path_prefix: only include parameters whose name begins with this prefix
+    :param parameter_filters: additional ``ParameterFilters``
+    :param with_decryption: whether to decrypt SecureString values to measure the
+        plain text size, otherwise the encrypted size is measured
+    :param compression: also recommend downgrades that need compression
+    :param pricing: price and quota figures, defaults to :class:`~simple_aws_ssm_parameter_store.tier.TierPricing`
+    :param max_workers: max number of concurrent ``GetParameters`` calls per page
+    """
+    report = TierReport(
+        pricing=pricing or TierPricing(),
+        compression=compression,
+    )
+    for param in iter_parameter_inventory(
+        ssm_client,
+        path_prefix=path_prefix,
+        parameter_filters=parameter_filters,
+        with_value=_is_advanced_tier,
+        with_decryption=with_decryption,
+        max_workers=max_workers,
+    ):
+        report.add(param)
+    return report
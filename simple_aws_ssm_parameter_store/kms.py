@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+KMS key aware reads of parameters whose metadata is known.
+
+Every SecureString read with ``WithDecryption`` is a KMS ``Decrypt`` call
+under the key of the parameter, and counts against the KMS request quota
+of the account, shared with every other use of the key. A ``GetParameters``
+batch that mixes ``String`` and SecureString values decrypts nothing for the
+plain values, but still sends them with ``WithDecryption``, and a bulk read
+that fans out over one customer managed key can throttle the other users
+of that key.
+
+:func:`get_parameters_by_key` takes the ``describe_parameters`` metadata
+(``Type`` and ``KeyId``), which the bulk read and refresh paths already
+have, and:
+
+- reads the non-secure parameters, and the SecureString parameters that
+  aren't decrypted, without ``WithDecryption``
+- batches the SecureString parameters by KMS key, so that a batch only
+  decrypts under one key
+- runs at most ``max_workers_per_key`` concurrent calls per key, on top of
+  the overall ``max_workers``, so that one key's reads can't take up its
+  whole quota, while reads under different keys still run side by side.
+  The calls in flight are counted per client object and key, across all
+  the concurrent callers, e.g. the threads of a web server
+
+Example::
+
+    metas = list(iter_parameter_metadata(ssm_client, path_prefix="/app/"))
+    params = get_parameters_by_key(ssm_client, metas, max_workers_per_key=2)
+"""
+
+import typing as T
+import weakref
+import itertools
+import threading
+import contextlib
+
+from .constants import ParameterType, DEFAULT_KMS_KEY
+from .model import Parameter
+from .client import GET_PARAMETERS_BATCH_SIZE
+from .batch import make_batches, map_batches, get_max_workers
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+DEFAULT_MAX_WORKERS_PER_KEY = 2
+
+
+class _KeyLimiter:
+    """
+    Number of the decrypting calls in flight under one key of one client,
+    shared by all the callers. Each caller waits until fewer than its own
+    limit are in flight.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._in_flight = 0
+
+    @contextlib.contextmanager
+    def limit(self, n: int) -> T.Iterator[None]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < n)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+
+# client -> key id -> limiter, dropped with the client
+_limiters: "weakref.WeakKeyDictionary[T.Any, dict[str, _KeyLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+_limiters_lock = threading.Lock()
+
+
+def _get_limiter(ssm_client: "SSMClient", key_id: str) -> _KeyLimiter:
+    with _limiters_lock:
+        try:
+            limiters = _limiters.setdefault(ssm_client, dict())
+        except TypeError:  # pragma: no cover
+            # not weak referenceable, the limit only holds within the call
+            return _KeyLimiter()
+        return limiters.setdefault(key_id, _KeyLimiter())
+
+
+def get_decryption_key(
+    param: Parameter,
+    with_decryption: bool | T.Callable[[Parameter], bool] = True,
+) -> str | None:
+    """
+    The KMS key that reading ``param`` decrypts under, None if the read
+    doesn't decrypt.
+
+    :param param: parameter metadata, with the ``Type`` and ``KeyId``
+    :param with_decryption: whether to decrypt SecureString parameter values,
+        either a bool or a predicate that receives the metadata
+    """
+    if param.type != ParameterType.SECURE_STRING.value:
+        return None
+    if with_decryption is False:
+        return None
+    if with_decryption is not True and not with_decryption(param):
+        return None
+    return param.key_id or DEFAULT_KMS_KEY
+
+
+def group_by_key(
+    params: T.Iterable[Parameter],
+    with_decryption: bool | T.Callable[[Parameter], bool] = True,
+) -> dict[str | None, list[str]]:
+    """
+    Group parameter names by :func:`get_decryption_key`, in the input order.
+    The names read without decryption are under the None key.
+    """
+    groups: dict[str | None, list[str]] = dict()
+    for param in params:
+        key_id = get_decryption_key(param, with_decryption)
+        groups.setdefault(key_id, []).append(param.name)
+    return groups
+
+
+def get_parameters_by_key(
+    ssm_client: "SSMClient",
+    params: T.Iterable[Parameter],
+    with_decryption: bool | T.Callable[[Parameter], bool] = True,
+    max_workers: int | None = None,
+    max_workers_per_key: int | dict[str, int] = DEFAULT_MAX_WORKERS_PER_KEY,
+) -> dict[str, Parameter]:
+    """
+    Get the values of parameters whose metadata is known, with batches of
+    one KMS key each, see module docstring.
+
+    :param ssm_client: SSM client
+    :param params: parameter metadata, e.g. from
+        :func:`~simple_aws_ssm_parameter_store.inventory.iter_parameter_metadata`
+    :param with_decryption: whether to decrypt SecureString parameter values,
+        either a bool or a predicate that receives the metadata
+    :param max_workers: max number of concurrent ``GetParameters`` calls
+    :param max_workers_per_key: max number of concurrent ``GetParameters``
+        calls that decrypt under the same key, counting the calls of the
+        other callers that use the same client, or ``{key_id: n}``, keys not
+        listed get :data:`DEFAULT_MAX_WORKERS_PER_KEY`
+
+    :return: dictionary mapping the name to the ``Parameter`` object, in the
+        input order
+    """
+    params = list(params)
+    groups = group_by_key(params, with_decryption)
+    limits: dict[str, tuple[_KeyLimiter, int]] = dict()
+    for key_id in groups:
+        if key_id is None:
+            continue
+        if isinstance(max_workers_per_key, dict):
+            n = max_workers_per_key.get(key_id, DEFAULT_MAX_WORKERS_PER_KEY)
+        else:
+            n = max_workers_per_key
+        limits[key_id] = (_get_limiter(ssm_client, key_id), n)
+
+    # interleave the keys, so that the workers don't all queue up on the
+    # limiter of the first key
+    key_batches = [
+        [(key_id, batch) for batch in make_batches(names, GET_PARAMETERS_BATCH_SIZE)]
+        for key_id, names in groups.items()
+    ]
+    batches = [
+        batch
+        for row in itertools.zip_longest(*key_batches)
+        for batch in row
+        if batch is not None
+    ]
+
+    def get_batch(batch: tuple[str | None, list[str]]) -> list[dict[str, T.Any]]:
+        key_id, names = batch
+        if key_id is None:
+            response = ssm_client.get_parameters(Names=names, WithDecryption=False)
+        else:
+            limiter, n = limits[key_id]
+            with limiter.limit(n):
+                response = ssm_client.get_parameters(Names=names, WithDecryption=True)
+        return response.get("Parameters", [])
+
+    found = dict()
+    for param_data_list in map_batches(
+        get_batch,
+        batches,
+        get_max_workers(ssm_client, max_workers),
+    ):
+        for param_data in param_data_list:
+            found[param_data["Name"]] = Parameter(_data=param_data)
+    return {param.name: found[param.name] for param in params if param.name in found}
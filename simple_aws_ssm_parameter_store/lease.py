@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+"""
+Leases (leader election, mutual exclusion) on top of Parameter Store.
+
+A lease is a ``String`` parameter whose value is a JSON record::
+
+    {"owner": "host-1:4242", "token": 7, "expires_at": 1767225600.0}
+
+Every write is an ``expected_version`` write of
+:func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`,
+so of two processes that race for a free or expired lease, only one gets
+it:
+
+- :func:`acquire_lease` takes the lease if it doesn't exist, is expired, or
+  was released
+- :func:`renew_lease` extends it, as long as the record still holds our
+  owner and token
+- :func:`renew_leases` renews many leases in one refresh cycle, the records
+  are read with batched ``GetParameters`` calls (10 per call) and the
+  renewals are written concurrently
+- :func:`release_lease` marks it expired, the parameter is kept so that
+  the versions, and the fencing tokens, keep growing
+
+The fencing token is the ``Parameter.version`` of the write that acquired
+the lease. It grows with every acquisition, pass it to the protected
+resource so that it can reject a former holder that didn't notice it lost
+the lease, e.g. after a long GC pause.
+
+``PutParameter`` has no condition, the loser of a race may write its record
+on top of the winner's before it sees the conflict. It then puts the
+winner's record back. If the loser dies in between, the winner loses the
+lease at its next renewal and nobody holds it until the loser's record
+expires. The lease is never held by two owners, but it may be lost early.
+
+Expiry uses the wall clock of the processes, keep them in sync (NTP) and
+keep the TTL well above the clock skew. With ``expiration_policy=True``,
+an Advanced tier ``Expiration`` policy also makes SSM delete the parameter
+of an abandoned lease. Advanced parameters are charged, and the version,
+hence the fencing token, restarts at 1 once the parameter is deleted.
+
+Example::
+
+    lease = acquire_lease(ssm_client, "/locks/nightly-report", owner, ttl=60)
+    if lease is not None:
+        run_report(fencing_token=lease.token)
+        release_lease(ssm_client, lease)
+"""
+
+import typing as T
+import json
+import time
+import dataclasses
+from datetime import datetime, timezone
+
+from .constants import ParameterType, ParameterTier
+from .client import (
+    get_parameter,
+    get_parameters,
+    put_parameter_if_changed,
+    _put_parameter_if_changed,
+)
+from .batch import map_batches, get_max_workers
+from .exc import ParameterVersionConflictError
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+    from .model import Parameter
+
+
+@dataclasses.dataclass(frozen=True)
+class Lease:
+    """
+    A held lease.
+
+    :param name: parameter name of the lease
+    :param owner: unique id of the holder, e.g. ``{hostname}:{pid}``
+    :param token: fencing token, the version of the acquiring write
+    :param version: current version of the lease parameter
+    :param expires_at: wall clock expiry, seconds since the epoch
+    """
+
+    name: str = dataclasses.field()
+    owner: str = dataclasses.field()
+    token: int = dataclasses.field()
+    version: int = dataclasses.field()
+    expires_at: float = dataclasses.field()
+
+    def is_expired(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) >= self.expires_at
+
+
+def _read_record(param: "Parameter") -> dict[str, T.Any]:
+    try:
+        return json.loads(param.value)
+    except ValueError:
+        # not a lease record, treat it as expired
+        return {"owner": None, "token": 0, "expires_at": 0}
+
+
+def _write_kwargs(
+    record: dict[str, T.Any],
+    expiration_policy: bool,
+) -> dict[str, T.Any]:
+    kwargs = dict(
+        value=record,
+        type=ParameterType.STRING,
+        codec="json",
+    )
+    if expiration_policy:
+        timestamp = datetime.fromtimestamp(record["expires_at"], tz=timezone.utc)
+        policy = {
+            "Type": "Expiration",
+            "Version": "1.0",
+            "Attributes": {
+                "Timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            },
+        }
+        kwargs["tier"] = ParameterTier.ADVANCED
+        kwargs["policies"] = json.dumps([policy])
+    return kwargs
+
+
+def acquire_lease(
+    ssm_client: "SSMClient",
+    name: str,
+    owner: str,
+    ttl: float,
+    expiration_policy: bool = False,
+    clock: T.Callable[[], float] = time.time,
+) -> Lease | None:
+    """
+    Acquire the lease ``name`` if it is free, see module docstring.
+
+    :param ssm_client: SSM client
+    :param name: parameter name of the lease
+    :param owner: unique id of the holder, e.g. ``{hostname}:{pid}``
+    :param ttl: seconds until the lease expires, unless renewed
+    :param expiration_policy: whether SSM deletes the parameter at expiry,
+        with an Advanced tier ``Expiration`` policy
+    :param clock: wall clock, shared by all the contenders
+
+    :return: the lease, None if another owner holds it
+    """
+    now = clock()
+    current = get_parameter(ssm_client, name)
+    if current is None:
+        expected_version = 0
+    else:
+        record = _read_record(current)
+        if record["owner"] != owner and record["expires_at"] > now:
+            return None
+        expected_version = current.version
+    record = {"owner": owner, "token": expected_version + 1, "expires_at": now + ttl}
+    try:
+        _, after = put_parameter_if_changed(
+            ssm_client,
+            name,
+            expected_version=expected_version,
+            **_write_kwargs(record, expiration_policy),
+        )
+    except ParameterVersionConflictError:
+        # if our write landed on top of the winner's, the winner's record
+        # was put back, see put_parameter_if_changed
+        return None
+    return Lease(
+        name=name,
+        owner=owner,
+        token=after.version,
+        version=after.version,
+        expires_at=record["expires_at"],
+    )
+
+
+def _renew(
+    ssm_client: "SSMClient",
+    lease: Lease,
+    current: "Parameter | None",
+    ttl: float,
+    expiration_policy: bool,
+    now: float,
+) -> Lease | None:
+    if current is None:
+        return None
+    record = _read_record(current)
+    if (record["owner"], record["token"]) != (lease.owner, lease.token):
+        return None
+    if record["expires_at"] <= now:
+        return None
+    record = dict(record, expires_at=now + ttl)
+    try:
+        _, after = _put_parameter_if_changed(
+            ssm_client=ssm_client,
+            before_param=current,
+            name=lease.name,
+            expected_version=current.version,
+            **_write_kwargs(record, expiration_policy),
+        )
+    except ParameterVersionConflictError:
+        return None
+    return dataclasses.replace(
+        lease,
+        # None if the record didn't change, i.e. renewed at the same time
+        version=current.version if after is None else after.version,
+        expires_at=record["expires_at"],
+    )
+
+
+def renew_lease(
+    ssm_client: "SSMClient",
+    lease: Lease,
+    ttl: float,
+    expiration_policy: bool = False,
+    clock: T.Callable[[], float] = time.time,
+) -> Lease | None:
+    """
+    Extend a held lease by ``ttl`` seconds from now.
+
+    :return: the renewed lease, None if it was lost (expired, taken over)
+    """
+    current = get_parameter(ssm_client, lease.name)
+    return _renew(ssm_client, lease, current, ttl, expiration_policy, clock())
+
+
+def renew_leases(
+    ssm_client: "SSMClient",
+    leases: T.Iterable[Lease],
+    ttl: float,
+    expiration_policy: bool = False,
+    max_workers: int | None = None,
+    clock: T.Callable[[], float] = time.time,
+) -> list[Lease | None]:
+    """
+    Renew many leases in one refresh cycle, see :func:`renew_lease`.
+
+    :return: the renewed leases, None for the lost ones, in the input order
+    """
+    leases = list(leases)
+    now = clock()
+    currents = get_parameters(
+        ssm_client,
+        [lease.name for lease in leases],
+        max_workers=max_workers,
+    )
+
+    def renew(batch: list[Lease]) -> Lease | None:
+        lease = batch[0]
+        current = currents.get(lease.name)
+        return _renew(ssm_client, lease, current, ttl, expiration_policy, now)
+
+    return map_batches(
+        renew,
+        [[lease] for lease in leases],
+        get_max_workers(ssm_client, max_workers),
+    )
+
+
+def release_lease(
+    ssm_client: "SSMClient",
+    lease: Lease,
+    clock: T.Callable[[], float] = time.time,
+) -> bool:
+    """
+    Release a held lease, so that others can acquire it right away.
+
+    :return: whether the lease was still held
+    """
+    current = get_parameter(ssm_client, lease.name)
+    if current is None:
+        return False
+    record = _read_record(current)
+    if (record["owner"], record["token"]) != (lease.owner, lease.token):
+        return False
+    if record["expires_at"] <= clock():
+        return False
+    try:
+        _put_parameter_if_changed(
+            ssm_client=ssm_client,
+            before_param=current,
+            name=lease.name,
+            expected_version=current.version,
+            **_write_kwargs(dict(record, expires_at=0), False),
+        )
+    except ParameterVersionConflictError:
+        return False
+    return True
@@ -5,11 +5,23 @@ Data Model.
 """
 
 import typing as T
+import copy
 import dataclasses
 from datetime import datetime
 from func_args.api import BaseFrozenModel, T_KWARGS
 
 from .constants import ParameterType, ParameterTier
+from .codec import (
+    Codec,
+    JSON_CODEC,
+    STRING_LIST_CODEC,
+    INT_CODEC,
+    BOOL_CODEC,
+    get_codec,
+)
+from .compression import is_compressed_value, decompress_value
+
+_DECOMPRESSED_KEY = "__decompressed__"
 
 
 @dataclasses.dataclass(frozen=True)
@@ -24,6 +36,13 @@ class Parameter(BaseFrozenModel):
     """
 
     _data: dict[str, T.Any] = dataclasses.field()
+    # memoized values, by Codec object, and the decompressed value
+    _decoded: dict[T.Any, T.Any] = dataclasses.field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     @property
     def response(self) -> dict[str, T.Any]:
@@ -45,9 +64,34 @@ class Parameter(BaseFrozenModel):
         return self._data.get("Tier")
 
     @property
-    def value(self) -> str | None:
+    def raw_value(self) -> str | None:
+        """
+        The value as stored in Parameter Store, compressed values are not
+        decompressed.
+        """
         return self._data.get("Value")
 
+    @property
+    def value(self) -> str | None:
+        """
+        The parameter value. Values written with compression (see
+        :mod:`~simple_aws_ssm_parameter_store.compression`) are decompressed
+        transparently, and the result is memoized. A value that only looks
+        compressed, i.e. doesn't decompress, is returned as is.
+        """
+        raw_value = self._data.get("Value")
+        if not is_compressed_value(raw_value):
+            return raw_value
+        try:
+            return self._decoded[_DECOMPRESSED_KEY]
+        except KeyError:
+            try:
+                value = decompress_value(raw_value)
+            except ValueError:
+                value = raw_value
+            self._decoded[_DECOMPRESSED_KEY] = value
+            return value
+
     @property
     def version(self) -> int | None:
         return self._data.get("Version")
@@ -136,3 +180,53 @@ class Parameter(BaseFrozenModel):
             "last_modified_date": self.last_modified_date,
             "arn": self.arn,
         }
+
+    def decode(self, codec: Codec | str) -> T.Any:
+        """
+        Decode the parameter value with the given codec.
+
+        The decoded value is memoized on this object. Because a ``Parameter``
+        is immutable and represents exactly one parameter version, repeated
+        access never re-parses the value. Treat the returned object as
+        read-only, it is shared by all callers.
+
+        :param codec: a :class:`~simple_aws_ssm_parameter_store.codec.Codec`
+            object or the name of a registered codec
+        """
+        codec = get_codec(codec)
+        # keyed by the codec itself, two codecs may share a name
+        try:
+            return self._decoded[codec]
+        except KeyError:
+            decoded = codec.decode(self.value)
+            self._decoded[codec] = decoded
+            return decoded
+
+    def to_dict(self) -> T_KWARGS:
+        """
+        Convert to a dictionary, the memoized decoded values are left out.
+        """
+        return {"_data": copy.deepcopy(self._data)}
+
+    def to_kwargs(self) -> T_KWARGS:
+        return self.to_dict()
+
+    @property
+    def json_value(self) -> T.Any:
+        """Parameter value decoded as JSON."""
+        return self.decode(JSON_CODEC)
+
+    @property
+    def string_list_value(self) -> list[str]:
+        """Parameter value decoded as a comma separated ``StringList``."""
+        return self.decode(STRING_LIST_CODEC)
+
+    @property
+    def int_value(self) -> int:
+        """Parameter value decoded as integer."""
+        return self.decode(INT_CODEC)
+
+    @property
+    def bool_value(self) -> bool:
+        """Parameter value decoded as boolean (true/false, yes/no, on/off, 1/0)."""
+        return self.decode(BOOL_CODEC)
@@ -25,6 +25,7 @@ path_cov_index_html = dir_htmlcov / "index.html"
 dir_unit_test = dir_project_root / "tests"
 dir_int_test = dir_project_root / "tests_int"
 dir_load_test = dir_project_root / "tests_load"
+dir_benchmark_results = dir_load_test / "results"
 
 # ------------------------------------------------------------------------------
 # Doc Related
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+Per path policies: TTL, decryption and refresh interval by parameter path.
+
+Different subtrees need different handling, e.g. feature flags refreshed
+every few seconds, database endpoints cached for an hour, secrets decrypted
+and cached briefly. Register the rules once in a :class:`PolicyRegistry`,
+and pass it to :class:`~simple_aws_ssm_parameter_store.cache.ParameterCache`,
+:class:`~simple_aws_ssm_parameter_store.watcher.ParameterWatcher`,
+:func:`~simple_aws_ssm_parameter_store.settings.load_settings` and
+:func:`~simple_aws_ssm_parameter_store.env.load_env`.
+
+Rules are matched on whole path segments, the longest matching prefix
+wins, and the fields it leaves to None are inherited from the shorter
+prefixes, then from the settings of the consumer. The rules are kept in a
+trie of path segments with the inherited policy precomputed on every node,
+so resolving a name walks its segments once, whatever the number of rules.
+
+Example::
+
+    policies = PolicyRegistry()
+    policies.register("/flags/", ttl=5, refresh_interval=5)
+    policies.register("/db/", ttl=3600, refresh_interval=3600)
+    policies.register("/secrets/", ttl=30, with_decryption=True)
+
+    cache = ParameterCache(ssm_client, with_decryption=False, policies=policies)
+"""
+
+import typing as T
+import dataclasses
+
+from .client import get_parameters
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+    from .model import Parameter
+
+
+@dataclasses.dataclass(frozen=True)
+class PathPolicy:
+    """
+    Handling of the parameters under a path, None fields are inherited.
+
+    :param ttl: seconds a cached parameter stays fresh
+    :param stale_while_revalidate: seconds an expired cached parameter is
+        still served while it is refreshed in the background
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param refresh_interval: seconds between two polls of a watcher
+    """
+
+    ttl: float | None = dataclasses.field(default=None)
+    stale_while_revalidate: float | None = dataclasses.field(default=None)
+    with_decryption: bool | None = dataclasses.field(default=None)
+    refresh_interval: float | None = dataclasses.field(default=None)
+
+    def merge(self, other: "PathPolicy") -> "PathPolicy":
+        """
+        Override the fields of this policy with the fields ``other`` sets.
+        """
+        changes = {
+            field.name: getattr(other, field.name)
+            for field in dataclasses.fields(other)
+            if getattr(other, field.name) is not None
+        }
+        return dataclasses.replace(self, **changes) if changes else self
+
+
+class _Node:
+    __slots__ = ("children", "policy", "effective")
+
+    def __init__(self, effective: PathPolicy):
+        self.children: dict[str, "_Node"] = dict()
+        self.policy: PathPolicy | None = None
+        self.effective = effective
+
+
+def _split(name: str) -> list[str]:
+    # drop a version or label selector, parameter names can't contain ":"
+    return [segment for segment in name.split(":", 1)[0].split("/") if segment]
+
+
+class PolicyRegistry:
+    """
+    See module docstring.
+
+    :param default: policy of the names no rule matches
+    """
+
+    def __init__(self, default: PathPolicy | None = None):
+        self._root = _Node(default or PathPolicy())
+        self._root.policy = self._root.effective
+
+    def register(
+        self,
+        prefix: str,
+        policy: PathPolicy | None = None,
+        **kwargs,
+    ) -> PathPolicy:
+        """
+        Set the policy of the parameters under ``prefix``, e.g. ``"/flags/"``,
+        or of one parameter. Registering the same prefix again replaces its
+        rule, registering ``"/"`` replaces the default.
+
+        :param prefix: parameter path or name
+        :param policy: the policy, or its fields as keyword arguments
+        """
+        if policy is None:
+            policy = PathPolicy(**kwargs)
+        node = self._root
+        inherited = PathPolicy()
+        for segment in _split(prefix):
+            inherited = node.effective
+            child = node.children.get(segment)
+            if child is None:
+                child = _Node(inherited)
+                node.children[segment] = child
+            node = child
+        node.policy = policy
+        self._propagate(node, inherited)
+        return policy
+
+    def _propagate(self, node: _Node, inherited: PathPolicy):
+        """
+        Recompute the effective policies of ``node`` and its subtree.
+        """
+        if node.policy is None:
+            node.effective = inherited
+        else:
+            node.effective = inherited.merge(node.policy)
+        for child in node.children.values():
+            self._propagate(child, node.effective)
+
+    def resolve(self, name: str) -> PathPolicy:
+        """
+        The effective policy of a parameter name or path.
+        """
+        node = self._root
+        for segment in _split(name):
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+        return node.effective
+
+    def __len__(self) -> int:
+        def count(node: _Node) -> int:
+            return int(node.policy is not None) + sum(
+                count(child) for child in node.children.values()
+            )
+
+        return count(self._root) - 1
+
+
+def get_with_decryption(
+    policies: PolicyRegistry | None,
+    name: str,
+    default: bool,
+) -> bool:
+    """
+    Whether to decrypt ``name``, from ``policies`` or else ``default``.
+    """
+    if policies is None:
+        return default
+    with_decryption = policies.resolve(name).with_decryption
+    return default if with_decryption is None else with_decryption
+
+
+def get_parameters_by_policy(
+    ssm_client: "SSMClient",
+    names: T.Iterable[str],
+    policies: PolicyRegistry | None,
+    with_decryption: bool = True,
+    max_workers: int | None = None,
+) -> dict[str, "Parameter"]:
+    """
+    :func:`~simple_aws_ssm_parameter_store.client.get_parameters`, with the
+    decryption of every name resolved from ``policies``. Names are batched
+    separately for each decryption setting.
+    """
+    names = list(dict.fromkeys(names))
+    groups: dict[bool, list[str]] = dict()
+    for name in names:
+        key = get_with_decryption(policies, name, with_decryption)
+        groups.setdefault(key, []).append(name)
+    fetched = dict()
+    for key, group in groups.items():
+        fetched.update(
+            get_parameters(
+                ssm_client,
+                group,
+                with_decryption=key,
+                max_workers=max_workers,
+            )
+        )
+    return {name: fetched[name] for name in names if name in fetched}
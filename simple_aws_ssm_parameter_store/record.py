@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+Portable JSON records of parameters, the line format of ``ssm-param export``
+and ``ssm-param import``, also used to copy parameters between paths by
+:mod:`~simple_aws_ssm_parameter_store.subtree`.
+
+A record is the
+:attr:`~simple_aws_ssm_parameter_store.model.Parameter.core_data` plus the
+value and the attributes needed to re-create the parameter.
+"""
+
+import typing as T
+
+from .constants import ParameterType, ParameterTier
+from .compression import get_compression_algorithm
+from .model import Parameter
+
+
+def parameter_to_record(
+    param: Parameter,
+    tags: dict[str, str] | None = None,
+    decrypted: bool = True,
+) -> dict[str, T.Any]:
+    """
+    Convert a parameter (metadata and value) to an ``export`` record.
+
+    :param decrypted: whether ``param`` was read with decryption. If not, a
+        SecureString record holds the encrypted value as is and is marked
+        ``"encrypted": true``
+    """
+    record = dict(param.core_data)
+    if record["last_modified_date"] is not None:
+        record["last_modified_date"] = record["last_modified_date"].isoformat()
+    encrypted = param.is_secure_string_type and not decrypted
+    algorithm = None if encrypted else get_compression_algorithm(param.raw_value)
+    record.update(
+        value=param.raw_value if encrypted else param.value,
+        encrypted=encrypted,
+        compression=algorithm.value if algorithm else None,
+        description=param.description,
+        key_id=param.key_id,
+        allowed_pattern=param.allowed_pattern,
+        data_type=param.data_type,
+        policies=[policy["PolicyText"] for policy in param.policies or []],
+    )
+    if tags is not None:
+        record["tags"] = tags
+    return record
+
+
+def record_to_kwargs(record: dict[str, T.Any]) -> dict[str, T.Any]:
+    """
+    Convert an ``export`` record to keyword arguments of
+    :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`.
+    Only the attributes present in the record are set.
+
+    :raises ValueError: the record holds an encrypted SecureString value,
+        writing it back would store the ciphertext as the value
+    """
+    if record.get("encrypted"):
+        raise ValueError(
+            f"the value of {record['name']} is encrypted, "
+            f"export SecureString parameters with --decrypt to import them"
+        )
+    kwargs = dict(
+        name=record["name"],
+        value=record["value"],
+        type=ParameterType(record.get("type") or ParameterType.STRING.value),
+    )
+    if record.get("tier") == ParameterTier.ADVANCED.value:
+        kwargs["tier"] = ParameterTier.ADVANCED
+    if record.get("compression"):
+        kwargs["compression"] = record["compression"]
+    if kwargs["type"] is ParameterType.SECURE_STRING and record.get("key_id"):
+        kwargs["key_id"] = record["key_id"]
+    for key in ["description", "allowed_pattern", "data_type", "tags"]:
+        if record.get(key):
+            kwargs[key] = record[key]
+    if record.get("policies"):
+        kwargs["policies"] = "[" + ",".join(record["policies"]) + "]"
+    return kwargs
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+Declarative binding of settings classes to parameters.
+
+Instead of one ``get_parameter`` call per field, :func:`load_settings` reads
+every field of a settings class in one batched read (``GetParameters``,
+10 names per call, batches fetched concurrently), then decodes each value and
+coerces it to the field type.
+
+Fields map to ``{prefix}/{field_name}`` by default. Use :func:`setting` on a
+dataclass field, or the ``names`` argument, to map a field to a
+relative or absolute parameter name, and to pick a
+:class:`~simple_aws_ssm_parameter_store.codec.Codec`.
+
+Example::
+
+    @dataclasses.dataclass
+    class DatabaseSettings:
+        host: str
+        port: int = 5432
+        replicas: list[str] = dataclasses.field(default_factory=list)
+        password: str = setting("/shared/prod/db/password")
+        options: dict = setting("db-options", codec="json", default_factory=dict)
+
+    cache = ParameterCache(ssm_client, ttl=300)
+    settings = load_settings(cache, DatabaseSettings, prefix="/app/prod/db")
+
+Pass a :class:`~simple_aws_ssm_parameter_store.cache.ParameterCache` as the
+source to make re-instantiating the settings, e.g. once per request, free of
+API calls until the cache entries expire. pydantic models are supported as
+well, they validate the coerced values as usual.
+"""
+
+import typing as T
+import types
+import dataclasses
+
+from .codec import (
+    Codec,
+    JSON_CODEC,
+    STRING_LIST_CODEC,
+    INT_CODEC,
+    BOOL_CODEC,
+    get_codec,
+)
+from .cache import ParameterCache
+from .policy import PolicyRegistry, get_parameters_by_policy
+from .exc import SettingsError
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+    from .model import Parameter
+
+
+_METADATA_KEY = "simple_aws_ssm_parameter_store.setting"
+
+
+@dataclasses.dataclass(frozen=True)
+class SettingSpec:
+    """
+    How a settings field maps to a parameter.
+
+    :param name: parameter name, absolute if it starts with ``/``, otherwise
+        relative to the prefix. Defaults to the field name
+    :param codec: codec used to decode the value, defaults to the one implied
+        by the field type
+    """
+
+    name: str | None = dataclasses.field(default=None)
+    codec: Codec | str | None = dataclasses.field(default=None)
+
+
+def setting(
+    name: str | None = None,
+    codec: Codec | str | None = None,
+    default: T.Any = dataclasses.MISSING,
+    default_factory: T.Any = dataclasses.MISSING,
+) -> T.Any:
+    """
+    Declare a dataclass field bound to a parameter, see :class:`SettingSpec`.
+
+    Fields with a default are optional, they keep the default when the
+    parameter doesn't exist.
+    """
+    return dataclasses.field(
+        default=default,
+        default_factory=default_factory,
+        metadata={_METADATA_KEY: SettingSpec(name=name, codec=codec)},
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class _Field:
+    attr: str = dataclasses.field()
+    type: T.Any = dataclasses.field()
+    spec: SettingSpec = dataclasses.field()
+    required: bool = dataclasses.field()
+
+
+def _iter_fields(
+    settings_class: type,
+    names: dict[str, str],
+) -> T.Iterator[_Field]:
+    hints = T.get_type_hints(settings_class)
+    if dataclasses.is_dataclass(settings_class):
+        for field in dataclasses.fields(settings_class):
+            if field.init is False:
+                continue
+            spec = field.metadata.get(_METADATA_KEY, SettingSpec())
+            required = (field.default is dataclasses.MISSING) and (
+                field.default_factory is dataclasses.MISSING
+            )
+            yield _Field(
+                attr=field.name,
+                type=hints.get(field.name, str),
+                spec=dataclasses.replace(spec, name=names.get(field.name, spec.name)),
+                required=required,
+            )
+    elif hasattr(settings_class, "model_fields"):  # pydantic v2
+        for attr, field in settings_class.model_fields.items():
+            yield _Field(
+                attr=attr,
+                type=hints.get(attr, str),
+                spec=SettingSpec(name=names.get(attr)),
+                required=field.is_required(),
+            )
+    else:
+        raise TypeError(f"{settings_class!r} is not a dataclass or a pydantic model")
+
+
+def _join_name(prefix: str, name: str) -> str:
+    if name.startswith("/") or not prefix:
+        return name
+    return f"{prefix.rstrip('/')}/{name}"
+
+
+def _unwrap_optional(type_: T.Any) -> T.Any:
+    if T.get_origin(type_) in (T.Union, types.UnionType):
+        args = [arg for arg in T.get_args(type_) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return type_
+
+
+def coerce_value(param: "Parameter", type_: T.Any) -> T.Any:
+    """
+    Convert a parameter value to ``type_``.
+
+    - ``str`` (or no annotation): the value as is
+    - ``bool``, ``int``: the built-in bool and int codecs
+    - ``float`` and other callables, e.g. ``Path``, ``Decimal`` or an
+      ``Enum``: ``type_(value)``
+    - ``list[...]``, ``tuple[...]``, ``set[...]``: a JSON array, or a comma
+      separated ``StringList``, items are coerced to the item type
+    - ``dict``: a JSON object
+
+    Decoded values are memoized on the ``Parameter`` object, so a cached
+    parameter is not parsed again.
+    """
+    type_ = _unwrap_optional(type_)
+    origin = T.get_origin(type_) or type_
+    if type_ in (str, T.Any):
+        return param.value
+    if type_ is bool:
+        return param.decode(BOOL_CODEC)
+    if type_ is int:
+        return param.decode(INT_CODEC)
+    if origin in (list, tuple, set, frozenset):
+        if param.value.lstrip().startswith("["):
+            items = param.decode(JSON_CODEC)
+        else:
+            items = param.decode(STRING_LIST_CODEC)
+        args = T.get_args(type_)
+        item_type = args[0] if args else str
+        if item_type not in (str, T.Any):
+            items = [item_type(item) for item in items]
+        return origin(items)
+    if origin is dict:
+        return param.decode(JSON_CODEC)
+    return type_(param.value)
+
+
+def load_settings(
+    source: T.Union["SSMClient", ParameterCache],
+    settings_class: type,
+    prefix: str = "",
+    names: dict[str, str] | None = None,
+    with_decryption: bool = True,
+    policies: PolicyRegistry | None = None,
+) -> T.Any:
+    """
+    Instantiate ``settings_class`` from parameters, with one batched read.
+
+    :param source: a :class:`~simple_aws_ssm_parameter_store.cache.ParameterCache`,
+        or an SSM client to always read from Parameter Store
+    :param settings_class: a dataclass or a pydantic model
+    :param prefix: path of the relative parameter names
+    :param names: ``{field_name: parameter_name}`` overrides
+    :param with_decryption: whether to decrypt SecureString parameter values,
+        ignored for a cache, which has its own setting
+    :param policies: per path decryption, ignored for a cache
+
+    :return: the ``settings_class`` instance
+    """
+    fields = list(_iter_fields(settings_class, names or {}))
+    param_names = {
+        field.attr: _join_name(prefix, field.spec.name or field.attr)
+        for field in fields
+    }
+    if isinstance(source, ParameterCache):
+        params = source.get_many(param_names.values())
+    else:
+        params = get_parameters_by_policy(
+            source,
+            param_names.values(),
+            policies,
+            with_decryption=with_decryption,
+        )
+
+    kwargs = dict()
+    missing = list()
+    for field in fields:
+        param_name = param_names[field.attr]
+        param = params.get(param_name)
+        if param is None:
+            if field.required:
+                missing.append(param_name)
+            continue
+        try:
+            if field.spec.codec is not None:
+                kwargs[field.attr] = param.decode(get_codec(field.spec.codec))
+            else:
+                kwargs[field.attr] = coerce_value(param, field.type)
+        except Exception as e:
+            raise SettingsError(
+                f"Cannot decode parameter {param_name!r} "
+                f"for field {settings_class.__name__}.{field.attr}: {e}"
+            ) from e
+    if missing:
+        raise SettingsError(
+            f"Required parameters of {settings_class.__name__} not found: "
+            f"{', '.join(missing)}"
+        )
+    return settings_class(**kwargs)
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parameter cache shared by the processes of one host, e.g. the forked workers
+of a gunicorn or uwsgi server, through a memory mapped file.
+
+:class:`SharedParameterCache` is a drop-in replacement of
+:class:`~simple_aws_ssm_parameter_store.cache.ParameterCache`, so it works
+with every function that takes a cache, e.g.
+:func:`~simple_aws_ssm_parameter_store.settings.load_settings`. Instead of
+one cache (and one stream of SSM calls) per worker, all the workers read the
+same file:
+
+- The file holds an index (name, offset, length, fetch time) followed by the
+  raw parameter data. Workers ``mmap`` it, and only the entries they look up
+  are sliced out of the shared page cache and parsed, once per process and
+  file generation.
+- When entries are missing or expired, the worker that takes the exclusive
+  ``flock`` on ``{path}.lock`` first becomes the refresher: it fetches all
+  of them with one batched read and atomically replaces the file. The other
+  workers wait for the lock, then find the fresh entries and make no call.
+- With ``stale_while_revalidate``, an expired entry is still served while a
+  background thread of the process refreshes it the same way. TTLs and
+  decryption follow the ``policies``, as in ``ParameterCache``.
+
+Example::
+
+    # in the gunicorn config, or anywhere before the workers read parameters
+    cache = SharedParameterCache(
+        ssm_client,
+        path="/dev/shm/my-app-ssm-cache",
+        ttl=300,
+    )
+
+.. note::
+
+    The file contains the decrypted values, it is created with ``0600``
+    permissions. Put it on a tmpfs such as ``/dev/shm`` to keep it in memory.
+    On platforms without ``fcntl`` (Windows) the file is read without
+    ``mmap`` and each process refreshes on its own.
+"""
+
+import typing as T
+import os
+import json
+import mmap
+import time
+import struct
+import contextlib
+from pathlib import Path
+
+from .cache import ParameterCache
+from .model import Parameter
+from .policy import PolicyRegistry
+from .instrument import record_cache_access
+from .utils import json_default, json_object_hook
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+_MAGIC = b"SSMPC001"
+_HEADER = struct.Struct("<8sQ")
+
+
+class _View:
+    """
+    One generation of the cache file, mapped into this process.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if fcntl is not None:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:  # pragma: no cover
+                self.buffer = f.read()
+        magic, index_length = _HEADER.unpack_from(self.buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a parameter cache file")
+        self.data_start = _HEADER.size + index_length
+        # name -> [offset, length, fetched_at]
+        self.index: dict[str, list] = json.loads(
+            self.buffer[_HEADER.size : self.data_start]
+        )
+        self._params: dict[str, Parameter | None] = dict()
+
+    def fetched_at(self, name: str) -> float | None:
+        try:
+            return self.index[name][2]
+        except KeyError:
+            return None
+
+    def raw(self, name: str) -> bytes:
+        offset, length, _ = self.index[name]
+        start = self.data_start + offset
+        return self.buffer[start : start + length]
+
+    def param(self, name: str) -> Parameter | None:
+        try:
+            return self._params[name]
+        except KeyError:
+            data = json.loads(self.raw(name), object_hook=json_object_hook)
+            param = None if data is None else Parameter(_data=data)
+            self._params[name] = param
+            return param
+
+
+def _to_blob(param: Parameter | None) -> bytes:
+    data = None if param is None else param.response
+    return json.dumps(data, default=json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _write_file(path: Path, blobs: dict[str, tuple[bytes, float]]):
+    index = dict()
+    offset = 0
+    for name, (blob, fetched_at) in blobs.items():
+        index[name] = [offset, len(blob), fetched_at]
+        offset += len(blob)
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for blob, _ in blobs.values():
+            f.write(blob)
+    os.replace(tmp, path)
+
+
+class SharedParameterCache(ParameterCache):
+    """
+    See module docstring.
+
+    :param ssm_client: SSM client
+    :param path: path of the cache file, shared by all processes
+    :param ttl: seconds an entry stays fresh
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param max_workers: max number of concurrent ``GetParameters`` calls
+    :param clock: wall clock, shared by all processes
+    :param stale_while_revalidate: seconds an expired entry is still served
+        while this process refreshes it in the background
+    :param policies: per path TTL, stale-while-revalidate and decryption
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        path: Path | str,
+        ttl: float = 60.0,
+        with_decryption: bool = True,
+        max_workers: int | None = None,
+        clock: T.Callable[[], float] = time.time,
+        stale_while_revalidate: float = 0.0,
+        policies: PolicyRegistry | None = None,
+    ):
+        super().__init__(
+            ssm_client,
+            ttl=ttl,
+            with_decryption=with_decryption,
+            max_workers=max_workers,
+            clock=clock,
+            stale_while_revalidate=stale_while_revalidate,
+            policies=policies,
+        )
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._view: _View | None = None
+
+    def _get_view(self) -> _View | None:
+        """
+        Get the mapping of the current cache file, remap it if another
+        process replaced the file.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._view = None
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._view is None or self._view.identity != identity:
+            self._view = _View(self.path)
+        return self._view
+
+    @contextlib.contextmanager
+    def _refresher_lock(self) -> T.Iterator[None]:
+        with self._lock:
+            if fcntl is None:  # pragma: no cover
+                yield
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _deadlines(self, view: _View | None, name: str) -> tuple[float, float] | None:
+        """
+        :return: the time ``name`` expires and the end of its
+            stale-while-revalidate window, None if it is not in the file
+        """
+        fetched_at = None if view is None else view.fetched_at(name)
+        if fetched_at is None:
+            return None
+        ttl, stale_while_revalidate = self._resolve_ttl(name)
+        expires_at = fetched_at + ttl
+        return expires_at, expires_at + stale_while_revalidate
+
+    def _find_stale(self, view: _View | None, names: list[str]) -> list[str]:
+        now = self.clock()
+        stale = list()
+        for name in names:
+            deadlines = self._deadlines(view, name)
+            if deadlines is None or deadlines[0] <= now:
+                stale.append(name)
+        return stale
+
+    def _copy_blobs(self, view: _View | None) -> dict[str, tuple[bytes, float]]:
+        """
+        Get the entries of ``view`` that are worth keeping in the next file
+        generation, i.e. drop the entries nobody asked for in a while.
+        """
+        now = self.clock()
+        blobs = dict()
+        if view is not None:
+            for name in view.index:
+                ttl, stale_while_revalidate = self._resolve_ttl(name)
+                fetched_at = view.fetched_at(name)
+                if fetched_at + 10 * ttl + stale_while_revalidate > now:
+                    blobs[name] = (view.raw(name), fetched_at)
+        return blobs
+
+    def _refresh(self, names: list[str]) -> _View:
+        """
+        Fetch the stale ones of ``names``, unless another process did it while
+        we waited for the lock, and write the new file generation.
+        """
+        with self._refresher_lock():
+            view = self._get_view()
+            stale = self._find_stale(view, names)
+            if stale:
+                fetched = self._fetch(stale)
+                blobs = self._copy_blobs(view)
+                now = self.clock()
+                for name in stale:
+                    blobs[name] = (_to_blob(fetched.get(name)), now)
+                _write_file(self.path, blobs)
+                view = self._get_view()
+            return view
+
+    def _refetch(self, names: list[str]):
+        self._refresh(names)
+
+    def _get_many(self, names: list[str], operation: str) -> dict[str, Parameter]:
+        view = self._get_view()
+        now = self.clock()
+        missing = list()
+        expired = list()
+        for name in names:
+            deadlines = self._deadlines(view, name)
+            if deadlines is None or deadlines[1] <= now:
+                missing.append(name)
+            elif deadlines[0] <= now:
+                expired.append(name)
+        for name in names:
+            record_cache_access(operation, name not in missing)
+        if missing:
+            # the expired names are refreshed in the same batch
+            view = self._refresh(names)
+        elif expired:
+            with self._lock:
+                for name in expired:
+                    self._schedule_revalidate(name)
+        params = dict()
+        for name in names:
+            param = view.param(name)
+            if param is not None:
+                params[name] = param
+        return params
+
+    def get(self, name: str) -> Parameter | None:
+        return self._get_many([name], "GetParameter").get(name)
+
+    def get_many(self, names: T.Iterable[str]) -> dict[str, Parameter]:
+        return self._get_many(list(dict.fromkeys(names)), "GetParameters")
+
+    def set(self, name: str, param: Parameter | None):
+        with self._refresher_lock():
+            view = self._get_view()
+            blobs = self._copy_blobs(view)
+            blobs[name] = (_to_blob(param), self.clock())
+            _write_file(self.path, blobs)
+
+    def invalidate(self, name: str | None = None):
+        with self._refresher_lock():
+            view = self._get_view()
+            if view is None:
+                return
+            blobs = {
+                key: (view.raw(key), view.fetched_at(key))
+                for key in view.index
+                if name is not None and key != name
+            }
+            _write_file(self.path, blobs)
+
+    def __len__(self) -> int:
+        view = self._get_view()
+        return 0 if view is None else len(view.index)
@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+
+"""
+Node level parameter cache, served over a Unix domain socket or local HTTP.
+
+Run one :class:`SidecarServer` per node (``ssm-param sidecar``), and let
+every process on the node read parameters through it, whatever its
+language. The server keeps one
+:class:`~simple_aws_ssm_parameter_store.cache.ParameterCache` with a TTL and
+stale-while-revalidate, so the SSM traffic of the node doesn't grow with the
+number of processes. Misses of a request are fetched together with batched
+``GetParameters`` calls.
+
+The protocol is JSON over HTTP/1.1, parameters are the raw ``GetParameters``
+response dictionaries (``LastModifiedDate`` as ``{"__datetime__": iso}``):
+
+- ``GET /parameter?name=/app/db/host``: ``{"parameter": {...}}``, 404 and
+  ``{"parameter": null}`` if it doesn't exist
+- ``POST /parameters`` with ``{"names": [...]}``: ``{"parameters": {name: {...}}}``
+- ``GET /parameters-by-path?path=/app/&recursive=true``: ``{"parameters": [...]}``
+- ``GET /health``: ``{"status": "ok"}``
+
+SSM errors are returned as 502 with ``{"error": {"code": ..., "message": ...}}``.
+
+On a Unix domain socket, access is controlled by the socket permissions
+(``0600`` by default). Over HTTP, any local process or a web page (through
+DNS rebinding) could otherwise read the decrypted values, so the server
+rejects requests whose ``Host`` header is not the server address with 403,
+and requests without ``Authorization: Bearer <token>`` with 401, except
+``/health``. The token is :attr:`SidecarServer.token`, generated unless one
+is given.
+
+Example::
+
+    # on the node
+    ssm-param sidecar --socket /run/ssm-param.sock --ttl 60 --stale 600
+
+    # in a Python process
+    client = SidecarClient(socket_path="/run/ssm-param.sock")
+    param = client.get("/app/db/host")
+
+    # over HTTP, the token is written to the token file
+    ssm-param sidecar --port 8741 --token-file /run/ssm-param.token
+    client = SidecarClient(url="http://127.0.0.1:8741", token=token)
+"""
+
+import typing as T
+import os
+import hmac
+import json
+import secrets
+import socket
+import logging
+import threading
+import dataclasses
+import http.client
+import socketserver
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cache import ParameterCache
+from .inventory import iter_parameters_by_path
+from .chunk import is_chunk_name
+from .model import Parameter
+from .utils import json_default, json_object_hook
+from .exc import SidecarError
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class _PathEntry:
+    names: list[str] = dataclasses.field()
+    expires_at: float = dataclasses.field()
+
+
+if hasattr(socketserver, "UnixStreamServer"):  # not on Windows
+
+    class _ThreadingUnixHTTPServer(
+        socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+    ):
+        daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sidecar: "SidecarServer"
+
+    def address_string(self) -> str:
+        # client_address is an empty string for Unix sockets
+        return str(self.client_address or "unix")
+
+    def log_message(self, format: str, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body: dict[str, T.Any]):
+        data = json.dumps(body, default=json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, func: T.Callable[[], tuple[int, dict[str, T.Any]]]):
+        import botocore.exceptions
+
+        try:
+            status, body = func()
+        except (KeyError, ValueError) as e:
+            status, body = 400, {"error": {"code": "BadRequest", "message": str(e)}}
+        except botocore.exceptions.ClientError as e:
+            error = e.response.get("Error", {})
+            status, body = 502, {
+                "error": {"code": error.get("Code"), "message": error.get("Message")}
+            }
+        except botocore.exceptions.BotoCoreError as e:
+            status, body = 502, {"error": {"code": type(e).__name__, "message": str(e)}}
+        self._send(status, body)
+
+    def _authorize(self, path: str) -> bool:
+        """
+        Check the ``Host`` header and the bearer token, send the error
+        response if the request is rejected.
+        """
+        sidecar = self.sidecar
+        if sidecar.allowed_hosts is not None:
+            if self.headers.get("Host") not in sidecar.allowed_hosts:
+                message = "invalid Host header"
+                self._send(403, {"error": {"code": "Forbidden", "message": message}})
+                return False
+        if sidecar.token is not None and path != "/health":
+            expected = f"Bearer {sidecar.token}".encode("utf-8")
+            actual = self.headers.get("Authorization", "").encode("utf-8")
+            if not hmac.compare_digest(actual, expected):
+                message = "missing or invalid bearer token"
+                self._send(401, {"error": {"code": "Unauthorized", "message": message}})
+                return False
+        return True
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if not self._authorize(url.path):
+            return
+        query = dict(urllib.parse.parse_qsl(url.query))
+        if url.path == "/health":
+            self._handle(lambda: (200, {"status": "ok"}))
+        elif url.path == "/parameter":
+            self._handle(lambda: self._get(query["name"]))
+        elif url.path == "/parameters-by-path":
+            self._handle(
+                lambda: self._get_by_path(
+                    query["path"], query.get("recursive", "true") == "true"
+                )
+            )
+        else:
+            self._send(404, {"error": {"code": "NotFound", "message": url.path}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        path = urllib.parse.urlsplit(self.path).path
+        if not self._authorize(path):
+            return
+        if path == "/parameters":
+            self._handle(lambda: self._get_many(json.loads(body)["names"]))
+        else:
+            self._send(404, {"error": {"code": "NotFound", "message": self.path}})
+
+    def _get(self, name: str) -> tuple[int, dict[str, T.Any]]:
+        param = self.sidecar.cache.get(name)
+        if param is None:
+            return 404, {"parameter": None}
+        return 200, {"parameter": param.response}
+
+    def _get_many(self, names: list[str]) -> tuple[int, dict[str, T.Any]]:
+        params = self.sidecar.cache.get_many(names)
+        return 200, {
+            "parameters": {name: param.response for name, param in params.items()}
+        }
+
+    def _get_by_path(self, path: str, recursive: bool) -> tuple[int, dict[str, T.Any]]:
+        params = self.sidecar.get_by_path(path, recursive=recursive)
+        return 200, {"parameters": [param.response for param in params]}
+
+
+class SidecarServer:
+    """
+    See module docstring.
+
+    :param ssm_client: SSM client
+    :param socket_path: serve on this Unix domain socket, otherwise on
+        ``host:port``
+    :param host: HTTP host, keep it local
+    :param port: HTTP port, 0 picks a free port
+    :param ttl: seconds an entry stays fresh
+    :param stale_while_revalidate: seconds an expired entry is still served
+        while it is refreshed in the background
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param max_workers: max number of concurrent ``GetParameters`` calls
+    :param socket_mode: permissions of the Unix domain socket
+    :param token: bearer token the clients must send. Over HTTP a random
+        token is generated if not given, on a Unix domain socket there is no
+        token by default
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        socket_path: str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ttl: float = 60.0,
+        stale_while_revalidate: float = 300.0,
+        with_decryption: bool = True,
+        max_workers: int | None = None,
+        socket_mode: int = 0o600,
+        token: str | None = None,
+    ):
+        self.ssm_client = ssm_client
+        self.cache = ParameterCache(
+            ssm_client,
+            ttl=ttl,
+            stale_while_revalidate=stale_while_revalidate,
+            with_decryption=with_decryption,
+            max_workers=max_workers,
+        )
+        self.socket_path = socket_path
+        self._paths: dict[tuple[str, bool], _PathEntry] = dict()
+        self._refreshing_paths: set[tuple[str, bool]] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+        handler = type("Handler", (_Handler,), {"sidecar": self})
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)  # left over by a previous run
+            self.server = _ThreadingUnixHTTPServer(socket_path, handler)
+            os.chmod(socket_path, socket_mode)
+            self.token = token
+            self.allowed_hosts: set[str] | None = None
+        else:
+            self.server = ThreadingHTTPServer((host, port), handler)
+            self.server.daemon_threads = True
+            self.token = token or secrets.token_urlsafe(32)
+            port = self.server.server_address[1]
+            self.allowed_hosts = {
+                f"{name}:{port}" for name in (host, "localhost", "127.0.0.1", "[::1]")
+            }
+
+    @property
+    def url(self) -> str | None:
+        """
+        Base URL of the HTTP server, None for a Unix domain socket.
+        """
+        if self.socket_path is not None:
+            return None
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _list_path(self, key: tuple[str, bool]) -> list[Parameter]:
+        path, recursive = key
+        params = [
+            param
+            for param in iter_parameters_by_path(
+                self.ssm_client,
+                path,
+                recursive=recursive,
+                with_decryption=self.cache.with_decryption,
+            )
+            if not is_chunk_name(param.name)
+        ]
+        for param in params:
+            self.cache.set(param.name, param)
+        with self._lock:
+            self._paths[key] = _PathEntry(
+                names=[param.name for param in params],
+                expires_at=self.cache.clock() + self.cache.ttl,
+            )
+        return params
+
+    def _revalidate_path(self, key: tuple[str, bool]):
+        try:
+            self._list_path(key)
+        except Exception:
+            logger.exception("Failed to revalidate path %s", key[0])
+        finally:
+            with self._lock:
+                self._refreshing_paths.discard(key)
+
+    def get_by_path(self, path: str, recursive: bool = True) -> list[Parameter]:
+        """
+        Get all parameters under ``path``, the listing is cached with the
+        same TTL and stale-while-revalidate policy as the parameters.
+        """
+        key = (path, recursive)
+        now = self.cache.clock()
+        with self._lock:
+            entry = self._paths.get(key)
+            if entry is not None and entry.expires_at <= now:
+                if entry.expires_at + self.cache.stale_while_revalidate > now:
+                    if key not in self._refreshing_paths:
+                        self._refreshing_paths.add(key)
+                        threading.Thread(
+                            target=self._revalidate_path,
+                            args=(key,),
+                            daemon=True,
+                        ).start()
+                else:
+                    entry = None
+        if entry is None:
+            return self._list_path(key)
+        return list(self.cache.get_many(entry.names).values())
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def start(self) -> "SidecarServer":
+        """
+        Serve in a background thread.
+        """
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            name="ssm-parameter-sidecar",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class SidecarClient:
+    """
+    Thin client of a :class:`SidecarServer`, returns
+    :class:`~simple_aws_ssm_parameter_store.model.Parameter` objects.
+
+    :param socket_path: Unix domain socket of the sidecar
+    :param url: base URL of the sidecar, if it serves HTTP
+    :param timeout: socket timeout in seconds
+    :param token: bearer token of the sidecar, see :attr:`SidecarServer.token`
+    """
+
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        url: str | None = None,
+        timeout: float = 5.0,
+        token: str | None = None,
+    ):
+        if (socket_path is None) == (url is None):
+            raise ValueError("Exactly one of socket_path and url is required")
+        self.socket_path = socket_path
+        self.url = url
+        self.timeout = timeout
+        self.token = token
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.socket_path is not None:
+            return _UnixHTTPConnection(self.socket_path, self.timeout)
+        url = urllib.parse.urlsplit(self.url)
+        return http.client.HTTPConnection(url.hostname, url.port, timeout=self.timeout)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, T.Any] | None = None,
+    ) -> tuple[int, dict[str, T.Any]]:
+        conn = self._connect()
+        try:
+            headers = {}
+            if self.token is not None:
+                headers["Authorization"] = f"Bearer {self.token}"
+            data = None
+            if body is not None:
+                data = json.dumps(body).encode("utf-8")
+                headers["Content-Type"] = "application/json"
+            conn.request(method, path, body=data, headers=headers)
+            response = conn.getresponse()
+            result = json.loads(response.read(), object_hook=json_object_hook)
+        finally:
+            conn.close()
+        if "error" in result:
+            error = result["error"]
+            raise SidecarError(response.status, error.get("code"), error.get("message"))
+        return response.status, result
+
+    def get(self, name: str) -> Parameter | None:
+        query = urllib.parse.urlencode({"name": name})
+        _, result = self._request("GET", f"/parameter?{query}")
+        data = result["parameter"]
+        return None if data is None else Parameter(_data=data)
+
+    def get_many(self, names: T.Iterable[str]) -> dict[str, Parameter]:
+        _, result = self._request("POST", "/parameters", {"names": list(names)})
+        return {
+            name: Parameter(_data=data) for name, data in result["parameters"].items()
+        }
+
+    def get_by_path(self, path: str, recursive: bool = True) -> list[Parameter]:
+        query = urllib.parse.urlencode(
+            {"path": path, "recursive": "true" if recursive else "false"}
+        )
+        _, result = self._request("GET", f"/parameters-by-path?{query}")
+        return [Parameter(_data=data) for data in result["parameters"]]
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+
+"""
+Copy or move a parameter subtree, e.g. ``/legacy/app/`` to ``/app/prod/``.
+
+A naive loop reads, re-creates and deletes the parameters one by one.
+:func:`copy_subtree` and :func:`move_subtree` instead:
+
+1. stream the source with
+   :func:`~simple_aws_ssm_parameter_store.inventory.iter_parameter_inventory`,
+   one ``DescribeParameters`` page (50 parameters) at a time, values read
+   with batched ``GetParameters`` calls
+2. write the targets with
+   :func:`~simple_aws_ssm_parameter_store.client.put_parameters_if_changed`:
+   the current targets are prefetched in batches, unchanged ones are
+   skipped, the others are written concurrently. Type, tier, KMS key,
+   description, allowed pattern, data type, policies and tags are preserved
+3. verify each page of targets with batched ``GetParameters`` calls
+4. for a move, once everything is copied and verified, delete the sources
+   with ``DeleteParameters`` (10 names per call)
+
+With a ``checkpoint_path``, the progress is saved after every page, and a
+failed or interrupted run resumes where it stopped when called again.
+
+The returned :class:`SubtreeReport` counts the API calls that were made and
+compares them with a naive loop.
+
+Example::
+
+    report = move_subtree(
+        ssm_client,
+        "/legacy/app/",
+        "/app/prod/",
+        checkpoint_path="move-legacy-app.json",
+    )
+    print(report.n_api_call, report.n_api_call_saved)
+"""
+
+import typing as T
+import json
+import threading
+import dataclasses
+from pathlib import Path
+
+from .client import (
+    get_parameters,
+    put_parameters_if_changed,
+    delete_parameters,
+    get_parameter_tags,
+    update_parameter_tags,
+)
+from .batch import map_batches, get_max_workers
+from .inventory import iter_parameter_inventory
+from .record import parameter_to_record, record_to_kwargs
+from .exc import SubtreeVerificationError
+from .utils import write_private_file
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+    from .model import Parameter
+
+
+@dataclasses.dataclass
+class SubtreeReport:
+    """
+    Result of :func:`copy_subtree` and :func:`move_subtree`.
+
+    :param n_parameter: number of source parameters
+    :param n_written: number of targets created or updated
+    :param n_unchanged: number of targets that already had the source value
+    :param n_resumed: number of parameters skipped, done by a previous run
+    :param n_deleted: number of source parameters deleted
+    :param n_api_call: number of API calls made
+    :param n_naive_api_call: number of API calls of a naive loop: per
+        parameter, ``DescribeParameters`` (metadata), ``GetParameter``,
+        ``ListTagsForResource``, ``GetParameter`` on the target, and
+        ``PutParameter``, plus ``DeleteParameter`` for a move
+    """
+
+    source_path: str = dataclasses.field()
+    target_path: str = dataclasses.field()
+    n_parameter: int = dataclasses.field(default=0)
+    n_written: int = dataclasses.field(default=0)
+    n_unchanged: int = dataclasses.field(default=0)
+    n_resumed: int = dataclasses.field(default=0)
+    n_deleted: int = dataclasses.field(default=0)
+    n_api_call: int = dataclasses.field(default=0)
+    n_naive_api_call: int = dataclasses.field(default=0)
+
+    @property
+    def n_api_call_saved(self) -> int:
+        return self.n_naive_api_call - self.n_api_call
+
+
+class _Paginator:
+    def __init__(self, paginator, counter: "_CallCounter"):
+        self.paginator = paginator
+        self.counter = counter
+
+    def paginate(self, **kwargs):
+        for page in self.paginator.paginate(**kwargs):
+            self.counter.add()
+            yield page
+
+
+class _CallCounter:
+    """
+    Count the API calls made through an SSM client, including paginated ones.
+    """
+
+    def __init__(self, ssm_client: "SSMClient"):
+        self._ssm_client = ssm_client
+        self._lock = threading.Lock()
+        self.n_call = 0
+
+    def add(self):
+        with self._lock:
+            self.n_call += 1
+
+    def get_paginator(self, operation_name: str) -> _Paginator:
+        return _Paginator(self._ssm_client.get_paginator(operation_name), self)
+
+    def __getattr__(self, name: str) -> T.Any:
+        attr = getattr(self._ssm_client, name)
+        if name.startswith("_") or name in ("meta", "exceptions", "can_paginate"):
+            return attr
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.add()
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def _normalize_path(path: str) -> str:
+    return path.rstrip("/") + "/"
+
+
+class _Checkpoint:
+    def __init__(
+        self,
+        path: Path | str | None,
+        source_path: str,
+        target_path: str,
+    ):
+        self.path = None if path is None else Path(path)
+        self.source_path = source_path
+        self.target_path = target_path
+        self.copied: dict[str, None] = dict()
+        self.deleted: dict[str, None] = dict()
+        if self.path is not None and self.path.exists():
+            data = json.loads(self.path.read_text())
+            if (data["source_path"], data["target_path"]) != (
+                source_path,
+                target_path,
+            ):
+                raise ValueError(
+                    f"Checkpoint {self.path} belongs to "
+                    f"{data['source_path']} -> {data['target_path']}"
+                )
+            self.copied = dict.fromkeys(data["copied"])
+            self.deleted = dict.fromkeys(data["deleted"])
+
+    def save(self):
+        if self.path is None:
+            return
+        data = dict(
+            source_path=self.source_path,
+            target_path=self.target_path,
+            copied=list(self.copied),
+            deleted=list(self.deleted),
+        )
+        write_private_file(self.path, json.dumps(data, indent=2))
+
+
+def _verify(
+    ssm_client: "SSMClient",
+    sources: list["Parameter"],
+    target_names: list[str],
+    max_workers: int | None,
+):
+    targets = get_parameters(
+        ssm_client,
+        target_names,
+        with_decryption=True,
+        max_workers=max_workers,
+    )
+    for source, target_name in zip(sources, target_names):
+        target = targets.get(target_name)
+        if target is None or target.value != source.value or target.type != source.type:
+            raise SubtreeVerificationError(
+                f"Target {target_name!r} doesn't match source {source.name!r}"
+            )
+
+
+def _transfer(
+    ssm_client: "SSMClient",
+    source_path: str,
+    target_path: str,
+    delete_source: bool,
+    with_tags: bool,
+    checkpoint_path: Path | str | None,
+    max_workers: int | None,
+) -> SubtreeReport:
+    source_path = _normalize_path(source_path)
+    target_path = _normalize_path(target_path)
+    if target_path.startswith(source_path) or source_path.startswith(target_path):
+        raise ValueError("source and target paths must not overlap")
+
+    counter = _CallCounter(ssm_client)
+    checkpoint = _Checkpoint(checkpoint_path, source_path, target_path)
+    report = SubtreeReport(source_path=source_path, target_path=target_path)
+    n_worker = get_max_workers(ssm_client, max_workers)
+    n_naive_per_param = 6 if delete_source else 5
+
+    def get_tags(batch: list[str]) -> dict[str, str]:
+        return get_parameter_tags(counter, batch[0])
+
+    page: list["Parameter"] = list()
+
+    def copy_page():
+        todo = [param for param in page if param.name not in checkpoint.copied]
+        report.n_resumed += len(page) - len(todo)
+        if not todo:
+            return
+        target_names = [target_path + param.name[len(source_path) :] for param in todo]
+        if with_tags:
+            tags_list = map_batches(
+                get_tags, [[param.name] for param in todo], n_worker
+            )
+        else:
+            tags_list = [None] * len(todo)
+        kwargs_list = list()
+        for param, target_name, tags in zip(todo, target_names, tags_list):
+            kwargs = record_to_kwargs(parameter_to_record(param, tags=tags))
+            kwargs["name"] = target_name
+            kwargs_list.append(kwargs)
+        results = put_parameters_if_changed(
+            counter,
+            kwargs_list,
+            max_workers=max_workers,
+        )
+        for kwargs, (before, after) in zip(kwargs_list, results):
+            if after is None:
+                report.n_unchanged += 1
+                continue
+            report.n_written += 1
+            # put_parameter only applies tags on create
+            if before is not None and kwargs.get("tags"):
+                update_parameter_tags(counter, kwargs["name"], kwargs["tags"])
+        _verify(counter, todo, target_names, max_workers)
+        checkpoint.copied.update(dict.fromkeys(param.name for param in todo))
+        checkpoint.save()
+
+    for param in iter_parameter_inventory(
+        counter,
+        path_prefix=source_path,
+        with_decryption=True,
+        max_workers=max_workers,
+    ):
+        report.n_parameter += 1
+        page.append(param)
+        if len(page) >= 50:
+            copy_page()
+            page.clear()
+    copy_page()
+
+    if delete_source:
+        # sources deleted by a previous run are not listed any more
+        report.n_parameter += len(checkpoint.deleted)
+        report.n_resumed += len(checkpoint.deleted)
+        names = [name for name in checkpoint.copied if name not in checkpoint.deleted]
+        if names:
+            delete_parameters(counter, names, max_workers=max_workers)
+            report.n_deleted = len(names)
+            checkpoint.deleted.update(dict.fromkeys(names))
+            checkpoint.save()
+
+    report.n_api_call = counter.n_call
+    report.n_naive_api_call = n_naive_per_param * (
+        report.n_parameter - report.n_resumed
+    )
+    return report
+
+
+def copy_subtree(
+    ssm_client: "SSMClient",
+    source_path: str,
+    target_path: str,
+    with_tags: bool = True,
+    checkpoint_path: Path | str | None = None,
+    max_workers: int | None = None,
+) -> SubtreeReport:
+    """
+    Copy all parameters under ``source_path`` to ``target_path``, see
+    module docstring.
+
+    :param ssm_client: SSM client
+    :param source_path: source path, e.g. ``/legacy/app/``
+    :param target_path: target path, e.g. ``/app/prod/``, must not overlap
+        with the source path
+    :param with_tags: whether to copy the tags
+    :param checkpoint_path: JSON file to save the progress in and resume from
+    :param max_workers: max number of concurrent API calls
+    """
+    return _transfer(
+        ssm_client,
+        source_path,
+        target_path,
+        delete_source=False,
+        with_tags=with_tags,
+        checkpoint_path=checkpoint_path,
+        max_workers=max_workers,
+    )
+
+
+def move_subtree(
+    ssm_client: "SSMClient",
+    source_path: str,
+    target_path: str,
+    with_tags: bool = True,
+    checkpoint_path: Path | str | None = None,
+    max_workers: int | None = None,
+) -> SubtreeReport:
+    """
+    Copy all parameters under ``source_path`` to ``target_path``, then delete
+    the sources, see module docstring. Nothing is deleted unless every
+    target was verified.
+
+    :param ssm_client: SSM client
+    :param source_path: source path, e.g. ``/legacy/app/``
+    :param target_path: target path, e.g. ``/app/prod/``, must not overlap
+        with the source path
+    :param with_tags: whether to copy the tags
+    :param checkpoint_path: JSON file to save the progress in and resume from
+    :param max_workers: max number of concurrent API calls
+    """
+    return _transfer(
+        ssm_client,
+        source_path,
+        target_path,
+        delete_source=True,
+        with_tags=with_tags,
+        checkpoint_path=checkpoint_path,
+        max_workers=max_workers,
+    )
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+"""
+Sync parameters from a desired state file (YAML or JSON) kept in git.
+
+File format::
+
+    # names are relative to ``path``, unless they start with "/"
+    path: /app/prod
+    parameters:
+      db/host: db.example.com             # a String parameter
+      db/password:
+        value: "..."
+        type: SecureString
+        key_id: alias/app
+        description: database password
+        tags: {team: data}
+      features:
+        value: {checkout: true}           # non-string values use the json codec
+      replicas:
+        value: [a, b]
+        type: StringList
+
+The keys of a parameter are the arguments of
+:func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`.
+
+:func:`sync_file` hashes every entry and the whole state. The hashes of the
+last applied state are stored in a marker parameter, a local state file, or
+both. With both, the marker is shared by everyone who applies the file and
+is the one compared, the local file is only a copy:
+
+- if the hash of the file matches, nothing is applied (one ``GetParameter``
+  call for the marker, none for the state file)
+- otherwise the file is diffed locally with the last applied state, and only
+  the added or changed entries go through
+  :func:`~simple_aws_ssm_parameter_store.client.put_parameters_if_changed`
+  (batched reads, concurrent writes). Entries removed from the file are
+  deleted with ``prune=True``
+
+Changes made outside of the file (drift) are not seen while the hash
+matches, use ``force=True`` to re-check every entry.
+
+SecureString entries are hashed with a keyed hash (HMAC), so the stored
+hashes can't be used to guess the secret values. The key is ``secret_key``,
+or a random key kept in the marker parameter, which is a SecureString. With
+only a local state file and no ``secret_key``, there is nowhere safe to keep
+a key: the SecureString entries are not hashed and are checked on every
+apply.
+
+YAML files require PyYAML, install it with
+``pip install simple_aws_ssm_parameter_store[yaml]``.
+
+Example::
+
+    result = sync_file(
+        ssm_client,
+        "parameters/prod.yml",
+        marker_name="/sync-state/app/prod",
+    )
+    if not result.skipped:
+        print(result.created, result.updated, result.deleted)
+"""
+
+import typing as T
+import hmac
+import json
+import secrets
+import hashlib
+import dataclasses
+from pathlib import Path
+
+from .constants import ParameterType, ParameterTier
+from .compression import CompressionAlgorithm
+from .client import (
+    get_parameter,
+    put_parameter_if_changed,
+    put_parameters_if_changed,
+    delete_parameters,
+)
+from .utils import write_private_file
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+_PARAMETER_KEYS = {
+    "value",
+    "type",
+    "description",
+    "tier",
+    "key_id",
+    "allowed_pattern",
+    "tags",
+    "policies",
+    "data_type",
+    "codec",
+    "compression",
+}
+
+
+def _import_yaml():
+    try:
+        import yaml
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "YAML desired state files require the 'PyYAML' package, "
+            "install it with 'pip install simple_aws_ssm_parameter_store[yaml]'"
+        ) from e
+    return yaml
+
+
+def parse_desired_state(
+    data: dict[str, T.Any],
+) -> dict[str, dict[str, T.Any]]:
+    """
+    Resolve a desired state document to
+    ``{name: put_parameter_if_changed kwargs}``, see module docstring.
+    """
+    path = data.get("path", "")
+    desired = dict()
+    for key, spec in (data.get("parameters") or {}).items():
+        name = key if key.startswith("/") else f"{path.rstrip('/')}/{key}"
+        if not isinstance(spec, dict):
+            spec = {"value": spec}
+        unknown = set(spec) - _PARAMETER_KEYS
+        if unknown:
+            raise ValueError(f"Unknown keys of parameter {name!r}: {sorted(unknown)}")
+        if "value" not in spec:
+            raise ValueError(f"Parameter {name!r} has no value")
+        kwargs = dict(spec, name=name)
+        kwargs["type"] = ParameterType(kwargs.get("type", ParameterType.STRING.value))
+        if "tier" in kwargs:
+            kwargs["tier"] = ParameterTier(kwargs["tier"])
+        if not isinstance(kwargs["value"], str) and "codec" not in kwargs:
+            if kwargs["type"] is ParameterType.STRING_LIST:
+                kwargs["codec"] = "string_list"
+            else:
+                kwargs["codec"] = "json"
+        if isinstance(kwargs.get("policies"), list):
+            kwargs["policies"] = json.dumps(kwargs["policies"])
+        desired[name] = kwargs
+    return desired
+
+
+def load_desired_state(path: Path | str) -> dict[str, dict[str, T.Any]]:
+    """
+    Load a ``.yml`` / ``.yaml`` or ``.json`` desired state file, see
+    :func:`parse_desired_state`.
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in (".yml", ".yaml"):
+        data = _import_yaml().safe_load(text)
+    else:
+        data = json.loads(text)
+    return parse_desired_state(data or {})
+
+
+def _hash(obj: T.Any, key: bytes | None = None) -> str:
+    text = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    if key is None:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hmac.new(key, text.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def hash_desired_state(
+    desired: dict[str, dict[str, T.Any]],
+    key: bytes | None = None,
+) -> tuple[str | None, dict[str, str | None]]:
+    """
+    :param key: key of the HMAC of the SecureString entries. Without a key
+        they are not hashed, their hash is None
+
+    :return: the hash of the whole state, None if an entry has no hash, and
+        the hash of every entry
+    """
+    entries = dict()
+    for name, kwargs in desired.items():
+        if kwargs["type"] is ParameterType.SECURE_STRING:
+            entries[name] = None if key is None else _hash(kwargs, key)[:16]
+        else:
+            entries[name] = _hash(kwargs)[:16]
+    if None in entries.values():
+        return None, entries
+    return _hash(entries), entries
+
+
+@dataclasses.dataclass
+class SyncResult:
+    """
+    Result of :func:`sync_file`.
+
+    :param hash: hash of the desired state, None if SecureString entries
+        could not be hashed
+    :param skipped: whether the apply was skipped because the hash matched
+    :param created: names of the created parameters
+    :param updated: names of the updated parameters
+    :param unchanged: names of the checked parameters that had the desired value
+    :param deleted: names of the deleted parameters
+    """
+
+    hash: str | None = dataclasses.field()
+    skipped: bool = dataclasses.field(default=False)
+    created: list[str] = dataclasses.field(default_factory=list)
+    updated: list[str] = dataclasses.field(default_factory=list)
+    unchanged: list[str] = dataclasses.field(default_factory=list)
+    deleted: list[str] = dataclasses.field(default_factory=list)
+
+
+def _read_state(
+    ssm_client: "SSMClient",
+    marker_name: str | None,
+    state_path: Path | None,
+) -> dict[str, T.Any]:
+    # the marker is shared, a local file may be stale
+    if marker_name is not None:
+        param = get_parameter(ssm_client, marker_name, with_decryption=True)
+        if param is not None:
+            return json.loads(param.value)
+    elif state_path is not None and state_path.exists():
+        return json.loads(state_path.read_text())
+    return {"hash": None, "entries": {}}
+
+
+def _write_state(
+    ssm_client: "SSMClient",
+    marker_name: str | None,
+    state_path: Path | None,
+    state: dict[str, T.Any],
+    marker_key: str | None = None,
+):
+    if marker_name is not None:
+        put_parameter_if_changed(
+            ssm_client,
+            marker_name,
+            state if marker_key is None else dict(state, key=marker_key),
+            # holds the key of the SecureString entry hashes
+            type=ParameterType.SECURE_STRING,
+            codec="json",
+            compression=CompressionAlgorithm.ZLIB,
+            auto_tier=True,
+        )
+    if state_path is not None:
+        write_private_file(state_path, json.dumps(state, indent=2, sort_keys=True))
+
+
+def sync_file(
+    ssm_client: "SSMClient",
+    path: Path | str,
+    marker_name: str | None = None,
+    state_path: Path | str | None = None,
+    prune: bool = True,
+    force: bool = False,
+    max_workers: int | None = None,
+    secret_key: str | bytes | None = None,
+) -> SyncResult:
+    """
+    Apply a desired state file, see module docstring.
+
+    :param ssm_client: SSM client
+    :param path: the ``.yml`` / ``.yaml`` / ``.json`` desired state file
+    :param marker_name: name of the parameter that stores the hashes of the
+        last applied state, shared by everyone who applies the file
+    :param state_path: local file that stores the hashes of the last applied
+        state, only read if there is no ``marker_name``
+    :param prune: whether to delete the parameters removed from the file,
+        otherwise they are left as they are and no longer tracked
+    :param force: whether to check every entry, even if the hash matches
+    :param max_workers: max number of concurrent API calls
+    :param secret_key: key of the keyed hash of the SecureString entries, by
+        default a random key kept in the marker parameter, see module docstring
+    """
+    if marker_name is None and state_path is None:
+        raise ValueError("marker_name or state_path is required")
+    state_path = None if state_path is None else Path(state_path)
+
+    desired = load_desired_state(path)
+    previous = _read_state(ssm_client, marker_name, state_path)
+    marker_key = None
+    if secret_key is None and marker_name is not None:
+        marker_key = previous.get("key") or secrets.token_hex(32)
+        secret_key = marker_key
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode("utf-8")
+    state_hash, entries = hash_desired_state(desired, key=secret_key)
+    result = SyncResult(hash=state_hash)
+    if state_hash is not None and previous["hash"] == state_hash and not force:
+        result.skipped = True
+        return result
+
+    previous_entries: dict[str, str | None] = previous["entries"]
+    changed = [
+        kwargs
+        for name, kwargs in desired.items()
+        if force or entries[name] is None or previous_entries.get(name) != entries[name]
+    ]
+    for (before, after), kwargs in zip(
+        put_parameters_if_changed(ssm_client, changed, max_workers=max_workers),
+        changed,
+    ):
+        if after is None:
+            result.unchanged.append(kwargs["name"])
+        elif before is None:
+            result.created.append(kwargs["name"])
+        else:
+            result.updated.append(kwargs["name"])
+
+    removed = [name for name in previous_entries if name not in desired]
+    if prune and removed:
+        result.deleted = delete_parameters(
+            ssm_client,
+            removed,
+            max_workers=max_workers,
+        )
+
+    _write_state(
+        ssm_client,
+        marker_name,
+        state_path,
+        {"hash": state_hash, "entries": entries},
+        marker_key=marker_key,
+    )
+    return result
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark helpers for the load tests in ``tests_load/``.
+
+The benchmarks run against moto in server mode, so every operation goes
+through the full boto3 HTTP stack (serialization, signing, connection pool)
+like it does against the real AWS endpoint.
+"""
+
+import typing as T
+import sys
+import json
+import time
+import platform
+import subprocess
+import dataclasses
+from pathlib import Path
+from datetime import datetime, timezone
+
+import boto3
+import botocore.exceptions
+
+from .._version import __version__
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from botocore.config import Config
+    from mypy_boto3_ssm.client import SSMClient
+    from ..fault import FaultInjectingClient
+
+
+class MotoServer:
+    """
+    Run moto in server mode on a random local port for the lifetime of the
+    context manager.
+
+    Example::
+
+        with MotoServer() as server:
+            ssm_client = server.get_ssm_client()
+    """
+
+    def __init__(self, region_name: str = "us-east-1"):
+        from moto.server import ThreadedMotoServer
+
+        self.region_name = region_name
+        self.server = ThreadedMotoServer(port=0, verbose=False)
+
+    def __enter__(self) -> "MotoServer":
+        self.server.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.stop()
+
+    @property
+    def endpoint_url(self) -> str:
+        _, port = self.server.get_host_and_port()
+        return f"http://127.0.0.1:{port}"
+
+    def get_ssm_client(self, config: T.Optional["Config"] = None) -> "SSMClient":
+        boto_ses = boto3.Session(
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+            region_name=self.region_name,
+        )
+        return boto_ses.client("ssm", endpoint_url=self.endpoint_url, config=config)
+
+
+class ApiCallCounter:
+    """
+    Count the SSM API calls made by a client, by operation name, using the
+    botocore ``before-call`` event.
+    """
+
+    def __init__(self, ssm_client: "SSMClient"):
+        self.counts: dict[str, int] = dict()
+        ssm_client.meta.events.register("before-call.ssm", self._on_before_call)
+
+    def _on_before_call(self, model, **kwargs):
+        self.counts[model.name] = self.counts.get(model.name, 0) + 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self):
+        self.counts.clear()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    """
+    :param name: benchmark name, e.g. ``get_parameter``
+    :param n_parameter: number of parameters in the store during the benchmark
+    :param n_op: number of operations measured
+    :param total_sec: wall clock time of all operations
+    :param ops_per_sec: operations per second
+    :param p50_ms: median latency in milliseconds
+    :param p99_ms: 99th percentile latency in milliseconds
+    :param api_calls_per_op: average number of SSM API calls per operation
+    """
+
+    name: str = dataclasses.field()
+    n_parameter: int = dataclasses.field()
+    n_op: int = dataclasses.field()
+    total_sec: float = dataclasses.field()
+    ops_per_sec: float = dataclasses.field()
+    p50_ms: float = dataclasses.field()
+    p99_ms: float = dataclasses.field()
+    api_calls_per_op: float = dataclasses.field()
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.n_parameter}]"
+
+
+def run_benchmark(
+    name: str,
+    func: T.Callable[[int], T.Any],
+    n_op: int,
+    n_parameter: int,
+    api_call_counter: ApiCallCounter,
+    n_warmup: int = 3,
+) -> BenchmarkResult:
+    """
+    Call ``func(i)`` ``n_op`` times and measure the latency of each call.
+
+    :param name: benchmark name
+    :param func: the operation, receives the iteration index
+    :param n_op: number of measured operations
+    :param n_parameter: number of parameters in the store, for the report
+    :param api_call_counter: counter attached to the client used by ``func``
+    :param n_warmup: number of un-measured warm up calls
+    """
+    for i in range(n_warmup):
+        func(i)
+    api_call_counter.reset()
+    latencies = list()
+    start = time.perf_counter()
+    for i in range(n_op):
+        op_start = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - op_start)
+    total_sec = time.perf_counter() - start
+    latencies.sort()
+    return BenchmarkResult(
+        name=name,
+        n_parameter=n_parameter,
+        n_op=n_op,
+        total_sec=total_sec,
+        ops_per_sec=n_op / total_sec if total_sec else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        api_calls_per_op=api_call_counter.total / n_op,
+    )
+
+
+@dataclasses.dataclass
+class FaultBenchmarkResult:
+    """
+    :param name: benchmark name, e.g. ``get_parameter``
+    :param scenario: fault scenario name, e.g. ``throttle 10%``
+    :param n_op: number of operations measured
+    :param total_sec: wall clock time of all operations
+    :param ops_per_sec: successful operations per second
+    :param p50_ms: median latency in milliseconds, failed operations included
+    :param p99_ms: 99th percentile latency in milliseconds
+    :param error_rate: ratio of operations that failed after all retries
+    :param attempts_per_op: average number of HTTP attempts per operation,
+        the error amplification of the scenario
+    """
+
+    name: str = dataclasses.field()
+    scenario: str = dataclasses.field()
+    n_op: int = dataclasses.field()
+    total_sec: float = dataclasses.field()
+    ops_per_sec: float = dataclasses.field()
+    p50_ms: float = dataclasses.field()
+    p99_ms: float = dataclasses.field()
+    error_rate: float = dataclasses.field()
+    attempts_per_op: float = dataclasses.field()
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.scenario}]"
+
+
+def run_fault_benchmark(
+    name: str,
+    scenario: str,
+    func: T.Callable[[int], T.Any],
+    n_op: int,
+    fault_client: "FaultInjectingClient",
+) -> FaultBenchmarkResult:
+    """
+    Call ``func(i)`` ``n_op`` times against a fault injecting client, counting
+    operations that still fail after the client's retries.
+    """
+    fault_client.stats.reset()
+    latencies = list()
+    n_failed = 0
+    start = time.perf_counter()
+    for i in range(n_op):
+        op_start = time.perf_counter()
+        try:
+            func(i)
+        except botocore.exceptions.BotoCoreError:
+            n_failed += 1
+        except botocore.exceptions.ClientError:
+            n_failed += 1
+        latencies.append(time.perf_counter() - op_start)
+    total_sec = time.perf_counter() - start
+    latencies.sort()
+    return FaultBenchmarkResult(
+        name=name,
+        scenario=scenario,
+        n_op=n_op,
+        total_sec=total_sec,
+        ops_per_sec=(n_op - n_failed) / total_sec if total_sec else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        error_rate=n_failed / n_op,
+        attempts_per_op=fault_client.stats.total_attempt / n_op,
+    )
+
+
+@dataclasses.dataclass
+class ImportTimeRecord:
+    """
+    One line of ``python -X importtime`` output.
+
+    :param module: module name
+    :param self_us: import time of the module itself in microseconds
+    :param cumulative_us: import time including its own imports in microseconds
+    :param depth: nesting level, 0 for modules imported by the script
+    """
+
+    module: str = dataclasses.field()
+    self_us: int = dataclasses.field()
+    cumulative_us: int = dataclasses.field()
+    depth: int = dataclasses.field()
+
+
+def measure_import_time(code: str) -> list[ImportTimeRecord]:
+    """
+    Run ``code`` in a fresh interpreter with ``-X importtime`` and parse the
+    import time breakdown from its stderr.
+    """
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = list()
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        records.append(
+            ImportTimeRecord(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+            )
+        )
+    return records
+
+
+def write_results(
+    path: Path,
+    results: list[BenchmarkResult | FaultBenchmarkResult],
+) -> Path:
+    """
+    Write benchmark results as JSON, together with the environment metadata
+    needed to compare results across releases.
+    """
+    data = {
+        "version": __version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "boto3": boto3.__version__,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "results": [dataclasses.asdict(result) for result in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=4))
+    return path
+
+
+def format_fault_results(results: list[FaultBenchmarkResult]) -> str:
+    """
+    Render fault benchmark results as a fixed width text table.
+    """
+    lines = [
+        f"{'benchmark':<32} {'scenario':<20} {'ops/sec':>9} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>7} {'attempts/op':>12}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.name:<32} {r.scenario:<20} {r.ops_per_sec:>9.1f} {r.p50_ms:>8.2f} "
+            f"{r.p99_ms:>8.2f} {r.error_rate:>7.1%} {r.attempts_per_op:>12.2f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_results(
+    baseline_path: Path,
+    current_path: Path,
+    max_slowdown: float = 0.2,
+) -> list[str]:
+    """
+    Compare two result files written by :func:`write_results`.
+
+    :param max_slowdown: allowed relative drop of ``ops_per_sec``
+        and rise of ``api_calls_per_op`` (``attempts_per_op`` for fault
+        benchmarks), e.g. 0.2 for 20%
+
+    :return: list of human readable regressions, empty if none
+    """
+
+    def load(path: Path) -> dict[str, dict[str, T.Any]]:
+        data = json.loads(path.read_text())
+        return {
+            (
+                FaultBenchmarkResult(**dct)
+                if "scenario" in dct
+                else BenchmarkResult(**dct)
+            ).key: dct
+            for dct in data["results"]
+        }
+
+    baseline = load(baseline_path)
+    current = load(current_path)
+    regressions = list()
+    for key, dct in current.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        if dct["ops_per_sec"] < base["ops_per_sec"] * (1 - max_slowdown):
+            regressions.append(
+                f"{key}: ops/sec {base['ops_per_sec']:.1f} -> {dct['ops_per_sec']:.1f}"
+            )
+        calls = "api_calls_per_op" if "api_calls_per_op" in dct else "attempts_per_op"
+        if dct[calls] > base[calls] * (1 + max_slowdown):
+            regressions.append(f"{key}: {calls} {base[calls]:.2f} -> {dct[calls]:.2f}")
+    return regressions
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """
+    Render results as a fixed width text table.
+    """
+    lines = [
+        f"{'benchmark':<40} {'params':>7} {'ops/sec':>10} {'p50 ms':>8} {'p99 ms':>8} {'calls/op':>9}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.name:<40} {r.n_parameter:>7} {r.ops_per_sec:>10.1f} "
+            f"{r.p50_ms:>8.2f} {r.p99_ms:>8.2f} {r.api_calls_per_op:>9.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parameter tier advisor and cost estimator.
+
+This module only contains the pure decision logic, so it can be used in the
+write path of :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`.
+The streamed account-wide scan lives in
+:func:`~simple_aws_ssm_parameter_store.inventory.scan_tier_report`.
+
+See `Parameter tiers <https://docs.aws.amazon.com/systems-manager/latest/userguide/parameter-store-advanced-parameters.html>`_
+and `AWS Systems Manager pricing <https://aws.amazon.com/systems-manager/pricing/>`_.
+"""
+
+import typing as T
+import dataclasses
+
+from .constants import (
+    ParameterTier,
+    STANDARD_TIER_MAX_VALUE_SIZE,
+)
+from .compression import (
+    CompressionAlgorithm,
+    compress_value,
+    get_value_size,
+)
+from .model import Parameter
+
+
+@dataclasses.dataclass(frozen=True)
+class StandardTierCandidate:
+    """
+    An Advanced tier parameter whose value fits into the Standard tier.
+
+    .. note::
+
+        Parameter Store cannot change an Advanced parameter back to Standard
+        in place, the parameter has to be deleted and re-created, which also
+        drops its version history.
+
+    :param name: parameter name
+    :param value_size: size in bytes of the uncompressed value
+    :param compressed_size: size in bytes of the value after compression
+    :param needs_compression: whether the value only fits after compression
+    """
+
+    name: str = dataclasses.field()
+    value_size: int = dataclasses.field()
+    compressed_size: int = dataclasses.field()
+    needs_compression: bool = dataclasses.field()
+
+
+def find_standard_tier_candidates(
+    params: T.Iterable[Parameter],
+    algorithm: CompressionAlgorithm | str = CompressionAlgorithm.ZLIB,
+    max_size: int = STANDARD_TIER_MAX_VALUE_SIZE,
+) -> T.Iterator[StandardTierCandidate]:
+    """
+    Report the Advanced tier parameters that could drop back to the Standard
+    tier, with or without compression.
+
+    Parameters with policies are skipped, because parameter policies are only
+    available in the Advanced tier. Policies are only known for parameters
+    that carry ``describe_parameters`` metadata.
+
+    :param params: parameters with values, e.g. from
+        :func:`~simple_aws_ssm_parameter_store.client.get_parameters`
+    :param algorithm: compression algorithm used to estimate the compressed size
+    :param max_size: max value size in bytes of the target tier
+    """
+    for param in params:
+        if param.tier != ParameterTier.ADVANCED.value:
+            continue
+        if param.policies:
+            continue
+        value_size = get_value_size(param.value)
+        compressed_size = get_value_size(compress_value(param.value or "", algorithm))
+        if value_size <= max_size:
+            needs_compression = False
+        elif compressed_size <= max_size:
+            needs_compression = True
+        else:
+            continue
+        yield StandardTierCandidate(
+            name=param.name,
+            value_size=value_size,
+            compressed_size=compressed_size,
+            needs_compression=needs_compression,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class TierPricing:
+    """
+    Price and quota figures used by the cost estimator. The defaults are the
+    published us-east-1 numbers, override them for other regions or when
+    AWS changes its pricing.
+
+    :param advanced_parameter_monthly_cost: USD per Advanced parameter per month
+    :param api_interaction_cost: USD per 10,000 API interactions, charged for
+        Advanced parameters and for Standard parameters with higher throughput
+    :param standard_max_parameters: max number of Standard parameters per region
+    :param advanced_max_parameters: max number of Advanced parameters per region
+    :param standard_throughput_tps: default max get TPS per account and region
+    :param higher_throughput_tps: max get TPS with higher throughput enabled
+    """
+
+    advanced_parameter_monthly_cost: float = dataclasses.field(default=0.05)
+    api_interaction_cost: float = dataclasses.field(default=0.05)
+    standard_max_parameters: int = dataclasses.field(default=10_000)
+    advanced_max_parameters: int = dataclasses.field(default=100_000)
+    standard_throughput_tps: int = dataclasses.field(default=40)
+    higher_throughput_tps: int = dataclasses.field(default=10_000)
+
+
+def select_tier(
+    value: str,
+    policies: str | None = None,
+    before_tier: str | None = None,
+) -> ParameterTier:
+    """
+    Pick the cheapest tier that can hold the value.
+
+    - An existing Advanced parameter stays Advanced, it cannot be downgraded in place.
+    - Parameter policies require the Advanced tier.
+    - Values larger than the Standard tier limit require the Advanced tier.
+
+    :param value: the raw value to store (after compression, if any)
+    :param policies: parameter policies (JSON string)
+    :param before_tier: tier of the existing parameter, if any
+    """
+    if before_tier == ParameterTier.ADVANCED.value:
+        return ParameterTier.ADVANCED
+    if policies:
+        return ParameterTier.ADVANCED
+    if get_value_size(value) > STANDARD_TIER_MAX_VALUE_SIZE:
+        return ParameterTier.ADVANCED
+    return ParameterTier.STANDARD
+
+
+@dataclasses.dataclass(frozen=True)
+class TierRecommendation:
+    """
+    A suggested tier change for one parameter.
+
+    :param name: parameter name
+    :param current_tier: current tier
+    :param recommended_tier: recommended tier
+    :param value_size: size in bytes of the value, None if the value was not read
+    :param reason: human readable explanation
+    """
+
+    name: str = dataclasses.field()
+    current_tier: str = dataclasses.field()
+    recommended_tier: str = dataclasses.field()
+    value_size: int | None = dataclasses.field()
+    reason: str = dataclasses.field()
+
+
+@dataclasses.dataclass
+class TierStats:
+    """
+    Aggregated statistics of the parameters in one tier.
+    """
+
+    n_parameter: int = dataclasses.field(default=0)
+    n_with_policies: int = dataclasses.field(default=0)
+    n_value_read: int = dataclasses.field(default=0)
+    total_value_size: int = dataclasses.field(default=0)
+    max_value_size: int = dataclasses.field(default=0)
+
+
+@dataclasses.dataclass
+class TierReport:
+    """
+    Incrementally built tier report. Feed parameters one by one with
+    :meth:`add`, only aggregates and recommendations are kept, so the
+    memory usage does not grow with the number of values scanned.
+
+    :param pricing: price and quota figures
+    :param compression: if given, Advanced parameters that only fit the
+        Standard tier after compression are also recommended for downgrade
+    """
+
+    pricing: TierPricing = dataclasses.field(default_factory=TierPricing)
+    compression: CompressionAlgorithm | str | None = dataclasses.field(default=None)
+    stats: dict[str, TierStats] = dataclasses.field(
+        default_factory=lambda: {
+            ParameterTier.STANDARD.value: TierStats(),
+            ParameterTier.ADVANCED.value: TierStats(),
+        }
+    )
+    recommendations: list[TierRecommendation] = dataclasses.field(default_factory=list)
+
+    def add(self, param: Parameter) -> TierRecommendation | None:
+        """
+        Account one parameter. The parameter should carry ``describe_parameters``
+        metadata, the value is optional.
+
+        :return: the recommendation for this parameter, if any
+        """
+        tier = param.tier or ParameterTier.STANDARD.value
+        stats = self.stats.setdefault(tier, TierStats())
+        stats.n_parameter += 1
+        if param.policies:
+            stats.n_with_policies += 1
+        value_size = None
+        if param.raw_value is not None:
+            value_size = get_value_size(param.raw_value)
+            stats.n_value_read += 1
+            stats.total_value_size += value_size
+            stats.max_value_size = max(stats.max_value_size, value_size)
+
+        recommendation = None
+        if tier == ParameterTier.ADVANCED.value and param.value is not None:
+            algorithm = self.compression or CompressionAlgorithm.ZLIB
+            for candidate in find_standard_tier_candidates([param], algorithm):
+                if candidate.needs_compression and self.compression is None:
+                    break
+                reason = (
+                    "value fits the Standard tier after compression"
+                    if candidate.needs_compression
+                    else "value fits the Standard tier and has no policies"
+                )
+                recommendation = TierRecommendation(
+                    name=param.name,
+                    current_tier=tier,
+                    recommended_tier=ParameterTier.STANDARD.value,
+                    value_size=value_size,
+                    reason=f"{reason}, re-create the parameter to downgrade",
+                )
+                self.recommendations.append(recommendation)
+        return recommendation
+
+    @property
+    def n_standard(self) -> int:
+        return self.stats[ParameterTier.STANDARD.value].n_parameter
+
+    @property
+    def n_advanced(self) -> int:
+        return self.stats[ParameterTier.ADVANCED.value].n_parameter
+
+    @property
+    def monthly_storage_cost(self) -> float:
+        """Current monthly parameter storage cost in USD."""
+        return self.n_advanced * self.pricing.advanced_parameter_monthly_cost
+
+    @property
+    def recommended_monthly_storage_cost(self) -> float:
+        """Monthly parameter storage cost in USD after applying all recommendations."""
+        n_downgrade = sum(
+            1
+            for rec in self.recommendations
+            if rec.recommended_tier == ParameterTier.STANDARD.value
+        )
+        return (
+            self.n_advanced - n_downgrade
+        ) * self.pricing.advanced_parameter_monthly_cost
+
+    def estimate_api_cost(
+        self,
+        monthly_api_interactions: int,
+        higher_throughput: bool = False,
+    ) -> float:
+        """
+        Estimate the monthly API interaction cost in USD, assuming interactions
+        are evenly spread over all scanned parameters.
+
+        :param monthly_api_interactions: total number of API interactions per month
+        :param higher_throughput: whether higher throughput is enabled in the account
+        """
+        n_total = self.n_standard + self.n_advanced
+        if n_total == 0:
+            return 0.0
+        if higher_throughput:
+            n_charged = monthly_api_interactions
+        else:
+            n_charged = monthly_api_interactions * self.n_advanced / n_total
+        return n_charged / 10_000 * self.pricing.api_interaction_cost
+
+    def get_max_tps(self, higher_throughput: bool = False) -> int:
+        """
+        Max get throughput (transactions per second), shared by all tiers.
+        """
+        if higher_throughput:
+            return self.pricing.higher_throughput_tps
+        return self.pricing.standard_throughput_tps
+
+    @property
+    def standard_quota_usage(self) -> float:
+        """Fraction of the Standard tier parameter quota in use."""
+        return self.n_standard / self.pricing.standard_max_parameters
+
+    @property
+    def advanced_quota_usage(self) -> float:
+        """Fraction of the Advanced tier parameter quota in use."""
+        return self.n_advanced / self.pricing.advanced_max_parameters
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import typing as T
+import os
+import tempfile
+from pathlib import Path
+from datetime import datetime
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from mypy_boto3_ssm.type_defs import TagTypeDef
@@ -28,3 +32,46 @@ def decode_tags(tag_list: list["TagTypeDef"]) -> dict[str, str]:
         {'name': 'Alice'}
     """
     return {dct["Key"]: dct["Value"] for dct in tag_list}
+
+
+_DATETIME_KEY = "__datetime__"
+
+
+def json_default(obj: T.Any) -> T.Any:
+    """
+    ``default`` hook of :func:`json.dumps` for API response data, which may
+    contain ``datetime`` values, e.g. ``LastModifiedDate``.
+    """
+    if isinstance(obj, datetime):
+        return {_DATETIME_KEY: obj.isoformat()}
+    raise TypeError(f"{obj!r} is not JSON serializable")
+
+
+def json_object_hook(dct: dict[str, T.Any]) -> T.Any:
+    """
+    ``object_hook`` of :func:`json.loads`, the reverse of :func:`json_default`.
+    """
+    if len(dct) == 1 and _DATETIME_KEY in dct:
+        return datetime.fromisoformat(dct[_DATETIME_KEY])
+    return dct
+
+
+def write_private_file(path: Path | str, content: str) -> Path:
+    """
+    Atomically write ``content`` to ``path``, readable by the owner only.
+
+    The content goes to a new temp file, which :func:`tempfile.mkstemp`
+    always creates with mode ``0600``, then replaces ``path``. An existing
+    file with broader permissions is therefore replaced rather than reused.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
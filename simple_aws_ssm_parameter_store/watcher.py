@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+
+"""
+Push parameter changes to callbacks, with one shared, batched poll.
+
+A :class:`ParameterWatcher` serves all its subscriptions from one background
+thread. Each poll:
+
+- reads all the watched names with ``GetParameters`` (10 names per call)
+- lists all the watched prefixes with ``DescribeParameters`` (50 parameters
+  per call, no values), and only reads the values of the parameters whose
+  ``Version`` changed
+- compares the ``Version`` with the last seen one, and calls the matching
+  callbacks with ``(old, new)`` :class:`~simple_aws_ssm_parameter_store.model.Parameter`
+  pairs. ``old`` is None for a created parameter, ``new`` is None for a
+  deleted one
+
+The poll interval adapts: it drops to ``min_interval`` after a change, and
+grows by ``backoff`` after every quiet poll (or failed poll, e.g. throttled)
+up to ``max_interval``.
+
+With a :class:`~simple_aws_ssm_parameter_store.policy.PolicyRegistry`, the
+watched names and prefixes whose policy has a ``refresh_interval`` are
+polled on that fixed schedule instead, e.g. feature flags every 5 seconds
+and database endpoints every hour, and their decryption is resolved from
+the policy too. Targets that are due at the same time share the poll.
+
+Example::
+
+    watcher = get_shared_watcher(ssm_client)
+    watcher.watch("/app/flags/new-checkout", on_flag_change)
+    watcher.watch_prefix("/app/prod/", on_config_change)
+"""
+
+import typing as T
+import time
+import logging
+import weakref
+import threading
+import dataclasses
+
+from .inventory import iter_parameter_metadata
+from .model import Parameter
+from .policy import PolicyRegistry, get_with_decryption, get_parameters_by_policy
+from .kms import get_parameters_by_key
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+logger = logging.getLogger(__name__)
+
+T_CALLBACK = T.Callable[[Parameter | None, Parameter | None], T.Any]
+
+
+@dataclasses.dataclass(frozen=True, eq=False)
+class Subscription:
+    """
+    A registered callback, returned by :meth:`ParameterWatcher.watch` and
+    :meth:`ParameterWatcher.watch_prefix`.
+
+    :param names: watched parameter names
+    :param prefixes: watched name prefixes
+    :param callback: called with ``(old, new)`` for every change
+    """
+
+    names: tuple[str, ...] = dataclasses.field()
+    prefixes: tuple[str, ...] = dataclasses.field()
+    callback: T_CALLBACK = dataclasses.field()
+
+    def match(self, name: str) -> bool:
+        return name in self.names or any(
+            name.startswith(prefix) for prefix in self.prefixes
+        )
+
+
+def _version(param: Parameter | None) -> int | None:
+    return None if param is None else param.version
+
+
+class ParameterWatcher:
+    """
+    See module docstring.
+
+    :param ssm_client: SSM client
+    :param min_interval: seconds between polls right after a change
+    :param max_interval: upper bound of the seconds between polls
+    :param backoff: interval multiplier after a poll without changes
+    :param with_decryption: whether to decrypt SecureString parameter values
+    :param policies: per path refresh interval and decryption
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        with_decryption: bool = True,
+        policies: PolicyRegistry | None = None,
+    ):
+        self.ssm_client = ssm_client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.with_decryption = with_decryption
+        self.policies = policies
+        self.interval = min_interval
+        # next poll of the adaptive targets, and of every scheduled target
+        self._adaptive_due = 0.0
+        self._due: dict[str, float] = dict()
+        self._subscriptions: list[Subscription] = list()
+        # last seen parameter of every watched name
+        self._state: dict[str, Parameter | None] = dict()
+        self._lock = threading.RLock()
+        self._poll_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # --- subscriptions
+    def _subscribe(
+        self,
+        names: tuple[str, ...],
+        prefixes: tuple[str, ...],
+        callback: T_CALLBACK,
+        start: bool,
+    ) -> Subscription:
+        subscription = Subscription(names=names, prefixes=prefixes, callback=callback)
+        # take the baseline now, so the first poll only reports real changes
+        with self._poll_lock:
+            baseline = self._fetch(names, prefixes, self._state)
+            with self._lock:
+                for name, param in baseline.items():
+                    self._state.setdefault(name, param)
+                self._subscriptions.append(subscription)
+        if start:
+            self.start()
+        return subscription
+
+    def watch(
+        self,
+        names: str | T.Iterable[str],
+        callback: T_CALLBACK,
+        start: bool = True,
+    ) -> Subscription:
+        """
+        Call ``callback(old, new)`` when any of ``names`` changes.
+
+        :param start: whether to start the background thread if needed
+        """
+        if isinstance(names, str):
+            names = [names]
+        return self._subscribe(tuple(dict.fromkeys(names)), (), callback, start)
+
+    def watch_prefix(
+        self,
+        prefix: str,
+        callback: T_CALLBACK,
+        start: bool = True,
+    ) -> Subscription:
+        """
+        Call ``callback(old, new)`` when a parameter whose name begins with
+        ``prefix`` is created, updated or deleted.
+
+        :param start: whether to start the background thread if needed
+        """
+        return self._subscribe((), (prefix,), callback, start)
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.remove(subscription)
+            names, prefixes = self._targets()
+            for name in list(self._state):
+                if name not in names and not name.startswith(prefixes):
+                    del self._state[name]
+            for target in list(self._due):
+                if target not in names and target not in prefixes:
+                    del self._due[target]
+
+    def _targets(self) -> tuple[list[str], tuple[str, ...]]:
+        names = dict()
+        prefixes = dict()
+        for subscription in self._subscriptions:
+            names.update(dict.fromkeys(subscription.names))
+            prefixes.update(dict.fromkeys(subscription.prefixes))
+        return list(names), tuple(prefixes)
+
+    # --- polling
+    def _get_parameters(self, names: T.Sequence[str]) -> dict[str, Parameter]:
+        return get_parameters_by_policy(
+            self.ssm_client,
+            names,
+            self.policies,
+            with_decryption=self.with_decryption,
+        )
+
+    def _fetch(
+        self,
+        names: T.Sequence[str],
+        prefixes: T.Sequence[str],
+        state: dict[str, Parameter | None],
+    ) -> dict[str, Parameter | None]:
+        """
+        Get the current parameter of the watched names, and of every
+        parameter under the watched prefixes. Values under the prefixes are
+        only read when the version differs from ``state``, batched by KMS
+        key from the metadata.
+        """
+        result: dict[str, Parameter | None] = dict.fromkeys(names)
+        result.update(self._get_parameters(names))
+        to_read = list()
+        for prefix in prefixes:
+            for meta in iter_parameter_metadata(self.ssm_client, path_prefix=prefix):
+                if meta.name in result:
+                    continue
+                old = state.get(meta.name)
+                if old is not None and old.version == meta.version:
+                    result[meta.name] = old
+                else:
+                    to_read.append(meta)
+        # the parameter may be deleted in the meantime, then it's simply absent
+        result.update(
+            get_parameters_by_key(
+                self.ssm_client,
+                to_read,
+                with_decryption=lambda meta: get_with_decryption(
+                    self.policies, meta.name, self.with_decryption
+                ),
+            )
+        )
+        return result
+
+    def poll(self) -> list[tuple[Parameter | None, Parameter | None]]:
+        """
+        Poll all the watched names and prefixes once, and dispatch the
+        changes to the callbacks.
+
+        :return: the ``(old, new)`` pairs of the changed parameters
+        """
+        with self._lock:
+            names, prefixes = self._targets()
+        return self._poll(names, prefixes)
+
+    def _poll(
+        self,
+        names: list[str],
+        prefixes: tuple[str, ...],
+    ) -> list[tuple[Parameter | None, Parameter | None]]:
+        """
+        Poll some of the watched names and prefixes.
+        """
+        covered = set(names)
+        with self._poll_lock:
+            with self._lock:
+                state = {
+                    name: param
+                    for name, param in self._state.items()
+                    if name in covered or name.startswith(prefixes)
+                }
+            current = self._fetch(names, prefixes, state)
+
+            changes = list()
+            with self._lock:
+                names, prefixes = self._targets()
+                for name in dict.fromkeys([*state, *current]):
+                    old = state.get(name)
+                    new = current.get(name)
+                    if new is None or not (name in names or name.startswith(prefixes)):
+                        # deleted, or unsubscribed while polling
+                        self._state.pop(name, None)
+                    else:
+                        self._state[name] = new
+                    if _version(old) != _version(new):
+                        changes.append((old, new))
+                subscriptions = list(self._subscriptions)
+
+        for old, new in changes:
+            name = (new or old).name
+            for subscription in subscriptions:
+                if subscription.match(name):
+                    try:
+                        subscription.callback(old, new)
+                    except Exception:
+                        logger.exception("Watcher callback failed for %s", name)
+        return changes
+
+    def _next_interval(self, changed: bool) -> float:
+        if changed:
+            return self.min_interval
+        return min(self.interval * self.backoff, self.max_interval)
+
+    def _refresh_interval(self, target: str) -> float | None:
+        if self.policies is None:
+            return None
+        return self.policies.resolve(target).refresh_interval
+
+    def _due_targets(self, now: float) -> tuple[list[str], tuple[str, ...], bool]:
+        """
+        Find the targets to poll at ``now``, and schedule their next poll.
+
+        :return: the due names and prefixes, and whether the adaptive
+            targets are due
+        """
+        names, prefixes = self._targets()
+        is_adaptive_due = self._adaptive_due <= now
+        due: list[list[str]] = [[], []]
+        for targets, due_targets in zip((names, prefixes), due):
+            for target in targets:
+                interval = self._refresh_interval(target)
+                if interval is None:
+                    if is_adaptive_due:
+                        due_targets.append(target)
+                elif self._due.setdefault(target, now + interval) <= now:
+                    due_targets.append(target)
+                    self._due[target] = now + interval
+        return due[0], tuple(due[1]), is_adaptive_due
+
+    def _wait_time(self) -> float:
+        next_due = min([self._adaptive_due, *self._due.values()])
+        return max(0.0, next_due - time.monotonic())
+
+    def _run(self):
+        self._adaptive_due = time.monotonic() + self.interval
+        while not self._stop_event.wait(self._wait_time()):
+            now = time.monotonic()
+            with self._lock:
+                names, prefixes, is_adaptive_due = self._due_targets(now)
+            try:
+                changed = bool(self._poll(names, prefixes))
+            except Exception:
+                logger.exception("Parameter watcher poll failed")
+                changed = False
+            if is_adaptive_due:
+                self.interval = self._next_interval(changed)
+                self._adaptive_due = now + self.interval
+
+    # --- thread
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start the background thread, if it is not running.
+        """
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="ssm-parameter-watcher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Stop the background thread, the subscriptions are kept.
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+# the watcher holds its client, so it is referenced weakly too, otherwise the
+# entry would keep the client alive. A watcher lives as long as a caller holds
+# it or its background thread runs.
+_shared_watchers: "weakref.WeakKeyDictionary[T.Any, weakref.ref[ParameterWatcher]]" = (
+    weakref.WeakKeyDictionary()
+)
+_shared_watchers_lock = threading.Lock()
+
+
+def get_shared_watcher(ssm_client: "SSMClient", **kwargs) -> ParameterWatcher:
+    """
+    Get the process wide watcher of ``ssm_client``, so that all the
+    subscribers in the process share one thread and one poll.
+
+    The watcher is released with the client once nobody holds it and its
+    background thread is stopped.
+
+    :param kwargs: :class:`ParameterWatcher` arguments, only used when the
+        watcher is created
+    """
+    with _shared_watchers_lock:
+        try:
+            ref = _shared_watchers.get(ssm_client)
+        except TypeError:  # pragma: no cover
+            # not weak referenceable, the watcher can't be shared
+            return ParameterWatcher(ssm_client, **kwargs)
+        watcher = None if ref is None else ref()
+        if watcher is None:
+            watcher = ParameterWatcher(ssm_client, **kwargs)
+            _shared_watchers[ssm_client] = weakref.ref(watcher)
+        return watcher
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+"""
+Write-behind buffer for parameters that are updated many times a minute,
+e.g. last run timestamps or checkpoint cursors.
+
+:meth:`BufferedWriter.put` only records the value. A background thread
+flushes every ``flush_interval`` seconds, and only the last value of every
+name is written, so ten updates of a cursor within the window cost one
+``PutParameter`` call and one version instead of ten. A flush goes through
+:func:`~simple_aws_ssm_parameter_store.client.put_parameters_if_changed`:
+the current values are read with batched ``GetParameters`` calls, values
+that didn't change are skipped, the others are written concurrently.
+
+The pending values are flushed when the writer is closed, and at process
+exit. A failed flush keeps its values pending for the next one, unless
+they were updated in the meantime.
+
+Example::
+
+    writer = BufferedWriter(ssm_client, flush_interval=10)
+    for record in stream:
+        process(record)
+        writer.put("/app/consumer/cursor", record.offset)
+"""
+
+import typing as T
+import atexit
+import logging
+import threading
+
+from .constants import ParameterType
+from .client import put_parameters_if_changed
+from .model import Parameter
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_ssm.client import SSMClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """
+    See module docstring.
+
+    :param ssm_client: SSM client
+    :param flush_interval: seconds between two flushes of the background thread
+    :param max_pending: flush right away in :meth:`put` once this many names
+        are pending, None for no limit
+    :param max_workers: max number of concurrent API calls of a flush
+    :param flush_on_exit: whether to flush the pending values at process exit
+    """
+
+    def __init__(
+        self,
+        ssm_client: "SSMClient",
+        flush_interval: float = 5.0,
+        max_pending: int | None = None,
+        max_workers: int | None = None,
+        flush_on_exit: bool = True,
+    ):
+        self.ssm_client = ssm_client
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self.n_put = 0
+        self.n_coalesced = 0
+        self.n_written = 0
+        self.n_unchanged = 0
+        # name -> put_parameter_if_changed kwargs of the last value
+        self._pending: dict[str, dict[str, T.Any]] = dict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._flush_on_exit = flush_on_exit
+        if flush_on_exit:
+            atexit.register(self.close)
+
+    def put(
+        self,
+        name: str,
+        value: str | T.Any,
+        type: ParameterType = ParameterType.STRING,
+        **kwargs,
+    ):
+        """
+        Buffer a write, see module docstring. It replaces the pending value
+        of the same name, if any.
+
+        :param name: parameter name
+        :param value: parameter value
+        :param type: parameter type
+        :param kwargs: other arguments of
+            :func:`~simple_aws_ssm_parameter_store.client.put_parameter_if_changed`,
+            e.g. ``codec`` or ``tier``
+        """
+        with self._lock:
+            self.n_put += 1
+            if name in self._pending:
+                self.n_coalesced += 1
+            self._pending[name] = dict(kwargs, name=name, value=value, type=type)
+            n_pending = len(self._pending)
+        if self.max_pending is not None and n_pending >= self.max_pending:
+            self.flush()
+        elif not self.is_running:
+            self.start()
+
+    @property
+    def n_pending(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Whether a value of ``name`` is pending.
+        """
+        return name in self._pending
+
+    def flush(self) -> list[tuple[Parameter | None, Parameter | None]]:
+        """
+        Write the pending values now.
+
+        :return: ``(before_parameter, after_parameter)`` tuples of
+            :func:`~simple_aws_ssm_parameter_store.client.put_parameters_if_changed`
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, dict()
+            if not pending:
+                return []
+            try:
+                results = put_parameters_if_changed(
+                    self.ssm_client,
+                    list(pending.values()),
+                    max_workers=self.max_workers,
+                )
+            except Exception:
+                with self._lock:
+                    for name, kwargs in pending.items():
+                        # a newer value was put during the flush
+                        self._pending.setdefault(name, kwargs)
+                raise
+            with self._lock:
+                for _, after in results:
+                    if after is None:
+                        self.n_unchanged += 1
+                    else:
+                        self.n_written += 1
+            return results
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Buffered parameter flush failed")
+
+    # --- thread
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start the background flush thread, if it is not running.
+        """
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="ssm-parameter-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Stop the background thread, without flushing.
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def close(self):
+        """
+        Stop the background thread and flush the pending values.
+        """
+        self.stop()
+        if self._flush_on_exit:
+            atexit.unregister(self.close)
+            self._flush_on_exit = False
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
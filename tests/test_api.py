@@ -1,5 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import sys
+import ast
+import subprocess
+
+import pytest
+
 from simple_aws_ssm_parameter_store import api
 
 
@@ -9,16 +15,159 @@ def test():
     _ = api.ParameterTier
     _ = api.ResourceType
     _ = api.DEFAULT_KMS_KEY
+    _ = api.STANDARD_TIER_MAX_VALUE_SIZE
+    _ = api.ADVANCED_TIER_MAX_VALUE_SIZE
+    _ = api.ChunkIntegrityError
+    _ = api.Codec
+    _ = api.JSON_CODEC
+    _ = api.STRING_LIST_CODEC
+    _ = api.INT_CODEC
+    _ = api.BOOL_CODEC
+    _ = api.register_codec
+    _ = api.get_codec
+    _ = api.CompressionAlgorithm
+    _ = api.compress_value
+    _ = api.decompress_value
+    _ = api.is_compressed_value
     _ = api.encode_tags
     _ = api.decode_tags
     _ = api.Parameter
     _ = api.get_parameter
+    _ = api.get_parameters
     _ = api.put_parameter_if_changed
     _ = api.delete_parameter
+    _ = api.delete_parameters
     _ = api.get_parameter_tags
     _ = api.remove_parameter_tags
     _ = api.update_parameter_tags
     _ = api.put_parameter_tags
+    _ = api.put_chunked_parameter
+    _ = api.get_chunked_parameter
+    _ = api.delete_chunked_parameter
+    _ = api.StandardTierCandidate
+    _ = api.find_standard_tier_candidates
+    _ = api.select_tier
+    _ = api.TierPricing
+    _ = api.TierRecommendation
+    _ = api.TierStats
+    _ = api.TierReport
+    _ = api.iter_parameter_metadata_pages
+    _ = api.iter_parameter_metadata
+    _ = api.iter_parameter_inventory
+    _ = api.scan_tier_report
+    _ = api.OperationRecord
+    _ = api.OperationStats
+    _ = api.UsageStats
+    _ = api.MetricsExporter
+    _ = api.StatsdExporter
+    _ = api.PrometheusExporter
+    _ = api.add_exporter
+    _ = api.remove_exporter
+    _ = api.track_usage
+    _ = api.record_cache_access
+    _ = api.instrument_client
+    _ = api.uninstrument_client
+    _ = api.LocalSSMClient
+    _ = api.constant_latency
+    _ = api.uniform_latency
+    _ = api.lognormal_latency
+    _ = api.FaultSpec
+    _ = api.FaultStats
+    _ = api.FaultInjectingClient
+    _ = api.get_max_pool_connections
+    _ = api.build_config
+    _ = api.get_ssm_client
+    _ = api.clear_client_cache
+    _ = api.prewarm_client
+    _ = api.iter_parameters_by_path
+    _ = api.make_env_key
+    _ = api.load_env
+    _ = api.apply_env
+    _ = api.format_dotenv
+    _ = api.write_dotenv
+    _ = api.format_exports
+    _ = api.write_snapshot
+    _ = api.read_snapshot
+    _ = api.put_parameters_if_changed
+    _ = api.ParameterCache
+    _ = api.SettingSpec
+    _ = api.setting
+    _ = api.coerce_value
+    _ = api.load_settings
+    _ = api.SettingsError
+    _ = api.Subscription
+    _ = api.ParameterWatcher
+    _ = api.get_shared_watcher
+    _ = api.SharedParameterCache
+    _ = api.SidecarServer
+    _ = api.SidecarClient
+    _ = api.SidecarError
+    _ = api.SubtreeReport
+    _ = api.copy_subtree
+    _ = api.move_subtree
+    _ = api.SubtreeVerificationError
+    _ = api.parse_desired_state
+    _ = api.load_desired_state
+    _ = api.hash_desired_state
+    _ = api.SyncResult
+    _ = api.sync_file
+    _ = api.ChangeAction
+    _ = api.ParameterChange
+    _ = api.PrefixState
+    _ = api.read_state
+    _ = api.write_state
+    _ = api.iter_changes
+    _ = api.ParameterVersionConflictError
+    _ = api.Lease
+    _ = api.acquire_lease
+    _ = api.renew_lease
+    _ = api.renew_leases
+    _ = api.release_lease
+    _ = api.BufferedWriter
+    _ = api.BudgetAction
+    _ = api.VersionBudgetGuard
+    _ = api.VersionChurn
+    _ = api.VersionChurnReport
+    _ = api.scan_version_churn
+    _ = api.VersionBudgetExceededError
+    _ = api.MAX_PARAMETER_VERSIONS
+    _ = api.PathPolicy
+    _ = api.PolicyRegistry
+    _ = api.get_parameters_by_policy
+    _ = api.get_parameters_by_key
+    _ = api.group_by_key
+
+
+def test_lazy_import():
+    assert "get_parameter" in dir(api)
+    assert set(api.__all__) <= set(dir(api))
+    with pytest.raises(AttributeError):
+        _ = api.not_a_member
+
+    code = (
+        "import sys; import simple_aws_ssm_parameter_store.api as api; "
+        "api.get_parameter; api.Parameter; "
+        "print('botocore' in sys.modules)"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert res.stdout.strip() == "False"
+
+
+def test_type_checking_imports():
+    """
+    The ``TYPE_CHECKING`` imports and ``_LAZY_MEMBERS`` list the same members.
+    """
+    tree = ast.parse(open(api.__file__, encoding="utf-8").read())
+    imports = dict()
+    for node in tree.body:
+        if isinstance(node, ast.If) and "TYPE_CHECKING" in ast.unparse(node.test):
+            for stmt in node.body:
+                assert isinstance(stmt, ast.ImportFrom)
+                for alias in stmt.names:
+                    imports[alias.asname or alias.name] = stmt.module
+    assert imports == api._LAZY_MEMBERS
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import contextvars
+
+from simple_aws_ssm_parameter_store.batch import make_batches, map_batches
+
+var = contextvars.ContextVar("var", default=None)
+
+
+def test_make_batches():
+    assert make_batches([], 10) == []
+    assert make_batches(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+
+
+def test_map_batches():
+    batches = make_batches(list(range(25)), 10)
+    assert map_batches(sum, batches, max_workers=1) == [45, 145, 110]
+    assert map_batches(sum, batches, max_workers=4) == [45, 145, 110]
+
+    # the worker threads see the caller's context variables
+    var.set("caller")
+    assert (
+        map_batches(lambda batch: var.get(), batches, max_workers=4) == ["caller"] * 3
+    )
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.batch",
+        preview=False,
+    )
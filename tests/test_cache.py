@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from simple_aws_ssm_parameter_store.cache import ParameterCache
+from simple_aws_ssm_parameter_store.instrument import track_usage
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parameter_cache():
+    ssm_client = LocalSSMClient()
+    for i in range(15):
+        ssm_client.put_parameter(
+            Name=f"/cache/p{i:02d}",
+            Value=f"v{i}",
+            Type=ParameterType.SECURE_STRING.value,
+        )
+    client = FaultInjectingClient(ssm_client)
+    clock = Clock()
+    cache = ParameterCache(client, ttl=10, clock=clock)
+
+    names = [f"/cache/p{i:02d}" for i in range(15)] + ["/cache/missing"]
+    with track_usage() as usage:
+        params = cache.get_many(names)
+    assert list(params) == names[:15]
+    assert params["/cache/p00"].value == "v0"
+    assert client.stats.n_attempt == {"GetParameters": 2}
+    assert usage.n_cache_miss == 16
+
+    # served from the cache, including the missing one
+    with track_usage() as usage:
+        assert cache.get_many(reversed(names)) == dict(reversed(params.items()))
+        assert cache.get("/cache/p01").value == "v1"
+        assert cache.get("/cache/missing") is None
+    assert client.stats.total_attempt == 2
+    assert usage.n_cache_hit == 18
+
+    # expired entries are fetched again, in one call
+    clock.now = 11
+    ssm_client.put_parameter(Name="/cache/missing", Value="x", Type="String")
+    assert (
+        cache.get_many(["/cache/p00", "/cache/missing"])["/cache/missing"].value == "x"
+    )
+    assert client.stats.n_attempt == {"GetParameters": 3}
+
+    assert cache.get("/cache/p14").value == "v14"
+    assert client.stats.n_attempt["GetParameter"] == 1
+    cache.invalidate("/cache/p14")
+    cache.get("/cache/p14")
+    assert client.stats.n_attempt["GetParameter"] == 2
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_stale_while_revalidate():
+    ssm_client = LocalSSMClient()
+    names = [f"/cache/swr/p{i:02d}" for i in range(12)]
+    for name in names:
+        ssm_client.put_parameter(Name=name, Value="v1", Type="String")
+    client = FaultInjectingClient(ssm_client)
+    clock = Clock()
+    cache = ParameterCache(client, ttl=10, stale_while_revalidate=60, clock=clock)
+    cache.get_many(names)
+
+    for name in names:
+        ssm_client.put_parameter(Name=name, Value="v2", Overwrite=True)
+    clock.now = 11
+    # stale values are served right away, and refreshed together
+    assert {param.value for param in cache.get_many(names).values()} == {"v1"}
+    while cache._refresh_thread is not None:
+        time.sleep(0.01)
+    assert {param.value for param in cache.get_many(names).values()} == {"v2"}
+    assert client.stats.n_attempt == {"GetParameters": 4}
+
+    # too old to be served
+    clock.now = 100
+    cache.set(names[0], None)
+    assert cache.get(names[0]) is None
+    assert cache.get(names[1]).value == "v2"
+    assert client.stats.n_attempt["GetParameter"] == 1
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.cache",
+        preview=False,
+    )
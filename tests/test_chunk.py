@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simple_aws_ssm_parameter_store.chunk import (
+    get_chunk_name,
+    is_chunk_name,
+    split_text,
+    put_chunked_parameter,
+    get_chunked_parameter,
+    delete_chunked_parameter,
+)
+from simple_aws_ssm_parameter_store.client import get_parameter, get_parameters
+from simple_aws_ssm_parameter_store.constants import ParameterType
+from simple_aws_ssm_parameter_store.exc import ChunkIntegrityError
+from simple_aws_ssm_parameter_store.env import load_env
+from simple_aws_ssm_parameter_store.sidecar import SidecarServer, SidecarClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def test_split_text():
+    assert split_text("abcdefghi", 4) == ["abcd", "efgh", "i"]
+    assert split_text("", 4) == []
+    # "é" is 2 bytes in UTF-8, never split in the middle
+    pieces = split_text("aaéé", 5)
+    assert pieces == ["aaé", "é"]
+    assert "".join(split_text("测试" * 100, 7)) == "测试" * 100
+    # a 4 bytes character must fit
+    assert split_text("😀😀", 4) == ["😀", "😀"]
+    with pytest.raises(ValueError):
+        split_text("测试", 3)
+
+
+def test_is_chunk_name():
+    assert is_chunk_name(get_chunk_name("/app/cert", 3)) is True
+    assert is_chunk_name("/app/cert") is False
+    assert is_chunk_name("/app/__chunk__x/0") is False
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_path_loaders_skip_chunks(self):
+        value = "x" * 10000
+        put_chunked_parameter(
+            self.ssm_client, "/test/tree/cert", value, chunk_size=4096
+        )
+        self.ssm_client.put_parameter(Name="/test/tree/host", Value="h", Type="String")
+
+        env = load_env(self.ssm_client, "/test/tree")
+        assert sorted(env) == ["CERT", "HOST"]
+
+        with SidecarServer(self.ssm_client, token="secret") as server:
+            client = SidecarClient(url=server.url, token="secret")
+            params = client.get_by_path("/test/tree")
+            assert [param.name for param in params] == [
+                "/test/tree/cert",
+                "/test/tree/host",
+            ]
+
+    def test_chunked_parameter(self):
+        name = "/test/chunked"
+        value = "".join(f"line {i}\n" for i in range(2000))  # ~16KB
+
+        before, after = put_chunked_parameter(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=value,
+        )
+        assert before is None
+        assert after is not None
+        n_chunk = after.json_value["chunks"]
+        assert n_chunk >= 4
+        assert get_chunked_parameter(self.ssm_client, name) == value
+
+        # same value, no write
+        before, after = put_chunked_parameter(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=value,
+        )
+        assert after is None
+
+        # smaller compressed value, stale chunks are deleted
+        before, after = put_chunked_parameter(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=value,
+            compress=True,
+        )
+        assert after.json_value["chunks"] < n_chunk
+        assert get_chunked_parameter(self.ssm_client, name) == value
+        params = get_parameters(
+            self.ssm_client,
+            [get_chunk_name(name, i) for i in range(n_chunk)],
+        )
+        assert len(params) == after.json_value["chunks"]
+
+        # binary, secure string
+        data = bytes(range(256)) * 40
+        put_chunked_parameter(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=data,
+            type=ParameterType.SECURE_STRING,
+        )
+        assert (
+            get_chunked_parameter(self.ssm_client, name, with_decryption=True) == data
+        )
+        # the manifest, and its hash, is a secret too
+        manifest = get_parameter(self.ssm_client, name)
+        assert manifest.is_secure_string_type
+        with pytest.raises(ValueError):
+            get_chunked_parameter(self.ssm_client, name)
+
+        # tampered chunk
+        self.ssm_client.put_parameter(
+            Name=get_chunk_name(name, 0),
+            Value="tampered",
+            Type=ParameterType.SECURE_STRING.value,
+            Overwrite=True,
+        )
+        with pytest.raises(ChunkIntegrityError):
+            get_chunked_parameter(self.ssm_client, name, with_decryption=True)
+
+        assert delete_chunked_parameter(self.ssm_client, name) is True
+        assert delete_chunked_parameter(self.ssm_client, name) is False
+        assert get_chunked_parameter(self.ssm_client, name) is None
+        assert get_parameter(self.ssm_client, get_chunk_name(name, 0)) is None
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            put_chunked_parameter(self.ssm_client, "no-slash", "value")
+
+        name = "/test/not-chunked"
+        self.ssm_client.put_parameter(Name=name, Value="plain", Type="String")
+        with pytest.raises(ValueError):
+            get_chunked_parameter(self.ssm_client, name)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.chunk",
+        preview=False,
+    )
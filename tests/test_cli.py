@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from simple_aws_ssm_parameter_store.cli import build_parser, run
+from simple_aws_ssm_parameter_store.client import get_parameter, get_parameter_tags
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def cli(self, capsys, *argv: str) -> tuple[int, str, str]:
+        args = build_parser().parse_args(list(argv))
+        code = run(args, self.ssm_client)
+        out, err = capsys.readouterr()
+        return code, out, err
+
+    def test_commands(self, capsys, tmp_path):
+        name = "/cli/app/host"
+        code, out, _ = self.cli(capsys, "get", name)
+        assert code == 1
+
+        _, out, _ = self.cli(capsys, "put-if-changed", name, "v1", "--tag", "env=dev")
+        assert out.startswith("created")
+        _, out, _ = self.cli(capsys, "put-if-changed", name, "v1")
+        assert out.startswith("unchanged")
+        _, out, _ = self.cli(capsys, "put-if-changed", name, "v2")
+        assert out.startswith("updated")
+        _, out, _ = self.cli(capsys, "get", name)
+        assert out == "v2\n"
+        _, out, _ = self.cli(capsys, "get", name, "--json")
+        assert json.loads(out)["version"] == 2
+
+        _, out, _ = self.cli(capsys, "tags", "update", name, "team=a")
+        assert json.loads(out) == {"env": "dev", "team": "a"}
+        _, out, _ = self.cli(capsys, "tags", "remove", name, "env")
+        assert json.loads(out) == {"team": "a"}
+        _, out, _ = self.cli(capsys, "tags", "set", name, "x=1")
+        assert json.loads(out) == {"x": "1"}
+
+        _, out, _ = self.cli(capsys, "env", "/cli/app", "--format", "dotenv")
+        assert out == 'HOST="v2"\n'
+
+        sync_path = tmp_path / "state.json"
+        sync_path.write_text('{"parameters": {"/cli/sync/a": "1"}}')
+        argv = ["sync", str(sync_path), "--state", str(tmp_path / "applied.json")]
+        _, out, _ = self.cli(capsys, *argv)
+        assert out.splitlines()[0] == "created /cli/sync/a"
+        _, out, _ = self.cli(capsys, *argv)
+        assert out.startswith("unchanged")
+
+        argv = ["changes", "/cli/sync/", "--state", str(tmp_path / "changes.json")]
+        _, out, _ = self.cli(capsys, *argv)
+        record = json.loads(out)
+        assert (record["action"], record["name"], record["value"]) == (
+            "created",
+            "/cli/sync/a",
+            "1",
+        )
+        _, out, _ = self.cli(capsys, *argv)
+        assert out == ""
+
+        # serving decrypted values over HTTP requires a token
+        code, _, err = self.cli(capsys, "sidecar", "--port", "0")
+        assert code == 2 and "--token-file" in err
+
+        _, out, _ = self.cli(capsys, "delete", name, "/cli/missing")
+        assert out.splitlines() == [f"deleted {name}", "not found /cli/missing"]
+
+    def test_export_import(self, capsys, tmp_path):
+        for i in range(25):
+            self.ssm_client.put_parameter(
+                Name=f"/cli/export/p{i:02d}",
+                Value=f"v{i}",
+                Type="SecureString" if i == 0 else "String",
+                Description="desc",
+            )
+        self.ssm_client.add_tags_to_resource(
+            ResourceType="Parameter",
+            ResourceId="/cli/export/p01",
+            Tags=[{"Key": "k", "Value": "v"}],
+        )
+        path = tmp_path / "export.jsonl"
+        _, _, err = self.cli(
+            capsys,
+            "export",
+            "/cli/export/",
+            "--decrypt",
+            "--tags",
+            "-o",
+            str(path),
+        )
+        assert "exported 25 parameters" in err
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 25
+        assert records[0]["value"] == "v0"
+
+        # restore into another path
+        lines = list()
+        for record in records:
+            record["name"] = record["name"].replace("/export/", "/restore/")
+            lines.append(json.dumps(record))
+        path.write_text("\n".join(lines) + "\n")
+        _, _, err = self.cli(capsys, "import", "-i", str(path), "--chunk-size", "10")
+        assert "imported 25 parameters" in err and "25 written" in err
+        _, _, err = self.cli(capsys, "import", "-i", str(path))
+        assert "0 written" in err
+
+        param = get_parameter(self.ssm_client, "/cli/restore/p00", with_decryption=True)
+        assert param.value == "v0"
+        assert param.type == "SecureString"
+        assert get_parameter_tags(self.ssm_client, "/cli/restore/p01") == {"k": "v"}
+
+        # without --decrypt the SecureString value is exported encrypted,
+        # and not imported as the plain value
+        self.cli(capsys, "export", "/cli/export/", "-o", str(path))
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert records[0]["encrypted"] is True
+        assert records[0]["value"] != "v0"
+        assert records[1]["encrypted"] is False
+        records[0]["name"] = "/cli/encrypted/p00"
+        path.write_text(json.dumps(records[0]) + "\n")
+        code, _, err = self.cli(capsys, "import", "-i", str(path))
+        assert code == 1
+        assert "encrypted" in err
+        assert get_parameter(self.ssm_client, "/cli/encrypted/p00") is None
+
+        # same for the changes records
+        argv = ["changes", "/cli/export/", "--state", str(tmp_path / "changes.json")]
+        _, out, _ = self.cli(capsys, *argv)
+        record = json.loads(out.splitlines()[0])
+        assert record["encrypted"] is True
+        record["name"] = "/cli/encrypted/p00"
+        path.write_text(json.dumps(record) + "\n")
+        code, _, err = self.cli(capsys, "import", "-i", str(path))
+        assert code == 1
+        assert "encrypted" in err
+        assert get_parameter(self.ssm_client, "/cli/encrypted/p00") is None
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.cli",
+        preview=False,
+    )
@@ -1,19 +1,50 @@
 # -*- coding: utf-8 -*-
 
+import pytest
+
 from simple_aws_ssm_parameter_store.client import (
     get_parameter,
+    get_parameters,
     put_parameter_if_changed,
+    put_parameters_if_changed,
     delete_parameter,
+    delete_parameters,
     get_parameter_tags,
     remove_parameter_tags,
     update_parameter_tags,
     put_parameter_tags,
 )
 from simple_aws_ssm_parameter_store.constants import ParameterType, ParameterTier
+from simple_aws_ssm_parameter_store.exc import ParameterVersionConflictError
 
 from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
 
 
+class _RacingClient:
+    """
+    Let another writer put ``value`` right before our next ``put_parameter``.
+    """
+
+    def __init__(self, ssm_client, value: str, type: str = "String"):
+        self._ssm_client = ssm_client
+        self._value = value
+        self._type = type
+
+    def put_parameter(self, **kwargs):
+        if self._value is not None:
+            self._ssm_client.put_parameter(
+                Name=kwargs["Name"],
+                Value=self._value,
+                Type=self._type,
+                Overwrite=True,
+            )
+            self._value = None
+        return self._ssm_client.put_parameter(**kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._ssm_client, name)
+
+
 class Test(BaseMockAwsTest):
     use_mock = True
 
@@ -78,6 +109,38 @@ class Test(BaseMockAwsTest):
         )
         assert flag is False
 
+    def test_get_and_delete_parameters(self):
+        names = [f"/test_get_and_delete_parameters/p{i}" for i in range(25)]
+        for name in names:
+            self.ssm_client.put_parameter(
+                Name=name,
+                Value=name,
+                Type=ParameterType.STRING.value,
+            )
+
+        missing_name = "/test_get_and_delete_parameters/missing"
+        params = get_parameters(
+            ssm_client=self.ssm_client,
+            names=names + [names[0], missing_name],
+        )
+        assert list(params) == names
+        assert params[names[0]].value == names[0]
+
+        params = get_parameters(
+            ssm_client=self.ssm_client,
+            names=[f"{names[0]}:1"],
+            max_workers=1,
+        )
+        assert params[f"{names[0]}:1"].value == names[0]
+
+        deleted = delete_parameters(
+            ssm_client=self.ssm_client,
+            names=names + [missing_name],
+        )
+        assert sorted(deleted) == sorted(names)
+        assert get_parameters(self.ssm_client, names) == {}
+        assert delete_parameters(self.ssm_client, names) == []
+
     def test_manage_tags(self):
         name = "test_manage_tags"
         self.ssm_client.put_parameter(
@@ -232,6 +295,265 @@ class Test(BaseMockAwsTest):
         delete_parameter(self.ssm_client, name)
         delete_parameter(self.ssm_client, secure_name)
 
+    def test_put_parameter_if_changed_with_compression(self):
+        name = "test_put_parameter_if_changed_with_compression"
+        value = {f"key{i}": "value" for i in range(500)}  # ~7KB json
+
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=value,
+            type=ParameterType.STRING,
+            codec="json",
+            compression="zlib",
+        )
+        assert after_param.raw_value.startswith("ssmz:zlib:")
+        assert len(after_param.raw_value) < 4096
+        assert after_param.json_value == value
+
+        param = get_parameter(self.ssm_client, name)
+        assert param.raw_value.startswith("ssmz:zlib:")
+        assert param.json_value == value
+
+        # same value, no write
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=value,
+            type=ParameterType.STRING,
+            codec="json",
+            compression="zlib",
+        )
+        assert after_param is None
+
+        # short value is stored uncompressed
+        value = {"key": "value"}
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value=value,
+            type=ParameterType.STRING,
+            codec="json",
+            compression="zlib",
+        )
+        # too short to benefit from compression
+        assert after_param.raw_value == '{"key":"value"}'
+
+        delete_parameter(self.ssm_client, name)
+
+    def test_put_parameter_if_changed_with_auto_tier(self):
+        name = "test_put_parameter_if_changed_with_auto_tier"
+
+        _, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value="a" * 100,
+            type=ParameterType.STRING,
+            auto_tier=True,
+        )
+        assert after_param.tier == ParameterTier.STANDARD.value
+
+        _, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value="a" * 5000,
+            type=ParameterType.STRING,
+            auto_tier=True,
+        )
+        assert after_param.tier == ParameterTier.ADVANCED.value
+
+        # compression makes it fit, but advanced can't be downgraded in place
+        _, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value="b" * 5000,
+            type=ParameterType.STRING,
+            compression="zlib",
+            auto_tier=True,
+        )
+        assert after_param.tier == ParameterTier.ADVANCED.value
+        delete_parameter(self.ssm_client, name)
+
+        _, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value="b" * 5000,
+            type=ParameterType.STRING,
+            compression="zlib",
+            auto_tier=True,
+        )
+        assert after_param.tier == ParameterTier.STANDARD.value
+        delete_parameter(self.ssm_client, name)
+
+    def test_put_parameter_if_changed_with_codec(self):
+        name = "test_put_parameter_if_changed_with_codec"
+
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value={"b": 1, "a": [1, 2]},
+            type=ParameterType.STRING,
+            codec="json",
+        )
+        assert before_param is None
+        assert after_param.value == '{"a":[1,2],"b":1}'
+        assert after_param.json_value == {"a": [1, 2], "b": 1}
+
+        # semantically equal value, no write
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value={"a": [1, 2], "b": 1},
+            type=ParameterType.STRING,
+            codec="json",
+        )
+        assert after_param is None
+
+        # existing value is not in canonical form but semantically equal, no write
+        self.ssm_client.put_parameter(
+            Name=name,
+            Value='{ "b": 1,\n  "a": [1, 2] }',
+            Type=ParameterType.STRING.value,
+            Overwrite=True,
+        )
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value={"a": [1, 2], "b": 1},
+            type=ParameterType.STRING,
+            codec="json",
+        )
+        assert after_param is None
+
+        # existing value is not valid json, write
+        self.ssm_client.put_parameter(
+            Name=name,
+            Value="not json",
+            Type=ParameterType.STRING.value,
+            Overwrite=True,
+        )
+        before_param, after_param = put_parameter_if_changed(
+            ssm_client=self.ssm_client,
+            name=name,
+            value={"a": [1, 2], "b": 1},
+            type=ParameterType.STRING,
+            codec="json",
+        )
+        assert after_param is not None
+
+        delete_parameter(self.ssm_client, name)
+
+
+    def test_put_parameters_if_changed(self):
+        prefix = "/test_put_parameters_if_changed"
+        parameters = [
+            dict(name=f"{prefix}/p{i:02d}", value=f"v{i}", type=ParameterType.STRING)
+            for i in range(15)
+        ] + [
+            dict(
+                name=f"{prefix}/secret",
+                value="s",
+                type=ParameterType.SECURE_STRING,
+            )
+        ]
+        results = put_parameters_if_changed(self.ssm_client, parameters, max_workers=4)
+        assert [after.name for _, after in results] == [p["name"] for p in parameters]
+        assert all(before is None for before, _ in results)
+
+        parameters[0]["value"] = "changed"
+        results = put_parameters_if_changed(self.ssm_client, parameters)
+        written = [after.name for _, after in results if after is not None]
+        assert written == [parameters[0]["name"]]
+        assert results[-1][0].value == "s"
+
+        with pytest.raises(ValueError):
+            put_parameters_if_changed(self.ssm_client, parameters[:1] * 2)
+
+        delete_parameters(self.ssm_client, [p["name"] for p in parameters])
+    def test_put_parameter_if_changed_with_expected_version(self):
+        name = "/test/expected_version"
+        kwargs = dict(ssm_client=self.ssm_client, name=name, type=ParameterType.STRING)
+
+        # 0 means "must not exist"
+        _, after = put_parameter_if_changed(value="v1", expected_version=0, **kwargs)
+        assert after.version == 1
+        with pytest.raises(ParameterVersionConflictError) as e:
+            put_parameter_if_changed(value="v2", expected_version=0, **kwargs)
+        assert (e.value.actual_version, e.value.written) == (1, False)
+        # the desired value is never a conflict
+        _, after = put_parameter_if_changed(value="v1", expected_version=0, **kwargs)
+        assert after is None
+
+        _, after = put_parameter_if_changed(value="v2", expected_version=1, **kwargs)
+        assert after.version == 2
+        with pytest.raises(ParameterVersionConflictError) as e:
+            put_parameter_if_changed(value="v3", expected_version=1, **kwargs)
+        assert (e.value.expected_version, e.value.actual_version) == (1, 2)
+        assert get_parameter(self.ssm_client, name).value == "v2"
+
+        # another writer lands between the check and the write
+        kwargs["ssm_client"] = _RacingClient(self.ssm_client, "other")
+        with pytest.raises(ParameterVersionConflictError) as e:
+            put_parameter_if_changed(value="v3", expected_version=2, **kwargs)
+        assert (e.value.actual_version, e.value.written) == (3, True)
+        # the other writer's value was put back on top of ours
+        assert e.value.restored is True
+        param = get_parameter(self.ssm_client, name)
+        assert (param.version, param.value) == (5, "other")
+
+        # a concurrent write of the same value is not a conflict
+        kwargs["ssm_client"] = _RacingClient(self.ssm_client, "v5")
+        _, after = put_parameter_if_changed(value="v5", expected_version=5, **kwargs)
+        assert after.version == 7
+
+        # a concurrent create
+        kwargs["name"] = "/test/expected_version_create"
+        kwargs["ssm_client"] = _RacingClient(self.ssm_client, "other")
+        with pytest.raises(ParameterVersionConflictError) as e:
+            put_parameter_if_changed(value="v1", expected_version=0, **kwargs)
+        assert e.value.actual_version == 1
+
+        # a SecureString conflict, without key_id
+        kwargs["name"] = "/test/expected_version_secure"
+        kwargs["type"] = ParameterType.SECURE_STRING
+        kwargs["ssm_client"] = self.ssm_client
+        put_parameter_if_changed(value="v1", expected_version=0, **kwargs)
+        kwargs["ssm_client"] = _RacingClient(self.ssm_client, "other", "SecureString")
+        with pytest.raises(ParameterVersionConflictError) as e:
+            put_parameter_if_changed(value="v2", expected_version=1, **kwargs)
+        assert (e.value.actual_version, e.value.written) == (2, True)
+        assert e.value.restored is True
+        param = get_parameter(self.ssm_client, kwargs["name"], with_decryption=True)
+        assert (param.version, param.value, param.type) == (
+            4,
+            "other",
+            "SecureString",
+        )
+
+    def test_put_parameters_if_changed_with_expected_version(self):
+        prefix = "/test/put_parameters_expected_version"
+        names = [f"{prefix}/p{i}" for i in range(5)]
+        results = put_parameters_if_changed(
+            self.ssm_client,
+            [
+                dict(name=n, value="v1", type=ParameterType.STRING, expected_version=0)
+                for n in names
+            ],
+        )
+        assert [after.version for _, after in results] == [1] * 5
+
+        parameters = [dict(name=name, value="v2", expected_version=1) for name in names]
+        parameters[1]["expected_version"] = 0
+        parameters[3]["expected_version"] = 7
+        with pytest.raises(ParameterVersionConflictError) as e:
+            put_parameters_if_changed(self.ssm_client, parameters, max_workers=4)
+        assert [c.name for c in e.value.conflicts] == [names[1], names[3]]
+        # the other writes went through
+        params = get_parameters(self.ssm_client, names)
+        assert [params[name].value for name in names] == ["v2", "v1", "v2", "v1", "v2"]
+
+        delete_parameters(self.ssm_client, names)
+
 
 if __name__ == "__main__":
     from simple_aws_ssm_parameter_store.tests import run_cov_test
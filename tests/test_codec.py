@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simple_aws_ssm_parameter_store.codec import (
+    Codec,
+    JSON_CODEC,
+    STRING_LIST_CODEC,
+    INT_CODEC,
+    BOOL_CODEC,
+    register_codec,
+    get_codec,
+)
+
+
+def test_json_codec():
+    assert JSON_CODEC.encode({"b": 1, "a": [1, 2]}) == '{"a":[1,2],"b":1}'
+    assert JSON_CODEC.decode('{"b": 1, "a": [1, 2]}') == {"a": [1, 2], "b": 1}
+
+
+def test_string_list_codec():
+    assert STRING_LIST_CODEC.encode(["a", "b"]) == "a,b"
+    assert STRING_LIST_CODEC.decode("a,b") == ["a", "b"]
+    assert STRING_LIST_CODEC.decode("") == []
+    with pytest.raises(ValueError):
+        STRING_LIST_CODEC.encode(["a,b"])
+
+
+def test_int_codec():
+    assert INT_CODEC.encode(3) == "3"
+    assert INT_CODEC.decode("3") == 3
+
+
+def test_bool_codec():
+    assert BOOL_CODEC.encode(True) == "true"
+    assert BOOL_CODEC.encode(False) == "false"
+    for value in ["true", "True", "1", "yes", "on"]:
+        assert BOOL_CODEC.decode(value) is True
+    for value in ["false", "FALSE", "0", "no", "off"]:
+        assert BOOL_CODEC.decode(value) is False
+    with pytest.raises(ValueError):
+        BOOL_CODEC.decode("maybe")
+
+
+def test_register_codec():
+    codec = Codec(name="upper", encode=str.upper, decode=str.lower)
+    assert register_codec(codec) is codec
+    assert get_codec("upper") is codec
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        register_codec(codec)
+    register_codec(codec, overwrite=True)
+    with pytest.raises(ValueError):
+        get_codec("not-exists")
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.codec",
+        preview=False,
+    )
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simple_aws_ssm_parameter_store.compression import (
+    CompressionAlgorithm,
+    is_compressed_value,
+    get_compression_algorithm,
+    compress_value,
+    decompress_value,
+    compress_value_if_smaller,
+    get_value_size,
+)
+
+
+def test_zlib():
+    value = '{"key": "value"}' * 100
+    compressed = compress_value(value)
+    assert compressed.startswith("ssmz:zlib:")
+    assert is_compressed_value(compressed) is True
+    assert is_compressed_value(value) is False
+    assert is_compressed_value(None) is False
+    assert get_compression_algorithm(compressed) is CompressionAlgorithm.ZLIB
+    assert get_compression_algorithm(value) is None
+    assert decompress_value(compressed) == value
+    assert decompress_value(value) == value
+
+    # only the whole format counts as compressed
+    for value in [
+        "ssmz:hello world",
+        "ssmz:gzip:aGk=",
+        "ssmz:zlib:a b",
+        "ssmz:zlib:abc",
+    ]:
+        assert is_compressed_value(value) is False
+        assert get_compression_algorithm(value) is None
+        assert decompress_value(value) == value
+    # the format, but not a zlib payload
+    assert is_compressed_value("ssmz:zlib:aGVsbG8=") is True
+    with pytest.raises(ValueError):
+        decompress_value("ssmz:zlib:aGVsbG8=")
+
+
+def test_zstd():
+    pytest.importorskip("zstandard")
+    value = "测试" * 1000
+    compressed = compress_value(value, "zstd")
+    assert get_compression_algorithm(compressed) is CompressionAlgorithm.ZSTD
+    assert decompress_value(compressed) == value
+
+
+def test_compress_value_if_smaller():
+    assert compress_value_if_smaller("short") == "short"
+    value = "a" * 1000
+    assert is_compressed_value(compress_value_if_smaller(value)) is True
+
+
+def test_get_value_size():
+    assert get_value_size(None) == 0
+    assert get_value_size("é") == 2
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.compression",
+        preview=False,
+    )
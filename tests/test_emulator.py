@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import botocore.exceptions
+
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.client import (
+    get_parameter,
+    get_parameters,
+    put_parameter_if_changed,
+    delete_parameter,
+    delete_parameters,
+    get_parameter_tags,
+    update_parameter_tags,
+    put_parameter_tags,
+    remove_parameter_tags,
+)
+from simple_aws_ssm_parameter_store.chunk import (
+    put_chunked_parameter,
+    get_chunked_parameter,
+)
+from simple_aws_ssm_parameter_store.inventory import iter_parameter_metadata
+from simple_aws_ssm_parameter_store.constants import ParameterType, ParameterTier
+
+
+def get_code(e: botocore.exceptions.ClientError) -> str:
+    return e.response["Error"]["Code"]
+
+
+def test_client_functions():
+    ssm_client = LocalSSMClient()
+
+    assert get_parameter(ssm_client, "/app/db/host") is None
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        ssm_client.put_parameter(Name="/app/db/host", Value="v1")
+    assert get_code(e.value) == "ValidationException"
+    before, after = put_parameter_if_changed(
+        ssm_client,
+        "/app/db/host",
+        "v1",
+        type=ParameterType.STRING,
+        tags={"env": "dev"},
+    )
+    assert before is None and after.version == 1
+    before, after = put_parameter_if_changed(ssm_client, "/app/db/host", "v1")
+    assert after is None
+    before, after = put_parameter_if_changed(ssm_client, "/app/db/host", "v2")
+    assert after.version == 2
+
+    assert get_parameter(ssm_client, "/app/db/host").value == "v2"
+    assert get_parameter(ssm_client, "/app/db/host:1").value == "v1"
+    assert get_parameter(ssm_client, "/app/db/host:3") is None
+
+    names = [f"/app/many/{i:02d}" for i in range(25)]
+    for name in names:
+        ssm_client.put_parameter(Name=name, Value=name, Type="String")
+    params = get_parameters(ssm_client, names + ["/app/missing"])
+    assert list(params) == names
+
+    assert get_parameter_tags(ssm_client, "/app/db/host") == {"env": "dev"}
+    update_parameter_tags(ssm_client, "/app/db/host", {"team": "a"})
+    assert get_parameter_tags(ssm_client, "/app/db/host") == {
+        "env": "dev",
+        "team": "a",
+    }
+    put_parameter_tags(ssm_client, "/app/db/host", {"team": "b"})
+    assert get_parameter_tags(ssm_client, "/app/db/host") == {"team": "b"}
+    remove_parameter_tags(ssm_client, "/app/db/host", ["team"])
+    assert get_parameter_tags(ssm_client, "/app/db/host") == {}
+
+    assert len(list(iter_parameter_metadata(ssm_client, path_prefix="/app/"))) == 26
+
+    text = "".join(f"line {i}\n" for i in range(2000))
+    put_chunked_parameter(ssm_client, "/app/chunked", text)
+    assert get_chunked_parameter(ssm_client, "/app/chunked") == text
+
+    assert delete_parameter(ssm_client, "/app/db/host") is True
+    assert delete_parameter(ssm_client, "/app/db/host") is False
+    assert sorted(delete_parameters(ssm_client, names[:12] + ["/nope"])) == names[:12]
+
+
+def test_path_and_describe():
+    ssm_client = LocalSSMClient()
+    for name in ["/a/x", "/a/b/y", "/a/b/c/z", "/ab/w", "root"]:
+        ssm_client.put_parameter(Name=name, Value="v", Type="String")
+    ssm_client.add_tags_to_resource(
+        ResourceType="Parameter",
+        ResourceId="/a/b/y",
+        Tags=[{"Key": "env", "Value": "prod"}],
+    )
+
+    def by_path(path, recursive):
+        paginator = ssm_client.get_paginator("get_parameters_by_path")
+        return [
+            p["Name"]
+            for page in paginator.paginate(
+                Path=path,
+                Recursive=recursive,
+                PaginationConfig={"PageSize": 1},
+            )
+            for p in page["Parameters"]
+        ]
+
+    assert by_path("/a", False) == ["/a/x"]
+    assert by_path("/a/", True) == ["/a/b/c/z", "/a/b/y", "/a/x"]
+
+    def describe(filters):
+        res = ssm_client.describe_parameters(ParameterFilters=filters)
+        return [p["Name"] for p in res["Parameters"]]
+
+    assert describe([{"Key": "Path", "Option": "OneLevel", "Values": ["/a/b"]}]) == [
+        "/a/b/y"
+    ]
+    assert describe([{"Key": "Name", "Option": "BeginsWith", "Values": ["/ab"]}]) == [
+        "/ab/w"
+    ]
+    assert describe([{"Key": "tag:env", "Values": ["prod"]}]) == ["/a/b/y"]
+    assert describe([{"Key": "Type", "Values": ["SecureString"]}]) == []
+
+    paginator = ssm_client.get_paginator("describe_parameters")
+    pages = list(paginator.paginate(PaginationConfig={"PageSize": 2}))
+    assert [len(page["Parameters"]) for page in pages] == [2, 2, 1]
+    pages = paginator.paginate(
+        PaginationConfig={"PageSize": 2, "StartingToken": pages[0]["NextToken"]}
+    )
+    assert [p["Name"] for page in pages for p in page["Parameters"]] == [
+        "/a/x",
+        "/ab/w",
+        "root",
+    ]
+    assert ssm_client.can_paginate("get_parameter") is False
+    with pytest.raises(botocore.exceptions.OperationNotPageableError):
+        ssm_client.get_paginator("get_parameter")
+
+
+def test_history_paginator():
+    ssm_client = LocalSSMClient()
+    for i in range(5):
+        ssm_client.put_parameter(Name="/h", Value=str(i), Type="String", Overwrite=True)
+    ssm_client.label_parameter_version(Name="/h", ParameterVersion=2, Labels=["a"])
+    paginator = ssm_client.get_paginator("get_parameter_history")
+    pages = list(paginator.paginate(Name="/h", PaginationConfig={"PageSize": 2}))
+    assert len(pages) == 3
+    versions = [p for page in pages for p in page["Parameters"]]
+    assert [p["Version"] for p in versions] == [1, 2, 3, 4, 5]
+    assert versions[1]["Labels"] == ["a"]
+
+
+def test_versions_labels_and_errors():
+    ssm_client = LocalSSMClient()
+    name = "/app/secret"
+    ssm_client.put_parameter(Name=name, Value="s1", Type="SecureString")
+    res = ssm_client.get_parameter(Name=name)
+    assert res["Parameter"]["Value"] != "s1"
+    res = ssm_client.get_parameter(Name=name, WithDecryption=True)
+    assert res["Parameter"]["Value"] == "s1"
+
+    with pytest.raises(ssm_client.exceptions.ParameterAlreadyExists):
+        ssm_client.put_parameter(Name=name, Value="s2")
+    ssm_client.put_parameter(Name=name, Value="s2", Overwrite=True)
+    ssm_client.label_parameter_version(Name=name, ParameterVersion=1, Labels=["old"])
+    res = ssm_client.get_parameter(Name=f"{name}:old", WithDecryption=True)
+    assert res["Parameter"]["Value"] == "s1"
+    assert res["Parameter"]["Selector"] == ":old"
+
+    history = ssm_client.get_parameter_history(Name=name, WithDecryption=True)
+    assert [p["Labels"] for p in history["Parameters"]] == [["old"], []]
+    assert history["Parameters"][1]["Type"] == ParameterType.SECURE_STRING.value
+
+    # the oldest version has a label, it can't be rotated out of the history
+    for i in range(98):
+        ssm_client.put_parameter(Name=name, Value=f"v{i}", Overwrite=True)
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        ssm_client.put_parameter(Name=name, Value="v", Overwrite=True)
+    assert get_code(e.value) == "ParameterMaxVersionLimitExceeded"
+
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        ssm_client.put_parameter(Name="/big", Value="x" * 5000, Type="String")
+    assert get_code(e.value) == "ValidationException"
+    res = ssm_client.put_parameter(
+        Name="/big",
+        Value="x" * 5000,
+        Type="String",
+        Tier=ParameterTier.INTELLIGENT_TIERING.value,
+    )
+    assert res["Tier"] == ParameterTier.ADVANCED.value
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        ssm_client.put_parameter(
+            Name="/big", Value="x", Tier="Standard", Overwrite=True
+        )
+    assert get_code(e.value) == "ValidationException"
+
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        ssm_client.list_tags_for_resource(ResourceType="Parameter", ResourceId="/no")
+    assert get_code(e.value) == "InvalidResourceId"
+
+
+def test_persistence_and_throttling(tmp_path):
+    path = str(tmp_path / "ssm.sqlite")
+    ssm_client = LocalSSMClient(path)
+    ssm_client.put_parameter(Name="/p", Value="v", Type="String")
+    ssm_client.close()
+    assert get_parameter(LocalSSMClient(path), "/p").value == "v"
+
+    calls = []
+    ssm_client = LocalSSMClient(max_tps=2, latency=lambda op: calls.append(op))
+    ssm_client.put_parameter(Name="/p", Value="v", Type="String")
+    ssm_client.get_parameter(Name="/p")
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        ssm_client.get_parameter(Name="/p")
+    assert get_code(e.value) == "ThrottlingException"
+    # the same per operation error class as the other errors
+    assert isinstance(e.value, ssm_client.exceptions.ThrottlingException)
+    assert e.value.operation_name == "GetParameter"
+    assert calls == ["PutParameter", "GetParameter", "GetParameter"]
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.emulator",
+        preview=False,
+    )
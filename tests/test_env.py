@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shlex
+import subprocess
+
+import pytest
+import botocore.exceptions
+
+from simple_aws_ssm_parameter_store.env import (
+    make_env_key,
+    load_env,
+    apply_env,
+    format_dotenv,
+    write_dotenv,
+    format_exports,
+    read_snapshot,
+)
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultSpec, FaultInjectingClient
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def test_make_env_key():
+    assert make_env_key("/app/prod/db/host", "/app/prod") == "DB_HOST"
+    assert make_env_key("/app/prod/db/host", "/app/prod/") == "DB_HOST"
+    assert make_env_key("/app/prod/x.y-z", "/app", env_prefix="A_") == "A_PROD_X_Y_Z"
+    assert make_env_key("/other/key", "/app", upper=False) == "other_key"
+
+
+def put(ssm_client, name, value, type=ParameterType.STRING):
+    ssm_client.put_parameter(Name=name, Value=value, Type=type.value)
+
+
+def test_load_env(tmp_path):
+    ssm_client = LocalSSMClient()
+    put(ssm_client, "/app/prod/db/host", "db.example.com")
+    put(ssm_client, "/app/prod/db/password", "p@ss 'word'", ParameterType.SECURE_STRING)
+    put(ssm_client, "/app/prod/internal", "skip me")
+    put(ssm_client, "/shared/prod/db/host", "shared.example.com")
+    put(ssm_client, "/shared/prod/region", "us-east-1")
+
+    snapshot_path = tmp_path / "env.json"
+    env = load_env(
+        ssm_client,
+        ["/shared/prod", "/app/prod"],
+        rename=lambda name, path: (
+            None if name.endswith("/internal") else make_env_key(name, path)
+        ),
+        mapping={"/shared/prod/region": "AWS_REGION"},
+        snapshot_path=snapshot_path,
+    )
+    # the later path wins
+    assert env == {
+        "DB_HOST": "db.example.com",
+        "AWS_REGION": "us-east-1",
+        "DB_PASSWORD": "p@ss 'word'",
+    }
+    assert read_snapshot(snapshot_path) == env
+    assert load_env(ssm_client, "/app/prod/db", env_prefix="X_") == {
+        "X_HOST": "db.example.com",
+        "X_PASSWORD": "p@ss 'word'",
+    }
+
+    # SSM is unreachable, fall back to the snapshot
+    client = FaultInjectingClient(ssm_client, default=FaultSpec(error_rate=1.0))
+    assert load_env(client, "/app/prod", snapshot_path=snapshot_path) == env
+    with pytest.raises(botocore.exceptions.ClientError):
+        load_env(client, "/app/prod")
+    with pytest.raises(botocore.exceptions.ClientError):
+        load_env(client, "/app/prod", snapshot_path=tmp_path / "missing.json")
+
+    # other errors, e.g. missing permissions, are not hidden by the snapshot
+    class DeniedClient:
+        def get_paginator(self, name):
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "AccessDeniedException", "Message": ""}},
+                "GetParametersByPath",
+            )
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        load_env(DeniedClient(), "/app/prod", snapshot_path=snapshot_path)
+
+
+def test_outputs(tmp_path):
+    env = {"A": "1", "B": 'it\'s a "test" $HOME\nline2'}
+
+    environ = {"A": "0"}
+    assert apply_env(env, environ=environ, overwrite=False) == {"B": env["B"]}
+    assert environ["A"] == "0"
+    apply_env(env, environ=environ)
+    assert environ == env
+
+    # an existing, world readable file is replaced by an owner only one
+    (tmp_path / ".env").write_text("OLD=1\n")
+    os.chmod(tmp_path / ".env", 0o644)
+    path = write_dotenv(env, tmp_path / ".env")
+    assert path.read_text() == format_dotenv(env)
+    assert [p.name for p in tmp_path.iterdir()] == [".env"]
+
+    if os.name == "posix":
+        assert oct(path.stat().st_mode & 0o777) == oct(0o600)
+        script = format_exports(env) + 'printf "%s" "$B"'
+        res = subprocess.run(["sh", "-c", script], capture_output=True, text=True)
+        assert res.stdout == env["B"]
+        assert shlex.split(format_exports({"A": "1"})) == ["export", "A=1"]
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_load_env(self):
+        for i in range(25):
+            put(self.ssm_client, f"/env/app/key{i:02d}", f"value-{i}")
+        env = load_env(self.ssm_client, "/env/app")
+        assert len(env) == 25
+        assert env["KEY00"] == "value-0"
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.env",
+        preview=False,
+    )
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import gc
+
+import boto3
+from botocore.config import Config
+
+from simple_aws_ssm_parameter_store.factory import (
+    build_config,
+    get_ssm_client,
+    clear_client_cache,
+    prewarm_client,
+    _session_clients,
+)
+from simple_aws_ssm_parameter_store.batch import (
+    DEFAULT_MAX_WORKERS,
+    get_max_pool_connections,
+    get_max_workers,
+)
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def test_build_config():
+    config = build_config()
+    assert config.max_pool_connections == DEFAULT_MAX_WORKERS
+    assert config.tcp_keepalive is True
+
+    config = build_config(
+        max_workers=32,
+        config=Config(max_pool_connections=4, read_timeout=5),
+    )
+    assert config.max_pool_connections == 32
+    assert config.read_timeout == 5
+
+    config = build_config(config=Config(max_pool_connections=64))
+    assert config.max_pool_connections == 64
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_get_ssm_client(self):
+        clear_client_cache()
+        client_1 = get_ssm_client(region_name="us-east-1")
+        client_2 = get_ssm_client(region_name="us-east-1")
+        assert client_1 is client_2
+        assert get_max_pool_connections(client_1) == DEFAULT_MAX_WORKERS
+
+        client_3 = get_ssm_client(region_name="us-east-1", max_workers=16, prewarm=2)
+        assert client_3 is not client_1
+        assert get_max_pool_connections(client_3) == 16
+
+        client_4 = get_ssm_client(boto_ses=self.boto_ses)
+        assert client_4 is get_ssm_client(boto_ses=self.boto_ses)
+
+        # the clients of a garbage collected session are dropped
+        boto_ses = boto3.Session(region_name="us-east-1")
+        client_5 = get_ssm_client(boto_ses=boto_ses)
+        assert client_5 is not client_4
+        assert len(_session_clients) == 2
+        del boto_ses, client_5
+        gc.collect()
+        assert len(_session_clients) == 1
+
+        clear_client_cache()
+        assert get_ssm_client(region_name="us-east-1") is not client_1
+
+    def test_prewarm_client(self):
+        assert prewarm_client(self.ssm_client, n_connection=3) == 3
+        assert prewarm_client(LocalSSMClient()) == 1
+
+    def test_get_max_workers(self):
+        ssm_client = self.boto_ses.client("ssm", config=Config(max_pool_connections=2))
+        assert get_max_workers(ssm_client, None) == 2
+        assert get_max_workers(ssm_client, 1) == 1
+        assert get_max_workers(LocalSSMClient(), 32) == 32
+        assert get_max_workers(LocalSSMClient(), None) == DEFAULT_MAX_WORKERS
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.factory",
+        preview=False,
+    )
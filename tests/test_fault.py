@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+import botocore.exceptions
+from botocore.config import Config
+
+from simple_aws_ssm_parameter_store.fault import (
+    constant_latency,
+    uniform_latency,
+    lognormal_latency,
+    FaultSpec,
+    FaultInjectingClient,
+)
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.client import (
+    get_parameter,
+    put_parameter_if_changed,
+    get_parameter_tags,
+)
+from simple_aws_ssm_parameter_store.inventory import iter_parameter_metadata
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def test_latency_distributions():
+    rng = random.Random(1)
+    assert constant_latency(0.1)(rng) == 0.1
+    assert 0.1 <= uniform_latency(0.1, 0.2)(rng) <= 0.2
+    values = sorted(lognormal_latency(0.01)(rng) for _ in range(1001))
+    assert 0.005 < values[500] < 0.02
+
+
+def test_local_client():
+    ssm_client = LocalSSMClient()
+    client = FaultInjectingClient(ssm_client, seed=1)
+    put_parameter_if_changed(
+        client, "/app/p", "v", type=ParameterType.STRING, tags={"k": "v"}
+    )
+    assert get_parameter_tags(client, "/app/p") == {"k": "v"}
+    assert client.stats.total_fault == 0
+
+    client.faults["GetParameter"] = FaultSpec(throttle_rate=1.0)
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        get_parameter(client, "/app/p")
+    assert e.value.response["Error"]["Code"] == "ThrottlingException"
+    assert client.stats.n_throttle == {"GetParameter": 1}
+
+    client.faults["DescribeParameters"] = FaultSpec(error_rate=1.0)
+    with pytest.raises(botocore.exceptions.ClientError) as e:
+        list(iter_parameter_metadata(client))
+    assert e.value.response["ResponseMetadata"]["HTTPStatusCode"] >= 500
+
+    client = FaultInjectingClient(ssm_client, default=FaultSpec(timeout_rate=1.0))
+    with pytest.raises(botocore.exceptions.ReadTimeoutError):
+        get_parameter(client, "/app/p")
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    @classmethod
+    def setup_class_post_hook(cls):
+        cls.ssm_client.put_parameter(
+            Name="/fault/p",
+            Value="v",
+            Type=ParameterType.STRING.value,
+        )
+
+    def test_boto3_client(self):
+        ssm_client = self.boto_ses.client(
+            "ssm",
+            config=Config(retries={"mode": "standard", "total_max_attempts": 2}),
+        )
+        with FaultInjectingClient(
+            ssm_client,
+            faults={"GetParameter": FaultSpec(throttle_rate=1.0)},
+        ) as client:
+            # the fault goes through botocore retries
+            with pytest.raises(botocore.exceptions.ClientError) as e:
+                get_parameter(client, "/fault/p")
+            assert e.value.response["Error"]["Code"] == "ThrottlingException"
+            assert client.stats.n_attempt == {"GetParameter": 2}
+            assert client.stats.total_fault == 2
+
+            # other operations pass through
+            assert get_parameter_tags(client, "/fault/p") == {}
+            assert client.stats.n_attempt["ListTagsForResource"] == 1
+
+            # other users of the wrapped client don't get faults
+            assert get_parameter(ssm_client, "/fault/p").value == "v"
+            assert client.stats.n_attempt["GetParameter"] == 2
+
+            # paginated calls through the wrapper do
+            client.faults["DescribeParameters"] = FaultSpec(error_rate=1.0)
+            paginator = client.get_paginator("describe_parameters")
+            with pytest.raises(botocore.exceptions.ClientError):
+                list(paginator.paginate())
+            assert client.stats.n_attempt["DescribeParameters"] == 2
+            client.faults.pop("DescribeParameters")
+
+        # detached
+        assert get_parameter(ssm_client, "/fault/p").value == "v"
+        assert client.stats.total_attempt == 5
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.fault",
+        preview=False,
+    )
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simple_aws_ssm_parameter_store.history import (
+    BudgetAction,
+    VersionBudgetGuard,
+    scan_version_churn,
+)
+from simple_aws_ssm_parameter_store.constants import ParameterType
+from simple_aws_ssm_parameter_store.client import get_parameter
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+from simple_aws_ssm_parameter_store.exc import VersionBudgetExceededError
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_budget(caplog):
+    ssm_client = LocalSSMClient()
+    clock = Clock()
+    kwargs = dict(max_writes=3, window=60, clock=clock)
+    name = "/history/rate"
+
+    guard = VersionBudgetGuard(ssm_client, action=BudgetAction.REJECT, **kwargs)
+    for i in range(3):
+        guard.put_parameter_if_changed(name, str(i), type=ParameterType.STRING)
+    # unchanged values are not writes
+    assert guard.put_parameter_if_changed(name, "2")[1] is None
+    with pytest.raises(VersionBudgetExceededError):
+        guard.put_parameter_if_changed(name, "3")
+    assert guard.get_version(name) == 3
+    clock.now += 61
+    assert guard.put_parameter_if_changed(name, "3")[1].version == 4
+
+    guard = VersionBudgetGuard(ssm_client, action="warn", **kwargs)
+    for i in range(4):
+        guard.put_parameter_if_changed(name, f"warn-{i}")
+    assert "3 writes in the last 60s" in caplog.text
+    assert get_parameter(ssm_client, name).version == 8
+
+
+def test_coalesce():
+    ssm_client = LocalSSMClient()
+    clock = Clock()
+    guard = VersionBudgetGuard(
+        ssm_client,
+        max_writes=2,
+        window=60,
+        action=BudgetAction.COALESCE,
+        clock=clock,
+    )
+    name = "/history/coalesce"
+    for i in range(10):
+        guard.put_parameter_if_changed(name, str(i), type=ParameterType.STRING)
+    assert guard.writer.n_pending == 1
+    # the deferred value stays ahead of the later writes
+    clock.now += 61
+    guard.put_parameter_if_changed(name, "10", type=ParameterType.STRING)
+    guard.writer.close()
+    param = get_parameter(ssm_client, name)
+    assert (param.value, param.version) == ("10", 3)
+
+
+def test_labeled_versions():
+    client = FaultInjectingClient(LocalSSMClient())
+    name = "/history/labeled"
+    for i in range(95):
+        client.put_parameter(Name=name, Value=str(i), Type="String", Overwrite=True)
+    client.label_parameter_version(Name=name, ParameterVersion=1, Labels=["stable"])
+    guard = VersionBudgetGuard(client, max_writes=100, labeled_margin=5)
+
+    # version 95, version 1 rotates out with the 6th write from now
+    client.stats.reset()
+    guard.put_parameter_if_changed(name, "95")
+    assert "GetParameterHistory" not in client.stats.n_attempt
+
+    guard.action = BudgetAction.REJECT
+    with pytest.raises(VersionBudgetExceededError, match="labeled version 1"):
+        guard.put_parameter_if_changed(name, "96")
+    # the history is read once, then cached
+    with pytest.raises(VersionBudgetExceededError):
+        guard.put_parameter_if_changed(name, "96")
+    assert client.stats.n_attempt["GetParameterHistory"] == 2
+
+    client.unlabel_parameter_version(Name=name, ParameterVersion=1, Labels=["stable"])
+    guard.history_ttl = 0
+    assert guard.put_parameter_if_changed(name, "96")[1].version == 97
+
+
+def test_scan_version_churn():
+    client = FaultInjectingClient(LocalSSMClient())
+    for i in range(60):
+        for version in range(i % 7 + 1):
+            client.put_parameter(
+                Name=f"/churn/p{i:02d}",
+                Value=str(version),
+                Type="String",
+                Overwrite=True,
+            )
+    client.stats.reset()
+    report = scan_version_churn(client, path_prefix="/churn/", top=3)
+    assert report.n_parameter == 60
+    assert [churn.version for churn in report.top] == [7, 7, 7]
+    assert report.top[0].n_new_version is None
+    # one streamed pass, no history read
+    assert client.stats.n_attempt == {"DescribeParameters": 2}
+
+    previous = {f"/churn/p{i:02d}": 7 for i in range(60)}
+    previous["/churn/p01"] = 0
+    report = scan_version_churn(client, previous_versions=previous, top=1)
+    assert [(c.name, c.n_new_version) for c in report.top] == [("/churn/p01", 2)]
+    assert report.n_history_full == 0
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_guard(self):
+        guard = VersionBudgetGuard(self.ssm_client, max_writes=1, action="reject")
+        name = "/history/moto"
+        guard.put_parameter_if_changed(name, "1", type=ParameterType.STRING)
+        with pytest.raises(VersionBudgetExceededError):
+            guard.put_parameter_if_changed(name, "2", type=ParameterType.STRING)
+        report = scan_version_churn(self.ssm_client, path_prefix="/history/")
+        assert [churn.name for churn in report.top] == [name]
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.history",
+        preview=False,
+    )
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from simple_aws_ssm_parameter_store.incremental import (
+    ChangeAction,
+    iter_changes,
+    read_state,
+)
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def summarize(changes):
+    return sorted(
+        (
+            change.action.value,
+            change.name,
+            None if change.parameter is None else change.parameter.value,
+        )
+        for change in changes
+    )
+
+
+def test_iter_changes(tmp_path):
+    ssm_client = LocalSSMClient()
+    for i in range(60):
+        ssm_client.put_parameter(Name=f"/inc/app/p{i:02d}", Value="v1", Type="String")
+    ssm_client.put_parameter(
+        Name="/inc/app/secret",
+        Value="s1",
+        Type="SecureString",
+        Tags=[{"Key": "k", "Value": "v"}],
+    )
+    ssm_client.put_parameter(Name="/inc/other", Value="x", Type="String")
+    client = FaultInjectingClient(ssm_client)
+    state_path = tmp_path / "state.json"
+
+    # first run, everything is new
+    changes = list(iter_changes(client, "/inc/app/", state_path, with_decryption=True))
+    assert len(changes) == 61
+    assert {change.action for change in changes} == {ChangeAction.CREATED}
+    assert read_state(state_path)["/inc/app/"].versions["/inc/app/p00"] == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+    if os.name == "posix":
+        assert oct(state_path.stat().st_mode & 0o777) == oct(0o600)
+
+    # nothing changed, no value is read
+    client.stats.reset()
+    assert list(iter_changes(client, "/inc/app/", state_path)) == []
+    assert client.stats.n_attempt == {"DescribeParameters": 2}
+
+    ssm_client.put_parameter(Name="/inc/app/p10", Value="v2", Overwrite=True)
+    ssm_client.put_parameter(Name="/inc/app/new", Value="n", Type="String")
+    ssm_client.put_parameter(Name="/inc/app/secret", Value="s2", Overwrite=True)
+    ssm_client.delete_parameter(Name="/inc/app/p20")
+    client.stats.reset()
+    changes = list(
+        iter_changes(
+            client, "/inc/app/", state_path, with_decryption=True, with_tags=True
+        )
+    )
+    assert summarize(changes) == [
+        ("created", "/inc/app/new", "n"),
+        ("deleted", "/inc/app/p20", None),
+        ("updated", "/inc/app/p10", "v2"),
+        ("updated", "/inc/app/secret", "s2"),
+    ]
+    assert [c.tags for c in changes if c.name == "/inc/app/secret"] == [{"k": "v"}]
+    assert [c.is_deleted for c in changes if c.name == "/inc/app/p20"] == [True]
+    # values of the 3 changed parameters, at most one call per page, and tags
+    assert client.stats.n_attempt["DescribeParameters"] == 2
+    assert client.stats.n_attempt["GetParameters"] <= 2
+    assert client.stats.n_attempt["ListTagsForResource"] == 3
+
+    # an interrupted run doesn't move the high-water mark
+    ssm_client.put_parameter(Name="/inc/app/p11", Value="v2", Overwrite=True)
+    stream = iter_changes(client, "/inc/app/", state_path)
+    next(stream)
+    stream.close()
+    assert summarize(iter_changes(client, "/inc/app/", state_path)) == [
+        ("updated", "/inc/app/p11", "v2"),
+    ]
+
+    # prefixes are tracked independently
+    changes = list(iter_changes(client, "/inc/other", state_path))
+    assert [change.name for change in changes] == ["/inc/other"]
+    assert set(read_state(state_path)) == {"/inc/app/", "/inc/other"}
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_iter_changes(self, tmp_path):
+        for i in range(3):
+            self.ssm_client.put_parameter(
+                Name=f"/inc/moto/p{i}", Value="v1", Type="String"
+            )
+        state_path = tmp_path / "state.json"
+        assert len(list(iter_changes(self.ssm_client, "/inc/moto/", state_path))) == 3
+        self.ssm_client.put_parameter(Name="/inc/moto/p1", Value="v2", Overwrite=True)
+        changes = list(iter_changes(self.ssm_client, "/inc/moto/", state_path))
+        assert [(c.action, c.name) for c in changes] == [
+            (ChangeAction.UPDATED, "/inc/moto/p1")
+        ]
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.incremental",
+        preview=False,
+    )
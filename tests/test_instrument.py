@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+from simple_aws_ssm_parameter_store.instrument import (
+    OperationRecord,
+    UsageStats,
+    StatsdExporter,
+    PrometheusExporter,
+    add_exporter,
+    remove_exporter,
+    track_usage,
+    record_cache_access,
+    instrument_client,
+    uninstrument_client,
+)
+from simple_aws_ssm_parameter_store.client import get_parameter, get_parameters
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class _Raw:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+def test_usage_stats():
+    usage = UsageStats()
+    usage.add(OperationRecord(operation="GetParameter", latency=0.1, retries=1))
+    usage.add(OperationRecord(operation="GetParameter", latency=0.3, error_code="X"))
+    usage.add_cache_access("GetParameter", hit=True)
+    usage.add_cache_access("GetParameter", hit=False)
+    assert usage.n_call == 2
+    assert usage.n_error == 1
+    assert usage.n_retry == 1
+    assert usage.n_cache_hit == 1
+    assert usage.n_cache_miss == 1
+    assert usage.total_latency == pytest.approx(0.4)
+    assert usage.operations["GetParameter"].avg_latency == pytest.approx(0.2)
+    assert usage.operations["GetParameter"].max_latency == pytest.approx(0.3)
+
+
+def test_exporters():
+    lines = list()
+    statsd = StatsdExporter(send=lines.append)
+    statsd.export_call(
+        OperationRecord(
+            operation="GetParameter",
+            latency=0.01,
+            retries=1,
+            throttles=1,
+            n_decrypt=1,
+            error_code="X",
+        )
+    )
+    statsd.export_cache_access("GetParameter", hit=False)
+    assert "ssm.GetParameter.calls:1|c" in lines
+    assert "ssm.GetParameter.latency:10.000|ms" in lines
+    assert "ssm.GetParameter.throttles:1|c" in lines
+    assert "ssm.GetParameter.cache_miss:1|c" in lines
+
+    prom = PrometheusExporter()
+    prom.export_call(OperationRecord(operation="GetParameter", latency=0.01))
+    prom.export_cache_access("GetParameter", hit=True)
+    text = prom.render()
+    assert 'ssm_calls_total{operation="GetParameter"} 1' in text
+    assert 'ssm_cache_hits_total{operation="GetParameter"} 1' in text
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    @classmethod
+    def setup_class_post_hook(cls):
+        instrument_client(cls.ssm_client)
+        # idempotent
+        instrument_client(cls.ssm_client)
+        for i in range(25):
+            cls.ssm_client.put_parameter(
+                Name=f"/test_instrument/p{i}",
+                Value="secret",
+                Type=ParameterType.SECURE_STRING.value,
+            )
+
+    def test_track_usage(self):
+        prom = add_exporter(PrometheusExporter())
+        try:
+            with track_usage() as outer:
+                get_parameter(self.ssm_client, "/test_instrument/p0")
+                with track_usage() as inner:
+                    # 3 concurrent batches, accounted in the worker threads
+                    params = get_parameters(
+                        self.ssm_client,
+                        [f"/test_instrument/p{i}" for i in range(25)],
+                        with_decryption=True,
+                    )
+                    assert len(params) == 25
+                    get_parameter(self.ssm_client, "/test_instrument/missing")
+                    record_cache_access("GetParameter", hit=True)
+        finally:
+            remove_exporter(prom)
+
+        assert outer.n_call == 5
+        assert inner.n_call == 4
+        assert inner.operations["GetParameters"].n_call == 3
+        assert inner.n_decrypt == 25
+        assert inner.n_error == 1
+        assert inner.n_cache_hit == 1
+        assert outer.operations["GetParameter"].n_decrypt == 0
+        assert inner.operations["GetParameters"].request_bytes > 0
+        assert inner.operations["GetParameters"].response_bytes > 0
+        assert prom.usage.n_call == 5
+
+        # no scope, no exporter, nothing recorded
+        get_parameter(self.ssm_client, "/test_instrument/p0")
+        assert outer.n_call == 5
+
+    def test_throttle(self):
+        state = {"n": 0}
+
+        def throttle_once(request, **kwargs):
+            if state["n"] == 0:
+                state["n"] += 1
+                body = json.dumps(
+                    {"__type": "ThrottlingException", "message": "Rate exceeded"}
+                ).encode("utf-8")
+                return AWSResponse(request.url, 400, {}, _Raw(body))
+
+        event_name = "before-send.ssm.GetParameter"
+        self.ssm_client.meta.events.register_first(event_name, throttle_once)
+        try:
+            with track_usage() as usage:
+                get_parameter(self.ssm_client, "/test_instrument/p0")
+        finally:
+            self.ssm_client.meta.events.unregister(event_name, throttle_once)
+        assert usage.n_throttle == 1
+        assert usage.n_retry == 1
+        assert usage.n_error == 0
+
+    def test_uninstrument(self):
+        uninstrument_client(self.ssm_client)
+        uninstrument_client(self.ssm_client)
+        try:
+            with track_usage() as usage:
+                get_parameter(self.ssm_client, "/test_instrument/p0")
+            assert usage.n_call == 0
+        finally:
+            instrument_client(self.ssm_client)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.instrument",
+        preview=False,
+    )
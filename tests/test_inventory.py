@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from simple_aws_ssm_parameter_store.inventory import (
+    iter_parameter_metadata,
+    iter_parameter_inventory,
+    scan_tier_report,
+)
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    @classmethod
+    def setup_class_post_hook(cls):
+        for i in range(12):
+            cls.ssm_client.put_parameter(
+                Name=f"/test_inventory/standard/p{i}",
+                Value=f"v{i}",
+                Type=ParameterType.STRING.value,
+            )
+        cls.ssm_client.put_parameter(
+            Name="/test_inventory/advanced/small",
+            Value="small",
+            Type=ParameterType.SECURE_STRING.value,
+            Tier="Advanced",
+        )
+        cls.ssm_client.put_parameter(
+            Name="/test_inventory/advanced/large",
+            Value="a" * 6000,
+            Type=ParameterType.STRING.value,
+            Tier="Advanced",
+        )
+
+    def test_iter_parameter_metadata(self):
+        params = list(
+            iter_parameter_metadata(
+                self.ssm_client,
+                path_prefix="/test_inventory/standard/",
+                page_size=5,
+            )
+        )
+        assert len(params) == 12
+        assert all(param.value is None for param in params)
+
+    def test_iter_parameter_inventory(self):
+        params = list(
+            iter_parameter_inventory(
+                self.ssm_client,
+                path_prefix="/test_inventory/",
+                with_decryption=True,
+            )
+        )
+        assert len(params) == 14
+        params = {param.name: param for param in params}
+        assert params["/test_inventory/standard/p1"].value == "v1"
+        assert params["/test_inventory/advanced/small"].value == "small"
+        # metadata from describe_parameters is kept
+        assert params["/test_inventory/advanced/small"].key_id is not None
+
+        params = list(
+            iter_parameter_inventory(
+                self.ssm_client,
+                path_prefix="/test_inventory/",
+                with_value=False,
+            )
+        )
+        assert all(param.value is None for param in params)
+
+    def test_scan_tier_report(self):
+        report = scan_tier_report(self.ssm_client, path_prefix="/test_inventory/")
+        assert report.n_standard == 12
+        assert report.n_advanced == 2
+        # values are only read for advanced parameters
+        assert report.stats["Standard"].n_value_read == 0
+        assert report.stats["Advanced"].n_value_read == 2
+        assert [rec.name for rec in report.recommendations] == [
+            "/test_inventory/advanced/small"
+        ]
+
+        report = scan_tier_report(
+            self.ssm_client,
+            path_prefix="/test_inventory/",
+            compression="zlib",
+        )
+        assert len(report.recommendations) == 2
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.inventory",
+        preview=False,
+    )
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import collections
+
+from simple_aws_ssm_parameter_store.kms import (
+    get_decryption_key,
+    group_by_key,
+    get_parameters_by_key,
+)
+from simple_aws_ssm_parameter_store.inventory import (
+    iter_parameter_metadata,
+    iter_parameter_inventory,
+)
+from simple_aws_ssm_parameter_store.constants import ParameterType, DEFAULT_KMS_KEY
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class RecordingClient:
+    """
+    Record the ``GetParameters`` calls, and the max number of concurrent
+    calls per decryption key.
+    """
+
+    def __init__(self, ssm_client):
+        self.ssm_client = ssm_client
+        self.calls = list()
+        self.in_flight = collections.Counter()
+        self.max_in_flight = collections.Counter()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.ssm_client, name)
+
+    def get_parameters(self, Names, WithDecryption=False):
+        key_ids = set()
+        if WithDecryption:
+            for meta in iter_parameter_metadata(self.ssm_client):
+                if meta.name in Names and meta.type == "SecureString":
+                    key_ids.add(meta.key_id)
+        with self._lock:
+            self.calls.append((list(Names), WithDecryption, key_ids))
+            for key_id in key_ids:
+                self.in_flight[key_id] += 1
+                self.max_in_flight[key_id] = max(
+                    self.max_in_flight[key_id], self.in_flight[key_id]
+                )
+        time.sleep(0.02)
+        try:
+            return self.ssm_client.get_parameters(
+                Names=Names, WithDecryption=WithDecryption
+            )
+        finally:
+            with self._lock:
+                for key_id in key_ids:
+                    self.in_flight[key_id] -= 1
+
+
+def put_all(ssm_client):
+    for i in range(20):
+        ssm_client.put_parameter(
+            Name=f"/kms/plain/p{i:02d}", Value=f"v{i}", Type="String"
+        )
+    for key_id in ["alias/a", "alias/b"]:
+        for i in range(30):
+            ssm_client.put_parameter(
+                Name=f"/kms/{key_id[-1]}/s{i:02d}",
+                Value=f"{key_id}-{i}",
+                Type="SecureString",
+                KeyId=key_id,
+            )
+    ssm_client.put_parameter(Name="/kms/default", Value="d", Type="SecureString")
+
+
+def test_group_by_key():
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    metas = list(iter_parameter_metadata(ssm_client, path_prefix="/kms/"))
+    groups = group_by_key(metas)
+    assert {key_id: len(names) for key_id, names in groups.items()} == {
+        None: 20,
+        "alias/a": 30,
+        "alias/b": 30,
+        DEFAULT_KMS_KEY: 1,
+    }
+    assert list(group_by_key(metas, with_decryption=False)) == [None]
+    meta = metas[0]
+    assert get_decryption_key(meta, lambda meta: False) is None
+
+
+def test_get_parameters_by_key():
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = RecordingClient(ssm_client)
+    metas = list(iter_parameter_metadata(ssm_client, path_prefix="/kms/"))
+    params = get_parameters_by_key(
+        client,
+        metas,
+        max_workers=8,
+        max_workers_per_key={"alias/a": 1},
+    )
+    assert list(params) == [meta.name for meta in metas]
+    assert params["/kms/a/s00"].value == "alias/a-0"
+    assert params["/kms/plain/p00"].value == "v0"
+
+    # plain values are never read with decryption, a batch has one key
+    for names, with_decryption, key_ids in client.calls:
+        assert len(key_ids) <= 1
+        if with_decryption is False:
+            assert all(name.startswith("/kms/plain/") for name in names)
+        else:
+            assert not any(name.startswith("/kms/plain/") for name in names)
+    assert len(client.calls) == 2 + 3 + 3 + 1
+    assert client.max_in_flight["alias/a"] == 1
+    assert client.max_in_flight["alias/b"] <= 2
+
+
+def test_max_workers_per_key_across_callers():
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = RecordingClient(ssm_client)
+    metas = list(iter_parameter_metadata(ssm_client, path_prefix="/kms/a/"))
+
+    # the per key limit holds for all the callers of the same client
+    threads = [
+        threading.Thread(
+            target=get_parameters_by_key,
+            args=(client, metas),
+            kwargs=dict(max_workers=4, max_workers_per_key=1),
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(client.calls) == 3 * 3
+    assert client.max_in_flight["alias/a"] == 1
+
+
+def test_iter_parameter_inventory():
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = RecordingClient(ssm_client)
+    params = list(
+        iter_parameter_inventory(
+            client,
+            path_prefix="/kms/",
+            with_decryption=True,
+            max_workers_per_key=1,
+        )
+    )
+    assert len(params) == 81
+    assert all(param.value is not None for param in params)
+    assert all(len(key_ids) <= 1 for _, _, key_ids in client.calls)
+    assert max(client.max_in_flight.values()) == 1
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_get_parameters_by_key(self):
+        self.ssm_client.put_parameter(
+            Name="/kms/moto/plain", Value="v", Type=ParameterType.STRING.value
+        )
+        self.ssm_client.put_parameter(
+            Name="/kms/moto/secret",
+            Value="s",
+            Type=ParameterType.SECURE_STRING.value,
+        )
+        metas = list(iter_parameter_metadata(self.ssm_client, path_prefix="/kms/moto/"))
+        params = get_parameters_by_key(self.ssm_client, metas)
+        assert params["/kms/moto/plain"].value == "v"
+        assert params["/kms/moto/secret"].value == "s"
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.kms",
+        preview=False,
+    )
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from simple_aws_ssm_parameter_store.lease import (
+    acquire_lease,
+    renew_lease,
+    renew_leases,
+    release_lease,
+)
+from simple_aws_ssm_parameter_store.client import get_parameter
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RacingClient:
+    """
+    Let ``other`` acquire the lease right before our next ``put_parameter``.
+    """
+
+    def __init__(self, ssm_client, clock: Clock, other: str):
+        self._ssm_client = ssm_client
+        self._clock = clock
+        self._other = other
+        self.other_lease = None
+
+    def put_parameter(self, **kwargs):
+        if self._other is not None:
+            other, self._other = self._other, None
+            self.other_lease = acquire_lease(
+                self._ssm_client, kwargs["Name"], other, ttl=30, clock=self._clock
+            )
+        return self._ssm_client.put_parameter(**kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._ssm_client, name)
+
+
+def run_lease_lifecycle(ssm_client):
+    clock = Clock()
+    name = "/lease/lifecycle"
+
+    lease = acquire_lease(ssm_client, name, "a", ttl=30, clock=clock)
+    assert (lease.owner, lease.token, lease.expires_at) == ("a", 1, clock.now + 30)
+    assert lease.is_expired(clock.now) is False
+    assert acquire_lease(ssm_client, name, "b", ttl=30, clock=clock) is None
+
+    clock.now += 20
+    lease = renew_lease(ssm_client, lease, ttl=30, clock=clock)
+    assert (lease.token, lease.version, lease.expires_at) == (1, 2, clock.now + 30)
+
+    # expired, taken over by b with a higher fencing token
+    clock.now += 31
+    lease_b = acquire_lease(ssm_client, name, "b", ttl=30, clock=clock)
+    assert lease_b.token == 3
+    assert renew_lease(ssm_client, lease, ttl=30, clock=clock) is None
+    assert release_lease(ssm_client, lease, clock=clock) is False
+
+    # released, a gets it right away
+    assert release_lease(ssm_client, lease_b, clock=clock) is True
+    lease = acquire_lease(ssm_client, name, "a", ttl=30, clock=clock)
+    assert lease.token == 5
+
+
+def test_lease_lifecycle():
+    run_lease_lifecycle(LocalSSMClient())
+
+
+def test_acquire_race():
+    ssm_client = LocalSSMClient()
+    clock = Clock()
+    name = "/lease/race"
+
+    # b creates the lease between our check and our write
+    racing = _RacingClient(ssm_client, clock, "b")
+    assert acquire_lease(racing, name, "a", ttl=30, clock=clock) is None
+    assert racing.other_lease.token == 1
+
+    # b's lease expires, b takes it over again while we write on top of it
+    clock.now += 31
+    racing = _RacingClient(ssm_client, clock, "b")
+    assert acquire_lease(racing, name, "a", ttl=30, clock=clock) is None
+    lease_b = racing.other_lease
+    assert lease_b.token == 2
+    # b's record was put back, b still holds the lease
+    record = json.loads(get_parameter(ssm_client, name).value)
+    assert (record["owner"], record["token"]) == ("b", 2)
+    assert renew_lease(ssm_client, lease_b, ttl=30, clock=clock) is not None
+    assert acquire_lease(ssm_client, name, "a", ttl=30, clock=clock) is None
+
+
+def test_renew_leases():
+    client = FaultInjectingClient(LocalSSMClient())
+    clock = Clock()
+    names = [f"/lease/many/{i:02d}" for i in range(25)]
+    leases = [acquire_lease(client, name, "a", ttl=30, clock=clock) for name in names]
+    # one of them is lost
+    release_lease(client, leases[3], clock=clock)
+    acquire_lease(client, names[3], "b", ttl=30, clock=clock)
+    clock.now += 20
+
+    client.stats.reset()
+    renewed = renew_leases(client, leases, ttl=30, clock=clock, max_workers=4)
+    assert [lease is None for lease in renewed] == [False] * 3 + [True] + [False] * 21
+    assert [lease.version for lease in renewed if lease is not None] == [2] * 24
+    # the records of all the leases are read with 3 batched calls
+    assert client.stats.n_attempt == {"GetParameters": 3, "PutParameter": 24}
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_lease_lifecycle(self):
+        run_lease_lifecycle(self.ssm_client)
+
+    def test_expiration_policy(self):
+        clock = Clock()
+        lease = acquire_lease(
+            self.ssm_client,
+            "/lease/policy",
+            "a",
+            ttl=30,
+            expiration_policy=True,
+            clock=clock,
+        )
+        assert lease.token == 1
+        clock.now += 10
+        lease = renew_lease(
+            self.ssm_client, lease, ttl=30, expiration_policy=True, clock=clock
+        )
+        assert lease.version == 2
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.lease",
+        preview=False,
+    )
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from simple_aws_ssm_parameter_store.model import Parameter
+from simple_aws_ssm_parameter_store.codec import Codec
+from simple_aws_ssm_parameter_store.compression import compress_value
 from simple_aws_ssm_parameter_store.constants import (
     ParameterType,
     ParameterTier,
@@ -44,6 +46,49 @@ class TestParameter:
 
         _ = param.core_data
 
+    def test_decode(self):
+        param = Parameter(
+            _data={
+                "Name": "my_parameter",
+                "Value": '{"b": 1, "a": 2}',
+                "Version": 1,
+            }
+        )
+        value = param.json_value
+        assert value == {"a": 2, "b": 1}
+        # decoded value is memoized per parameter object (version)
+        assert param.json_value is value
+        assert param.decode("json") is value
+
+        assert Parameter(_data={"Name": "p", "Value": "a,b"}).string_list_value == [
+            "a",
+            "b",
+        ]
+        assert Parameter(_data={"Name": "p", "Value": "42"}).int_value == 42
+        assert Parameter(_data={"Name": "p", "Value": "true"}).bool_value is True
+
+        # the decoded value cache is not part of equality nor serialization
+        assert param == Parameter(_data=dict(param._data))
+        assert param.to_dict() == {"_data": param._data}
+
+        # codecs sharing a name don't share the memoized value
+        upper = Codec(name="json", encode=str, decode=str.upper)
+        assert param.decode(upper) == '{"B": 1, "A": 2}'
+        assert param.json_value is value
+
+    def test_compressed_value(self):
+        raw_value = compress_value('{"a": 1}')
+        param = Parameter(_data={"Name": "my_parameter", "Value": raw_value})
+        assert param.raw_value == raw_value
+        assert param.value == '{"a": 1}'
+        assert param.value is param.value
+        assert param.json_value == {"a": 1}
+
+        # plain values that look compressed are read as is
+        for raw_value in ["ssmz:hello world", "ssmz:zlib:aGVsbG8="]:
+            param = Parameter(_data={"Name": "my_parameter", "Value": raw_value})
+            assert param.value == raw_value
+
 
 if __name__ == "__main__":
     from simple_aws_ssm_parameter_store.tests import run_cov_test
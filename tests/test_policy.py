@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import dataclasses
+
+from simple_aws_ssm_parameter_store.policy import (
+    PathPolicy,
+    PolicyRegistry,
+    get_parameters_by_policy,
+)
+from simple_aws_ssm_parameter_store.cache import ParameterCache
+from simple_aws_ssm_parameter_store.watcher import ParameterWatcher
+from simple_aws_ssm_parameter_store.settings import load_settings
+from simple_aws_ssm_parameter_store.env import load_env
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def put(ssm_client, name, value, type=ParameterType.STRING):
+    ssm_client.put_parameter(Name=name, Value=value, Type=type.value, Overwrite=True)
+
+
+def make_policies() -> PolicyRegistry:
+    policies = PolicyRegistry(default=PathPolicy(ttl=60))
+    policies.register("/app/", with_decryption=False)
+    policies.register("/app/flags/", ttl=5, refresh_interval=5)
+    policies.register("/app/secrets/", PathPolicy(ttl=30, with_decryption=True))
+    return policies
+
+
+def test_resolve():
+    policies = make_policies()
+    assert len(policies) == 3
+    assert policies.resolve("/other") == PathPolicy(ttl=60)
+    assert policies.resolve("/app/db/host") == PathPolicy(ttl=60, with_decryption=False)
+    assert policies.resolve("/app/flags/dark-mode") == PathPolicy(
+        ttl=5, with_decryption=False, refresh_interval=5
+    )
+    assert policies.resolve("/app/secrets/key:3").with_decryption is True
+    # whole segments only
+    assert policies.resolve("/app/flagship").ttl == 60
+    assert policies.resolve("/app/flags").ttl == 5
+
+    # a shorter prefix registered later is inherited too
+    policies.register("/app/", stale_while_revalidate=120)
+    assert policies.resolve("/app/flags/x").stale_while_revalidate == 120
+    assert policies.resolve("/app/flags/x").with_decryption is None
+    # so is a new default
+    policies.register("/", ttl=600)
+    assert policies.resolve("/other").ttl == 600
+    assert policies.resolve("/app/db/host").ttl == 600
+    assert len(policies) == 3
+
+
+def test_get_parameters_by_policy():
+    ssm_client = LocalSSMClient()
+    put(ssm_client, "/app/db/host", "db")
+    put(ssm_client, "/app/secrets/key", "k", type=ParameterType.SECURE_STRING)
+    client = FaultInjectingClient(ssm_client)
+    names = ["/app/secrets/key", "/app/db/host", "/app/missing"]
+    params = get_parameters_by_policy(client, names, make_policies())
+    assert list(params) == names[:2]
+    assert params["/app/secrets/key"].value == "k"
+    # one batch per decryption setting
+    assert client.stats.n_attempt == {"GetParameters": 2}
+
+
+def test_parameter_cache():
+    ssm_client = LocalSSMClient()
+    put(ssm_client, "/app/flags/a", "on")
+    put(ssm_client, "/app/db/host", "db")
+    put(ssm_client, "/app/secrets/key", "k", type=ParameterType.SECURE_STRING)
+    client = FaultInjectingClient(ssm_client)
+    clock = Clock()
+    cache = ParameterCache(client, ttl=3600, clock=clock, policies=make_policies())
+    names = ["/app/flags/a", "/app/db/host", "/app/secrets/key"]
+    params = cache.get_many(names)
+    assert params["/app/secrets/key"].value == "k"
+    assert cache.get("/other") is None
+    assert client.stats.n_attempt == {"GetParameters": 2, "GetParameter": 1}
+
+    # each name expires after the TTL of its path, one batch per decryption
+    client.stats.reset()
+    for now, n_call in [(4, 0), (6, 1), (31, 3), (61, 5)]:
+        clock.now = now
+        cache.get_many(names)
+        assert client.stats.total_attempt == n_call
+
+
+def test_parameter_watcher():
+    ssm_client = LocalSSMClient()
+    put(ssm_client, "/app/flags/a", "off")
+    put(ssm_client, "/app/db/host", "db1")
+    client = FaultInjectingClient(ssm_client)
+    policies = PolicyRegistry()
+    policies.register("/app/flags/", refresh_interval=5)
+    policies.register("/app/db/host", refresh_interval=3600)
+    watcher = ParameterWatcher(client, policies=policies)
+    events = list()
+    callback = lambda o, n: events.append(n.value)
+    watcher.watch_prefix("/app/flags/", callback, start=False)
+    subscription = watcher.watch("/app/db/host", callback, start=False)
+    watcher.watch("/app/other", callback, start=False)
+
+    # the first due times are scheduled, the adaptive target is due right away
+    assert watcher._due_targets(0) == (["/app/other"], (), True)
+    watcher._adaptive_due = 3600
+    assert watcher._due_targets(4) == ([], (), False)
+
+    put(ssm_client, "/app/flags/a", "on")
+    put(ssm_client, "/app/db/host", "db2")
+    names, prefixes, _ = watcher._due_targets(5)
+    assert (names, prefixes) == ([], ("/app/flags/",))
+    watcher._poll(names, prefixes)
+    # the db host change is only seen at its own schedule
+    assert events == ["on"]
+    assert watcher._due_targets(9)[:2] == ([], ())
+    names, prefixes, _ = watcher._due_targets(3600)
+    assert (names, prefixes) == (["/app/db/host", "/app/other"], ("/app/flags/",))
+    watcher._poll(names, prefixes)
+    assert events == ["on", "db2"]
+
+    watcher.unsubscribe(subscription)
+    assert "/app/db/host" not in watcher._due
+
+
+@dataclasses.dataclass
+class Settings:
+    host: str
+    key: str
+
+
+def test_loaders():
+    ssm_client = LocalSSMClient()
+    put(ssm_client, "/app/db/host", "db")
+    put(ssm_client, "/app/secrets/key", "k", type=ParameterType.SECURE_STRING)
+    policies = make_policies()
+
+    settings = load_settings(
+        ssm_client,
+        Settings,
+        names={"host": "/app/db/host", "key": "/app/secrets/key"},
+        with_decryption=False,
+        policies=policies,
+    )
+    assert settings == Settings(host="db", key="k")
+
+    env = load_env(ssm_client, "/app/secrets/", with_decryption=False)
+    assert env["KEY"] != "k"
+    env = load_env(
+        ssm_client, "/app/secrets/", with_decryption=False, policies=policies
+    )
+    assert env == {"KEY": "k"}
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_get_parameters_by_policy(self):
+        put(self.ssm_client, "/policy/moto/host", "db")
+        put(
+            self.ssm_client,
+            "/policy/moto/secrets/key",
+            "k",
+            type=ParameterType.SECURE_STRING,
+        )
+        policies = PolicyRegistry(default=PathPolicy(with_decryption=False))
+        policies.register("/policy/moto/secrets/", with_decryption=True)
+        params = get_parameters_by_policy(
+            self.ssm_client,
+            ["/policy/moto/host", "/policy/moto/secrets/key"],
+            policies,
+        )
+        assert params["/policy/moto/host"].value == "db"
+        assert params["/policy/moto/secrets/key"].value == "k"
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.policy",
+        preview=False,
+    )
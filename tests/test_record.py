@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simple_aws_ssm_parameter_store.record import (
+    parameter_to_record,
+    record_to_kwargs,
+)
+from simple_aws_ssm_parameter_store.model import Parameter
+from simple_aws_ssm_parameter_store.constants import ParameterType, ParameterTier
+
+
+def test_round_trip():
+    param = Parameter(
+        _data={
+            "Name": "/record/p",
+            "Type": "SecureString",
+            "Value": "secret",
+            "Version": 3,
+            "Tier": "Advanced",
+            "KeyId": "alias/app",
+            "Description": "desc",
+        }
+    )
+    record = parameter_to_record(param, tags={"env": "prod"})
+    assert record["value"] == "secret"
+    assert record["encrypted"] is False
+    kwargs = record_to_kwargs(record)
+    assert kwargs["name"] == "/record/p"
+    assert kwargs["value"] == "secret"
+    assert kwargs["type"] is ParameterType.SECURE_STRING
+    assert kwargs["tier"] is ParameterTier.ADVANCED
+    assert kwargs["key_id"] == "alias/app"
+    assert kwargs["description"] == "desc"
+    assert kwargs["tags"] == {"env": "prod"}
+
+    # an encrypted value can't be written back as the plain value
+    record = parameter_to_record(param, decrypted=False)
+    assert record["encrypted"] is True
+    with pytest.raises(ValueError):
+        record_to_kwargs(record)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.record",
+        preview=False,
+    )
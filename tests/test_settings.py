@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import enum
+import typing as T
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from simple_aws_ssm_parameter_store.settings import setting, load_settings
+from simple_aws_ssm_parameter_store.cache import ParameterCache
+from simple_aws_ssm_parameter_store.exc import SettingsError
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+class Mode(enum.Enum):
+    fast = "fast"
+    safe = "safe"
+
+
+@dataclasses.dataclass
+class AppSettings:
+    host: str
+    port: int
+    debug: bool
+    ratio: float
+    mode: Mode
+    root: Path
+    hosts: list[str]
+    ports: tuple[int, ...]
+    password: str = setting("/shared/password")
+    options: dict = setting("opts", codec="json", default_factory=dict)
+    timeout: T.Optional[int] = None
+    tags: list[str] = dataclasses.field(default_factory=list)
+
+
+def put_all(ssm_client):
+    for name, value in [
+        ("/app/host", "db.example.com"),
+        ("/app/port", "5432"),
+        ("/app/debug", "yes"),
+        ("/app/ratio", "0.5"),
+        ("/app/mode", "safe"),
+        ("/app/root", "/srv/app"),
+        ("/app/hosts", "a,b"),
+        ("/app/ports", "[1, 2]"),
+        ("/app/opts", '{"a": 1}'),
+        ("/shared/password", "secret"),
+    ]:
+        ssm_client.put_parameter(
+            Name=name,
+            Value=value,
+            Type="SecureString" if "password" in name else "String",
+        )
+
+
+def test_load_settings():
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = FaultInjectingClient(ssm_client)
+
+    settings = load_settings(client, AppSettings, prefix="/app/")
+    assert settings == AppSettings(
+        host="db.example.com",
+        port=5432,
+        debug=True,
+        ratio=0.5,
+        mode=Mode.safe,
+        root=Path("/srv/app"),
+        hosts=["a", "b"],
+        ports=(1, 2),
+        password="secret",
+        options={"a": 1},
+    )
+    # 12 fields, one batched read
+    assert client.stats.n_attempt == {"GetParameters": 2}
+
+    # re-instantiating through the cache costs no API call
+    client.stats.reset()
+    cache = ParameterCache(client, ttl=60)
+    for _ in range(3):
+        assert load_settings(cache, AppSettings, prefix="/app") == settings
+    assert client.stats.n_attempt == {"GetParameters": 2}
+
+    ssm_client.put_parameter(Name="/app/timeout", Value="3", Type="String")
+    settings = load_settings(
+        client, AppSettings, prefix="/app", names={"tags": "hosts"}
+    )
+    assert settings.timeout == 3
+    assert settings.tags == ["a", "b"]
+
+    with pytest.raises(SettingsError, match="/other/host"):
+        load_settings(client, AppSettings, prefix="/other")
+    with pytest.raises(SettingsError, match="AppSettings.port"):
+        load_settings(client, AppSettings, prefix="/app", names={"port": "host"})
+    with pytest.raises(TypeError):
+        load_settings(client, dict)
+
+
+def test_load_pydantic_settings():
+    pydantic = pytest.importorskip("pydantic")
+
+    class PydanticSettings(pydantic.BaseModel):
+        host: str
+        port: int
+        hosts: list[str]
+        timeout: int = 30
+
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    settings = load_settings(ssm_client, PydanticSettings, prefix="/app")
+    assert settings.port == 5432
+    assert settings.hosts == ["a", "b"]
+    assert settings.timeout == 30
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_load_settings(self):
+        put_all(self.ssm_client)
+        settings = load_settings(self.ssm_client, AppSettings, prefix="/app")
+        assert settings.password == "secret"
+        assert settings.ports == (1, 2)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.settings",
+        preview=False,
+    )
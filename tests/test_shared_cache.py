@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import dataclasses
+import multiprocessing
+
+import pytest
+
+from simple_aws_ssm_parameter_store.shared_cache import SharedParameterCache
+from simple_aws_ssm_parameter_store.policy import PolicyRegistry
+from simple_aws_ssm_parameter_store.settings import load_settings
+from simple_aws_ssm_parameter_store.instrument import track_usage
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+NAMES = [f"/shared-cache/p{i:02d}" for i in range(12)]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def put_all(ssm_client):
+    for i, name in enumerate(NAMES):
+        ssm_client.put_parameter(Name=name, Value=f"v{i}", Type="SecureString")
+
+
+def test_shared_parameter_cache(tmp_path):
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = FaultInjectingClient(ssm_client)
+    clock = Clock()
+    path = tmp_path / "cache"
+    cache1 = SharedParameterCache(client, path, ttl=10, clock=clock)
+    cache2 = SharedParameterCache(client, path, ttl=10, clock=clock)
+
+    with track_usage() as usage:
+        params = cache1.get_many(NAMES + ["/shared-cache/missing"])
+    assert list(params) == NAMES
+    assert params[NAMES[0]].value == "v0"
+    assert params[NAMES[0]].last_modified_date is not None
+    assert usage.n_cache_miss == 13
+    assert client.stats.n_attempt == {"GetParameters": 2}
+    if os.name == "posix":
+        assert oct(path.stat().st_mode & 0o777) == oct(0o600)
+
+    # another cache on the same file makes no call
+    with track_usage() as usage:
+        assert cache2.get_many(NAMES) == params
+        assert cache2.get("/shared-cache/missing") is None
+    assert usage.n_cache_hit == 13
+    assert client.stats.total_attempt == 2
+    assert len(cache2) == 13
+
+    # parsed entries are reused within a file generation
+    assert cache2.get(NAMES[1]) is cache2.get(NAMES[1])
+
+    # expired entries are refreshed once, for everybody
+    clock.now += 11
+    ssm_client.put_parameter(Name=NAMES[0], Value="new", Overwrite=True)
+    assert cache2.get(NAMES[0]).value == "new"
+    assert cache1.get(NAMES[0]).value == "new"
+    assert client.stats.n_attempt == {"GetParameters": 3}
+
+    cache1.invalidate(NAMES[0])
+    assert len(cache2) == 12
+    cache1.invalidate()
+    assert len(cache2) == 0
+
+    @dataclasses.dataclass
+    class Settings:
+        p00: str
+        p01: str
+
+    assert load_settings(cache2, Settings, prefix="/shared-cache") == Settings(
+        p00="new", p01="v1"
+    )
+
+
+def test_stale_while_revalidate_and_set(tmp_path):
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = FaultInjectingClient(ssm_client)
+    clock = Clock()
+    path = tmp_path / "cache"
+    policies = PolicyRegistry()
+    policies.register(NAMES[0], ttl=1000)
+    cache1 = SharedParameterCache(
+        client,
+        path,
+        ttl=10,
+        clock=clock,
+        stale_while_revalidate=60,
+        policies=policies,
+    )
+    cache2 = SharedParameterCache(client, path, ttl=10, clock=clock)
+    assert (cache1.stale_while_revalidate, cache1.policies) == (60, policies)
+    cache1.get_many(NAMES)
+
+    for name in NAMES:
+        ssm_client.put_parameter(Name=name, Value="new", Overwrite=True)
+    clock.now += 11
+    # stale values are served right away, and refreshed in the background,
+    # except the one whose policy TTL is longer
+    params = cache1.get_many(NAMES)
+    assert [param.value for param in params.values()] == [f"v{i}" for i in range(12)]
+    while cache1._refresh_thread is not None:
+        time.sleep(0.01)
+    assert cache1.get(NAMES[0]).value == "v0"
+    params = cache2.get_many(NAMES[1:])
+    assert {param.value for param in params.values()} == {"new"}
+    assert client.stats.n_attempt == {"GetParameters": 4}
+
+    # set writes the shared file
+    cache1.set(NAMES[1], None)
+    cache1.set("/shared-cache/other", params[NAMES[2]])
+    assert cache2.get(NAMES[1]) is None
+    assert cache2.get("/shared-cache/other").value == "new"
+    assert client.stats.total_attempt == 4
+
+
+def _worker(database, path, barrier, queue):
+    client = FaultInjectingClient(LocalSSMClient(database=database))
+    cache = SharedParameterCache(client, path, ttl=60)
+    barrier.wait()
+    values = [param.value for param in cache.get_many(NAMES).values()]
+    queue.put((values, client.stats.total_attempt))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="requires fork")
+def test_multi_process(tmp_path):
+    database = str(tmp_path / "ssm.db")
+    put_all(LocalSSMClient(database=database))
+    path = str(tmp_path / "cache")
+
+    ctx = multiprocessing.get_context("fork")
+    n_process = 4
+    barrier = ctx.Barrier(n_process)
+    queue = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(database, path, barrier, queue))
+        for _ in range(n_process)
+    ]
+    for process in processes:
+        process.start()
+    results = [queue.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join()
+    for values, _ in results:
+        assert values == [f"v{i}" for i in range(12)]
+    # only the elected refresher called SSM
+    assert sorted(n_call for _, n_call in results) == [0, 0, 0, 2]
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_get_many(self, tmp_path):
+        put_all(self.ssm_client)
+        cache = SharedParameterCache(self.ssm_client, tmp_path / "cache")
+        assert cache.get(NAMES[0]).value == "v0"
+        assert len(cache.get_many(NAMES)) == 12
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.shared_cache",
+        preview=False,
+    )
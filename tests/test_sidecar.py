@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+import pytest
+
+from simple_aws_ssm_parameter_store.sidecar import SidecarServer, SidecarClient
+from simple_aws_ssm_parameter_store.exc import SidecarError
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultSpec, FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+NAMES = [f"/sidecar/app/p{i:02d}" for i in range(12)]
+
+
+def put_all(ssm_client):
+    for i, name in enumerate(NAMES):
+        ssm_client.put_parameter(Name=name, Value=f"v{i}", Type="SecureString")
+
+
+def check_client(client: SidecarClient, ssm_client: FaultInjectingClient):
+    param = client.get(NAMES[0])
+    assert param.value == "v0"
+    assert param.last_modified_date is not None
+    assert client.get("/sidecar/missing") is None
+
+    params = client.get_many(NAMES + ["/sidecar/missing"])
+    assert list(params) == NAMES
+    assert params[NAMES[1]].value == "v1"
+
+    params = client.get_by_path("/sidecar/app")
+    assert [param.name for param in params] == NAMES
+
+    # everything is cached now
+    ssm_client.stats.reset()
+    for _ in range(3):
+        client.get(NAMES[0])
+        client.get_many(NAMES)
+        client.get_by_path("/sidecar/app")
+    assert ssm_client.stats.total_attempt == 0
+
+
+def test_http():
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = FaultInjectingClient(ssm_client)
+    with SidecarServer(client, ttl=0.2, stale_while_revalidate=60) as server:
+        sidecar_client = SidecarClient(url=server.url, token=server.token)
+        check_client(sidecar_client, client)
+
+        # expired entries are served stale and revalidated in the background
+        ssm_client.put_parameter(Name=NAMES[0], Value="new", Overwrite=True)
+        time.sleep(0.3)
+        assert sidecar_client.get(NAMES[0]).value == "v0"
+        deadline = time.time() + 5
+        while sidecar_client.get(NAMES[0]).value != "new":
+            assert time.time() < deadline
+            time.sleep(0.05)
+        params = sidecar_client.get_by_path("/sidecar/app")
+        deadline = time.time() + 5
+        while params[0].value != "new":
+            assert time.time() < deadline
+            time.sleep(0.05)
+            params = sidecar_client.get_by_path("/sidecar/app")
+
+        # SSM errors are forwarded
+        client.faults["GetParameter"] = FaultSpec(error_rate=1.0)
+        with pytest.raises(SidecarError) as e:
+            sidecar_client.get("/sidecar/other")
+        assert e.value.status == 502
+        with pytest.raises(SidecarError):
+            sidecar_client._request("GET", "/unknown")
+        with pytest.raises(SidecarError) as e:
+            sidecar_client._request("GET", "/parameter")
+        assert e.value.status == 400
+        assert sidecar_client._request("GET", "/health")[1] == {"status": "ok"}
+
+        # requests need the bearer token, and the server's Host
+        for token in [None, "wrong"]:
+            with pytest.raises(SidecarError) as e:
+                SidecarClient(url=server.url, token=token).get(NAMES[0])
+            assert e.value.status == 401
+        with pytest.raises(SidecarError) as e:
+            SidecarClient(url=server.url, token="wrong").get_many(NAMES)
+        assert e.value.status == 401
+        conn = sidecar_client._connect()
+        conn.request(
+            "GET",
+            f"/parameter?name={NAMES[0]}",
+            headers={
+                "Host": "attacker.example.com",
+                "Authorization": f"Bearer {server.token}",
+            },
+        )
+        assert conn.getresponse().status == 403
+        conn.close()
+
+    with pytest.raises(ValueError):
+        SidecarClient()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="requires Unix domain sockets")
+def test_unix_socket(tmp_path):
+    ssm_client = LocalSSMClient()
+    put_all(ssm_client)
+    client = FaultInjectingClient(ssm_client)
+    socket_path = str(tmp_path / "sidecar.sock")
+    with SidecarServer(client, socket_path=socket_path) as server:
+        assert server.url is None
+        assert oct(os.stat(socket_path).st_mode & 0o777) == oct(0o600)
+        assert server.token is None
+        check_client(SidecarClient(socket_path=socket_path), client)
+    assert not os.path.exists(socket_path)
+
+    with SidecarServer(client, socket_path=socket_path, token="secret") as server:
+        with pytest.raises(SidecarError) as e:
+            SidecarClient(socket_path=socket_path).get(NAMES[0])
+        assert e.value.status == 401
+        param = SidecarClient(socket_path=socket_path, token="secret").get(NAMES[0])
+        assert param.value == "v0"
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_get_many(self):
+        put_all(self.ssm_client)
+        with SidecarServer(self.ssm_client, token="secret") as server:
+            assert server.token == "secret"
+            client = SidecarClient(url=server.url, token="secret")
+            assert len(client.get_many(NAMES)) == 12
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.sidecar",
+        preview=False,
+    )
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from simple_aws_ssm_parameter_store.subtree import copy_subtree, move_subtree
+from simple_aws_ssm_parameter_store.client import get_parameter, get_parameter_tags
+from simple_aws_ssm_parameter_store.exc import SubtreeVerificationError
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def put_tree(ssm_client, n: int = 60):
+    for i in range(n):
+        kwargs = dict(
+            Name=f"/legacy/app/sub{i % 3}/p{i:03d}",
+            Value=f"v{i}",
+            Type="String",
+            Description=f"desc {i}",
+        )
+        if i == 0:
+            kwargs.update(Type="SecureString", KeyId="alias/app", Tier="Advanced")
+            kwargs["Tags"] = [{"Key": "team", "Value": "data"}]
+        ssm_client.put_parameter(**kwargs)
+    # not part of the subtree
+    ssm_client.put_parameter(Name="/legacy/application", Value="x", Type="String")
+
+
+def test_copy_and_move(tmp_path):
+    ssm_client = LocalSSMClient()
+    put_tree(ssm_client)
+
+    report = copy_subtree(ssm_client, "/legacy/app", "/app/prod")
+    assert report.n_parameter == 60
+    assert report.n_written == 60
+    assert report.n_naive_api_call == 300
+    assert report.n_api_call < report.n_naive_api_call
+    assert report.n_api_call_saved == report.n_naive_api_call - report.n_api_call
+
+    param = get_parameter(ssm_client, "/app/prod/sub0/p000", with_decryption=True)
+    assert param.value == "v0"
+    assert param.type == "SecureString"
+    meta = ssm_client.describe_parameters(
+        ParameterFilters=[{"Key": "Name", "Values": ["/app/prod/sub0/p000"]}]
+    )["Parameters"][0]
+    assert meta["Tier"] == "Advanced"
+    assert meta["KeyId"] == "alias/app"
+    assert meta["Description"] == "desc 0"
+    assert get_parameter_tags(ssm_client, "/app/prod/sub0/p000") == {"team": "data"}
+    assert get_parameter(ssm_client, "/app/prod/ication") is None
+
+    # copying again writes nothing
+    report = copy_subtree(ssm_client, "/legacy/app/", "/app/prod/", with_tags=False)
+    assert (report.n_written, report.n_unchanged) == (0, 60)
+
+    # a move that fails half way resumes from the checkpoint
+    checkpoint_path = tmp_path / "checkpoint.json"
+    state = {"n": 0}
+    original_put = ssm_client.put_parameter
+
+    def flaky_put(**kwargs):
+        state["n"] += 1
+        if state["n"] > 55:
+            raise RuntimeError("boom")
+        return original_put(**kwargs)
+
+    ssm_client.put_parameter = flaky_put
+    with pytest.raises(RuntimeError):
+        move_subtree(
+            ssm_client, "/legacy/app", "/new/app", checkpoint_path=checkpoint_path
+        )
+    ssm_client.put_parameter = original_put
+    assert len(json.loads(checkpoint_path.read_text())["copied"]) == 50
+    assert get_parameter(ssm_client, "/legacy/app/sub0/p000") is not None
+
+    report = move_subtree(
+        ssm_client, "/legacy/app", "/new/app", checkpoint_path=checkpoint_path
+    )
+    assert report.n_resumed == 50
+    # 5 of the page that failed were written before the failure
+    assert (report.n_written, report.n_unchanged) == (5, 5)
+    assert report.n_deleted == 60
+    assert get_parameter(ssm_client, "/legacy/app/sub0/p000") is None
+    assert get_parameter(ssm_client, "/legacy/application") is not None
+    assert get_parameter(ssm_client, "/new/app/sub2/p059").value == "v59"
+
+    # resuming a finished move is a no-op
+    report = move_subtree(
+        ssm_client, "/legacy/app", "/new/app", checkpoint_path=checkpoint_path
+    )
+    assert (report.n_parameter, report.n_resumed, report.n_deleted) == (60, 60, 0)
+
+    with pytest.raises(ValueError):
+        copy_subtree(ssm_client, "/a", "/b", checkpoint_path=checkpoint_path)
+    with pytest.raises(ValueError):
+        copy_subtree(ssm_client, "/app", "/app/prod")
+
+
+def test_verification_error():
+    ssm_client = LocalSSMClient()
+    put_tree(ssm_client, n=3)
+    original_get_parameters = ssm_client.get_parameters
+
+    def get_parameters(**kwargs):
+        response = original_get_parameters(**kwargs)
+        for param in response["Parameters"]:
+            if param["Name"].startswith("/app/"):
+                param["Value"] = "corrupted"
+        return response
+
+    ssm_client.get_parameters = get_parameters
+    with pytest.raises(SubtreeVerificationError):
+        move_subtree(ssm_client, "/legacy/app", "/app")
+    # nothing was deleted
+    assert get_parameter(ssm_client, "/legacy/app/sub0/p000") is not None
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_move_subtree(self):
+        put_tree(self.ssm_client, n=12)
+        report = move_subtree(self.ssm_client, "/legacy/app", "/moto/app")
+        assert report.n_deleted == 12
+        assert get_parameter(self.ssm_client, "/moto/app/sub1/p001").value == "v1"
+        assert get_parameter_tags(self.ssm_client, "/moto/app/sub0/p000") == {
+            "team": "data"
+        }
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.subtree",
+        preview=False,
+    )
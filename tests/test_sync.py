@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+import json
+import textwrap
+
+import pytest
+
+from simple_aws_ssm_parameter_store.sync import (
+    parse_desired_state,
+    hash_desired_state,
+    sync_file,
+)
+from simple_aws_ssm_parameter_store.client import get_parameter, get_parameter_tags
+from simple_aws_ssm_parameter_store.constants import ParameterType, ParameterTier
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+YAML = textwrap.dedent("""
+    path: /app/prod
+    parameters:
+      db/host: db.example.com
+      db/password:
+        value: secret
+        type: SecureString
+        description: database password
+        tags: {team: data}
+      features:
+        value: {checkout: true}
+      replicas:
+        value: [a, b]
+        type: StringList
+      /shared/region:
+        value: us-east-1
+        tier: Advanced
+    """)
+YAML_DATA = {
+    "path": "/app/prod",
+    "parameters": {
+        "db/host": "db.example.com",
+        "db/password": {"value": "secret", "type": "SecureString"},
+    },
+}
+
+
+def test_parse_desired_state():
+    desired = parse_desired_state(
+        {"path": "/app/", "parameters": {"a": "1", "/b": {"value": 2}}}
+    )
+    assert desired == {
+        "/app/a": {"name": "/app/a", "value": "1", "type": ParameterType.STRING},
+        "/b": {
+            "name": "/b",
+            "value": 2,
+            "type": ParameterType.STRING,
+            "codec": "json",
+        },
+    }
+    assert (
+        parse_desired_state(
+            {"parameters": {"/c": {"value": "x", "tier": "Advanced", "policies": []}}}
+        )["/c"]["tier"]
+        is ParameterTier.ADVANCED
+    )
+    with pytest.raises(ValueError):
+        parse_desired_state({"parameters": {"/a": {"valeu": "x"}}})
+    with pytest.raises(ValueError):
+        parse_desired_state({"parameters": {"/a": {"type": "String"}}})
+
+    state_hash, entries = hash_desired_state(desired)
+    assert hash_desired_state(dict(reversed(desired.items())))[0] == state_hash
+    assert set(entries) == {"/app/a", "/b"}
+
+    # SecureString entries are only hashed with a key
+    desired = parse_desired_state(YAML_DATA)
+    state_hash, entries = hash_desired_state(desired)
+    assert state_hash is None
+    assert entries["/app/prod/db/password"] is None
+    assert entries["/app/prod/db/host"] is not None
+    state_hash_1, entries_1 = hash_desired_state(desired, key=b"k1")
+    state_hash_2, entries_2 = hash_desired_state(desired, key=b"k2")
+    assert None not in (state_hash_1, state_hash_2)
+    assert state_hash_1 != state_hash_2
+    assert entries_1["/app/prod/db/password"] != entries_2["/app/prod/db/password"]
+    assert entries_1["/app/prod/db/host"] == entries_2["/app/prod/db/host"]
+
+
+def test_sync_file(tmp_path):
+    ssm_client = LocalSSMClient()
+    client = FaultInjectingClient(ssm_client)
+    path = tmp_path / "prod.yml"
+    path.write_text(YAML)
+    marker_name = "/sync-state/app/prod"
+
+    result = sync_file(client, path, marker_name=marker_name)
+    assert not result.skipped
+    assert len(result.created) == 5
+    param = get_parameter(ssm_client, "/app/prod/db/password", with_decryption=True)
+    assert (param.value, param.type) == ("secret", "SecureString")
+    assert get_parameter_tags(ssm_client, "/app/prod/db/password") == {"team": "data"}
+    assert get_parameter(ssm_client, "/app/prod/features").value == '{"checkout":true}'
+    assert get_parameter(ssm_client, "/app/prod/replicas").value == "a,b"
+    assert get_parameter(ssm_client, marker_name).type == "SecureString"
+
+    # same file, one call to read the marker
+    client.stats.reset()
+    result = sync_file(client, path, marker_name=marker_name)
+    assert result.skipped
+    assert client.stats.n_attempt == {"GetParameter": 1}
+
+    # only the changed entry is touched, the removed one is deleted
+    path.write_text(
+        YAML.replace("db.example.com", "db2.example.com").replace(
+            "  /shared/region:\n    value: us-east-1\n    tier: Advanced\n",
+            "",
+        )
+    )
+    client.stats.reset()
+    result = sync_file(client, path, marker_name=marker_name)
+    assert result.updated == ["/app/prod/db/host"]
+    assert result.created == [] and result.unchanged == []
+    assert result.deleted == ["/shared/region"]
+    assert client.stats.n_attempt["GetParameters"] == 1
+    assert client.stats.n_attempt["PutParameter"] == 2  # the entry and the marker
+
+    # drift is only seen with force
+    ssm_client.put_parameter(Name="/app/prod/replicas", Value="x", Overwrite=True)
+    assert sync_file(client, path, marker_name=marker_name).skipped
+    result = sync_file(client, path, marker_name=marker_name, force=True)
+    assert result.updated == ["/app/prod/replicas"]
+    assert len(result.unchanged) == 3
+
+    # JSON file and local state file
+    json_path = tmp_path / "dev.json"
+    json_path.write_text(json.dumps({"path": "/app/dev", "parameters": {"a": "1"}}))
+    state_path = tmp_path / "state.json"
+    assert sync_file(client, json_path, state_path=state_path).created == ["/app/dev/a"]
+    client.stats.reset()
+    assert sync_file(client, json_path, state_path=state_path).skipped
+    assert client.stats.total_attempt == 0
+
+    with pytest.raises(ValueError):
+        sync_file(client, json_path)
+
+
+def test_sync_file_state(tmp_path):
+    ssm_client = LocalSSMClient()
+    client = FaultInjectingClient(ssm_client)
+    path = tmp_path / "prod.yml"
+    path.write_text(YAML)
+    marker_name = "/sync-state/app/prod"
+    state_path = tmp_path / "state.json"
+
+    # the random key of the secret hashes is only kept in the marker
+    sync_file(client, path, marker_name=marker_name, state_path=state_path)
+    marker = json.loads(get_parameter(ssm_client, marker_name, True).value)
+    state = json.loads(state_path.read_text())
+    assert len(marker.pop("key")) == 64
+    assert marker == state
+    assert "secret" not in state_path.read_text()
+
+    # with both, the marker is compared, a stale local file doesn't skip
+    other_path = tmp_path / "other.yml"
+    other_path.write_text(YAML.replace("db.example.com", "db2.example.com"))
+    sync_file(client, other_path, marker_name=marker_name)
+    result = sync_file(client, path, marker_name=marker_name, state_path=state_path)
+    assert result.updated == ["/app/prod/db/host"]
+    assert get_parameter(ssm_client, "/app/prod/db/host").value == "db.example.com"
+    assert sync_file(client, path, marker_name=marker_name).skipped
+
+    # local file only: the secret is checked on every apply ...
+    local_path = tmp_path / "local.json"
+    sync_file(client, path, state_path=local_path)
+    assert (
+        json.loads(local_path.read_text())["entries"]["/app/prod/db/password"] is None
+    )
+    client.stats.reset()
+    result = sync_file(client, path, state_path=local_path)
+    assert not result.skipped
+    assert result.unchanged == ["/app/prod/db/password"]
+    assert client.stats.n_attempt == {"GetParameters": 1}
+
+    # ... unless a secret key is given
+    sync_file(client, path, state_path=local_path, secret_key="k")
+    assert sync_file(client, path, state_path=local_path, secret_key="k").skipped
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_sync_file(self, tmp_path):
+        path = tmp_path / "prod.yml"
+        path.write_text(YAML)
+        result = sync_file(self.ssm_client, path, marker_name="/sync-state/moto")
+        assert len(result.created) == 5
+        assert sync_file(self.ssm_client, path, marker_name="/sync-state/moto").skipped
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.sync",
+        preview=False,
+    )
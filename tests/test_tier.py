@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from simple_aws_ssm_parameter_store.model import Parameter
+from simple_aws_ssm_parameter_store.constants import ParameterTier
+from simple_aws_ssm_parameter_store.tier import (
+    find_standard_tier_candidates,
+    select_tier,
+    TierPricing,
+    TierReport,
+)
+
+
+def test_find_standard_tier_candidates():
+    params = [
+        # small advanced parameter, fits as is
+        Parameter(_data={"Name": "p1", "Tier": "Advanced", "Value": "a" * 100}),
+        # fits only after compression
+        Parameter(_data={"Name": "p2", "Tier": "Advanced", "Value": "a" * 6000}),
+        # doesn't fit even after compression
+        Parameter(
+            _data={
+                "Name": "p3",
+                "Tier": "Advanced",
+                "Value": "".join(f"{i:x}" for i in range(2000)) * 2,
+            }
+        ),
+        # has policies, must stay advanced
+        Parameter(
+            _data={
+                "Name": "p4",
+                "Tier": "Advanced",
+                "Value": "a",
+                "Policies": [{"PolicyText": "{}"}],
+            }
+        ),
+        # already standard
+        Parameter(_data={"Name": "p5", "Tier": "Standard", "Value": "a"}),
+    ]
+    candidates = {c.name: c for c in find_standard_tier_candidates(params)}
+    assert set(candidates) == {"p1", "p2"}
+    assert candidates["p1"].needs_compression is False
+    assert candidates["p2"].needs_compression is True
+    assert candidates["p2"].value_size == 6000
+    assert candidates["p2"].compressed_size < 4096
+
+
+def test_select_tier():
+    assert select_tier("a") is ParameterTier.STANDARD
+    assert select_tier("a" * 5000) is ParameterTier.ADVANCED
+    assert select_tier("a", policies="[]") is ParameterTier.ADVANCED
+    assert select_tier("a", before_tier="Advanced") is ParameterTier.ADVANCED
+    assert select_tier("a", before_tier="Standard") is ParameterTier.STANDARD
+
+
+def test_tier_report():
+    report = TierReport(pricing=TierPricing(advanced_parameter_monthly_cost=1.0))
+    report.add(Parameter(_data={"Name": "s1", "Tier": "Standard"}))
+    report.add(Parameter(_data={"Name": "s2", "Tier": "Standard", "Value": "abc"}))
+    rec = report.add(Parameter(_data={"Name": "a1", "Tier": "Advanced", "Value": "a"}))
+    assert rec.recommended_tier == "Standard"
+    # only fits after compression, but compression is not enabled
+    assert (
+        report.add(
+            Parameter(_data={"Name": "a2", "Tier": "Advanced", "Value": "a" * 6000})
+        )
+        is None
+    )
+    # value unknown
+    assert report.add(Parameter(_data={"Name": "a3", "Tier": "Advanced"})) is None
+
+    assert report.n_standard == 2
+    assert report.n_advanced == 3
+    assert report.stats["Standard"].n_value_read == 1
+    assert report.stats["Advanced"].max_value_size == 6000
+    assert report.monthly_storage_cost == 3.0
+    assert report.recommended_monthly_storage_cost == 2.0
+    assert [rec.name for rec in report.recommendations] == ["a1"]
+    # 3 of 5 parameters are advanced
+    assert report.estimate_api_cost(100_000) == pytest.approx(0.3)
+    assert report.estimate_api_cost(100_000, higher_throughput=True) == pytest.approx(
+        0.5
+    )
+    assert report.get_max_tps() == 40
+    assert report.get_max_tps(higher_throughput=True) == 10_000
+    assert report.standard_quota_usage == 2 / 10_000
+    assert report.advanced_quota_usage == 3 / 100_000
+
+    report = TierReport(compression="zlib")
+    rec = report.add(
+        Parameter(_data={"Name": "a2", "Tier": "Advanced", "Value": "a" * 6000})
+    )
+    assert "compression" in rec.reason
+    assert TierReport().estimate_api_cost(100) == 0.0
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.tier",
+        preview=False,
+    )
@@ -1,6 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from simple_aws_ssm_parameter_store.utils import encode_tags, decode_tags
+import os
+import json
+from datetime import datetime, timezone
+
+from simple_aws_ssm_parameter_store.utils import (
+    encode_tags,
+    decode_tags,
+    json_default,
+    json_object_hook,
+    write_private_file,
+)
 
 
 def test_encode_tags():
@@ -15,7 +25,22 @@ def test_decode_tags():
     assert result == {"k1": "v1", "k2": "v2"}
 
 
-if __name__ == "__main__":
+def test_json_hooks():
+    data = {"Name": "/a", "LastModifiedDate": datetime.now(timezone.utc)}
+    text = json.dumps(data, default=json_default)
+    assert json.loads(text, object_hook=json_object_hook) == data
+
+
+def test_write_private_file(tmp_path):
+    path = tmp_path / "sub" / "state.json"
+    assert write_private_file(path, "a") == path
+    path.chmod(0o644)
+    write_private_file(path, "b")
+    assert path.read_text() == "b"
+    assert [p.name for p in path.parent.iterdir()] == ["state.json"]
+    if os.name == "posix":
+        assert path.stat().st_mode & 0o777 == 0o600
+
     from simple_aws_ssm_parameter_store.tests import run_cov_test
 
     run_cov_test(
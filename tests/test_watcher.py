@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import weakref
+import threading
+
+from simple_aws_ssm_parameter_store.watcher import ParameterWatcher, get_shared_watcher
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def put(ssm_client, name, value):
+    ssm_client.put_parameter(Name=name, Value=value, Type="String", Overwrite=True)
+
+
+def summarize(changes):
+    return [
+        (
+            (new or old).name,
+            None if old is None else old.value,
+            None if new is None else new.value,
+        )
+        for old, new in changes
+    ]
+
+
+def test_parameter_watcher():
+    ssm_client = LocalSSMClient()
+    for i in range(12):
+        put(ssm_client, f"/watch/flags/f{i:02d}", "off")
+    put(ssm_client, "/watch/app/a", "1")
+    client = FaultInjectingClient(ssm_client)
+    watcher = ParameterWatcher(client, min_interval=1, max_interval=4)
+
+    flag_events = list()
+    app_events = list()
+    flag_names = [f"/watch/flags/f{i:02d}" for i in range(12)] + ["/watch/flags/new"]
+    watcher.watch(
+        flag_names, lambda old, new: flag_events.append((old, new)), start=False
+    )
+    sub = watcher.watch_prefix(
+        "/watch/app/", lambda old, new: app_events.append((old, new)), start=False
+    )
+
+    # nothing changed since the baseline
+    client.stats.reset()
+    assert watcher.poll() == []
+    # 13 names in 2 batched calls, plus one listing of the prefix
+    assert client.stats.n_attempt == {"GetParameters": 2, "DescribeParameters": 1}
+
+    put(ssm_client, "/watch/flags/f03", "on")
+    put(ssm_client, "/watch/flags/new", "on")
+    put(ssm_client, "/watch/app/a", "2")
+    put(ssm_client, "/watch/app/b", "x")
+    changes = watcher.poll()
+    assert sorted(summarize(changes)) == [
+        ("/watch/app/a", "1", "2"),
+        ("/watch/app/b", None, "x"),
+        ("/watch/flags/f03", "off", "on"),
+        ("/watch/flags/new", None, "on"),
+    ]
+    assert sorted(summarize(flag_events)) == [
+        ("/watch/flags/f03", "off", "on"),
+        ("/watch/flags/new", None, "on"),
+    ]
+    assert len(app_events) == 2
+
+    # unchanged parameters under a prefix are not read again
+    client.stats.reset()
+    ssm_client.delete_parameter(Name="/watch/app/b")
+    assert summarize(watcher.poll()) == [("/watch/app/b", "x", None)]
+    assert client.stats.n_attempt == {"GetParameters": 2, "DescribeParameters": 1}
+
+    # a failing callback doesn't stop the others
+    def fail(old, new):
+        raise ValueError
+
+    watcher.watch("/watch/flags/f00", fail, start=False)
+    put(ssm_client, "/watch/flags/f00", "on")
+    assert len(watcher.poll()) == 1
+    assert len(flag_events) == 3
+
+    watcher.unsubscribe(sub)
+    put(ssm_client, "/watch/app/a", "3")
+    assert watcher.poll() == []
+
+    # adaptive interval
+    assert watcher._next_interval(True) == 1
+    watcher.interval = 3
+    assert watcher._next_interval(False) == 4
+
+
+def test_background_thread():
+    ssm_client = LocalSSMClient()
+    put(ssm_client, "/watch/bg", "1")
+    watcher = get_shared_watcher(ssm_client, min_interval=0.01, max_interval=0.02)
+    assert get_shared_watcher(ssm_client) is watcher
+
+    event = threading.Event()
+    seen = list()
+
+    def callback(old, new):
+        seen.append(new.value)
+        event.set()
+
+    with watcher:
+        watcher.watch("/watch/bg", callback)
+        assert watcher.is_running
+        put(ssm_client, "/watch/bg", "2")
+        assert event.wait(5)
+    assert not watcher.is_running
+    assert seen == ["2"]
+
+
+def test_shared_watcher_is_released():
+    ssm_client = LocalSSMClient()
+    watcher = get_shared_watcher(ssm_client)
+    client_ref, watcher_ref = weakref.ref(ssm_client), weakref.ref(watcher)
+    del ssm_client, watcher
+    gc.collect()
+    assert client_ref() is None
+    assert watcher_ref() is None
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_watch_prefix(self):
+        put(self.ssm_client, "/watch/moto/a", "1")
+        watcher = ParameterWatcher(self.ssm_client)
+        events = list()
+        watcher.watch_prefix("/watch/moto/", lambda o, n: events.append(n), start=False)
+        put(self.ssm_client, "/watch/moto/a", "2")
+        watcher.poll()
+        assert [param.value for param in events] == ["2"]
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.watcher",
+        preview=False,
+    )
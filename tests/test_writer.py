@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+import subprocess
+
+import pytest
+import botocore.exceptions
+
+from simple_aws_ssm_parameter_store.writer import BufferedWriter
+from simple_aws_ssm_parameter_store.client import get_parameter, get_parameters
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import FaultSpec, FaultInjectingClient
+
+from simple_aws_ssm_parameter_store.tests.mock_aws import BaseMockAwsTest
+
+
+def test_coalesce():
+    ssm_client = LocalSSMClient()
+    client = FaultInjectingClient(ssm_client)
+    writer = BufferedWriter(client, flush_interval=3600, flush_on_exit=False)
+    for i in range(100):
+        writer.put("/writer/cursor", str(i))
+        writer.put(f"/writer/p{i % 20:02d}", "v")
+    assert (writer.n_put, writer.n_coalesced, writer.n_pending) == (200, 179, 21)
+    assert client.stats.total_attempt == 0
+
+    results = writer.flush()
+    assert len(results) == 21
+    assert get_parameter(ssm_client, "/writer/cursor").version == 1
+    assert get_parameter(ssm_client, "/writer/cursor").value == "99"
+    # 3 batched reads, 21 concurrent writes
+    assert client.stats.n_attempt == {"GetParameters": 3, "PutParameter": 21}
+
+    # unchanged values are not written
+    client.stats.reset()
+    writer.put("/writer/p00", "v")
+    writer.put("/writer/cursor", "100", codec="json")
+    writer.close()
+    assert (writer.n_written, writer.n_unchanged) == (22, 1)
+    assert client.stats.n_attempt == {"GetParameters": 1, "PutParameter": 1}
+    assert writer.is_running is False
+
+
+def test_failed_flush():
+    ssm_client = LocalSSMClient()
+    client = FaultInjectingClient(ssm_client)
+    writer = BufferedWriter(client, flush_interval=3600, flush_on_exit=False)
+    writer.put("/writer/a", "1")
+    writer.put("/writer/b", "1")
+    client.faults["PutParameter"] = FaultSpec(error_rate=1.0)
+    with pytest.raises(botocore.exceptions.ClientError):
+        writer.flush()
+    assert writer.n_pending == 2
+
+    client.faults.clear()
+    writer.put("/writer/a", "2")
+    writer.flush()
+    params = get_parameters(ssm_client, ["/writer/a", "/writer/b"])
+    assert [param.value for param in params.values()] == ["2", "1"]
+    writer.stop()
+
+
+def test_background_flush():
+    ssm_client = LocalSSMClient()
+    with BufferedWriter(ssm_client, flush_interval=0.05) as writer:
+        writer.put("/writer/bg/a", "1")
+        assert writer.is_running
+        time.sleep(0.5)
+        assert (writer.n_pending, writer.n_written) == (0, 1)
+
+    # max_pending flushes right away
+    with BufferedWriter(ssm_client, flush_interval=3600, max_pending=3) as writer:
+        for name in ["b", "c", "d"]:
+            writer.put(f"/writer/bg/{name}", "1")
+        assert (writer.n_pending, writer.n_written) == (0, 3)
+
+
+def test_flush_on_exit(tmp_path):
+    database = tmp_path / "ssm.sqlite"
+    code = "\n".join(
+        [
+            "from simple_aws_ssm_parameter_store.emulator import LocalSSMClient",
+            "from simple_aws_ssm_parameter_store.writer import BufferedWriter",
+            f"writer = BufferedWriter(LocalSSMClient({str(database)!r}), 3600)",
+            "writer.put('/writer/exit', 'bye')",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert get_parameter(LocalSSMClient(str(database)), "/writer/exit").value == "bye"
+
+
+class Test(BaseMockAwsTest):
+    use_mock = True
+
+    def test_flush(self):
+        writer = BufferedWriter(self.ssm_client, flush_on_exit=False)
+        for i in range(5):
+            writer.put("/writer/moto", str(i))
+        writer.close()
+        param = get_parameter(self.ssm_client, "/writer/moto")
+        assert (param.value, param.version) == ("4", 1)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_cov_test
+
+    run_cov_test(
+        __file__,
+        "simple_aws_ssm_parameter_store.writer",
+        preview=False,
+    )
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the client functions against moto in server mode.
+
+Run::
+
+    pytest tests_load/test_benchmark_client.py -s
+
+Environment variables:
+
+- ``SSM_BENCHMARK_PARAMETER_COUNTS``: comma separated store sizes,
+  default ``100,1000,10000``
+- ``SSM_BENCHMARK_N_OP``: number of measured operations per benchmark, default 200
+
+Results are printed and written to
+``tests_load/results/benchmark_client-${version}.json``, compare two result
+files with :func:`simple_aws_ssm_parameter_store.tests.benchmark.compare_results`.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from simple_aws_ssm_parameter_store.client import (
+    get_parameter,
+    get_parameters,
+    put_parameter_if_changed,
+    get_parameter_tags,
+    update_parameter_tags,
+    put_parameter_tags,
+)
+from simple_aws_ssm_parameter_store.chunk import (
+    put_chunked_parameter,
+    get_chunked_parameter,
+)
+from simple_aws_ssm_parameter_store.inventory import iter_parameter_metadata
+from simple_aws_ssm_parameter_store.constants import ParameterType
+from simple_aws_ssm_parameter_store.paths import dir_benchmark_results
+from simple_aws_ssm_parameter_store._version import __version__
+from simple_aws_ssm_parameter_store.tests.benchmark import (
+    MotoServer,
+    ApiCallCounter,
+    BenchmarkResult,
+    run_benchmark,
+    write_results,
+    format_results,
+)
+
+_parameter_counts = os.environ.get("SSM_BENCHMARK_PARAMETER_COUNTS", "100,1000,10000")
+PARAMETER_COUNTS = [int(n) for n in _parameter_counts.split(",")]
+N_OP = int(os.environ.get("SSM_BENCHMARK_N_OP", "200"))
+PREFIX = "/benchmark/param"
+
+
+def get_name(i: int) -> str:
+    return f"{PREFIX}/{i:06d}"
+
+
+def seed(ssm_client, start: int, end: int):
+    def put(i: int):
+        ssm_client.put_parameter(
+            Name=get_name(i),
+            Value=f"value-{i}",
+            Type=ParameterType.STRING.value,
+            Tags=[{"Key": "index", "Value": str(i)}],
+        )
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(put, range(start, end)))
+
+
+def run_all(
+    ssm_client, counter: ApiCallCounter, n_parameter: int
+) -> list[BenchmarkResult]:
+    n_op = N_OP
+    results = list()
+
+    def bench(name, func, n_op=n_op, n_warmup=3):
+        result = run_benchmark(
+            name=name,
+            func=func,
+            n_op=n_op,
+            n_parameter=n_parameter,
+            api_call_counter=counter,
+            n_warmup=n_warmup,
+        )
+        results.append(result)
+
+    bench(
+        "get_parameter",
+        lambda i: get_parameter(ssm_client, get_name(i % n_parameter)),
+    )
+    bench(
+        "get_parameter (missing)",
+        lambda i: get_parameter(ssm_client, f"{PREFIX}/missing/{i}"),
+    )
+    bench(
+        "put_parameter_if_changed (no-op)",
+        lambda i: put_parameter_if_changed(
+            ssm_client,
+            get_name(i % n_parameter),
+            f"value-{i % n_parameter}",
+            type=ParameterType.STRING,
+        ),
+    )
+    bench(
+        "put_parameter_if_changed (write)",
+        lambda i: put_parameter_if_changed(
+            ssm_client,
+            f"{PREFIX}/write/{i % 10}",
+            f"value-{i}",
+            type=ParameterType.STRING,
+        ),
+    )
+    bench(
+        "get_parameter_tags",
+        lambda i: get_parameter_tags(ssm_client, get_name(i % n_parameter)),
+    )
+    bench(
+        "update_parameter_tags",
+        lambda i: update_parameter_tags(
+            ssm_client, get_name(i % n_parameter), {"updated": str(i)}
+        ),
+    )
+    bench(
+        "put_parameter_tags",
+        lambda i: put_parameter_tags(
+            ssm_client, get_name(i % n_parameter), {"index": str(i % n_parameter)}
+        ),
+    )
+    bench(
+        "get_parameters (50 names)",
+        lambda i: get_parameters(
+            ssm_client,
+            [get_name((i * 50 + j) % n_parameter) for j in range(50)],
+        ),
+        n_op=max(1, n_op // 10),
+    )
+    bench(
+        "get_chunked_parameter (16KB)",
+        lambda i: get_chunked_parameter(ssm_client, f"{PREFIX}/chunked"),
+        n_op=max(1, n_op // 10),
+    )
+    bench(
+        "iter_parameter_metadata (all)",
+        lambda i: sum(
+            1 for _ in iter_parameter_metadata(ssm_client, path_prefix=PREFIX)
+        ),
+        n_op=1,
+        n_warmup=0,
+    )
+    return results
+
+
+def test_benchmark_client():
+    results = list()
+    with MotoServer() as server:
+        ssm_client = server.get_ssm_client()
+        counter = ApiCallCounter(ssm_client)
+        put_chunked_parameter(
+            ssm_client,
+            f"{PREFIX}/chunked",
+            "".join(f"line {i}\n" for i in range(2000)),
+        )
+        n_seeded = 0
+        for n_parameter in sorted(PARAMETER_COUNTS):
+            seed(ssm_client, n_seeded, n_parameter)
+            n_seeded = n_parameter
+            results.extend(run_all(ssm_client, counter, n_parameter))
+
+    print()
+    print(format_results(results))
+    path = write_results(
+        dir_benchmark_results / f"benchmark_client-{__version__}.json",
+        results,
+    )
+    print(f"results written to {path}")
+    assert all(result.n_op > 0 for result in results)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_unit_test
+
+    run_unit_test(__file__)
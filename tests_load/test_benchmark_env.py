@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the entrypoint latency of loading an environment from Parameter
+Store, against the in-process emulator with injected network latency.
+
+Run::
+
+    pytest tests_load/test_benchmark_env.py -s
+
+Environment variables:
+
+- ``SSM_BENCHMARK_N_PARAMETER``: number of parameters, default 150
+- ``SSM_BENCHMARK_LATENCY_MS``: median injected latency per call, default 15
+
+The report compares one ``get_parameter`` call per variable with
+:func:`~simple_aws_ssm_parameter_store.env.load_env`, for one path and for
+the same parameters split over three paths.
+"""
+
+import os
+import time
+
+from simple_aws_ssm_parameter_store.client import get_parameter
+from simple_aws_ssm_parameter_store.env import load_env
+from simple_aws_ssm_parameter_store.emulator import LocalSSMClient
+from simple_aws_ssm_parameter_store.fault import (
+    FaultSpec,
+    FaultInjectingClient,
+    lognormal_latency,
+)
+from simple_aws_ssm_parameter_store.constants import ParameterType
+
+N_PARAMETER = int(os.environ.get("SSM_BENCHMARK_N_PARAMETER", "150"))
+LATENCY_MS = float(os.environ.get("SSM_BENCHMARK_LATENCY_MS", "15"))
+N_PATH = 3
+
+
+def get_name(i: int) -> str:
+    return f"/benchmark/env/part{i % N_PATH}/key{i:04d}"
+
+
+def test_benchmark_env():
+    ssm_client = LocalSSMClient()
+    for i in range(N_PARAMETER):
+        ssm_client.put_parameter(
+            Name=get_name(i),
+            Value=f"value-{i}",
+            Type=ParameterType.SECURE_STRING.value,
+        )
+    client = FaultInjectingClient(
+        ssm_client,
+        default=FaultSpec(latency=lognormal_latency(LATENCY_MS / 1000, sigma=0.3)),
+        seed=1,
+    )
+
+    def measure(name, func):
+        client.stats.reset()
+        start = time.perf_counter()
+        n_var = len(func())
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"{name:<36} {n_var:>5} vars {elapsed:>9.1f} ms "
+            f"{client.stats.total_attempt:>5} calls"
+        )
+        return elapsed
+
+    print()
+    measure(
+        "get_parameter per variable",
+        lambda: [
+            get_parameter(client, get_name(i), with_decryption=True)
+            for i in range(N_PARAMETER)
+        ],
+    )
+    measure("load_env (1 path)", lambda: load_env(client, "/benchmark/env"))
+    elapsed = measure(
+        f"load_env ({N_PATH} paths)",
+        lambda: load_env(client, [f"/benchmark/env/part{i}" for i in range(N_PATH)]),
+    )
+    assert elapsed > 0
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_unit_test
+
+    run_unit_test(__file__)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the client functions under injected throttling, latency and 5xx
+errors, against moto in server mode.
+
+Run::
+
+    pytest tests_load/test_benchmark_fault.py -s
+
+Environment variables:
+
+- ``SSM_BENCHMARK_N_OP``: number of measured operations per benchmark, default 200
+- ``SSM_BENCHMARK_RETRY_MODE``: botocore retry mode, default ``standard``
+- ``SSM_BENCHMARK_MAX_ATTEMPTS``: botocore total max attempts, default 3
+
+For every scenario the report shows the successful operations per second,
+the ratio of operations that still fail after retries and the number of
+HTTP attempts per operation (error amplification). Results are written to
+``tests_load/results/benchmark_fault-${version}.json``.
+"""
+
+import os
+
+from botocore.config import Config
+
+from simple_aws_ssm_parameter_store.client import (
+    get_parameter,
+    put_parameter_if_changed,
+    get_parameter_tags,
+    update_parameter_tags,
+)
+from simple_aws_ssm_parameter_store.fault import (
+    FaultSpec,
+    FaultInjectingClient,
+    lognormal_latency,
+)
+from simple_aws_ssm_parameter_store.constants import ParameterType
+from simple_aws_ssm_parameter_store.paths import dir_benchmark_results
+from simple_aws_ssm_parameter_store._version import __version__
+from simple_aws_ssm_parameter_store.tests.benchmark import (
+    MotoServer,
+    FaultBenchmarkResult,
+    run_fault_benchmark,
+    write_results,
+    format_fault_results,
+)
+
+N_OP = int(os.environ.get("SSM_BENCHMARK_N_OP", "200"))
+RETRY_MODE = os.environ.get("SSM_BENCHMARK_RETRY_MODE", "standard")
+MAX_ATTEMPTS = int(os.environ.get("SSM_BENCHMARK_MAX_ATTEMPTS", "3"))
+N_PARAMETER = 100
+PREFIX = "/benchmark/fault"
+
+SCENARIOS = {
+    "baseline": FaultSpec(),
+    "latency p50 20ms": FaultSpec(latency=lognormal_latency(0.02)),
+    "throttle 10%": FaultSpec(throttle_rate=0.1),
+    "throttle 30%": FaultSpec(throttle_rate=0.3),
+    "5xx 5%": FaultSpec(error_rate=0.05),
+    "timeout 2%": FaultSpec(timeout_rate=0.02),
+}
+
+
+def get_name(i: int) -> str:
+    return f"{PREFIX}/{i % N_PARAMETER:06d}"
+
+
+def run_scenario(
+    client: FaultInjectingClient, scenario: str
+) -> list[FaultBenchmarkResult]:
+    results = list()
+
+    def bench(name, func):
+        results.append(
+            run_fault_benchmark(
+                name=name,
+                scenario=scenario,
+                func=func,
+                n_op=N_OP,
+                fault_client=client,
+            )
+        )
+
+    bench("get_parameter", lambda i: get_parameter(client, get_name(i)))
+    bench(
+        "put_parameter_if_changed (no-op)",
+        lambda i: put_parameter_if_changed(
+            client,
+            get_name(i),
+            f"value-{i % N_PARAMETER}",
+            type=ParameterType.STRING,
+        ),
+    )
+    bench(
+        "put_parameter_if_changed (write)",
+        lambda i: put_parameter_if_changed(
+            client,
+            f"{PREFIX}/write/{i % 10}",
+            f"{i}",
+            type=ParameterType.STRING,
+        ),
+    )
+    bench("get_parameter_tags", lambda i: get_parameter_tags(client, get_name(i)))
+    bench(
+        "update_parameter_tags",
+        lambda i: update_parameter_tags(client, get_name(i), {"updated": str(i)}),
+    )
+    return results
+
+
+def test_benchmark_fault():
+    results = list()
+    config = Config(
+        retries={"mode": RETRY_MODE, "total_max_attempts": MAX_ATTEMPTS},
+    )
+    with MotoServer() as server:
+        ssm_client = server.get_ssm_client(config=config)
+        for i in range(N_PARAMETER):
+            ssm_client.put_parameter(
+                Name=get_name(i),
+                Value=f"value-{i}",
+                Type=ParameterType.STRING.value,
+            )
+        for scenario, spec in SCENARIOS.items():
+            with FaultInjectingClient(ssm_client, default=spec, seed=1) as client:
+                results.extend(run_scenario(client, scenario))
+
+    print()
+    print(format_fault_results(results))
+    path = write_results(
+        dir_benchmark_results / f"benchmark_fault-{__version__}.json",
+        results,
+    )
+    print(f"results written to {path}")
+    baseline = [r for r in results if r.scenario == "baseline"]
+    assert all(r.error_rate == 0 for r in baseline)
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_unit_test
+
+    run_unit_test(__file__)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the import time of this library with ``python -X importtime``.
+
+Run::
+
+    pytest tests_load/test_benchmark_import.py -s
+
+Environment variables:
+
+- ``SSM_BENCHMARK_N_RUN``: number of fresh interpreters per scenario, the
+  fastest run is reported, default 5
+
+Every scenario runs in a fresh interpreter. The modules the interpreter
+imports at startup (``site`` etc.) are excluded. The import time breakdown
+of the slowest modules is printed, and the results are written to
+``tests_load/results/benchmark_import-${version}.json``.
+"""
+
+import os
+import json
+import dataclasses
+
+from simple_aws_ssm_parameter_store.paths import dir_benchmark_results
+from simple_aws_ssm_parameter_store._version import __version__
+from simple_aws_ssm_parameter_store.tests.benchmark import (
+    ImportTimeRecord,
+    measure_import_time,
+)
+
+N_RUN = int(os.environ.get("SSM_BENCHMARK_N_RUN", "5"))
+
+SCENARIOS = {
+    "import api": "import simple_aws_ssm_parameter_store.api",
+    "api.Parameter": (
+        "import simple_aws_ssm_parameter_store.api as api; api.Parameter"
+    ),
+    "api.get_parameter": (
+        "import simple_aws_ssm_parameter_store.api as api; api.get_parameter"
+    ),
+    "first get_parameter call": (
+        "import simple_aws_ssm_parameter_store.api as api; "
+        "api.get_parameter(api.LocalSSMClient(), '/p')"
+    ),
+    "import boto3 (reference)": "import boto3",
+}
+
+
+def measure(code: str, startup: set[str]) -> list[ImportTimeRecord]:
+    runs = list()
+    for _ in range(N_RUN):
+        records = [
+            record
+            for record in measure_import_time(code)
+            if record.module not in startup
+        ]
+        runs.append(records)
+    return min(
+        runs, key=lambda records: sum(r.cumulative_us for r in records if r.depth == 0)
+    )
+
+
+def test_benchmark_import():
+    startup = {record.module for record in measure_import_time("pass")}
+    results = dict()
+    for scenario, code in SCENARIOS.items():
+        records = measure(code, startup)
+        total_us = sum(r.cumulative_us for r in records if r.depth == 0)
+        modules = {r.module for r in records}
+        results[scenario] = {
+            "total_ms": total_us / 1000,
+            "n_module": len(modules),
+            "botocore_loaded": "botocore" in modules,
+            "top": [
+                dataclasses.asdict(r)
+                for r in sorted(records, key=lambda r: r.self_us, reverse=True)[:10]
+            ],
+        }
+
+    print()
+    print(f"{'scenario':<30} {'total ms':>9} {'modules':>8} {'botocore':>9}")
+    for scenario, dct in results.items():
+        print(
+            f"{scenario:<30} {dct['total_ms']:>9.1f} {dct['n_module']:>8} "
+            f"{str(dct['botocore_loaded']):>9}"
+        )
+    for scenario in ["import api", "first get_parameter call"]:
+        print(f"\nslowest modules of {scenario!r} (self time):")
+        for dct in results[scenario]["top"]:
+            print(f"  {dct['self_us'] / 1000:>7.2f} ms  {dct['module']}")
+
+    path = dir_benchmark_results / f"benchmark_import-{__version__}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"version": __version__, "results": results}, indent=4))
+    print(f"results written to {path}")
+
+    assert results["import api"]["botocore_loaded"] is False
+    assert results["api.get_parameter"]["botocore_loaded"] is False
+
+
+if __name__ == "__main__":
+    from simple_aws_ssm_parameter_store.tests import run_unit_test
+
+    run_unit_test(__file__)